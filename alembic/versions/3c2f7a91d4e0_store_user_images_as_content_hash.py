@@ -0,0 +1,60 @@
+"""store user images as content hash
+
+Revision ID: 3c2f7a91d4e0
+Revises: 8f105cd51278
+Create Date: 2025-09-07 10:21:44.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c2f7a91d4e0'
+down_revision: Union[str, Sequence[str], None] = '8f105cd51278'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 画像列（列名, 変更前コメント, 変更後コメント）
+IMAGE_COLUMNS = [
+    ('profile_image', 'プロフィール画像', 'プロフィール画像（コンテンツハッシュ）'),
+    ('header_image', 'ヘッダー画像', 'ヘッダー画像（コンテンツハッシュ）'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # インラインの画像が残っている場合は、データを失わないよう変更せずに中断する
+    conditions = ' OR '.join(
+        f"({column_name} IS NOT NULL AND {column_name} !~ '^[0-9a-f]{{64}}$')"
+        for column_name, _, _ in IMAGE_COLUMNS
+    )
+    remaining = op.get_bind().execute(
+        sa.text(f'SELECT count(*) FROM users WHERE {conditions}')
+    ).scalar_one()
+    if remaining:
+        raise RuntimeError(
+            f'{remaining} users still have inline image values. '
+            'Run `python -m app.commands.migrate_user_images` before upgrading.'
+        )
+
+    for column_name, old_comment, new_comment in IMAGE_COLUMNS:
+        op.alter_column('users', column_name,
+                   existing_type=sa.Text(),
+                   type_=sa.String(length=64),
+                   existing_nullable=True,
+                   comment=new_comment,
+                   existing_comment=old_comment)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column_name, old_comment, new_comment in IMAGE_COLUMNS:
+        op.alter_column('users', column_name,
+                   existing_type=sa.String(length=64),
+                   type_=sa.Text(),
+                   existing_nullable=True,
+                   comment=old_comment,
+                   existing_comment=new_comment)
@@ -0,0 +1,43 @@
+"""create posts table
+
+Revision ID: 5d1e8b3c9a27
+Revises: 3c2f7a91d4e0
+Create Date: 2025-09-14 09:12:37.104582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e8b3c9a27'
+down_revision: Union[str, Sequence[str], None] = '3c2f7a91d4e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('posts',
+    sa.Column('post_id', sa.BigInteger(), autoincrement=False, nullable=False, comment='投稿ID'),
+    sa.Column('user_id', sa.BigInteger(), nullable=False, comment='投稿ユーザーID'),
+    sa.Column('content', sa.String(length=140), nullable=False, comment='本文'),
+    sa.Column('reply_to_post_id', sa.BigInteger(), nullable=True, comment='返信先投稿ID'),
+    sa.Column('repost_of_post_id', sa.BigInteger(), nullable=True, comment='再投稿元投稿ID'),
+    sa.Column('delete_flag', sa.Boolean(), nullable=False, comment='削除フラグ'),
+    sa.Column('create_datetime', sa.DateTime(), nullable=False, comment='作成日時'),
+    sa.Column('update_datetime', sa.DateTime(), nullable=False, comment='更新日時'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.ForeignKeyConstraint(['reply_to_post_id'], ['posts.post_id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['repost_of_post_id'], ['posts.post_id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_posts_user_id_post_id_active', 'posts', ['user_id', 'post_id'], unique=False, postgresql_where=sa.text('delete_flag = false'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_user_id_post_id_active', table_name='posts', postgresql_where=sa.text('delete_flag = false'))
+    op.drop_table('posts')
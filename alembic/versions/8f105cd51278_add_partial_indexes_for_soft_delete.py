@@ -0,0 +1,52 @@
+"""add partial indexes for soft delete
+
+Revision ID: 8f105cd51278
+Revises: ec0d448f5d3e
+Create Date: 2025-09-07 09:41:16.503328
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f105cd51278'
+down_revision: Union[str, Sequence[str], None] = 'ec0d448f5d3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_records',
+    sa.Column('archive_id', sa.BigInteger(), sa.Identity(always=False), nullable=False, comment='アーカイブID'),
+    sa.Column('table_name', sa.String(length=63), nullable=False, comment='退避元テーブル名'),
+    sa.Column('record_id', sa.BigInteger(), nullable=False, comment='退避元レコードID'),
+    sa.Column('record', postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment='退避レコード'),
+    sa.Column('archive_datetime', sa.DateTime(), server_default=sa.text('now()'), nullable=False, comment='アーカイブ日時'),
+    sa.PrimaryKeyConstraint('archive_id')
+    )
+    # 稼働中のテーブルをロックしないよう、インデックスはCONCURRENTLYで作成する
+    with op.get_context().autocommit_block():
+        op.create_index('uq_users_username_active', 'users', ['username'], unique=True, postgresql_where=sa.text('delete_flag = false'), postgresql_concurrently=True)
+        op.create_index('uq_users_email_active', 'users', ['email'], unique=True, postgresql_where=sa.text('delete_flag = false'), postgresql_concurrently=True)
+        op.create_index('ix_users_deleted_update_datetime', 'users', ['update_datetime'], unique=False, postgresql_where=sa.text('delete_flag = true'), postgresql_concurrently=True)
+        op.create_index('uq_user_credentials_identity_active', 'user_credentials', ['identity'], unique=True, postgresql_where=sa.text('delete_flag = false'), postgresql_concurrently=True)
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_constraint('user_credentials_identity_key', 'user_credentials', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('user_credentials_identity_key', 'user_credentials', ['identity'])
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.drop_index('uq_user_credentials_identity_active', table_name='user_credentials')
+    op.drop_index('ix_users_deleted_update_datetime', table_name='users')
+    op.drop_index('uq_users_email_active', table_name='users')
+    op.drop_index('uq_users_username_active', table_name='users')
+    op.drop_table('archived_records')
@@ -0,0 +1,42 @@
+"""generate user_id in application
+
+Revision ID: 9466609a1eeb
+Revises: b6e9b0b1250d
+Create Date: 2025-08-24 10:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.schema as ss
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9466609a1eeb'
+down_revision: Union[str, Sequence[str], None] = 'b6e9b0b1250d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # user_idはアプリケーション側でSnowflake IDとして採番するため、シーケンスを廃止する
+    op.alter_column('users', 'user_id',
+               existing_type=sa.BigInteger(),
+               server_default=None,
+               existing_nullable=False,
+               existing_comment='ユーザーID')
+    op.execute(ss.DropSequence(ss.Sequence('user_id_seq')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(ss.CreateSequence(ss.Sequence('user_id_seq')))
+    # 採番済みのIDと重複しないよう、シーケンスを現在の最大値から再開する
+    op.execute("SELECT setval('user_id_seq', COALESCE((SELECT MAX(user_id) FROM users), 0) + 1, false)")
+    op.alter_column('users', 'user_id',
+               existing_type=sa.BigInteger(),
+               server_default=sa.text("nextval('user_id_seq')"),
+               existing_nullable=False,
+               existing_comment='ユーザーID')
@@ -0,0 +1,37 @@
+"""create follows table
+
+Revision ID: a4c7e2f91b38
+Revises: 5d1e8b3c9a27
+Create Date: 2025-09-15 08:47:02.661934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2f91b38'
+down_revision: Union[str, Sequence[str], None] = '5d1e8b3c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('follows',
+    sa.Column('follower_id', sa.BigInteger(), nullable=False, comment='フォローするユーザーID'),
+    sa.Column('followee_id', sa.BigInteger(), nullable=False, comment='フォローされるユーザーID'),
+    sa.Column('create_datetime', sa.DateTime(), nullable=False, comment='フォロー日時'),
+    sa.ForeignKeyConstraint(['followee_id'], ['users.user_id'], ),
+    sa.ForeignKeyConstraint(['follower_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('follower_id', 'followee_id')
+    )
+    op.create_index('ix_follows_followee_id_follower_id', 'follows', ['followee_id', 'follower_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_follows_followee_id_follower_id', table_name='follows')
+    op.drop_table('follows')
@@ -0,0 +1,32 @@
+"""add post counters
+
+Revision ID: c81f3d5e2a60
+Revises: a4c7e2f91b38
+Create Date: 2025-09-16 10:12:38.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3d5e2a60'
+down_revision: Union[str, Sequence[str], None] = 'a4c7e2f91b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('like_count', sa.Integer(), server_default=sa.text('0'), nullable=False, comment='いいね数'))
+    op.add_column('posts', sa.Column('reply_count', sa.Integer(), server_default=sa.text('0'), nullable=False, comment='返信数'))
+    op.add_column('posts', sa.Column('repost_count', sa.Integer(), server_default=sa.text('0'), nullable=False, comment='再投稿数'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'repost_count')
+    op.drop_column('posts', 'reply_count')
+    op.drop_column('posts', 'like_count')
@@ -0,0 +1,33 @@
+"""add user search indexes
+
+Revision ID: d2a9e4b7c315
+Revises: c81f3d5e2a60
+Create Date: 2025-09-17 09:31:54.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9e4b7c315'
+down_revision: Union[str, Sequence[str], None] = 'c81f3d5e2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_users_search_trgm', 'users', [sa.text("lower(username || ' ' || account_name) gin_trgm_ops")], unique=False, postgresql_using='gin', postgresql_where=sa.text('delete_flag = false'))
+    op.create_index('ix_users_username_prefix', 'users', [sa.text('lower(username) text_pattern_ops')], unique=False, postgresql_where=sa.text('delete_flag = false'))
+    op.create_index('ix_users_account_name_prefix', 'users', [sa.text('lower(account_name) text_pattern_ops')], unique=False, postgresql_where=sa.text('delete_flag = false'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_account_name_prefix', table_name='users')
+    op.drop_index('ix_users_username_prefix', table_name='users')
+    op.drop_index('ix_users_search_trgm', table_name='users')
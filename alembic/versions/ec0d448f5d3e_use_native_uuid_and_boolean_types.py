@@ -0,0 +1,61 @@
+"""use native uuid and boolean types
+
+Revision ID: ec0d448f5d3e
+Revises: 9466609a1eeb
+Create Date: 2025-08-31 14:03:52.771046
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec0d448f5d3e'
+down_revision: Union[str, Sequence[str], None] = '9466609a1eeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# フラグ列（テーブル名, 列名, コメント）
+FLAG_COLUMNS = [
+    ('authcodes', 'delete_flag', '削除フラグ'),
+    ('users', 'verified_flag', '認証済みフラグ'),
+    ('users', 'account_lock_flag', 'アカウントロックフラグ'),
+    ('users', 'delete_flag', '削除フラグ'),
+    ('user_credentials', 'delete_flag', '削除フラグ'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('authcodes', 'authcode_id',
+               existing_type=sa.String(length=36),
+               type_=sa.Uuid(),
+               existing_nullable=False,
+               existing_comment='認証コードID',
+               postgresql_using='authcode_id::uuid')
+    for table_name, column_name, comment in FLAG_COLUMNS:
+        op.alter_column(table_name, column_name,
+                   existing_type=sa.String(length=1),
+                   type_=sa.Boolean(),
+                   existing_nullable=False,
+                   existing_comment=comment,
+                   postgresql_using=f"{column_name} = '1'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, column_name, comment in FLAG_COLUMNS:
+        op.alter_column(table_name, column_name,
+                   existing_type=sa.Boolean(),
+                   type_=sa.String(length=1),
+                   existing_nullable=False,
+                   existing_comment=comment,
+                   postgresql_using=f"CASE WHEN {column_name} THEN '1' ELSE '0' END")
+    op.alter_column('authcodes', 'authcode_id',
+               existing_type=sa.Uuid(),
+               type_=sa.String(length=36),
+               existing_nullable=False,
+               existing_comment='認証コードID',
+               postgresql_using='authcode_id::text')
@@ -0,0 +1,28 @@
+"""add users keyset index
+
+Revision ID: f3b8c1d6e924
+Revises: d2a9e4b7c315
+Create Date: 2025-10-02 10:14:27.530961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c1d6e924'
+down_revision: Union[str, Sequence[str], None] = 'd2a9e4b7c315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_create_datetime_user_id_active', 'users', ['create_datetime', 'user_id'], unique=False, postgresql_where=sa.text('delete_flag = false'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_create_datetime_user_id_active', table_name='users')
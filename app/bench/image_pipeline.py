@@ -0,0 +1,117 @@
+"""
+画像処理パイプラインのベンチマーク
+
+派生画像の生成（デコード・リサイズ・メタデータ除去・WebPエンコード）について、
+プロセス数ごとに1秒あたり・1コアあたりの処理枚数を計測する。
+
+Usage
+-----
+    python -m app.bench.image_pipeline [--images 40] [--processes 1 2 4] [--size 2048x1536]
+"""
+
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from PIL import Image
+
+from app.enums import UserImageType
+from app.services.image_service import IMAGE_VARIANTS, render_variants
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    """
+    ベンチマーク結果
+
+    Attributes
+    ----------
+    processes: int
+        プロセス数
+    images: int
+        処理枚数
+    seconds: float
+        経過秒数
+    """
+
+    processes: int
+    images: int
+    seconds: float
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.seconds
+
+    @property
+    def images_per_second_per_core(self) -> float:
+        return self.images_per_second / self.processes
+
+
+def generate_sample_image(width: int, height: int, seed: int) -> bytes:
+    """
+    写真相当の負荷となるノイズ入りのJPEG画像を生成する。
+    """
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 16 + seed % 16)
+    image = Image.merge(
+        "RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT))
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _render(args: tuple[bytes, UserImageType]) -> int:
+    data, image_type = args
+    return len(
+        render_variants(data, IMAGE_VARIANTS[image_type], quality=80, max_pixels=100_000_000)
+    )
+
+
+def run_bench(samples: list[tuple[bytes, UserImageType]], processes: int) -> BenchResult:
+    """
+    指定したプロセス数で全サンプルを処理し、経過時間を計測する。
+    """
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # プロセス起動コストを計測に含めないよう、事前に全プロセスを起動しておく
+        list(executor.map(_render, samples[:processes]))
+        started = time.perf_counter()
+        list(executor.map(_render, samples))
+        seconds = time.perf_counter() - started
+    return BenchResult(processes=processes, images=len(samples), seconds=seconds)
+
+
+def render_report(results: list[BenchResult]) -> str:
+    """
+    ベンチマーク結果を表形式の文字列に整形する。
+    """
+    lines = [f"{'processes':>9} {'images':>7} {'seconds':>8} {'images/s':>9} {'images/s/core':>13}"]
+    lines += [
+        f"{r.processes:>9} {r.images:>7} {r.seconds:>8.2f} "
+        f"{r.images_per_second:>9.1f} {r.images_per_second_per_core:>13.1f}"
+        for r in results
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="画像処理パイプラインのベンチマーク")
+    parser.add_argument("--images", type=int, default=40, help="処理枚数")
+    parser.add_argument(
+        "--processes", type=int, nargs="+", default=[1, os.cpu_count() or 1], help="プロセス数"
+    )
+    parser.add_argument("--size", default="2048x1536", help="入力画像のサイズ（幅x高さ）")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    # プロフィール画像・ヘッダー画像を交互に処理する
+    image_types = list(UserImageType)
+    samples = [
+        (generate_sample_image(width, height, seed), image_types[seed % len(image_types)])
+        for seed in range(args.images)
+    ]
+    print(f"input: {args.images} images, {width}x{height} JPEG")
+    print(render_report([run_bench(samples, processes) for processes in args.processes]))
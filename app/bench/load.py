@@ -0,0 +1,358 @@
+"""
+ユーザー登録フローの負荷試験
+
+仮登録（/user/register）→ 認証コード検証・トークン発行（/user/register/verify-authcode）を
+仮想ユーザーごとに実行し、ステップごとのスループット・レイテンシのパーセンタイル・エラー率、
+1リクエストあたりのDB・Redisへの往復回数を計測する。
+認証コードはメールを受信せず、Redisの一時ユーザーのキー（temp_user:*）から取得する。
+
+既定ではアプリケーションをプロセス内で（ASGI経由で）呼び出す。--url を指定した場合は
+起動中のサーバーへ送信する（DB・Redisへの往復回数は計測しない）。
+--json を指定するとJSONで出力し、コミット間で結果を比較できる。
+
+Usage
+-----
+    python -m app.bench.load [--users 1000] [--concurrency 32] [--url http://localhost:8000]
+        [--json] [--output result.json]
+    # 登録したユーザー・認証コードを削除
+    python -m app.bench.load --cleanup
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Generator
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+import httpx
+from redis.asyncio.client import Redis
+from redis.asyncio.connection import AbstractConnection
+from sqlalchemy import event, text
+
+from app.core.database import async_session, engine
+from app.core.redis import generate_temp_user_key, get_redis_client
+from app.main import app
+
+# 負荷試験で登録するユーザーのメールアドレスのドメイン（削除対象の識別に使用する）
+LOAD_EMAIL_DOMAIN = "load.bench.example.com"
+# 計測するステップ（フロー全体はflowとして計測する）
+STEPS = ("register", "verify-authcode")
+
+CLEANUP_QUERIES = [
+    text(
+        f"""
+        DELETE FROM user_credentials
+         WHERE user_id IN (SELECT user_id FROM users WHERE email LIKE '%@{LOAD_EMAIL_DOMAIN}')
+        """
+    ),
+    text(f"DELETE FROM users WHERE email LIKE '%@{LOAD_EMAIL_DOMAIN}'"),
+    text(f"DELETE FROM authcodes WHERE email LIKE '%@{LOAD_EMAIL_DOMAIN}'"),
+]
+
+
+@dataclass(slots=True)
+class RoundTrips:
+    """
+    DB・Redisへの往復回数
+
+    Attributes
+    ----------
+    db: int
+        DBへの往復回数（SQL・トランザクションの開始・確定・取消）
+    redis: int
+        Redisへの往復回数（パイプラインは1回とする）
+    """
+
+    db: int = 0
+    redis: int = 0
+
+
+# 実行中のリクエストの往復回数（計測しない場合はNone）
+_round_trips: ContextVar[RoundTrips | None] = ContextVar("round_trips", default=None)
+
+
+@contextmanager
+def count_round_trips() -> Generator[None]:
+    """
+    DB・Redisへの往復を、実行中のリクエストの往復回数に加算する。
+
+    プロセス内で呼び出すアプリケーションはリクエストと同じタスクで実行されるため、
+    コンテキスト変数でリクエストごとに集計できる。
+    """
+
+    def on_db(*_: Any) -> None:
+        if (round_trips := _round_trips.get()) is not None:
+            round_trips.db += 1
+
+    send_packed_command = AbstractConnection.send_packed_command
+
+    async def on_redis(self: AbstractConnection, *args: Any, **kwargs: Any) -> None:
+        if (round_trips := _round_trips.get()) is not None:
+            round_trips.redis += 1
+        await send_packed_command(self, *args, **kwargs)
+
+    identifiers = ("begin", "before_cursor_execute", "commit", "rollback")
+    for identifier in identifiers:
+        event.listen(engine.sync_engine, identifier, on_db)
+    AbstractConnection.send_packed_command = on_redis  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        AbstractConnection.send_packed_command = send_packed_command  # type: ignore[method-assign]
+        for identifier in identifiers:
+            event.remove(engine.sync_engine, identifier, on_db)
+
+
+@dataclass(slots=True)
+class StepResult:
+    """
+    ステップごとの計測結果
+
+    Attributes
+    ----------
+    latencies: list[float]
+        成功したリクエストのレイテンシ（ミリ秒）
+    errors: dict[str, int]
+        エラー（HTTPステータスコードまたは例外名）ごとの件数
+    round_trips: list[RoundTrips]
+        リクエストごとのDB・Redisへの往復回数
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    round_trips: list[RoundTrips] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    def add_error(self, error: str) -> None:
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        """
+        計測結果を集計する。
+        """
+        requests = self.requests
+        return {
+            "requests": requests,
+            "rps": requests / seconds if seconds else 0.0,
+            "error_rate": sum(self.errors.values()) / requests if requests else 0.0,
+            "errors": self.errors,
+            "latency_ms": {f"p{p}": percentile(self.latencies, p) for p in (50, 95, 99)},
+            "db_round_trips": _mean([r.db for r in self.round_trips]),
+            "redis_round_trips": _mean([r.redis for r in self.round_trips]),
+        }
+
+
+def percentile(values: list[float], p: int) -> float | None:
+    if len(values) < 2:
+        return values[0] if values else None
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def _mean(values: list[int]) -> float | None:
+    return statistics.fmean(values) if values else None
+
+
+async def request(
+    client: httpx.AsyncClient,
+    result: StepResult,
+    path: str,
+    body: dict[str, Any],
+    count: bool,
+) -> dict[str, Any] | None:
+    """
+    リクエストを送信して計測する。
+
+    Returns
+    -------
+    dict[str, Any] | None:
+        レスポンス（エラーの場合はNone）
+    """
+    round_trips = RoundTrips()
+    token = _round_trips.set(round_trips if count else None)
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, json=body)
+    except httpx.HTTPError as e:
+        result.add_error(type(e).__name__)
+        return None
+    finally:
+        _round_trips.reset(token)
+    if response.status_code != httpx.codes.OK:
+        result.add_error(str(response.status_code))
+        return None
+    result.latencies.append((time.perf_counter() - started) * 1000)
+    if count:
+        result.round_trips.append(round_trips)
+    return response.json()
+
+
+async def find_authcode(redis: Redis, authcode_id: str) -> str | None:
+    """
+    一時ユーザーのキーから認証コードを取得する。
+    """
+    async for key in redis.scan_iter(match=generate_temp_user_key(authcode_id, "*"), count=1000):
+        return key.rsplit(":", 1)[-1]
+    return None
+
+
+async def run_flow(
+    client: httpx.AsyncClient,
+    redis: Redis,
+    results: dict[str, StepResult],
+    email: str,
+    count: bool,
+) -> None:
+    """
+    1ユーザー分の登録フローを実行する。
+    """
+    started = time.perf_counter()
+    body = {"account_name": "負荷試験", "email": email, "birthday": date(2000, 1, 1).isoformat()}
+    registered = await request(client, results["register"], "/user/register", body, count)
+    if registered is None:
+        results["flow"].add_error("register")
+        return
+    code = await find_authcode(redis, registered["authcode_id"])
+    if code is None:
+        results["flow"].add_error("authcode not found")
+        return
+    body = {"authcode_id": registered["authcode_id"], "code": code}
+    path = "/user/register/verify-authcode"
+    tokens = await request(client, results["verify-authcode"], path, body, count)
+    if tokens is None or not tokens.get("access_token"):
+        results["flow"].add_error("verify-authcode")
+        return
+    results["flow"].latencies.append((time.perf_counter() - started) * 1000)
+
+
+def git_revision() -> str | None:
+    """
+    計測したコミットを取得する（Gitリポジトリ外の場合はNone）。
+    """
+    completed = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False
+    )
+    return completed.stdout.strip() or None
+
+
+async def run_load(users: int, concurrency: int, url: str | None) -> dict[str, Any]:
+    """
+    仮想ユーザーを同時実行数で分割して登録フローを実行し、計測結果を集計する。
+    """
+    results = {step: StepResult() for step in (*STEPS, "flow")}
+    run_id = int(time.time())
+    emails = [f"load-{run_id}-{i}@{LOAD_EMAIL_DOMAIN}" for i in range(users)]
+    redis = await get_redis_client()
+    count = url is None
+
+    async with AsyncExitStack() as stack:
+        if url is None:
+            # プロセス内で呼び出す場合も、起動処理（ID生成用のワーカーIDのリース等）を実行する
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            stack.enter_context(count_round_trips())
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://load")
+        else:
+            limits = httpx.Limits(max_connections=concurrency)
+            client = httpx.AsyncClient(base_url=url, limits=limits, timeout=30)
+        await stack.enter_async_context(client)
+
+        async def worker(chunk: list[str]) -> None:
+            for email in chunk:
+                await run_flow(client, redis, results, email, count)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(emails[i::concurrency]) for i in range(concurrency)))
+        seconds = time.perf_counter() - started
+    await redis.aclose()
+
+    return {
+        "revision": git_revision(),
+        "target": url or "asgi",
+        "users": users,
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "steps": {step: result.summary(seconds) for step, result in results.items()},
+    }
+
+
+def render_report(report: dict[str, Any]) -> str:
+    """
+    計測結果を表形式の文字列に整形する。
+    """
+
+    def fmt(value: float | None) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    lines = [
+        f"target: {report['target']}  revision: {report['revision']}  "
+        f"users: {report['users']}  concurrency: {report['concurrency']}  "
+        f"seconds: {report['seconds']:.2f}",
+        f"{'step':<16} {'requests':>8} {'rps':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'db rt':>6} {'redis rt':>8}",
+    ]
+    for step, s in report["steps"].items():
+        latency = s["latency_ms"]
+        lines.append(
+            f"{step:<16} {s['requests']:>8} {s['rps']:>8.1f} {s['error_rate']:>7.2%} "
+            f"{fmt(latency['p50']):>8} {fmt(latency['p95']):>8} {fmt(latency['p99']):>8} "
+            f"{fmt(s['db_round_trips']):>6} {fmt(s['redis_round_trips']):>8}"
+        )
+    return "\n".join(lines)
+
+
+async def cleanup() -> None:
+    """
+    負荷試験で登録したユーザー・認証コードを削除する。
+    """
+    async with async_session() as db:
+        for query in CLEANUP_QUERIES:
+            await db.execute(query)
+        await db.commit()
+
+
+async def main(
+    users: int, concurrency: int, url: str | None, as_json: bool, output: str | None, clean: bool
+) -> int:
+    try:
+        if clean:
+            await cleanup()
+            return 0
+        report = await run_load(users, concurrency, url)
+    finally:
+        await engine.dispose()
+    rendered = (
+        json.dumps(report, ensure_ascii=False, indent=2) if as_json else render_report(report)
+    )
+    if output is None:
+        print(rendered)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(rendered)
+    return 0 if report["steps"]["flow"]["error_rate"] == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザー登録フローの負荷試験")
+    parser.add_argument("--users", type=int, default=1000, help="登録するユーザー数")
+    parser.add_argument("--concurrency", type=int, default=32, help="同時実行数")
+    parser.add_argument("--url", help="起動中のサーバーのURL（省略時はプロセス内で呼び出す）")
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    parser.add_argument("--output", help="出力先のファイル（省略時は標準出力）")
+    parser.add_argument("--cleanup", action="store_true", help="登録したデータを削除する")
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            main(args.users, args.concurrency, args.url, args.json, args.output, args.cleanup)
+        )
+    )
@@ -0,0 +1,383 @@
+"""
+ホットパスのマイクロベンチマーク
+
+トークン発行・認証コード生成・初期ユーザー名の候補生成・スキーマの検証・crudの取得関数について、
+1回あたりの処理時間をラウンドごとに計測する。計測結果をベースライン（リポジトリに保存）と
+Mann-WhitneyのU検定で比較し、統計的に有意に遅くなったケースを性能劣化として検出する。
+
+DB・Redisを使用するケースは、設定の接続先（DBには1件以上のユーザーが必要）に対して計測する。
+--skip-io を指定した場合はCPUのみのケースを計測する。
+
+Usage
+-----
+    # 計測してベースラインを更新
+    python -m app.bench.micro run --save app/bench/baselines/micro.json
+    # 計測してベースラインと比較（性能劣化を検出した場合は終了コード1）
+    python -m app.bench.micro compare [--baseline app/bench/baselines/micro.json] [--skip-io]
+    # 保存済みの計測結果同士を比較
+    python -m app.bench.micro compare --current result.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+
+from app import crud, models
+from app.bench.load import git_revision
+from app.core.database import async_session, engine
+from app.core.redis import get_redis_client
+from app.core.security import generate_authcode
+from app.enums import TokenType
+from app.schemas import user_schema
+from app.services import token_service, user_service
+
+# ベースラインの保存先
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+# 性能劣化と判定する有意水準
+DEFAULT_ALPHA = 0.01
+# 性能劣化と判定する中央値の最小の増加率（有意でも小さな差は無視する）
+DEFAULT_MIN_CHANGE = 0.05
+
+TEMP_USER_JSON = json.dumps({
+    "account_name": "ベンチマーク",
+    "email": "bench@example.com",
+    "birthday": "2000-01-01",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """
+    ベンチマークのケース
+
+    Attributes
+    ----------
+    name: str
+        ケース名
+    func: Callable[[], Awaitable[object]]
+        計測対象の処理（1回分）
+    iterations: int
+        1ラウンドの実行回数
+    """
+
+    name: str
+    func: Callable[[], Awaitable[object]]
+    iterations: int
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    """
+    ベンチマーク結果
+
+    Attributes
+    ----------
+    name: str
+        ケース名
+    samples: list[float]
+        ラウンドごとの1回あたりの処理時間（マイクロ秒）
+    """
+
+    name: str
+    samples: list[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """
+    ベースラインとの比較結果
+
+    Attributes
+    ----------
+    name: str
+        ケース名
+    baseline: float
+        ベースラインの中央値（マイクロ秒）
+    current: float
+        計測結果の中央値（マイクロ秒）
+    p_value: float
+        Mann-WhitneyのU検定のp値（両側）
+    regressed: bool
+        性能劣化と判定したか
+    """
+
+    name: str
+    baseline: float
+    current: float
+    p_value: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def mann_whitney_u(a: list[float], b: list[float]) -> tuple[float, float]:
+    """
+    Mann-WhitneyのU検定（正規近似、同順位補正あり）を行う。
+
+    Parameters
+    ----------
+    a: list[float]
+        標本1
+    b: list[float]
+        標本2
+
+    Returns
+    -------
+    tuple[float, float]:
+        標本1のU統計量, p値（両側）
+    """
+    n1, n2 = len(a), len(b)
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    # 同順位は平均順位とする
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    r1 = sum(rank for rank, (_, group) in zip(ranks, values, strict=True) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u1, 1.0
+    # 連続性補正
+    z = (abs(u1 - mean) - 0.5) / math.sqrt(variance)
+    return u1, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare(
+    baseline: dict[str, list[float]],
+    current: dict[str, list[float]],
+    alpha: float,
+    min_change: float,
+) -> list[Comparison]:
+    """
+    両方に存在するケースについて、計測結果をベースラインと比較する。
+
+    中央値の増加率がmin_change以上、かつU検定のp値がalpha未満の場合に性能劣化と判定する。
+    """
+    comparisons: list[Comparison] = []
+    for name, samples in current.items():
+        if name not in baseline:
+            continue
+        base, now = statistics.median(baseline[name]), statistics.median(samples)
+        _, p_value = mann_whitney_u(baseline[name], samples)
+        regressed = now > base * (1 + min_change) and p_value < alpha
+        comparisons.append(Comparison(name, base, now, p_value, regressed))
+    return comparisons
+
+
+async def build_cases(db_user: models.User | None, redis: Redis | None) -> list[Case]:
+    """
+    ベンチマークのケースを生成する（DB・Redisが無い場合はCPUのみのケース）。
+    """
+    sample = models.User(
+        user_id=1,
+        username="benchuser",
+        account_name="ベンチマーク",
+        email="bench@example.com",
+        birthday=date(2000, 1, 1),
+        verified_flag=False,
+        auth_failure_count=0,
+        account_lock_flag=False,
+        update_datetime=datetime(2025, 1, 1),
+    )
+    user = user_schema.User.model_validate(sample)
+
+    async def authcode() -> object:
+        return generate_authcode()
+
+    async def username_candidate() -> object:
+        return user_service.generate_username_candidate()
+
+    async def user_from_orm() -> object:
+        return user_schema.User.model_validate(sample)
+
+    async def temp_user_from_json() -> object:
+        return user_schema.TempUser.model_validate_json(TEMP_USER_JSON)
+
+    cases = [
+        Case("security.generate_authcode", authcode, 2000),
+        Case("user_service.generate_username_candidate", username_candidate, 2000),
+        Case("user_schema.User.from_orm", user_from_orm, 2000),
+        Case("user_schema.TempUser.from_json", temp_user_from_json, 2000),
+    ]
+    if redis is not None:
+        expires = timedelta(minutes=1)
+        cases.append(
+            Case(
+                "token_service.create_token",
+                lambda: token_service.create_token(user, expires, redis, TokenType.ACCESS),
+                200,
+            )
+        )
+    if db_user is not None:
+
+        async def select_by(func: Callable[..., Awaitable[object]], *args: object) -> object:
+            async with async_session() as db:
+                return await func(db, *args)
+
+        cases += [
+            Case(
+                "crud.select_user_by_username",
+                lambda: select_by(crud.select_user_by_username, db_user.username),
+                200,
+            ),
+            Case(
+                "crud.select_user_by_email",
+                lambda: select_by(crud.select_user_by_email, db_user.email),
+                200,
+            ),
+            Case(
+                "crud.select_users_by_ids",
+                lambda: select_by(crud.select_users_by_ids, [db_user.user_id]),
+                200,
+            ),
+        ]
+    return cases
+
+
+async def run_case(case: Case, rounds: int) -> BenchResult:
+    """
+    ケースをウォームアップ後にラウンド数分計測する。
+    """
+    for _ in range(case.iterations // 10 or 1):
+        await case.func()
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(case.iterations):
+            await case.func()
+        samples.append((time.perf_counter() - started) / case.iterations * 1_000_000)
+    return BenchResult(name=case.name, samples=samples)
+
+
+async def run(rounds: int, skip_io: bool, only: list[str] | None) -> list[BenchResult]:
+    """
+    全てのケースを計測する。
+    """
+    redis: Redis | None = None
+    db_user: models.User | None = None
+    try:
+        if not skip_io:
+            redis = await get_redis_client()
+            async with async_session() as db:
+                db_user = (await db.scalars(select(models.User).limit(1))).first()
+        results = [
+            await run_case(case, rounds)
+            for case in await build_cases(db_user, redis)
+            if only is None or any(name in case.name for name in only)
+        ]
+    finally:
+        if redis is not None:
+            await redis.aclose()
+        await engine.dispose()
+    return results
+
+
+def dump_results(results: list[BenchResult]) -> dict[str, Any]:
+    """
+    計測結果を保存形式に変換する。
+    """
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": {r.name: [round(sample, 4) for sample in r.samples] for r in results},
+    }
+
+
+def render_results(results: list[BenchResult]) -> str:
+    """
+    計測結果を表形式の文字列に整形する。
+    """
+    lines = [f"{'case':<42} {'median us':>10} {'min us':>10} {'max us':>10}"]
+    lines += [
+        f"{r.name:<42} {r.median:>10.3f} {min(r.samples):>10.3f} {max(r.samples):>10.3f}"
+        for r in results
+    ]
+    return "\n".join(lines)
+
+
+def render_comparisons(comparisons: list[Comparison]) -> str:
+    """
+    比較結果を表形式の文字列に整形する。
+    """
+    lines = [f"{'case':<42} {'base us':>10} {'now us':>10} {'change':>8} {'p':>8} {'result':>6}"]
+    lines += [
+        f"{c.name:<42} {c.baseline:>10.3f} {c.current:>10.3f} {c.change:>+8.1%} "
+        f"{c.p_value:>8.4f} {'NG' if c.regressed else 'OK':>6}"
+        for c in comparisons
+    ]
+    return "\n".join(lines)
+
+
+def load_cases(path: Path) -> dict[str, list[float]]:
+    return json.loads(path.read_text(encoding="utf-8"))["cases"]
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.command == "compare" and args.current is not None:
+        current = load_cases(Path(args.current))
+    else:
+        results = await run(args.rounds, args.skip_io, args.only)
+        print(render_results(results))
+        if args.save is not None:
+            Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.save).write_text(
+                json.dumps(dump_results(results), indent=2) + "\n", encoding="utf-8"
+            )
+        current = {r.name: r.samples for r in results}
+    if args.command == "run":
+        return 0
+
+    comparisons = compare(load_cases(Path(args.baseline)), current, args.alpha, args.min_change)
+    print(render_comparisons(comparisons))
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ホットパスのマイクロベンチマーク")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("run", "compare"):
+        sub = subparsers.add_parser(command)
+        sub.add_argument("--rounds", type=int, default=20, help="ラウンド数")
+        sub.add_argument("--skip-io", action="store_true", help="CPUのみのケースを計測する")
+        sub.add_argument("--only", nargs="+", help="計測するケース名（部分一致）")
+        sub.add_argument("--save", help="計測結果の保存先")
+    compare_parser = subparsers.choices["compare"]
+    compare_parser.add_argument(
+        "--baseline", default=str(DEFAULT_BASELINE), help="ベースラインの計測結果"
+    )
+    compare_parser.add_argument("--current", help="比較する計測結果（省略時は計測する）")
+    compare_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="有意水準")
+    compare_parser.add_argument(
+        "--min-change", type=float, default=DEFAULT_MIN_CHANGE, help="中央値の最小の増加率"
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,218 @@
+"""
+通知ストリーム（SSE）の負荷試験
+
+起動中のサーバーに対して合成ユーザー（user_searchベンチマークで投入したユーザー）で
+多数のSSE接続を確立して維持し、接続中のユーザーに通知を発行して配信までの遅延を計測する。
+接続数がプロセスの上限を超えた分は503（接続失敗）として計上する。
+
+Usage
+-----
+    # 事前に合成ユーザーを投入しておく
+    python -m app.bench.user_search --seed --users 20000 --queries 1
+    python -m app.bench.notification_stream [--url http://localhost:8000] [--connections 10000]
+        [--notifications 1000] [--hold 30]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+from sqlalchemy import select
+
+from app.bench.user_search import BENCH_EMAIL_DOMAIN
+from app.core.database import async_session, engine
+from app.core.redis import get_redis_client
+from app.enums import NotificationType
+from app.models import User
+from app.schemas import user_schema
+from app.schemas.notification_schema import Notification
+from app.services import notification_service, token_service
+
+# 接続を同時に確立する最大数（接続の確立自体が負荷とならないようにする）
+CONNECT_CONCURRENCY = 200
+
+
+@dataclass(slots=True)
+class BenchResult:
+    """
+    負荷試験結果
+
+    Attributes
+    ----------
+    connect_latencies: list[float]
+        接続の確立（最初のコメントの受信）までのレイテンシ（ミリ秒）
+    connect_failures: int
+        接続に失敗した数
+    delivery_latencies: list[float]
+        通知の発行から受信までのレイテンシ（ミリ秒）
+    heartbeats: int
+        受信したハートビート数
+    dropped: int
+        サーバーで破棄された通知数
+    """
+
+    connect_latencies: list[float] = field(default_factory=list)
+    connect_failures: int = 0
+    delivery_latencies: list[float] = field(default_factory=list)
+    heartbeats: int = 0
+    dropped: int = 0
+
+
+def percentile(values: list[float], p: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+async def create_tokens(connections: int) -> dict[int, str]:
+    """
+    合成ユーザーのアクセストークンを作成する。
+
+    Returns
+    -------
+    dict[int, str]:
+        ユーザーIDごとのアクセストークン
+    """
+    redis = await get_redis_client()
+    async with async_session() as db:
+        users = (
+            await db.scalars(
+                select(User)
+                .where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+                .order_by(User.user_id)
+                .limit(connections)
+            )
+        ).all()
+        tokens = {
+            user.user_id: await token_service.create_access_token(
+                user_schema.User.model_validate(user), redis
+            )
+            for user in users
+        }
+    await redis.aclose()
+    return tokens
+
+
+async def listen(
+    client: httpx.AsyncClient,
+    token: str,
+    result: BenchResult,
+    semaphore: asyncio.Semaphore,
+    connected: asyncio.Event,
+) -> None:
+    """
+    SSE接続を確立し、切断（キャンセル）されるまでイベントを受信する。
+    """
+    started = time.perf_counter()
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        async with semaphore:
+            request = client.build_request("GET", "/notifications/stream", headers=headers)
+            response = await client.send(request, stream=True)
+        async with response:
+            if response.status_code != httpx.codes.OK:
+                result.connect_failures += 1
+                return
+            event = ""
+            async for line in response.aiter_lines():
+                if line == ": connected":
+                    result.connect_latencies.append((time.perf_counter() - started) * 1000)
+                    connected.set()
+                elif line == ": heartbeat":
+                    result.heartbeats += 1
+                elif line.startswith("event: "):
+                    event = line.removeprefix("event: ")
+                elif line.startswith("data: ") and event == "notification":
+                    notification = Notification.model_validate_json(line.removeprefix("data: "))
+                    delay = datetime.now() - notification.create_datetime
+                    result.delivery_latencies.append(delay.total_seconds() * 1000)
+                elif line.startswith("data: ") and event == "dropped":
+                    result.dropped += json.loads(line.removeprefix("data: "))["count"]
+    except httpx.HTTPError:
+        result.connect_failures += 1
+
+
+async def publish(user_ids: list[int], notifications: int, hold: float) -> None:
+    """
+    接続中のユーザーに無作為に通知を発行する（接続の維持期間に分散させる）。
+    """
+    redis = await get_redis_client()
+    rng = random.Random(0)
+    for _ in range(notifications):
+        await notification_service.notify(
+            redis, rng.choice(user_ids), NotificationType.FOLLOW, actor_id=0
+        )
+        await asyncio.sleep(hold / max(notifications, 1))
+    await redis.aclose()
+
+
+def render_report(result: BenchResult, connections: int) -> str:
+    """
+    負荷試験結果を表形式の文字列に整形する。
+    """
+    connected = len(result.connect_latencies)
+    lines = [
+        f"{'metric':<24} {'value':>12}",
+        f"{'connections':<24} {connections:>12,}",
+        f"{'connected':<24} {connected:>12,}",
+        f"{'connect failures':<24} {result.connect_failures:>12,}",
+        f"{'connect p50 ms':<24} {percentile(result.connect_latencies, 50):>12.2f}",
+        f"{'connect p99 ms':<24} {percentile(result.connect_latencies, 99):>12.2f}",
+        f"{'delivered':<24} {len(result.delivery_latencies):>12,}",
+        f"{'dropped':<24} {result.dropped:>12,}",
+        f"{'delivery p50 ms':<24} {percentile(result.delivery_latencies, 50):>12.2f}",
+        f"{'delivery p99 ms':<24} {percentile(result.delivery_latencies, 99):>12.2f}",
+        f"{'heartbeats':<24} {result.heartbeats:>12,}",
+    ]
+    return "\n".join(lines)
+
+
+async def main(url: str, connections: int, notifications: int, hold: float) -> int:
+    try:
+        tokens = await create_tokens(connections)
+    finally:
+        await engine.dispose()
+    if len(tokens) < connections:
+        print("合成ユーザーが不足しています。user_searchで投入してください。", file=sys.stderr)
+        return 1
+
+    result = BenchResult()
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=0)
+    timeout = httpx.Timeout(None, connect=30)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        events = {user_id: asyncio.Event() for user_id in tokens}
+        listeners = [
+            asyncio.create_task(listen(client, token, result, semaphore, events[user_id]))
+            for user_id, token in tokens.items()
+        ]
+        # 全ての接続の確立（または失敗）を待機してから通知を発行する
+        while sum(e.is_set() for e in events.values()) + result.connect_failures < connections:
+            await asyncio.sleep(0.1)
+        connected = [user_id for user_id, event in events.items() if event.is_set()]
+        if connected:
+            await publish(connected, notifications, hold)
+        # 発行済みの通知の受信を待機する
+        await asyncio.sleep(1)
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+    print(render_report(result, connections))
+    return 0 if result.connect_failures == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="通知ストリーム（SSE）の負荷試験")
+    parser.add_argument("--url", default="http://localhost:8000", help="サーバーのURL")
+    parser.add_argument("--connections", type=int, default=10_000, help="SSE接続数")
+    parser.add_argument("--notifications", type=int, default=1000, help="発行する通知数")
+    parser.add_argument("--hold", type=float, default=30.0, help="接続を維持する秒数")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.url, args.connections, args.notifications, args.hold)))
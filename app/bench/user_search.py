@@ -0,0 +1,211 @@
+"""
+ユーザー検索のベンチマーク
+
+合成データ（既定100万ユーザー）を投入したDBに対して検索文字列の長さ別にユーザー検索を実行し、
+レイテンシのパーセンタイルを計測する。p99が目標値を超えた場合は終了コード1で終了する。
+
+短い検索文字列（キャッシュ対象）は初回のみDBを検索するため、キャッシュ済みの状態を計測する。
+
+Usage
+-----
+    # 合成データを投入して計測（投入済みの場合は投入しない）
+    python -m app.bench.user_search --seed [--users 1000000] [--queries 2000] [--p99-ms 50]
+    # 合成データを削除
+    python -m app.bench.user_search --cleanup
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import async_session, engine
+from app.core.redis import get_redis_client
+from app.services import search_service
+
+# 合成データのメールアドレスのドメイン（削除対象の識別に使用する）
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+# 合成データのユーザーIDの開始値（アプリケーションで生成するIDと重複しない範囲）
+BENCH_USER_ID_OFFSET = 9_000_000_000_000_000_000
+# 1回のINSERTで投入するユーザー数
+SEED_BATCH_SIZE = 100_000
+
+# 合成ユーザーを投入する（ユーザー名は英数字、アカウント名は日本語・英語を半数ずつとする）
+SEED_QUERY = text(
+    f"""
+    INSERT INTO users (
+        user_id, username, account_name, email, birthday, verified_flag,
+        auth_failure_count, account_lock_flag, delete_flag, create_datetime, update_datetime
+    )
+    SELECT {BENCH_USER_ID_OFFSET} + g,
+           substr(md5(g::text), 1, 8) || g,
+           CASE WHEN g % 2 = 0
+                THEN (ARRAY['佐藤', '鈴木', '高橋', '田中', '伊藤',
+                            '渡辺', '山本', '中村', '小林', '加藤'])[1 + g % 10]
+                     || (ARRAY['太郎', '花子', '健太', '美咲', '翔', '陽菜'])[1 + g / 10 % 6]
+                ELSE (ARRAY['Alice', 'Bob', 'Carol', 'Dave', 'Eve',
+                            'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy'])[1 + g % 10]
+                     || ' ' || (ARRAY['Smith', 'Jones', 'Brown', 'Lee', 'Wilson'])[1 + g / 10 % 5]
+           END,
+           'user' || g || '@{BENCH_EMAIL_DOMAIN}',
+           DATE '2000-01-01',
+           false, 0, false, false, now(), now()
+      FROM generate_series(:start, :stop) AS g
+    """
+)
+COUNT_QUERY = text(f"SELECT count(*) FROM users WHERE email LIKE '%@{BENCH_EMAIL_DOMAIN}'")
+CLEANUP_QUERY = text(f"DELETE FROM users WHERE email LIKE '%@{BENCH_EMAIL_DOMAIN}'")
+SAMPLE_QUERY = text(
+    f"""
+    SELECT username, account_name
+      FROM users TABLESAMPLE SYSTEM (1)
+     WHERE email LIKE '%@{BENCH_EMAIL_DOMAIN}'
+     LIMIT :limit
+    """
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    """
+    ベンチマーク結果
+
+    Attributes
+    ----------
+    label: str
+        検索文字列の種類
+    latencies: list[float]
+        レイテンシ（ミリ秒）
+    """
+
+    label: str
+    latencies: list[float]
+
+    def percentile(self, p: int) -> float:
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[p - 1]
+
+
+async def seed_users(db: AsyncSession, users: int) -> int:
+    """
+    合成ユーザーを投入する（投入済みのユーザー数が不足する分のみ）。
+
+    Returns
+    -------
+    int:
+        投入したユーザー数
+    """
+    existing = (await db.execute(COUNT_QUERY)).scalar_one()
+    for start in range(existing + 1, users + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE - 1, users)
+        await db.execute(SEED_QUERY, {"start": start, "stop": stop})
+        await db.commit()
+        print(f"seeded: {stop:,} / {users:,}")
+    # インデックスの統計情報を最新化する
+    await db.execute(text("ANALYZE users"))
+    return max(users - existing, 0)
+
+
+def generate_queries(samples: list[tuple[str, str]], count: int) -> dict[str, list[str]]:
+    """
+    既存ユーザーのユーザー名・アカウント名から、長さ別の検索文字列を生成する。
+    """
+    rng = random.Random(0)
+    short_max = get_settings().SEARCH_PREFIX_CACHE_MAX_LENGTH
+    queries: dict[str, list[str]] = {"short (cached)": [], "prefix": [], "substring": []}
+    for _ in range(count):
+        name = rng.choice(rng.choice(samples))
+        queries["short (cached)"].append(name[: rng.randint(1, short_max)])
+        queries["prefix"].append(name[: rng.randint(short_max + 1, max(short_max + 1, len(name)))])
+        start = rng.randrange(max(len(name) - 3, 1))
+        queries["substring"].append(name[start : start + 3])
+    return queries
+
+
+async def run_bench(label: str, queries: list[str], concurrency: int) -> BenchResult:
+    """
+    検索文字列を同時実行数で分割して検索し、1件ごとのレイテンシを計測する。
+    """
+    redis = await get_redis_client()
+    latencies: list[float] = []
+
+    async def worker(chunk: list[str]) -> None:
+        async with async_session() as db:
+            for query in chunk:
+                started = time.perf_counter()
+                await search_service.search_users(db, redis, query, search_service.MAX_RESULTS)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    # キャッシュ対象の検索文字列は、キャッシュ済みの状態を計測する
+    if label.startswith("short"):
+        await worker(sorted(set(queries)))
+        latencies.clear()
+    await asyncio.gather(*(worker(queries[i::concurrency]) for i in range(concurrency)))
+    await redis.aclose()
+    return BenchResult(label=label, latencies=latencies)
+
+
+def render_report(results: list[BenchResult], p99_target_ms: float) -> str:
+    """
+    ベンチマーク結果を表形式の文字列に整形する。
+    """
+    lines = [f"{'query':<16} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'result':>6}"]
+    lines += [
+        f"{r.label:<16} {len(r.latencies):>6} {r.percentile(50):>8.2f} {r.percentile(95):>8.2f} "
+        f"{r.percentile(99):>8.2f} {'OK' if r.percentile(99) <= p99_target_ms else 'NG':>6}"
+        for r in results
+    ]
+    return "\n".join(lines)
+
+
+async def main(
+    seed: bool, cleanup: bool, users: int, queries: int, concurrency: int, p99_target_ms: float
+) -> int:
+    try:
+        async with async_session() as db:
+            if cleanup:
+                await db.execute(CLEANUP_QUERY)
+                await db.commit()
+                return 0
+            if seed:
+                await seed_users(db, users)
+            samples = [
+                (row.username, row.account_name)
+                for row in await db.execute(SAMPLE_QUERY, {"limit": queries})
+            ]
+        if not samples:
+            print("合成データが存在しません。--seed を指定してください。", file=sys.stderr)
+            return 1
+
+        results = [
+            await run_bench(label, values, concurrency)
+            for label, values in generate_queries(samples, queries).items()
+        ]
+    finally:
+        await engine.dispose()
+    print(render_report(results, p99_target_ms))
+    return 0 if all(r.percentile(99) <= p99_target_ms for r in results) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザー検索のベンチマーク")
+    parser.add_argument("--seed", action="store_true", help="合成データを投入する")
+    parser.add_argument("--cleanup", action="store_true", help="合成データを削除する")
+    parser.add_argument("--users", type=int, default=1_000_000, help="合成ユーザー数")
+    parser.add_argument("--queries", type=int, default=2000, help="種類ごとの検索回数")
+    parser.add_argument("--concurrency", type=int, default=8, help="同時実行数")
+    parser.add_argument(
+        "--p99-ms", type=float, default=50.0, help="p99レイテンシの目標値（ミリ秒）"
+    )
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            main(args.seed, args.cleanup, args.users, args.queries, args.concurrency, args.p99_ms)
+        )
+    )
@@ -0,0 +1,34 @@
+"""
+論理削除済みユーザーのアーカイブ
+
+保持期間を過ぎた論理削除済みユーザーをバッチ単位でアーカイブテーブルへ移動する。
+定期実行（cron等）を想定する。
+
+Usage
+-----
+    python -m app.commands.archive_deleted_users [--retention-days 30] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import async_session, engine
+from app.services import archive_service
+
+
+async def main(retention_days: int | None, batch_size: int | None, interval: float) -> None:
+    async with async_session() as db:
+        total = await archive_service.archive_deleted_users(
+            db, retention_days=retention_days, batch_size=batch_size, interval_seconds=interval
+        )
+    await engine.dispose()
+    print(f"archived users: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="論理削除済みユーザーのアーカイブ")
+    parser.add_argument("--retention-days", type=int, help="論理削除後の保持日数")
+    parser.add_argument("--batch-size", type=int, help="1バッチの件数")
+    parser.add_argument("--interval", type=float, default=0.0, help="バッチ間の待機秒数")
+    args = parser.parse_args()
+    asyncio.run(main(args.retention_days, args.batch_size, args.interval))
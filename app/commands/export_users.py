@@ -0,0 +1,52 @@
+"""
+ユーザーのエクスポート
+
+論理削除されていないユーザーをNDJSON・CSVでファイル（または標準出力）へ出力する。
+APIと同じく一定件数ずつ取得・変換して書き込むため、メモリ使用量は件数によらず一定となる。
+
+Usage
+-----
+    python -m app.commands.export_users [--format ndjson|csv] [--gzip] [--output users.ndjson]
+        [--batch-size 5000]
+"""
+
+import argparse
+import asyncio
+import sys
+from contextlib import nullcontext
+
+from app.core.config import get_settings
+from app.core.database import async_session, engine
+from app.enums import ExportFormat
+from app.services import export_service
+
+
+async def main(
+    export_format: ExportFormat, compress: bool, output: str | None, batch_size: int
+) -> None:
+    with open(output, "wb") if output is not None else nullcontext(sys.stdout.buffer) as f:
+        async for chunk in export_service.export_users(
+            async_session, export_format, batch_size, compress
+        ):
+            f.write(chunk)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザーのエクスポート")
+    parser.add_argument(
+        "--format",
+        default=ExportFormat.NDJSON.value,
+        choices=[export_format.value for export_format in ExportFormat],
+        help="エクスポート形式",
+    )
+    parser.add_argument("--gzip", action="store_true", help="gzip圧縮する")
+    parser.add_argument("--output", help="出力先のファイル（省略時は標準出力）")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=get_settings().EXPORT_BATCH_SIZE,
+        help="1回で取得・出力する件数",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(ExportFormat(args.format), args.gzip, args.output, args.batch_size))
@@ -0,0 +1,69 @@
+"""
+ユーザーの一括登録
+
+NDJSON（1行1ユーザー、ユーザー登録APIと同じ項目）のファイル（または標準入力）からユーザーを
+一括登録し、行ごとの結果をNDJSONで出力する。APIと同じくCOPYで一時テーブルへ投入して登録する。
+
+Usage
+-----
+    python -m app.commands.import_users [--input users.ndjson] [--output result.ndjson]
+        [--max-rows 50000]
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncGenerator
+from contextlib import nullcontext
+from typing import BinaryIO
+
+from app.core.config import get_settings
+from app.core.database import async_session, engine
+from app.core.redis import get_redis_client
+from app.services import import_service
+
+# 1回で読み込むバイト数
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(f: BinaryIO) -> AsyncGenerator[bytes]:
+    while chunk := f.read(READ_CHUNK_SIZE):
+        yield chunk
+
+
+async def main(input_path: str | None, output: str | None, max_rows: int) -> int:
+    redis = await get_redis_client()
+    try:
+        with (
+            open(input_path, "rb") if input_path is not None else nullcontext(sys.stdin.buffer) as f
+        ):
+            async with async_session() as db:
+                response = await import_service.import_users(db, redis, read_chunks(f), max_rows)
+    except import_service.ImportTooLargeError:
+        print(f"行数が上限（{max_rows}行）を超えています。", file=sys.stderr)
+        return 1
+    finally:
+        await redis.aclose()
+        await engine.dispose()
+
+    with (
+        open(output, "w", encoding="utf-8") if output is not None else nullcontext(sys.stdout) as f
+    ):
+        for result in response.results:
+            f.write(result.model_dump_json() + "\n")
+    print(f"created: {response.created}  failed: {response.failed}", file=sys.stderr)
+    return 0 if response.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザーの一括登録")
+    parser.add_argument("--input", help="登録するユーザーのファイル（省略時は標準入力）")
+    parser.add_argument("--output", help="結果の出力先のファイル（省略時は標準出力）")
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=get_settings().IMPORT_MAX_ROWS,
+        help="受け付ける最大行数",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.input, args.output, args.max_rows)))
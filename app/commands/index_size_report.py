@@ -0,0 +1,136 @@
+"""
+テーブル・インデックスサイズレポート
+
+スキーマ変更（マイグレーション）前後でテーブル、インデックスのサイズを比較する。
+
+Usage
+-----
+    # 変更前のサイズを保存
+    python -m app.commands.index_size_report --output before.json
+    alembic upgrade head
+    # 変更後のサイズを変更前と比較
+    python -m app.commands.index_size_report --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session, engine
+
+# publicスキーマのテーブル・インデックスのサイズを取得する
+SIZE_QUERY = text(
+    """
+    SELECT c.relname AS name,
+           CASE c.relkind WHEN 'i' THEN 'index' ELSE 'table' END AS kind,
+           COALESCE(t.relname, c.relname) AS table_name,
+           pg_relation_size(c.oid) AS bytes
+      FROM pg_class c
+      JOIN pg_namespace n ON n.oid = c.relnamespace
+      LEFT JOIN pg_index i ON i.indexrelid = c.oid
+      LEFT JOIN pg_class t ON t.oid = i.indrelid
+     WHERE n.nspname = 'public'
+       AND c.relkind IN ('r', 'i')
+       AND c.relname <> 'alembic_version'
+     ORDER BY table_name, kind DESC, name
+    """
+)
+
+
+async def collect_sizes(db: AsyncSession) -> dict[str, dict[str, str | int]]:
+    """
+    テーブル・インデックスのサイズを取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+
+    Returns
+    -------
+    dict[str, dict[str, str | int]]:
+        リレーション名をキーとしたサイズ情報
+    """
+    # 統計情報を最新化してからサイズを取得する
+    await db.execute(text("ANALYZE"))
+    rows = (await db.execute(SIZE_QUERY)).mappings().all()
+    return {
+        row["name"]: {"kind": row["kind"], "table": row["table_name"], "bytes": row["bytes"]}
+        for row in rows
+    }
+
+
+def format_bytes(size: int) -> str:
+    """
+    バイト数を読みやすい単位に変換する。
+    """
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024 or unit == "GiB":
+            return f"{value:,.1f} {unit}"
+        value /= 1024
+    return f"{value:,.1f} GiB"
+
+
+def render_report(
+    after: dict[str, dict[str, str | int]], before: dict[str, dict[str, str | int]] | None = None
+) -> str:
+    """
+    サイズレポートを文字列に整形する。
+
+    Parameters
+    ----------
+    after: dict[str, dict[str, str | int]]
+        現在のサイズ情報
+    before: dict[str, dict[str, str | int]] | None
+        比較対象のサイズ情報
+
+    Returns
+    -------
+    str:
+        レポート
+    """
+    lines = [f"{'relation':<40} {'kind':<6} {'before':>14} {'after':>14} {'diff':>8}"]
+    total_before = total_after = 0
+    for name in sorted(set(after) | set(before or {})):
+        current = after.get(name)
+        previous = (before or {}).get(name)
+        size_after = int(current["bytes"]) if current else 0
+        size_before = int(previous["bytes"]) if previous else 0
+        kind = str((current or previous or {}).get("kind", ""))
+        total_after += size_after
+        total_before += size_before
+        diff = f"{(size_after - size_before) / size_before:+.1%}" if size_before else "-"
+        lines.append(
+            f"{name:<40} {kind:<6} {format_bytes(size_before) if previous else '-':>14} "
+            f"{format_bytes(size_after) if current else '-':>14} {diff:>8}"
+        )
+    total_diff = f"{(total_after - total_before) / total_before:+.1%}" if total_before else "-"
+    lines.append(
+        f"{'TOTAL':<40} {'':<6} {format_bytes(total_before):>14} "
+        f"{format_bytes(total_after):>14} {total_diff:>8}"
+    )
+    return "\n".join(lines)
+
+
+async def main(output: Path | None, compare: Path | None) -> None:
+    async with async_session() as db:
+        sizes = await collect_sizes(db)
+    await engine.dispose()
+
+    if output is not None:
+        output.write_text(json.dumps(sizes, indent=2), encoding="utf-8")
+    before = json.loads(compare.read_text(encoding="utf-8")) if compare is not None else None
+    print(render_report(sizes, before))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="テーブル・インデックスサイズレポート")
+    parser.add_argument("--output", type=Path, help="サイズ情報の保存先（JSON）")
+    parser.add_argument("--compare", type=Path, help="比較対象のサイズ情報（JSON）")
+    args = parser.parse_args()
+    asyncio.run(main(args.output, args.compare))
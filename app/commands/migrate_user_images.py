@@ -0,0 +1,140 @@
+"""
+ユーザー画像のBlobストア移行
+
+usersテーブルの画像列にインラインで保存された画像（data URL、Base64）をBlobストアに保存し、
+列の値をコンテンツハッシュに置き換える。
+画像列をコンテンツハッシュ型に変更するマイグレーション（3c2f7a91d4e0）の前に実行する。
+
+Usage
+-----
+    python -m app.commands.migrate_user_images [--batch-size 500] [--clear-invalid]
+    alembic upgrade head
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+from collections.abc import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session, engine
+from app.core.storage import DIGEST_PATTERN, BlobStore, UnsupportedMediaTypeError, get_blob_store
+from app.enums import UserImageType
+
+# コンテンツハッシュ以外の値を持つユーザーを取得する（ユーザーID順のキーセットページング）
+SELECT_INLINE_IMAGES_QUERY = text(
+    """
+    SELECT user_id, profile_image, header_image
+      FROM users
+     WHERE user_id > :after
+       AND ((profile_image IS NOT NULL AND profile_image !~ '^[0-9a-f]{64}$')
+         OR (header_image IS NOT NULL AND header_image !~ '^[0-9a-f]{64}$'))
+     ORDER BY user_id
+     LIMIT :limit
+    """
+)
+
+
+def decode_inline_image(value: str) -> bytes | None:
+    """
+    インラインで保存された画像（data URL、またはBase64）をデコードする。
+
+    Parameters
+    ----------
+    value: str
+        画像列の値
+
+    Returns
+    -------
+    bytes | None:
+        画像データ（デコードできない場合はNone）
+    """
+    value = value.strip()
+    if value.startswith("data:"):
+        header, sep, value = value.partition(",")
+        if not sep or not header.endswith(";base64"):
+            return None
+    try:
+        return base64.b64decode(value, validate=True) or None
+    except binascii.Error:
+        return None
+
+
+async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+async def migrate_batch(
+    db: AsyncSession, store: BlobStore, after: int, batch_size: int, clear_invalid: bool
+) -> tuple[int, int, list[int]]:
+    """
+    1バッチ分のユーザー画像をBlobストアに移行する。
+
+    Returns
+    -------
+    tuple[int, int, list[int]]:
+        (最後に処理したユーザーID, 処理件数, 移行できなかった画像を持つユーザーID)
+    """
+    rows = (
+        await db.execute(SELECT_INLINE_IMAGES_QUERY, {"after": after, "limit": batch_size})
+    ).all()
+    failed: list[int] = []
+    for row in rows:
+        values: dict[str, str | None] = {}
+        for image_type in UserImageType:
+            column = image_type.value
+            value: str | None = getattr(row, column)
+            if value is None or DIGEST_PATTERN.fullmatch(value):
+                continue
+            data = decode_inline_image(value)
+            try:
+                if data is None:
+                    raise UnsupportedMediaTypeError("not an inline image.")
+                # 既存の画像はアップロード時のサイズ上限に関わらず移行する
+                blob = await store.save(_single_chunk(data), len(data))
+                values[column] = blob.digest
+            except UnsupportedMediaTypeError:
+                if clear_invalid:
+                    values[column] = None
+                else:
+                    failed.append(row.user_id)
+        if values:
+            assignments = ", ".join(f"{column} = :{column}" for column in values)
+            await db.execute(
+                text(f"UPDATE users SET {assignments} WHERE user_id = :user_id"),
+                {**values, "user_id": row.user_id},
+            )
+    await db.commit()
+    return (rows[-1].user_id if rows else after), len(rows), failed
+
+
+async def main(batch_size: int, clear_invalid: bool) -> None:
+    store = get_blob_store()
+    after, total, failed = 0, 0, []
+    async with async_session() as db:
+        while True:
+            after, count, batch_failed = await migrate_batch(
+                db, store, after, batch_size, clear_invalid
+            )
+            total += count
+            failed += batch_failed
+            if count < batch_size:
+                break
+    await engine.dispose()
+    print(f"processed users: {total}")
+    if failed:
+        print(f"users with images that could not be migrated: {sorted(set(failed))}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザー画像のBlobストア移行")
+    parser.add_argument("--batch-size", type=int, default=500, help="1バッチの件数")
+    parser.add_argument(
+        "--clear-invalid", action="store_true", help="画像としてデコードできない値を削除する"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.clear_invalid))
@@ -0,0 +1,130 @@
+"""
+フォロー一覧のRedis再構築
+
+followsテーブルからRedisのフォロワー・フォロー中一覧（ソート済みセット）を再構築する。
+Redisのデータ消失時、フォロー機能の導入時、論理削除済みユーザーのアーカイブ後に実行する。
+再構築中に行われたフォロー解除が反映されない場合があるため、利用の少ない時間帯に実行すること。
+
+Usage
+-----
+    python -m app.commands.rebuild_follow_graph [--batch-size 10000]
+"""
+
+import argparse
+import asyncio
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.database import async_session, engine
+from app.core.redis import (
+    PREFIX_FOLLOWERS,
+    PREFIX_FOLLOWING,
+    TIMELINE_PULL_ACCOUNTS_KEY,
+    generate_followers_key,
+    generate_following_key,
+    get_redis_client,
+)
+from app.services import timeline_service
+from app.services.follow_service import follow_score
+
+# 既存キー削除時のSCAN 1回あたりの件数
+SCAN_COUNT = 1000
+
+
+async def clear_follow_graph(redis: Redis) -> int:
+    """
+    Redisのフォロワー・フォロー中一覧、ホームタイムラインへの配信対象外のユーザーを全て削除する。
+
+    Returns
+    -------
+    int:
+        削除したキー数
+    """
+    deleted = 0
+    deleted += await redis.unlink(TIMELINE_PULL_ACCOUNTS_KEY)
+    for prefix in (PREFIX_FOLLOWERS, PREFIX_FOLLOWING):
+        keys: list[str] = []
+        async for key in redis.scan_iter(match=f"{prefix}:*", count=SCAN_COUNT):
+            keys.append(key)
+            if len(keys) >= SCAN_COUNT:
+                deleted += await redis.unlink(*keys)
+                keys.clear()
+        if keys:
+            deleted += await redis.unlink(*keys)
+    return deleted
+
+
+async def rebuild_follow_graph(db: AsyncSession, redis: Redis, batch_size: int) -> int:
+    """
+    followsテーブルを主キー順にバッチ単位で読み込み、Redisのフォロー一覧に一括登録する。
+
+    1バッチ分の登録は1回のパイプラインで送信する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    batch_size: int
+        1バッチの件数
+
+    Returns
+    -------
+    int:
+        登録したフォロー件数
+    """
+    await clear_follow_graph(redis)
+    total = 0
+    after = (0, 0)
+    while follows := await crud.select_follows_batch(db, after, batch_size):
+        async with redis.pipeline(transaction=False) as pipe:
+            for follower_id, followee_id, followed_at in follows:
+                score = follow_score(followed_at)
+                pipe.zadd(generate_followers_key(followee_id), {str(follower_id): score})
+                pipe.zadd(generate_following_key(follower_id), {str(followee_id): score})
+            await pipe.execute()
+        total += len(follows)
+        after = follows[-1][:2]
+    await rebuild_pull_accounts(redis)
+    return total
+
+
+async def rebuild_pull_accounts(redis: Redis) -> None:
+    """
+    フォロワー数に応じて、ホームタイムラインへの配信対象外のユーザーを再設定する。
+    """
+    keys: list[str] = []
+    async for key in redis.scan_iter(match=f"{PREFIX_FOLLOWERS}:*", count=SCAN_COUNT):
+        keys.append(key)
+        if len(keys) >= SCAN_COUNT:
+            await _update_pull_accounts(redis, keys)
+            keys.clear()
+    await _update_pull_accounts(redis, keys)
+
+
+async def _update_pull_accounts(redis: Redis, keys: list[str]) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.zcard(key)
+        counts = await pipe.execute()
+    for key, count in zip(keys, counts, strict=True):
+        await timeline_service.update_pull_account(redis, int(key.split(":")[1]), count)
+
+
+async def main(batch_size: int) -> None:
+    redis = await get_redis_client()
+    async with async_session() as db:
+        total = await rebuild_follow_graph(db, redis, batch_size)
+    await redis.aclose()
+    await engine.dispose()
+    print(f"rebuilt follows: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="フォロー一覧のRedis再構築")
+    parser.add_argument("--batch-size", type=int, default=10000, help="1バッチの件数")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,39 @@
+"""
+ユーザー名のBloomフィルター再構築
+
+usersテーブルから登録済みユーザー名のBloomフィルターを再構築する。
+APIサーバーでも定期的に再構築するが、Redisのデータ消失時や大量のユーザーを論理削除した後に
+即時に再構築する場合に実行する。
+
+Usage
+-----
+    python -m app.commands.rebuild_username_filter [--batch-size 10000]
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import async_session, engine
+from app.core.redis import get_redis_client
+from app.services import user_service
+
+
+async def main(batch_size: int) -> None:
+    redis = await get_redis_client()
+    async with async_session() as db:
+        total = await user_service.rebuild_username_filter(db, redis, batch_size)
+    await redis.aclose()
+    await engine.dispose()
+    print(f"rebuilt usernames: {total}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ユーザー名のBloomフィルター再構築")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=user_service.USERNAME_FILTER_BATCH_SIZE,
+        help="1バッチの件数",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
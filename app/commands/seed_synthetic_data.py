@@ -0,0 +1,385 @@
+"""
+合成データの一括投入
+
+ベンチマーク・ステージング環境向けに、users・user_credentials・authcodesテーブルへ
+シード値から決定的に生成した合成データをCOPYで一括投入する（同じシード値・件数・バッチサイズで
+同じデータとなる）。
+行ごとのINSERT・コミットを行わず、バッチごとに1回のCOPY・コミットで投入する。
+
+投入中はインデックス（主キーを除く）を削除し、投入後にまとめて作成する。
+中断した場合は --restore-indexes で削除したインデックスを作成すること。
+投入済みの件数を数え、不足する分のみ投入する（中断後に再実行すると続きから投入する）。
+
+Usage
+-----
+    python -m app.commands.seed_synthetic_data [--users 10000000] [--seed 0]
+        [--credential-ratio 0.5] [--authcode-ratio 1.0] [--batch-size 100000] [--keep-indexes]
+    # 削除したインデックスを作成
+    python -m app.commands.seed_synthetic_data --restore-indexes
+    # 合成データを削除
+    python -m app.commands.seed_synthetic_data --cleanup
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Index, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+from app import models
+from app.core.database import async_session, engine
+
+# 合成データのメールアドレスのドメイン（削除対象の識別に使用する）
+SEED_EMAIL_DOMAIN = "seed.example.com"
+# 合成データのユーザーIDの開始値（アプリケーションで生成するID・他のベンチマークと重複しない範囲）
+SEED_USER_ID_OFFSET = 8_000_000_000_000_000_000
+# 1回のCOPY・コミットで投入するユーザー数
+DEFAULT_BATCH_SIZE = 100_000
+# 合成データの作成日時の基準（決定的に生成するため、現在日時は使用しない）
+SEED_BASE_DATETIME = datetime(2025, 1, 1)
+# 作成日時を分布させる期間（基準日時より前）
+SEED_PERIOD = timedelta(days=3 * 365)
+# 認証情報の識別子種別
+IDENTITY_TYPE_EMAIL = "email"
+# 認証情報のパスワードハッシュ（行ごとのハッシュ計算は行わず、固定値とする）
+SEED_PASSWORD_HASH = "$2b$12$" + "S" * 53
+
+LAST_NAMES = ["佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤"]
+FIRST_NAMES = ["太郎", "花子", "健太", "美咲", "翔", "陽菜", "蓮", "結衣", "大輝", "葵"]
+ENGLISH_FIRST_NAMES = ["Alice", "Bob", "Carol", "Dave", "Eve", "Frank", "Grace", "Heidi", "Ivan"]
+ENGLISH_LAST_NAMES = ["Smith", "Jones", "Brown", "Lee", "Wilson", "Taylor", "Clark", "Young"]
+INTRODUCTIONS = ["よろしくお願いします。", "エンジニアです。", "写真が好きです。", "Hello!"]
+
+USER_COLUMNS = [
+    "user_id",
+    "username",
+    "account_name",
+    "email",
+    "birthday",
+    "self_introduction",
+    "verified_flag",
+    "auth_failure_count",
+    "account_lock_flag",
+    "delete_flag",
+    "create_datetime",
+    "update_datetime",
+]
+CREDENTIAL_COLUMNS = [
+    "user_id",
+    "identity_type",
+    "identity",
+    "hashed_password",
+    "delete_flag",
+    "create_datetime",
+    "update_datetime",
+]
+AUTHCODE_COLUMNS = [
+    "authcode_id",
+    "code",
+    "email",
+    "expire_datetime",
+    "delete_flag",
+    "create_datetime",
+    "update_datetime",
+]
+
+# 投入対象のテーブル（外部キーの参照先を先に投入する）
+TABLES: list[Table] = [
+    models.User.__table__,  # type: ignore[list-item]
+    models.UserCredential.__table__,  # type: ignore[list-item]
+    models.Authcode.__table__,  # type: ignore[list-item]
+]
+
+COUNT_QUERY = text(f"SELECT count(*) FROM users WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}'")
+CLEANUP_QUERIES = [
+    text(
+        f"""
+        DELETE FROM user_credentials
+         WHERE user_id IN (SELECT user_id FROM users WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}')
+        """
+    ),
+    text(f"DELETE FROM users WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}'"),
+    text(f"DELETE FROM authcodes WHERE email LIKE '%@{SEED_EMAIL_DOMAIN}'"),
+]
+
+
+@dataclass(slots=True)
+class Batch:
+    """
+    1バッチ分の合成データ（COPYで投入する行）
+
+    Attributes
+    ----------
+    users: list[tuple[Any, ...]]
+        usersテーブルの行
+    credentials: list[tuple[Any, ...]]
+        user_credentialsテーブルの行
+    authcodes: list[tuple[Any, ...]]
+        authcodesテーブルの行
+    """
+
+    users: list[tuple[Any, ...]] = field(default_factory=list)
+    credentials: list[tuple[Any, ...]] = field(default_factory=list)
+    authcodes: list[tuple[Any, ...]] = field(default_factory=list)
+
+
+def to_base36(value: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        value, remainder = divmod(value, 36)
+        encoded = digits[remainder] + encoded
+        if value == 0:
+            return encoded
+
+
+def seed_uuid7(issued: datetime, rng: random.Random) -> uuid.UUID:
+    """
+    発行日時と乱数からUUIDv7を生成する（アプリケーションと同じく時系列順のIDとする）。
+    """
+    # 実行環境のタイムゾーンによらないよう、日時をUTCとみなす
+    unix_ms = int((issued - datetime(1970, 1, 1)).total_seconds() * 1000)
+    rand = rng.getrandbits(74)
+    value = unix_ms << 80 | 0x7 << 76 | (rand >> 62) << 64 | 0b10 << 62 | rand & ((1 << 62) - 1)
+    return uuid.UUID(int=value)
+
+
+def generate_batch(
+    seed: int,
+    start: int,
+    stop: int,
+    credential_ratio: float,
+    authcode_ratio: float,
+) -> Batch:
+    """
+    合成データを生成する。
+
+    バッチの開始位置ごとに乱数を初期化するため、同じシード値・範囲では常に同じデータとなる。
+
+    Parameters
+    ----------
+    seed: int
+        シード値
+    start: int
+        開始位置（0始まりの連番）
+    stop: int
+        終了位置（この位置を含まない）
+    credential_ratio: float
+        認証情報（パスワード）を登録するユーザーの割合
+    authcode_ratio: float
+        ユーザー1人あたりの認証コード数（期待値）
+
+    Returns
+    -------
+    Batch:
+        合成データ
+    """
+    rng = random.Random(f"{seed}:{start}")
+    batch = Batch()
+    period = int(SEED_PERIOD.total_seconds())
+    for i in range(start, stop):
+        user_id = SEED_USER_ID_OFFSET + i
+        if rng.random() < 0.5:
+            account_name = rng.choice(LAST_NAMES) + rng.choice(FIRST_NAMES)
+            prefix = "user"
+        else:
+            first = rng.choice(ENGLISH_FIRST_NAMES)
+            account_name = f"{first} {rng.choice(ENGLISH_LAST_NAMES)}"
+            prefix = first.lower()
+        # 連番を含めて一意にする（最大15文字）
+        username = f"{prefix}_{to_base36(i)}"
+        email = f"{username}@{SEED_EMAIL_DOMAIN}"
+        created = SEED_BASE_DATETIME - timedelta(seconds=rng.randrange(period))
+        updated = created + rng.random() * (SEED_BASE_DATETIME - created)
+        batch.users.append((
+            user_id,
+            username,
+            account_name,
+            email,
+            date(1960, 1, 1) + timedelta(days=rng.randrange(50 * 365)),
+            rng.choice(INTRODUCTIONS) if rng.random() < 0.3 else None,
+            rng.random() < 0.05,
+            0 if rng.random() < 0.9 else rng.randrange(1, 5),
+            rng.random() < 0.001,
+            rng.random() < 0.01,
+            created,
+            updated,
+        ))
+        if rng.random() < credential_ratio:
+            batch.credentials.append((
+                user_id,
+                IDENTITY_TYPE_EMAIL,
+                email,
+                SEED_PASSWORD_HASH,
+                False,
+                created,
+                created,
+            ))
+        # 認証コード数の期待値がauthcode_ratioとなるよう、整数部分＋小数部分の確率で生成する
+        count = int(authcode_ratio) + (rng.random() < authcode_ratio % 1)
+        for _ in range(count):
+            issued = created - timedelta(seconds=rng.randrange(600))
+            batch.authcodes.append((
+                seed_uuid7(issued, rng),
+                f"{rng.randrange(1_000_000):06d}",
+                email,
+                issued + timedelta(minutes=10),
+                False,
+                issued,
+                issued,
+            ))
+    return batch
+
+
+async def copy_batch(db: AsyncSession, batch: Batch) -> None:
+    """
+    合成データをCOPYで投入し、コミットする。
+    """
+    # 同期書き込みを待たずにコミットする（障害時は投入済みの件数から再実行する）
+    await db.execute(text("SET LOCAL synchronous_commit TO off"))
+    connection = await db.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    for table, columns, records in (
+        ("users", USER_COLUMNS, batch.users),
+        ("user_credentials", CREDENTIAL_COLUMNS, batch.credentials),
+        ("authcodes", AUTHCODE_COLUMNS, batch.authcodes),
+    ):
+        if records:
+            await driver.copy_records_to_table(table, records=records, columns=columns)  # type: ignore[union-attr]
+    await db.commit()
+
+
+def deferred_indexes() -> list[Index]:
+    """
+    投入中に削除するインデックス（モデルで定義した主キー以外のインデックス）を取得する。
+    """
+    return [
+        index for table in TABLES for index in sorted(table.indexes, key=lambda i: i.name or "")
+    ]
+
+
+async def drop_indexes(db: AsyncSession) -> None:
+    """
+    投入対象のテーブルのインデックスを削除する。
+    """
+    for index in deferred_indexes():
+        await db.execute(DropIndex(index, if_exists=True))
+    await db.commit()
+
+
+async def create_indexes(db: AsyncSession) -> None:
+    """
+    投入対象のテーブルのインデックスを作成し、統計情報を最新化する。
+    """
+    for index in deferred_indexes():
+        started = time.perf_counter()
+        await db.execute(CreateIndex(index, if_not_exists=True))
+        await db.commit()
+        print(f"created index: {index.name} ({time.perf_counter() - started:.1f}s)")
+    for table in TABLES:
+        await db.execute(text(f"ANALYZE {table.name}"))
+    await db.commit()
+
+
+async def seed(
+    db: AsyncSession,
+    users: int,
+    seed_value: int,
+    credential_ratio: float,
+    authcode_ratio: float,
+    batch_size: int,
+    keep_indexes: bool,
+) -> int:
+    """
+    合成データを投入する（投入済みのユーザー数が不足する分のみ）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    users: int
+        ユーザー数
+    seed_value: int
+        シード値
+    credential_ratio: float
+        認証情報を登録するユーザーの割合
+    authcode_ratio: float
+        ユーザー1人あたりの認証コード数
+    batch_size: int
+        1回のCOPYで投入するユーザー数
+    keep_indexes: bool
+        インデックスを削除せずに投入するか
+
+    Returns
+    -------
+    int:
+        投入したユーザー数
+    """
+    existing = (await db.execute(COUNT_QUERY)).scalar_one()
+    if existing >= users:
+        return 0
+    if not keep_indexes:
+        await drop_indexes(db)
+    started = time.perf_counter()
+    for start in range(existing, users, batch_size):
+        stop = min(start + batch_size, users)
+        await copy_batch(
+            db, generate_batch(seed_value, start, stop, credential_ratio, authcode_ratio)
+        )
+        rate = (stop - existing) / (time.perf_counter() - started)
+        print(f"seeded: {stop:,} / {users:,} ({rate:,.0f} users/s)")
+    if not keep_indexes:
+        await create_indexes(db)
+    return users - existing
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with async_session() as db:
+        if args.cleanup:
+            for query in CLEANUP_QUERIES:
+                await db.execute(query)
+            await db.commit()
+        elif args.restore_indexes:
+            await create_indexes(db)
+        else:
+            total = await seed(
+                db,
+                args.users,
+                args.seed,
+                args.credential_ratio,
+                args.authcode_ratio,
+                args.batch_size,
+                args.keep_indexes,
+            )
+            print(f"seeded users: {total}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="合成データの一括投入")
+    parser.add_argument("--users", type=int, default=10_000_000, help="ユーザー数")
+    parser.add_argument("--seed", type=int, default=0, help="シード値")
+    parser.add_argument(
+        "--credential-ratio", type=float, default=0.5, help="認証情報を登録するユーザーの割合"
+    )
+    parser.add_argument(
+        "--authcode-ratio", type=float, default=1.0, help="ユーザー1人あたりの認証コード数"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="1回のCOPYで投入するユーザー数"
+    )
+    parser.add_argument(
+        "--keep-indexes", action="store_true", help="インデックスを削除せずに投入する"
+    )
+    parser.add_argument(
+        "--restore-indexes", action="store_true", help="削除したインデックスを作成する"
+    )
+    parser.add_argument("--cleanup", action="store_true", help="合成データを削除する")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+import hashlib
+from collections.abc import Iterable
+
+from redis.asyncio.client import Redis
+
+
+class BloomFilter:
+    """
+    Redisのビット列を使用するBloomフィルター
+
+    全プロセスで同じフィルターを共有する。含まれないと判定した要素は確実に含まれず、
+    含まれると判定した要素は一定の確率（偽陽性）で実際には含まれない。
+    要素の削除はできないため、定期的に再構築すること。
+
+    Parameters
+    ----------
+    key: str
+        ビット列を保存するRedisキー
+    size: int
+        ビット数
+    hashes: int
+        ハッシュ関数の数
+    """
+
+    def __init__(self, key: str, size: int, hashes: int) -> None:
+        self.key = key
+        self.size = size
+        self.hashes = hashes
+
+    def positions(self, item: str) -> list[int]:
+        """
+        要素に対応するビット位置を取得する。
+
+        プロセスによらず同じ位置となるよう、組み込みのhash()ではなくBLAKE2を使用し、
+        2つのハッシュ値の線形結合でハッシュ関数の数だけ位置を生成する。
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    async def add(self, redis: Redis, *items: str) -> None:
+        """
+        要素を追加する（1回のパイプラインで送信する）。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        items: str
+            要素
+        """
+        if not items:
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            for item in items:
+                for position in self.positions(item):
+                    pipe.setbit(self.key, position, 1)
+            await pipe.execute()
+
+    async def might_contain(self, redis: Redis, item: str) -> bool | None:
+        """
+        要素が含まれる可能性があるか判定する。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        item: str
+            要素
+
+        Returns
+        -------
+        bool | None:
+            True: 含まれる可能性がある / False: 含まれない / None: フィルター未構築
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self.key)
+            for position in self.positions(item):
+                pipe.getbit(self.key, position)
+            exists, *bits = await pipe.execute()
+        if not exists:
+            return None
+        return all(bits)
+
+    def build(self, items: Iterable[str], bitmap: bytearray | None = None) -> bytearray:
+        """
+        要素を追加したビット列を生成する（Redisのビット順序と同じく先頭バイトの上位ビットから並べる）。
+
+        Parameters
+        ----------
+        items: Iterable[str]
+            要素
+        bitmap: bytearray | None
+            追加先のビット列（Noneの場合は新規に生成する）
+
+        Returns
+        -------
+        bytearray:
+            ビット列
+        """
+        bitmap = bytearray((self.size + 7) // 8) if bitmap is None else bitmap
+        for item in items:
+            for position in self.positions(item):
+                bitmap[position // 8] |= 0x80 >> (position % 8)
+        return bitmap
+
+    async def replace(self, redis: Redis, bitmap: bytearray) -> None:
+        """
+        フィルターをビット列で置き換える（一時キーに書き込んでからRENAMEで入れ替える）。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        bitmap: bytearray
+            ビット列
+        """
+        temp_key = f"{self.key}:building"
+        await redis.set(temp_key, bytes(bitmap))
+        await redis.rename(temp_key, self.key)
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import CACHE_INVALIDATION_CHANNEL, generate_cache_key
+
+logger = logging.getLogger(__name__)
+
+# 無効化通知の購読が切断された場合の再接続間隔（秒）
+RECONNECT_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    キャッシュエントリ
+
+    Attributes
+    ----------
+    value: dict[str, Any] | None
+        キャッシュ値（Noneは存在しないことを表すネガティブキャッシュ）
+    expire_at: float
+        有効期限（UNIX時刻）
+    delta: float
+        値の再計算にかかった秒数（確率的早期更新に使用する）
+    """
+
+    value: dict[str, Any] | None
+    expire_at: float
+    delta: float
+
+    def should_refresh(self, beta: float, now: float | None = None) -> bool:
+        """
+        有効期限切れ、または確率的早期更新（XFetch）の対象か判定する。
+
+        再計算コストが大きく期限が近いほど高い確率でTrueとなり、
+        期限切れの瞬間に再計算が集中すること（キャッシュスタンピード）を防ぐ。
+        """
+        now = time.time() if now is None else now
+        return now - self.delta * beta * math.log(1.0 - random.random()) >= self.expire_at
+
+    def dumps(self) -> str:
+        return json.dumps({"v": self.value, "e": self.expire_at, "d": self.delta})
+
+    @classmethod
+    def loads(cls, data: str) -> "CacheEntry":
+        obj = json.loads(data)
+        return cls(value=obj["v"], expire_at=obj["e"], delta=obj["d"])
+
+
+class LocalTTLCache:
+    """
+    プロセス内LRUキャッシュ
+
+    エントリ数の上限と有効期限を持ち、上限を超えた場合は最も古く参照されたエントリを破棄する。
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, CacheEntry]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> CacheEntry | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        local_expire_at, entry = item
+        if local_expire_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        # 共有キャッシュの有効期限を超えてローカルに保持しない
+        ttl = min(self.ttl, entry.expire_at - time.time())
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, entry)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class TwoTierCache[ModelT: BaseModel]:
+    """
+    2段キャッシュ（プロセス内LRU → Redis → ロード関数）
+
+    - 同一キーの同時ロードは1回に集約する（single-flight）
+    - 期限が近いエントリは確率的に早期更新する（XFetch）
+    - ロード結果がNoneの場合もネガティブキャッシュとして短期間保持する
+    - 無効化はRedis Pub/Subで他プロセスのプロセス内キャッシュにも通知する（listen_invalidations）
+
+    Parameters
+    ----------
+    namespace: str
+        キャッシュの名前空間（Redisキーのprefixに使用する）
+    model: type[ModelT]
+        キャッシュ値のスキーマ
+    local_maxsize: int
+        プロセス内キャッシュの最大エントリ数
+    local_ttl: float
+        プロセス内キャッシュの有効期間（秒）
+    ttl: float
+        Redisキャッシュの有効期間（秒）
+    negative_ttl: float
+        ネガティブキャッシュの有効期間（秒）
+    beta: float
+        早期更新の強さ（大きいほど早く更新する）
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        model: type[ModelT],
+        local_maxsize: int,
+        local_ttl: float,
+        ttl: float,
+        negative_ttl: float,
+        beta: float = 1.0,
+    ) -> None:
+        self.namespace = namespace
+        self.model = model
+        self.local = LocalTTLCache(local_maxsize, local_ttl)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.beta = beta
+        self._inflight: dict[str, asyncio.Future[CacheEntry]] = {}
+        # ロード中に無効化されたキー
+        self._stale: set[str] = set()
+
+    def _to_model(self, entry: CacheEntry) -> ModelT | None:
+        return self.model.model_validate(entry.value) if entry.value is not None else None
+
+    async def get_or_load(
+        self, redis: Redis, key: str, loader: Callable[[], Awaitable[ModelT | None]]
+    ) -> ModelT | None:
+        """
+        キャッシュから値を取得し、存在しない場合はロード関数で取得してキャッシュする。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        key: str
+            キー
+        loader: Callable[[], Awaitable[ModelT | None]]
+            キャッシュミス時に値を取得する関数
+
+        Returns
+        -------
+        ModelT | None:
+            取得結果
+        """
+        entry = self.local.get(key)
+        if entry is not None and not entry.should_refresh(self.beta):
+            return self._to_model(entry)
+
+        data = await redis.get(generate_cache_key(self.namespace, key))
+        if data is not None:
+            entry = CacheEntry.loads(data)
+            if not entry.should_refresh(self.beta):
+                self.local.set(key, entry)
+                return self._to_model(entry)
+
+        return self._to_model(await self._load(redis, key, loader))
+
+    async def _load(
+        self, redis: Redis, key: str, loader: Callable[[], Awaitable[ModelT | None]]
+    ) -> CacheEntry:
+        # 同一キーのロード中であれば、その結果を待つ
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 自身がキャンセルされた場合はそのまま伝播する
+                current = asyncio.current_task()
+                if not inflight.cancelled() or (current is not None and current.cancelling()):
+                    raise
+                # ロード中の呼び出し元がキャンセルされた場合は、自身でロードし直す
+
+        future: asyncio.Future[CacheEntry] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            started = time.time()
+            value = await loader()
+            delta = time.time() - started
+            ttl = self.ttl if value is not None else self.negative_ttl
+            entry = CacheEntry(
+                value=value.model_dump(mode="json") if value is not None else None,
+                expire_at=started + ttl,
+                delta=delta,
+            )
+            # ロード中に無効化された場合は、古い値でキャッシュを上書きしない
+            if key not in self._stale:
+                await redis.set(
+                    generate_cache_key(self.namespace, key), entry.dumps(), ex=max(1, round(ttl))
+                )
+                self.local.set(key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 待機者がいない場合に例外が未取得の警告とならないようにする
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            self._stale.discard(key)
+
+    def invalidate_local(self, *keys: str) -> None:
+        """
+        プロセス内キャッシュのみ無効化する。
+
+        Parameters
+        ----------
+        keys: str
+            キー
+        """
+        for key in keys:
+            self.local.delete(key)
+            if key in self._inflight:
+                self._stale.add(key)
+
+    async def invalidate(self, redis: Redis, *keys: str) -> None:
+        """
+        キャッシュを無効化し、他プロセスに無効化を通知する。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        keys: str
+            キー
+        """
+        if not keys:
+            return
+        self.invalidate_local(*keys)
+        await redis.delete(*(generate_cache_key(self.namespace, key) for key in keys))
+        await redis.publish(  # pyright: ignore[reportUnknownMemberType]
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"namespace": self.namespace, "keys": list(keys)}),
+        )
+
+
+async def listen_invalidations(redis: Redis, caches: Iterable[TwoTierCache[Any]]) -> None:
+    """
+    他プロセスからのキャッシュ無効化通知を購読し、プロセス内キャッシュに反映する。
+
+    購読が切断された場合は再接続する。切断中の通知を取りこぼした可能性があるため、
+    購読開始時にプロセス内キャッシュを全て破棄する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    caches: Iterable[TwoTierCache[Any]]
+        無効化通知を反映するキャッシュ
+    """
+    by_namespace = {cache.namespace: cache for cache in caches}
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)  # pyright: ignore[reportUnknownMemberType]
+                for cache in by_namespace.values():
+                    cache.local.clear()
+                async for message in pubsub.listen():
+                    obj = json.loads(message["data"])
+                    cache = by_namespace.get(obj["namespace"])
+                    if cache is not None:
+                        cache.invalidate_local(*obj["keys"])
+        except RedisError:
+            logger.exception("キャッシュ無効化通知の購読が切断されました。")
+            await asyncio.sleep(RECONNECT_INTERVAL_SECONDS)
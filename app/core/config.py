@@ -49,6 +49,59 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int
     SECRET_KEY: str
     ALGORITHM: str
+    ID_WORKER_LEASE_SECONDS: int
+    ARCHIVE_RETENTION_DAYS: int
+    ARCHIVE_BATCH_SIZE: int
+    USER_CACHE_LOCAL_MAXSIZE: int
+    USER_CACHE_LOCAL_TTL_SECONDS: int
+    USER_CACHE_TTL_SECONDS: int
+    USER_CACHE_NEGATIVE_TTL_SECONDS: int
+    USER_PROFILE_MAX_AGE_SECONDS: int
+    USER_PROFILE_S_MAXAGE_SECONDS: int
+    STORAGE_ROOT: str
+    IMAGE_MAX_BYTES: int
+    MEDIA_ACCEL_REDIRECT_PREFIX: str
+    IMAGE_VARIANT_QUALITY: int
+    IMAGE_MAX_PIXELS: int
+    IMAGE_WORKER_PROCESSES: int
+    IMAGE_JOB_MAX_ATTEMPTS: int
+    POST_MAX_LENGTH: int
+    POST_BATCH_MAX_SIZE: int
+    POST_BATCH_MAX_DELAY_MS: int
+    POST_CACHE_TTL_SECONDS: int
+    TIMELINE_MAX_LENGTH: int
+    TIMELINE_FANOUT_THRESHOLD: int
+    TIMELINE_FANOUT_BATCH_SIZE: int
+    TIMELINE_JOB_MAX_ATTEMPTS: int
+    POST_COUNTER_SHARDS: int
+    POST_COUNTER_FLUSH_INTERVAL_SECONDS: int
+    POST_COUNTER_FLUSH_BATCH_SIZE: int
+    TRENDS_SKETCH_WIDTH: int
+    TRENDS_SKETCH_DEPTH: int
+    TRENDS_TOP_K: int
+    TRENDS_REFRESH_INTERVAL_SECONDS: int
+    SEARCH_PREFIX_CACHE_MAX_LENGTH: int
+    SEARCH_CACHE_LOCAL_MAXSIZE: int
+    SEARCH_CACHE_LOCAL_TTL_SECONDS: int
+    SEARCH_CACHE_TTL_SECONDS: int
+    USERNAME_FILTER_BITS: int
+    USERNAME_FILTER_HASHES: int
+    USERNAME_FILTER_REBUILD_INTERVAL_SECONDS: int
+    NOTIFICATION_MAX_CONNECTIONS: int
+    NOTIFICATION_QUEUE_SIZE: int
+    NOTIFICATION_HEARTBEAT_SECONDS: int
+    ADMIN_API_KEY: str
+    EXPORT_BATCH_SIZE: int
+    IMPORT_MAX_ROWS: int
+    REQUEST_DEADLINE_SECONDS: float
+    IMAGE_UPLOAD_DEADLINE_SECONDS: float
+    IMPORT_DEADLINE_SECONDS: float
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float
+    LOAD_SHEDDING_INITIAL_LIMIT: int
+    LOAD_SHEDDING_MIN_LIMIT: int
+    LOAD_SHEDDING_MAX_LIMIT: int
+    LOAD_SHEDDING_TARGET_LATENCY_MS: int
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: int
 
 
 @lru_cache
@@ -2,14 +2,16 @@ from collections.abc import AsyncGenerator
 from typing import Any
 from urllib.parse import quote_plus
 
+from sqlalchemy import Connection, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, SessionTransaction, declarative_base
 
+from app.core import deadline
 from app.core.config import get_settings
 
 # DB接続先URL
@@ -48,9 +50,34 @@ async_session = async_sessionmaker(
 )
 
 
+def _apply_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    """
+    トランザクションの開始時に、リクエストの処理期限までの残り時間を文の実行時間の上限とする。
+    """
+    if (seconds := deadline.remaining()) is not None:
+        # SET LOCALはトランザクション内のみ有効なため、コミット後のトランザクションにも都度適用する
+        milliseconds = max(int(seconds * 1000), 1)
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {milliseconds}")
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, Any]:
     """
     DB sessionを取得する
+
+    リクエストの処理期限がある場合は、残り時間を文の実行時間の上限（statement_timeout）とする。
     """
     async with async_session() as session:
+        event.listen(session.sync_session, "after_begin", _apply_statement_timeout)
         yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    DBセッションの生成元を取得する
+
+    StreamingResponseの送信中にDBを参照する場合など、リクエストの処理後も
+    セッションを使用する場合に、レスポンスを生成する処理の中でセッションを生成するために使用する。
+    """
+    return async_session
@@ -0,0 +1,120 @@
+"""
+リクエストの処理期限
+
+リクエストごとに処理期限を設け、期限までの残り時間をDBの文の実行時間の上限
+（statement_timeout）・Redisのコマンドのタイムアウトとして適用する。
+期限を超えた場合は処理をキャンセルして504を返却し、接続を長時間占有しないようにする。
+
+処理期限はレスポンスの送信開始までを対象とする（ストリーミングの送信中は対象外とする）。
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# 処理中のリクエストの処理期限（リクエストの処理中以外はNone）
+_current: ContextVar[asyncio.Timeout | None] = ContextVar("request_deadline", default=None)
+
+
+def remaining() -> float | None:
+    """
+    処理中のリクエストの処理期限までの残り時間を取得する。
+
+    Returns
+    -------
+    float | None:
+        残り時間（秒、期限を超えた場合は0）、リクエストの処理中以外・期限がない場合はNone
+    """
+    timeout = _current.get()
+    if timeout is None or (when := timeout.when()) is None:
+        return None
+    return max(when - asyncio.get_running_loop().time(), 0.0)
+
+
+def route_deadline(seconds: float) -> Callable[[], Awaitable[None]]:
+    """
+    APIごとの処理期限を設定する依存性を生成する（既定の処理期限を上書きする）。
+
+    パスオペレーションのdependenciesに指定すると、他の依存性（DBセッション等）より先に評価される。
+
+    Parameters
+    ----------
+    seconds: float
+        処理期限（依存性の評価時点からの秒数）
+
+    Returns
+    -------
+    Callable[[], Awaitable[None]]:
+        依存性（処理期限を参照できるよう、スレッドプールではなくリクエストのタスクで評価する）
+    """
+
+    async def set_deadline() -> None:
+        timeout = _current.get()
+        if timeout is not None:
+            timeout.reschedule(asyncio.get_running_loop().time() + seconds)
+
+    return set_deadline
+
+
+class DeadlineMiddleware:
+    """
+    リクエストに処理期限を設けるミドルウェア
+
+    期限を超えた場合は処理中のタスクをキャンセルする（DBセッション等は依存性の終了処理で
+    解放される）。レスポンスの送信開始前であれば504を返却する。
+    期限の超過によりDB・Redisのタイムアウトとなった場合も同様とする。
+
+    Parameters
+    ----------
+    app: starlette.types.ASGIApp
+        ASGIアプリケーション
+    seconds: float
+        既定の処理期限（秒）
+    """
+
+    def __init__(self, app: ASGIApp, seconds: float) -> None:
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+        loop = asyncio.get_running_loop()
+        timeout = asyncio.timeout(self.seconds)
+
+        async def send_with_deadline(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                # レスポンスの送信開始後は処理期限を解除する
+                started = True
+                if not timeout.expired():
+                    timeout.reschedule(None)
+            await send(message)
+
+        try:
+            async with timeout:
+                token = _current.set(timeout)
+                try:
+                    await self.app(scope, receive, send_with_deadline)
+                finally:
+                    _current.reset(token)
+        except Exception:
+            when = timeout.when()
+            if started or not (timeout.expired() or (when is not None and loop.time() >= when)):
+                raise
+            logger.warning("処理期限を超えました: %s %s", scope["method"], scope["path"])
+            response = JSONResponse(
+                {"detail": "処理がタイムアウトしました。"},
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            )
+            await response(scope, receive, send)
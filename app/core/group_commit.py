@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitBuffer[T, R]:
+    """
+    複数リクエストからの書き込みを一定時間まとめて、1回の書き込み（コミット）で処理する。
+
+    最初の書き込みから max_delay 秒経過、または max_batch_size 件に達した時点で
+    まとめて flush を呼び出し、各呼び出し元に対応する結果を返却する。
+    1リクエストごとのコミット待ち時間に書き込みスループットが制限されないようにする。
+
+    Attributes
+    ----------
+    flush: Callable[[list[T]], Awaitable[Sequence[R]]]
+        まとめた書き込みを実行する関数（引数と同じ順序で結果を返却すること）
+    max_batch_size: int
+        1回の書き込みの最大件数
+    max_delay: float
+        最初の書き込みから書き込み実行までの最大待機秒数
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[Sequence[R]]],
+        max_batch_size: int,
+        max_delay: float,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive: {max_batch_size}")
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> R:
+        """
+        書き込みを登録し、まとめた書き込みの完了を待機する。
+
+        呼び出し元がキャンセルされた場合も、登録済みの書き込みは実行される。
+
+        Parameters
+        ----------
+        item: T
+            書き込む値
+
+        Returns
+        -------
+        R:
+            書き込み結果
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return await future
+
+    async def drain(self) -> None:
+        """
+        未実行の書き込みを実行し、実行中の書き込みの完了を待機する（終了処理用）。
+        """
+        self._start_flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                _set_exception(batch[0][1], e)
+                return
+            # 1件の不正な値で他の書き込みまで失敗しないよう、1件ずつ再実行する
+            logger.warning("まとめた書き込みに失敗したため1件ずつ再実行します: %s", e)
+            await asyncio.gather(*(self._flush([entry]) for entry in batch))
+            return
+        if len(results) != len(batch):
+            error = RuntimeError(f"flush returned {len(results)} results for {len(batch)} items")
+            for _, future in batch:
+                _set_exception(future, error)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future[Any], error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
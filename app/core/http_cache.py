@@ -0,0 +1,76 @@
+from datetime import datetime
+
+
+def generate_etag(*parts: object) -> str:
+    """
+    リソースのバージョンを表す強いETagを生成する。
+
+    Parameters
+    ----------
+    parts: object
+        バージョンを構成する値（ID、更新日時等）
+
+    Returns
+    -------
+    str:
+        ETag（ダブルクォートを含む）
+    """
+    tokens = [
+        format(int(part.timestamp() * 1_000_000), "x")
+        if isinstance(part, datetime)
+        else format(part, "x")
+        if isinstance(part, int)
+        else str(part)
+        for part in parts
+    ]
+    return '"' + "-".join(tokens) + '"'
+
+
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Matchヘッダーが現在のETagと一致するか判定する。
+
+    If-None-Matchは弱い比較で判定する（W/プレフィックスを無視する）。
+
+    Parameters
+    ----------
+    if_none_match: str | None
+        If-None-Matchヘッダーの値
+    etag: str
+        現在のETag
+
+    Returns
+    -------
+    bool:
+        True: 一致（304を返却可能） / False: 不一致
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+def generate_cache_control(max_age: int, s_maxage: int, stale_while_revalidate: int = 0) -> str:
+    """
+    共有キャッシュ（CDN）での保持を許可するCache-Controlヘッダーを生成する。
+
+    Parameters
+    ----------
+    max_age: int
+        ブラウザでの保持秒数
+    s_maxage: int
+        共有キャッシュでの保持秒数
+    stale_while_revalidate: int
+        期限切れ後、再検証中に古い値を返却してよい秒数
+
+    Returns
+    -------
+    str:
+        Cache-Controlヘッダーの値
+    """
+    directives = ["public", f"max-age={max_age}", f"s-maxage={s_maxage}"]
+    if stale_while_revalidate:
+        directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+    return ", ".join(directives)
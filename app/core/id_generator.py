@@ -0,0 +1,355 @@
+import asyncio
+import contextlib
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Protocol
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis import generate_id_worker_key
+
+logger = logging.getLogger(__name__)
+
+# Snowflake IDのビット構成（timestamp: 41bit / worker_id: 10bit / sequence: 12bit）
+TIMESTAMP_BITS = 41
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+WORKER_ID_SHIFT = SEQUENCE_BITS
+TIMESTAMP_SHIFT = SEQUENCE_BITS + WORKER_ID_BITS
+# カスタムエポック（2025-01-01T00:00:00Z）
+EPOCH_MS = 1735689600000
+# リース期限の安全マージン（秒）
+LEASE_SAFETY_MARGIN_SECONDS = 1.0
+# リース延長失敗時の再試行間隔（秒）
+LEASE_RETRY_INTERVAL_SECONDS = 1.0
+
+# ワーカーIDリースの延長・解放用スクリプト（トークンが一致する場合のみ操作する）
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class WorkerIdLeaseError(RuntimeError):
+    """
+    ワーカーIDのリースが有効でない（期限切れ・喪失）エラー
+    """
+
+
+class IdGenerator(Protocol):
+    """
+    ID生成器インターフェース
+    """
+
+    def generate(self) -> int: ...
+
+
+class SnowflakeGenerator:
+    """
+    Snowflake形式（64bit、時系列順）のIDを生成する。
+
+    DBへの問い合わせなしにプロセス内で採番でき、ワーカーIDが重複しない限り
+    複数プロセス・複数ホスト間でも一意となる。
+
+    Attributes
+    ----------
+    worker_id: int
+        ワーカーID（0 ~ 1023）
+    epoch_ms: int
+        エポック（UNIXミリ秒）
+    lease_expire_at: float | None
+        ワーカーIDのリースが確認済みの期限（time.monotonic()基準、Noneの場合はリースを確認しない）
+    """
+
+    def __init__(self, worker_id: int = 0, epoch_ms: int = EPOCH_MS) -> None:
+        self.epoch_ms = epoch_ms
+        self.worker_id = worker_id
+        self.lease_expire_at: float | None = None
+        self._last_timestamp = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def worker_id(self) -> int:
+        return self._worker_id
+
+    @worker_id.setter
+    def worker_id(self, value: int) -> None:
+        if not 0 <= value <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}: {value}")
+        self._worker_id = value
+
+    def _current_millis(self) -> int:
+        return time.time_ns() // 1_000_000 - self.epoch_ms
+
+    def generate(self) -> int:
+        """
+        IDを生成する。
+
+        Returns
+        -------
+        int:
+            生成したID
+
+        Raises
+        ------
+        WorkerIdLeaseError:
+            ワーカーIDのリースが確認できていない場合（他プロセスとのID重複を防ぐため採番しない）
+        """
+        if self.lease_expire_at is not None and time.monotonic() >= self.lease_expire_at:
+            raise WorkerIdLeaseError("worker id lease is not confirmed.")
+        with self._lock:
+            timestamp = self._current_millis()
+            # 時刻の巻き戻りが発生した場合は、最後に採番した時刻に追いつくまで待機する
+            while timestamp < self._last_timestamp:
+                time.sleep((self._last_timestamp - timestamp) / 1000)
+                timestamp = self._current_millis()
+
+            if timestamp == self._last_timestamp:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                # 同一ミリ秒内のシーケンスを使い切った場合は次のミリ秒まで待機する
+                if self._sequence == 0:
+                    while timestamp <= self._last_timestamp:
+                        timestamp = self._current_millis()
+            else:
+                self._sequence = 0
+
+            self._last_timestamp = timestamp
+            return (
+                (timestamp << TIMESTAMP_SHIFT)
+                | (self._worker_id << WORKER_ID_SHIFT)
+                | self._sequence
+            )
+
+
+def parse_id(snowflake_id: int, epoch_ms: int = EPOCH_MS) -> tuple[int, int, int]:
+    """
+    Snowflake IDを構成要素に分解する。
+
+    Parameters
+    ----------
+    snowflake_id: int
+        Snowflake ID
+    epoch_ms: int
+        エポック（UNIXミリ秒）
+
+    Returns
+    -------
+    tuple[int, int, int]:
+        (UNIXミリ秒, ワーカーID, シーケンス)
+    """
+    timestamp = (snowflake_id >> TIMESTAMP_SHIFT) + epoch_ms
+    worker_id = (snowflake_id >> WORKER_ID_SHIFT) & MAX_WORKER_ID
+    sequence = snowflake_id & MAX_SEQUENCE
+    return timestamp, worker_id, sequence
+
+
+# プロセス共通のID生成器
+_generator: IdGenerator = SnowflakeGenerator()
+
+
+def get_id_generator() -> IdGenerator:
+    """
+    プロセス共通のID生成器を取得する。
+    """
+    return _generator
+
+
+def set_id_generator(generator: IdGenerator) -> None:
+    """
+    プロセス共通のID生成器を差し替える。
+
+    Parameters
+    ----------
+    generator: IdGenerator
+        ID生成器
+    """
+    global _generator
+    _generator = generator
+
+
+def generate_id() -> int:
+    """
+    プロセス共通のID生成器でIDを生成する。
+
+    Returns
+    -------
+    int:
+        生成したID
+    """
+    return _generator.generate()
+
+
+def generate_uuid7() -> uuid.UUID:
+    """
+    UUIDv7（先頭48bitがUNIXミリ秒の時系列順UUID）を生成する。
+
+    Returns
+    -------
+    uuid.UUID:
+        UUIDv7
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10))
+    rand_a = rand >> 62 & 0xFFF
+    rand_b = rand & ((1 << 62) - 1)
+    value = (unix_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+async def lease_worker_id(redis: Redis, token: str, ttl: int) -> int:
+    """
+    Redisで未使用のワーカーIDをリースする。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    token: str
+        リース所有者を識別するトークン
+    ttl: int
+        リース期間（秒）
+
+    Returns
+    -------
+    int:
+        リースしたワーカーID
+
+    Raises
+    ------
+    RuntimeError:
+        空きワーカーIDが存在しない場合
+    """
+    # プロセス間で取り合いにならないよう、探索開始位置をランダムにする
+    offset = secrets.randbelow(MAX_WORKER_ID + 1)
+    for i in range(MAX_WORKER_ID + 1):
+        worker_id = (offset + i) % (MAX_WORKER_ID + 1)
+        if await redis.set(generate_id_worker_key(worker_id), token, nx=True, ex=ttl):
+            return worker_id
+    raise RuntimeError("No available worker id.")
+
+
+async def renew_worker_id(redis: Redis, worker_id: int, token: str, ttl: int) -> bool:
+    """
+    ワーカーIDのリースを延長する。
+
+    Returns
+    -------
+    bool:
+        True: 延長成功 / False: リース喪失
+    """
+    result = await redis.eval(  # pyright: ignore[reportUnknownMemberType]
+        _RENEW_SCRIPT, 1, generate_id_worker_key(worker_id), token, ttl
+    )
+    return bool(result)
+
+
+async def release_worker_id(redis: Redis, worker_id: int, token: str) -> None:
+    """
+    ワーカーIDのリースを解放する。
+    """
+    await redis.eval(  # pyright: ignore[reportUnknownMemberType]
+        _RELEASE_SCRIPT, 1, generate_id_worker_key(worker_id), token
+    )
+
+
+async def keep_worker_id_alive(
+    redis: Redis, generator: SnowflakeGenerator, token: str, ttl: int
+) -> None:
+    """
+    ワーカーIDのリースを定期的に延長し、確認できた期限をID生成器に反映する。
+
+    延長に失敗した場合は短い間隔で再試行し、確認済みの期限を過ぎるとID生成器は採番を停止する。
+    リースを喪失した場合は直ちに採番を停止し、新しいワーカーIDを取り直す。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    generator: SnowflakeGenerator
+        ID生成器
+    token: str
+        リース所有者を識別するトークン
+    ttl: int
+        リース期間（秒）
+    """
+    interval = ttl / 3
+    while True:
+        await asyncio.sleep(interval)
+        # Redis側の期限はリクエスト送信後に設定されるため、送信前の時刻を基準とする
+        started = time.monotonic()
+        try:
+            if not await renew_worker_id(redis, generator.worker_id, token, ttl):
+                generator.lease_expire_at = started
+                logger.warning("ワーカーIDのリースを喪失しました: %d", generator.worker_id)
+                generator.worker_id = await lease_worker_id(redis, token, ttl)
+                logger.info("ワーカーIDを再取得しました: %d", generator.worker_id)
+        except (RedisError, RuntimeError):
+            logger.exception("ワーカーIDのリース延長に失敗しました。")
+            interval = LEASE_RETRY_INTERVAL_SECONDS
+            continue
+        generator.lease_expire_at = started + ttl - LEASE_SAFETY_MARGIN_SECONDS
+        interval = ttl / 3
+
+
+@contextlib.asynccontextmanager
+async def worker_id_lease(
+    redis: Redis, generator: SnowflakeGenerator | None = None
+) -> AsyncGenerator[int]:
+    """
+    ワーカーIDをリースし、有効期間中は定期的に延長する。
+
+    リースを確認できない間はID生成器での採番を停止し、他プロセスとのID重複を防ぐ。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    generator: SnowflakeGenerator | None
+        ワーカーIDを設定するID生成器（省略時はプロセス共通のID生成器）
+
+    Yields
+    ------
+    int:
+        リースしたワーカーID
+    """
+    target = generator if generator is not None else _generator
+    if not isinstance(target, SnowflakeGenerator):
+        raise TypeError("worker id lease requires SnowflakeGenerator.")
+
+    ttl = get_settings().ID_WORKER_LEASE_SECONDS
+    token = secrets.token_hex(16)
+    started = time.monotonic()
+    target.worker_id = await lease_worker_id(redis, token, ttl)
+    target.lease_expire_at = started + ttl - LEASE_SAFETY_MARGIN_SECONDS
+
+    task = asyncio.create_task(keep_worker_id_alive(redis, target, token, ttl))
+    try:
+        yield target.worker_id
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        # 解放後は採番しない
+        target.lease_expire_at = time.monotonic()
+        try:
+            await release_worker_id(redis, target.worker_id, token)
+        except RedisError:
+            logger.exception("ワーカーIDのリース解放に失敗しました: %d", target.worker_id)
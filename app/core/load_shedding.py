@@ -0,0 +1,175 @@
+"""
+過負荷時の流量制限（ロードシェディング）
+
+同時処理数に上限を設け、上限を超えたリクエストはDB接続等を待たずに即座に503で拒否する。
+上限は応答時間に応じてAIMD（加算増加・乗算減少）で調整する。目標応答時間内に応答できている間は
+上限を少しずつ増やし、目標を超えた・サーバーエラーとなった場合は上限を一定の割合で減らす。
+
+優先度の低いリクエストほど上限の一部しか使用できないため、過負荷時は優先度の低いリクエストから
+拒否され、ヘルスチェック・トークン発行は最後まで受け付ける。
+"""
+
+import math
+import time
+from collections.abc import Callable
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.enums import RequestPriority
+
+# 優先度ごとに使用できる同時処理数の上限の割合
+PRIORITY_SHARES = {
+    RequestPriority.LOW: 0.5,
+    RequestPriority.NORMAL: 0.9,
+    RequestPriority.CRITICAL: 1.0,
+}
+# パス（前方一致）ごとの優先度（該当しない場合はNORMAL）
+PATH_PRIORITIES = {
+    "/health-check": RequestPriority.CRITICAL,
+    "/user/register/verify-authcode": RequestPriority.CRITICAL,
+    "/admin/": RequestPriority.LOW,
+}
+# 上限を減らす割合
+BACKOFF_RATIO = 0.9
+
+
+def classify(path: str) -> RequestPriority:
+    """
+    リクエストのパスから優先度を判定する。
+    """
+    for prefix, priority in PATH_PRIORITIES.items():
+        if path.startswith(prefix):
+            return priority
+    return RequestPriority.NORMAL
+
+
+class AdaptiveLimiter:
+    """
+    応答時間に応じて同時処理数の上限を調整する流量制限
+
+    Parameters
+    ----------
+    initial_limit: int
+        同時処理数の上限の初期値
+    min_limit: int
+        同時処理数の上限の最小値
+    max_limit: int
+        同時処理数の上限の最大値
+    target_latency: float
+        目標応答時間（秒）
+    clock: Callable[[], float]
+        現在時刻（秒）を取得する関数
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = -math.inf
+
+    def try_acquire(self, priority: RequestPriority) -> bool:
+        """
+        優先度に応じた上限に達していなければ、処理中のリクエストとして受け付ける。
+
+        Returns
+        -------
+        bool:
+            True: 受け付けた / False: 上限に達している
+        """
+        if self.in_flight >= max(self.limit * PRIORITY_SHARES[priority], 1):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, overloaded: bool) -> None:
+        """
+        処理の完了を記録し、応答時間に応じて上限を調整する。
+
+        上限を減らすのは目標応答時間ごとに1回までとする（同時に処理していたリクエストが
+        まとめて遅延した場合に、上限を過剰に減らさないため）。
+        上限を増やすのは上限の半分以上を使用している場合のみとする（負荷が低い間に上限が
+        際限なく増えないため）。
+
+        Parameters
+        ----------
+        latency: float
+            応答時間（秒）
+        overloaded: bool
+            サーバーエラー・処理期限の超過となったか
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if overloaded or latency > self.target_latency:
+            now = self._clock()
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = now
+        elif in_flight >= self.limit / 2:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class LoadSheddingMiddleware:
+    """
+    同時処理数の上限を超えたリクエストを503で拒否するミドルウェア
+
+    処理中のリクエストはレスポンスの送信開始までとする（ストリーミングの送信中は含めない）。
+
+    Parameters
+    ----------
+    app: starlette.types.ASGIApp
+        ASGIアプリケーション
+    limiter: AdaptiveLimiter
+        流量制限
+    retry_after: int
+        拒否したリクエストの再試行までの秒数
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AdaptiveLimiter, retry_after: int) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not self.limiter.try_acquire(classify(scope["path"])):
+            response = JSONResponse(
+                {"detail": "混雑しています。しばらくしてから再度お試しください。"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        released = False
+
+        def release(overloaded: bool) -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.limiter.release(time.monotonic() - started, overloaded)
+
+        async def send_with_release(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                release(message["status"] >= status.HTTP_500_INTERNAL_SERVER_ERROR)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_release)
+        finally:
+            # レスポンスを送信せずに終了した場合（例外・切断）
+            release(True)
@@ -0,0 +1,114 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+class MultipartError(Exception):
+    """
+    multipart/form-dataの解析エラー
+    """
+
+
+class _FilePartCollector:
+    """
+    multipart/form-dataを逐次解析し、指定したファイルパートのデータのみを収集する。
+    """
+
+    def __init__(self, field_name: str) -> None:
+        self.field_name = field_name.encode()
+        self.pending: list[bytes] = []
+        self.found = False
+        self._target = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+
+    def on_part_begin(self) -> None:
+        self._headers.clear()
+        self._target = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        # 同名のファイルパートが複数ある場合は最初のパートのみ対象とする
+        self._target = (
+            not self.found and options.get(b"name") == self.field_name and b"filename" in options
+        )
+        self.found = self.found or self._target
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._target:
+            self.pending.append(bytes(data[start:end]))
+
+    def on_part_end(self) -> None:
+        self._target = False
+
+
+async def iter_file_part(
+    content_type: str, stream: AsyncIterator[bytes], field_name: str
+) -> AsyncGenerator[bytes]:
+    """
+    multipart/form-dataのリクエストボディから指定したファイルパートのデータを逐次取り出す。
+
+    リクエストボディ全体をメモリや一時ファイルに展開せず、受信したチャンク単位で返却する。
+
+    Parameters
+    ----------
+    content_type: str
+        Content-Typeヘッダーの値
+    stream: AsyncIterator[bytes]
+        リクエストボディのストリーム
+    field_name: str
+        ファイルパートのフィールド名
+
+    Yields
+    ------
+    bytes:
+        ファイルデータのチャンク
+
+    Raises
+    ------
+    MultipartError:
+        multipart/form-dataでない場合、またはファイルパートが存在しない場合
+    """
+    media_type, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if media_type != b"multipart/form-data" or not boundary:
+        raise MultipartError("Content-Type must be multipart/form-data with boundary.")
+
+    collector = _FilePartCollector(field_name)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": collector.on_part_begin,
+            "on_header_field": collector.on_header_field,
+            "on_header_value": collector.on_header_value,
+            "on_header_end": collector.on_header_end,
+            "on_headers_finished": collector.on_headers_finished,
+            "on_part_data": collector.on_part_data,
+            "on_part_end": collector.on_part_end,
+        },
+    )
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            for data in collector.pending:
+                yield data
+            collector.pending.clear()
+        parser.finalize()
+    except FormParserError as e:
+        raise MultipartError(str(e)) from e
+
+    if not collector.found:
+        raise MultipartError(f"File part '{field_name}' is not found.")
@@ -0,0 +1,114 @@
+"""
+キーセットページング用のカーソル
+
+カーソルは最後に返却した要素の並び順のキー（例：作成日時・ID）をJSONで保持し、署名して
+Base64URLで符号化する。クライアントからは不透明な文字列として扱われ、改ざんされたカーソルや
+別の一覧のカーソルは署名の検証で拒否する。
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from app.core.config import get_settings
+
+type CursorValue = int | str | datetime
+
+# 署名の長さ（バイト）
+SIGNATURE_BYTES = 16
+# 一覧取得の既定件数、最大件数
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """
+    ページングカーソルが不正なエラー
+    """
+
+
+def _sign(scope: str, payload: bytes) -> bytes:
+    key = get_settings().SECRET_KEY.encode()
+    return hmac.new(key, scope.encode() + b"\0" + payload, hashlib.sha256).digest()[
+        :SIGNATURE_BYTES
+    ]
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def encode_cursor(scope: str, values: Sequence[CursorValue]) -> str:
+    """
+    ページングカーソルを生成する。
+
+    Parameters
+    ----------
+    scope: str
+        一覧の種別（他の一覧のカーソルを拒否するため署名に含める）
+    values: Sequence[CursorValue]
+        最後に返却した要素の並び順のキー（日時はISO形式で保持する）
+
+    Returns
+    -------
+    str:
+        ページングカーソル
+    """
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    ).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(scope, payload))}"
+
+
+def decode_cursor(scope: str, cursor: str, types: Sequence[type[CursorValue]]) -> list[CursorValue]:
+    """
+    ページングカーソルを検証し、並び順のキーに変換する。
+
+    Parameters
+    ----------
+    scope: str
+        一覧の種別
+    cursor: str
+        ページングカーソル
+    types: Sequence[type[CursorValue]]
+        並び順のキーの型
+
+    Returns
+    -------
+    list[CursorValue]:
+        並び順のキー
+
+    Raises
+    ------
+    InvalidCursorError:
+        カーソルが不正な場合（形式・署名・キーの数や型が一致しない場合）
+    """
+    encoded, sep, signature = cursor.partition(".")
+    try:
+        payload = _b64decode(encoded)
+        if not sep or not hmac.compare_digest(_b64decode(signature), _sign(scope, payload)):
+            raise InvalidCursorError(cursor)
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorError(cursor)
+        return [_convert(value, t) for value, t in zip(values, types, strict=True)]
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def _convert(value: object, t: type[CursorValue]) -> CursorValue:
+    if t is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    # boolはintのサブクラスのため除外する
+    if isinstance(value, t) and not isinstance(value, bool):
+        return value
+    raise InvalidCursorError(value)
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from redis.asyncio.client import PubSub, Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# 購読が切断された場合の再接続間隔（秒）
+RECONNECT_INTERVAL_SECONDS = 1.0
+
+
+class TooManySubscribersError(Exception):
+    """
+    購読者数が上限に達している場合の例外
+    """
+
+
+class Subscription:
+    """
+    購読者ごとのメッセージキュー
+
+    キューが満杯（購読者の受信が遅い）の場合は最も古いメッセージを破棄し、破棄した件数を記録する。
+    メッセージの受信によってRedisの購読（他の購読者への配信）が滞らないようにするため。
+
+    Parameters
+    ----------
+    channel: str
+        チャネル
+    queue_size: int
+        キューに保持する最大メッセージ数
+    """
+
+    def __init__(self, channel: str, queue_size: int) -> None:
+        self.channel = channel
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(queue_size)
+
+    def put(self, message: str) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> str | None:
+        """
+        メッセージを取得する。
+
+        Parameters
+        ----------
+        timeout: float
+            待機秒数
+
+        Returns
+        -------
+        str | None:
+            メッセージ（待機秒数内に受信しなかった場合はNone）
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def take_dropped(self) -> int:
+        """
+        破棄したメッセージ数を取得してリセットする。
+        """
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class PubSubHub:
+    """
+    Redis Pub/Subの購読をプロセス内の購読者に分配するハブ
+
+    クライアントごとにRedisへ接続せず、プロセスで1つの接続でチャネルを購読し、
+    受信したメッセージをチャネルの購読者（プロセス内のキュー）に分配する。
+    チャネルはプロセス内の購読者がいる間のみ購読する。
+
+    Parameters
+    ----------
+    control_channel: str
+        常に購読するチャネル（購読中のチャネルが無い間も受信を継続するため）
+    max_subscribers: int
+        プロセスの最大購読者数
+    queue_size: int
+        購読者ごとのキューに保持する最大メッセージ数
+    """
+
+    def __init__(self, control_channel: str, max_subscribers: int, queue_size: int) -> None:
+        self.control_channel = control_channel
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self._pubsub: PubSub | None = None
+
+    @property
+    def count(self) -> int:
+        """
+        購読者数
+        """
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        """
+        購読者数が上限に達しているか
+        """
+        return self._count >= self.max_subscribers
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncGenerator[Subscription]:
+        """
+        チャネルを購読する（コンテキストを抜けると購読を解除する）。
+
+        Parameters
+        ----------
+        channel: str
+            チャネル
+
+        Raises
+        ------
+        TooManySubscribersError:
+            購読者数が上限に達している場合
+        """
+        if self.is_full:
+            raise TooManySubscribersError
+        subscription = Subscription(channel, self.queue_size)
+        subscribers = self._subscriptions.setdefault(channel, set())
+        subscribers.add(subscription)
+        self._count += 1
+        try:
+            if len(subscribers) == 1:
+                await self._execute("subscribe", channel)
+            yield subscription
+        finally:
+            subscribers.discard(subscription)
+            self._count -= 1
+            if not subscribers and self._subscriptions.get(channel) is subscribers:
+                del self._subscriptions[channel]
+                await self._execute("unsubscribe", channel)
+
+    async def _execute(self, command: str, channel: str) -> None:
+        # 切断中の場合は、再接続時に購読中のチャネルをまとめて購読し直す
+        if self._pubsub is None:
+            return
+        try:
+            await getattr(self._pubsub, command)(channel)
+        except RedisError:
+            logger.exception("チャネルの購読・購読解除に失敗しました。")
+
+    def dispatch(self, channel: str, message: str) -> int:
+        """
+        メッセージをチャネルの購読者に分配する。
+
+        Parameters
+        ----------
+        channel: str
+            チャネル
+        message: str
+            メッセージ
+
+        Returns
+        -------
+        int:
+            分配した購読者数
+        """
+        subscribers = self._subscriptions.get(channel, ())
+        for subscription in subscribers:
+            subscription.put(message)
+        return len(subscribers)
+
+    async def run(self, redis: Redis) -> None:
+        """
+        チャネルを購読してメッセージを分配する（キャンセルされるまで実行する）。
+
+        購読が切断された場合は再接続し、購読中のチャネルを購読し直す。
+
+        Parameters
+        ----------
+        redis: Redis
+            Redisクライアント
+        """
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    # 購読し直す間に追加されたチャネルも購読するよう、先に接続を公開する
+                    self._pubsub = pubsub
+                    await pubsub.subscribe(self.control_channel, *self._subscriptions)  # pyright: ignore[reportUnknownMemberType]
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(message["channel"], message["data"])
+            except RedisError:
+                logger.exception("Pub/Subの購読が切断されました。")
+                await asyncio.sleep(RECONNECT_INTERVAL_SECONDS)
+            finally:
+                self._pubsub = None
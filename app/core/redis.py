@@ -1,16 +1,49 @@
+from uuid import UUID
+
 from redis import ConnectionError
 from redis.asyncio.client import Redis
 
+from app.core import deadline
 from app.core.config import get_settings
 
 # キーの用途別prefix定義
 PREFIX_TEMP_USER = "temp_user"
 PREFIX_JWT_TOKEN = "jwt_token"
+PREFIX_ID_WORKER = "id_worker"
+PREFIX_CACHE = "cache"
+PREFIX_QUEUE = "queue"
+PREFIX_FOLLOWERS = "followers"
+PREFIX_FOLLOWING = "following"
+PREFIX_TIMELINE = "timeline"
+PREFIX_USER_POSTS = "user_posts"
+PREFIX_POST_LIKES = "post_likes"
+PREFIX_POST_COUNTER = "post_counter"
+PREFIX_TRENDS = "trends"
+PREFIX_BLOOM_FILTER = "bloom_filter"
+PREFIX_NOTIFICATIONS = "notifications"
+
+# キャッシュ無効化の通知チャネル
+CACHE_INVALIDATION_CHANNEL = f"{PREFIX_CACHE}:invalidation"
+# ホームタイムラインへの配信（ファンアウト）を行わず、読み込み時に投稿を取得するユーザー
+# （ソート済みセット、スコアはフォロワー数）
+TIMELINE_PULL_ACCOUNTS_KEY = f"{PREFIX_TIMELINE}:pull_accounts"
+# 投稿カウンターの未反映の増分がある投稿IDのセット
+POST_COUNTER_DIRTY_KEY = f"{PREFIX_POST_COUNTER}:dirty"
+# トレンドのスナップショットを更新するプロセスの排他用キー
+TRENDS_REFRESH_LOCK_KEY = f"{PREFIX_TRENDS}:refresh_lock"
+# 登録済みユーザー名のBloomフィルター
+USERNAME_FILTER_KEY = f"{PREFIX_BLOOM_FILTER}:usernames"
+# 登録済みユーザー名のBloomフィルターを再構築するプロセスの排他用キー
+USERNAME_FILTER_REBUILD_LOCK_KEY = f"{PREFIX_BLOOM_FILTER}:usernames:rebuild_lock"
+# 通知の購読を維持するための制御チャネル（通知は送信しない）
+NOTIFICATION_CONTROL_CHANNEL = f"{PREFIX_NOTIFICATIONS}:control"
 
 
 async def get_redis_client() -> Redis:
     """
     Redisクライアントインスタンスを取得する
+
+    リクエストの処理中は、処理期限までの残り時間をコマンドのタイムアウトとする。
     """
     try:
         client = await Redis(
@@ -19,6 +52,8 @@ async def get_redis_client() -> Redis:
             db=get_settings().REDIS_DB,
             password=get_settings().REDIS_PASSWORD,
             decode_responses=True,
+            socket_timeout=deadline.remaining(),
+            socket_connect_timeout=get_settings().REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
         )
         return client
 
@@ -34,13 +69,13 @@ async def check_connection(redis: Redis) -> str:
     return await redis.ping()  # pyright: ignore[reportUnknownMemberType]
 
 
-def generate_temp_user_key(authcode_id: str, code: str) -> str:
+def generate_temp_user_key(authcode_id: UUID | str, code: str) -> str:
     """
     一時ユーザー用キーを生成する。
 
     Parameters
     ----------
-    authcode_id: str
+    authcode_id: uuid.UUID | str
         認証コードID
     code: str
         認証コード
@@ -68,3 +103,270 @@ def generate_jwt_token_key(token_id: str) -> str:
         JWTトークン用キー
     """
     return f"{PREFIX_JWT_TOKEN}:{token_id}"
+
+
+def generate_id_worker_key(worker_id: int) -> str:
+    """
+    ワーカーIDリース用キーを生成する。
+
+    Parameters
+    ----------
+    worker_id: int
+        ワーカーID
+
+    Returns
+    -------
+    str:
+        ワーカーIDリース用キー
+    """
+    return f"{PREFIX_ID_WORKER}:{worker_id}"
+
+
+def generate_cache_key(namespace: str, key: str) -> str:
+    """
+    キャッシュ用キーを生成する。
+
+    Parameters
+    ----------
+    namespace: str
+        キャッシュの名前空間
+    key: str
+        キー
+
+    Returns
+    -------
+    str:
+        キャッシュ用キー
+    """
+    return f"{PREFIX_CACHE}:{namespace}:{key}"
+
+
+def generate_queue_key(name: str) -> str:
+    """
+    ジョブキュー用キーを生成する。
+
+    Parameters
+    ----------
+    name: str
+        キュー名
+
+    Returns
+    -------
+    str:
+        ジョブキュー用キー
+    """
+    return f"{PREFIX_QUEUE}:{name}"
+
+
+def generate_processing_queue_key(name: str) -> str:
+    """
+    処理中ジョブ用キーを生成する。
+
+    ワーカーが取り出したジョブは処理完了まで本キーに保持し、異常終了時に再投入できるようにする。
+
+    Parameters
+    ----------
+    name: str
+        キュー名
+
+    Returns
+    -------
+    str:
+        処理中ジョブ用キー
+    """
+    return f"{PREFIX_QUEUE}:{name}:processing"
+
+
+def generate_dead_letter_queue_key(name: str) -> str:
+    """
+    デッドレターキュー（再試行回数を超えたジョブ）用キーを生成する。
+
+    Parameters
+    ----------
+    name: str
+        キュー名
+
+    Returns
+    -------
+    str:
+        デッドレターキュー用キー
+    """
+    return f"{PREFIX_QUEUE}:{name}:dead"
+
+
+def generate_followers_key(user_id: int) -> str:
+    """
+    フォロワー一覧（ソート済みセット、スコアはフォロー日時）用キーを生成する。
+
+    Parameters
+    ----------
+    user_id: int
+        フォローされているユーザーのユーザーID
+
+    Returns
+    -------
+    str:
+        フォロワー一覧用キー
+    """
+    return f"{PREFIX_FOLLOWERS}:{user_id}"
+
+
+def generate_following_key(user_id: int) -> str:
+    """
+    フォロー中一覧（ソート済みセット、スコアはフォロー日時）用キーを生成する。
+
+    Parameters
+    ----------
+    user_id: int
+        フォローしているユーザーのユーザーID
+
+    Returns
+    -------
+    str:
+        フォロー中一覧用キー
+    """
+    return f"{PREFIX_FOLLOWING}:{user_id}"
+
+
+def generate_timeline_key(user_id: int) -> str:
+    """
+    ホームタイムライン（投稿IDのリスト）用キーを生成する。
+
+    Parameters
+    ----------
+    user_id: int
+        ユーザーID
+
+    Returns
+    -------
+    str:
+        ホームタイムライン用キー
+    """
+    return f"{PREFIX_TIMELINE}:{user_id}"
+
+
+def generate_user_posts_key(user_id: int) -> str:
+    """
+    ユーザーの最新投稿（投稿IDのリスト）用キーを生成する。
+
+    Parameters
+    ----------
+    user_id: int
+        投稿ユーザーID
+
+    Returns
+    -------
+    str:
+        ユーザーの最新投稿用キー
+    """
+    return f"{PREFIX_USER_POSTS}:{user_id}"
+
+
+def generate_post_likes_key(post_id: int) -> str:
+    """
+    投稿にいいねしたユーザー（ユーザーIDのセット）用キーを生成する。
+
+    Parameters
+    ----------
+    post_id: int
+        投稿ID
+
+    Returns
+    -------
+    str:
+        いいねユーザー用キー
+    """
+    return f"{PREFIX_POST_LIKES}:{post_id}"
+
+
+def generate_post_counter_key(post_id: int, shard: int) -> str:
+    """
+    投稿カウンターの未反映の増分（ハッシュ）用キーを生成する。
+
+    同一投稿への書き込みが1キーに集中しないよう、増分を複数のキー（シャード）に分散する。
+
+    Parameters
+    ----------
+    post_id: int
+        投稿ID
+    shard: int
+        シャード番号
+
+    Returns
+    -------
+    str:
+        投稿カウンター用キー
+    """
+    return f"{PREFIX_POST_COUNTER}:{post_id}:{shard}"
+
+
+def generate_trend_sketch_key(window: str, bucket: int) -> str:
+    """
+    ハッシュタグの出現回数を集計するCount-Min Sketch（ハッシュ）用キーを生成する。
+
+    Parameters
+    ----------
+    window: str
+        集計期間
+    bucket: int
+        時間区間の番号（UNIX時刻を区間の秒数で割った値）
+
+    Returns
+    -------
+    str:
+        Count-Min Sketch用キー
+    """
+    return f"{PREFIX_TRENDS}:{window}:{bucket}:sketch"
+
+
+def generate_trend_top_key(window: str, bucket: int) -> str:
+    """
+    出現回数上位のハッシュタグ（ソート済みセット、スコアは推定出現回数）用キーを生成する。
+
+    Parameters
+    ----------
+    window: str
+        集計期間
+    bucket: int
+        時間区間の番号（UNIX時刻を区間の秒数で割った値）
+
+    Returns
+    -------
+    str:
+        上位ハッシュタグ用キー
+    """
+    return f"{PREFIX_TRENDS}:{window}:{bucket}:top"
+
+
+def generate_trend_snapshot_key(window: str) -> str:
+    """
+    トレンドのスナップショット（JSON）用キーを生成する。
+
+    Parameters
+    ----------
+    window: str
+        集計期間
+
+    Returns
+    -------
+    str:
+        スナップショット用キー
+    """
+    return f"{PREFIX_TRENDS}:{window}:snapshot"
+
+
+def generate_notification_channel(user_id: int) -> str:
+    """
+    ユーザーへの通知チャネルを生成する。
+
+    Parameters
+    ----------
+    user_id: int
+        通知先のユーザーID
+
+    Returns
+    -------
+    str:
+        通知チャネル
+    """
+    return f"{PREFIX_NOTIFICATIONS}:{user_id}"
@@ -14,3 +14,22 @@ def generate_authcode() -> str:
         認証コード
     """
     return "".join(secrets.choice(string.digits) for _ in range(get_settings().AUTHCODE_LENGTH))
+
+
+def is_valid_admin_key(key: str | None) -> bool:
+    """
+    管理APIの認証キーを検証する（処理時間から一致した文字数を推測されないよう、一定時間で比較する）。
+
+    Parameters
+    ----------
+    key: str | None
+        認証キー
+
+    Returns
+    -------
+    bool:
+        True: 有効 / False: 無効
+    """
+    return key is not None and secrets.compare_digest(
+        key.encode(), get_settings().ADMIN_API_KEY.encode()
+    )
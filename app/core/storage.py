@@ -0,0 +1,242 @@
+import hashlib
+import re
+import secrets
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+import anyio
+
+from app.core.config import get_settings
+
+# コンテンツハッシュ（SHA-256の16進表記）の形式
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# 画像形式判定用のシグネチャ（先頭バイト列, MIMEタイプ）
+IMAGE_SIGNATURES: list[tuple[bytes, str]] = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+# 形式判定に必要な先頭バイト数
+SIGNATURE_LENGTH = 12
+
+
+class BlobTooLargeError(Exception):
+    """
+    サイズ上限超過エラー
+    """
+
+
+class UnsupportedMediaTypeError(Exception):
+    """
+    未対応のファイル形式エラー
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class BlobInfo:
+    """
+    保存したBlobの情報
+
+    Attributes
+    ----------
+    digest: str
+        コンテンツハッシュ（SHA-256）
+    size: int
+        サイズ（バイト）
+    media_type: str
+        MIMEタイプ
+    """
+
+    digest: str
+    size: int
+    media_type: str
+
+
+def detect_image_type(head: bytes) -> str | None:
+    """
+    先頭バイト列から画像のMIMEタイプを判定する。
+
+    Parameters
+    ----------
+    head: bytes
+        ファイルの先頭バイト列
+
+    Returns
+    -------
+    str | None:
+        MIMEタイプ（未対応の形式の場合はNone）
+    """
+    for signature, media_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class BlobStore(Protocol):
+    """
+    コンテンツアドレス型Blobストアのインターフェース
+    """
+
+    async def save(self, chunks: AsyncIterable[bytes], max_bytes: int) -> BlobInfo: ...
+
+    def path(self, digest: str, variant: str | None = None) -> Path: ...
+
+    async def save_variant(self, digest: str, variant: str, data: bytes) -> None: ...
+
+    async def media_type(self, digest: str, variant: str | None = None) -> str | None: ...
+
+
+class LocalBlobStore:
+    """
+    ローカルファイルシステムをバックエンドとするBlobストア
+
+    Blobはコンテンツハッシュをファイル名として {root}/{digest[:2]}/{digest[2:4]}/{digest} に保存し、
+    同一内容のファイルは1つだけ保持する。
+
+    Parameters
+    ----------
+    root: pathlib.Path
+        保存先ルートディレクトリ
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, digest: str, variant: str | None = None) -> Path:
+        """
+        Blobの保存先パスを取得する。
+
+        Parameters
+        ----------
+        digest: str
+            コンテンツハッシュ
+        variant: str | None
+            派生ファイル（サムネイル等）の種別
+
+        Returns
+        -------
+        pathlib.Path:
+            保存先パス
+        """
+        if not DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f"invalid digest: {digest}")
+        name = digest if variant is None else f"{digest}.{variant}"
+        return self.root / digest[:2] / digest[2:4] / name
+
+    async def save(self, chunks: AsyncIterable[bytes], max_bytes: int) -> BlobInfo:
+        """
+        チャンク単位でハッシュを計算しながら一時ファイルに書き込み、完了後に保存先へ移動する。
+
+        Parameters
+        ----------
+        chunks: AsyncIterable[bytes]
+            ファイルデータのチャンク
+        max_bytes: int
+            サイズ上限（バイト）
+
+        Returns
+        -------
+        BlobInfo:
+            保存したBlobの情報
+
+        Raises
+        ------
+        BlobTooLargeError:
+            サイズ上限を超えた場合
+        UnsupportedMediaTypeError:
+            画像ファイルでない場合
+        """
+        tmp_dir = self.root / "tmp"
+        await anyio.Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / secrets.token_hex(16)
+
+        sha256 = hashlib.sha256()
+        size = 0
+        head = b""
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise BlobTooLargeError(f"file size exceeds {max_bytes} bytes.")
+                    if len(head) < SIGNATURE_LENGTH:
+                        head += chunk[: SIGNATURE_LENGTH - len(head)]
+                        # 画像でないことが判明した時点で受信を打ち切る
+                        if len(head) == SIGNATURE_LENGTH and detect_image_type(head) is None:
+                            raise UnsupportedMediaTypeError("unsupported image format.")
+                    sha256.update(chunk)
+                    await f.write(chunk)
+
+            media_type = detect_image_type(head)
+            if media_type is None:
+                raise UnsupportedMediaTypeError("unsupported image format.")
+
+            digest = sha256.hexdigest()
+            path = self.path(digest)
+            await anyio.Path(path.parent).mkdir(parents=True, exist_ok=True)
+            # 同一内容のファイルが既に存在する場合は上書きしない
+            if await anyio.Path(path).exists():
+                await anyio.Path(tmp_path).unlink()
+            else:
+                await anyio.Path(tmp_path).replace(path)
+            return BlobInfo(digest=digest, size=size, media_type=media_type)
+        finally:
+            await anyio.Path(tmp_path).unlink(missing_ok=True)
+
+    async def save_variant(self, digest: str, variant: str, data: bytes) -> None:
+        """
+        派生ファイル（サムネイル等）を元のBlobと同じディレクトリに保存する。
+
+        Parameters
+        ----------
+        digest: str
+            元のBlobのコンテンツハッシュ
+        variant: str
+            派生ファイルの種別
+        data: bytes
+            ファイルデータ
+        """
+        tmp_dir = self.root / "tmp"
+        await anyio.Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+        tmp_path = anyio.Path(tmp_dir / secrets.token_hex(16))
+        try:
+            await tmp_path.write_bytes(data)
+            path = self.path(digest, variant)
+            await anyio.Path(path.parent).mkdir(parents=True, exist_ok=True)
+            # 書き込み途中のファイルを返却しないよう、一時ファイルから置き換える
+            await tmp_path.replace(path)
+        finally:
+            await tmp_path.unlink(missing_ok=True)
+
+    async def media_type(self, digest: str, variant: str | None = None) -> str | None:
+        """
+        保存済みBlobのMIMEタイプを取得する。
+
+        Returns
+        -------
+        str | None:
+            MIMEタイプ（Blobが存在しない場合はNone）
+        """
+        try:
+            async with await anyio.open_file(self.path(digest, variant), "rb") as f:
+                head = await f.read(SIGNATURE_LENGTH)
+        except FileNotFoundError:
+            return None
+        return detect_image_type(head) or "application/octet-stream"
+
+
+# プロセス共通のBlobストア
+blob_store: BlobStore = LocalBlobStore(Path(get_settings().STORAGE_ROOT))
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Blobストアを取得する。
+    """
+    return blob_store
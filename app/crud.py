@@ -1,10 +1,252 @@
-from datetime import date
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy import select
+from redis.asyncio.client import Redis
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Integer,
+    RowMapping,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
 
-from app.models import Authcode, User
-from app.schemas import auth_schema, user_schema
+from app.core.config import get_settings
+from app.core.id_generator import generate_id
+from app.core.pagination import decode_cursor, encode_cursor
+from app.enums import Flag, ImportStatus
+from app.models import Authcode, BaseModelMixin, Follow, Post, User, UserCredential
+from app.schemas import auth_schema, post_schema, user_schema
+
+# 論理削除から一定期間経過したユーザーを、認証情報・投稿・フォローと合わせてアーカイブへ移動する
+# （アーカイブした投稿への返信・再投稿は、外部キー制約により返信先・再投稿元がNULLとなる）
+ARCHIVE_DELETED_USERS_QUERY = text(
+    """
+    WITH target AS (
+        SELECT user_id
+          FROM users
+         WHERE delete_flag = true
+           AND update_datetime < :threshold
+         ORDER BY update_datetime
+         LIMIT :batch_size
+           FOR UPDATE SKIP LOCKED
+    ), moved_credentials AS (
+        DELETE FROM user_credentials c
+         USING target t
+         WHERE c.user_id = t.user_id
+        RETURNING c.*
+    ), moved_posts AS (
+        DELETE FROM posts p
+         USING target t
+         WHERE p.user_id = t.user_id
+        RETURNING p.*
+    ), moved_follows AS (
+        DELETE FROM follows f
+         USING target t
+         WHERE f.follower_id = t.user_id OR f.followee_id = t.user_id
+        RETURNING f.*
+    ), moved_users AS (
+        DELETE FROM users u
+         USING target t
+         WHERE u.user_id = t.user_id
+        RETURNING u.*
+    ), archived AS (
+        INSERT INTO archived_records (table_name, record_id, record)
+        SELECT 'user_credentials', mc.user_id, to_jsonb(mc) FROM moved_credentials mc
+         UNION ALL
+        SELECT 'posts', mp.post_id, to_jsonb(mp) FROM moved_posts mp
+         UNION ALL
+        SELECT 'follows', mf.follower_id, to_jsonb(mf) FROM moved_follows mf
+         UNION ALL
+        SELECT 'users', mu.user_id, to_jsonb(mu) FROM moved_users mu
+        RETURNING table_name
+    )
+    SELECT count(*) FROM archived WHERE table_name = 'users'
+    """
+)
+
+# ユーザー更新時に呼び出すフック（キャッシュ無効化等）
+type UserWriteHook = Callable[[Sequence[user_schema.User], Redis], Awaitable[None]]
+user_write_hooks: list[UserWriteHook] = []
+
+
+def register_user_write_hook(hook: UserWriteHook) -> None:
+    """
+    ユーザー更新時に呼び出すフックを登録する。
+
+    Parameters
+    ----------
+    hook: UserWriteHook
+        更新前後のユーザー、Redisクライアントを引数に取る関数
+    """
+    if hook not in user_write_hooks:
+        user_write_hooks.append(hook)
+
+
+async def run_user_write_hooks(users: Sequence[user_schema.User], redis: Redis) -> None:
+    """
+    ユーザー更新時のフックを実行する。
+
+    Parameters
+    ----------
+    users: Sequence[app.schemas.user_schema.User]
+        更新前後のユーザー（ユーザー名・メールアドレスの変更前のキャッシュも無効化するため）
+    redis: Redis
+        Redisクライアント
+    """
+    for hook in user_write_hooks:
+        await hook(users, redis)
+
+
+def not_deleted(model: type[BaseModelMixin]) -> ColumnElement[bool]:
+    """
+    論理削除されていないレコードを抽出する条件を取得する。
+
+    部分インデックスの条件（delete_flag = false）と一致する式を返すため、
+    論理削除を考慮する検索は必ずこの条件を使用すること。
+
+    Parameters
+    ----------
+    model: type[BaseModelMixin]
+        検索対象のモデル
+
+    Returns
+    -------
+    sqlalchemy.ColumnElement[bool]
+        検索条件
+    """
+    return model.delete_flag == Flag.OFF.value
+
+
+async def select_page[T](
+    db: AsyncSession,
+    stmt: Select[tuple[T]],
+    keys: Sequence[InstrumentedAttribute[Any]],
+    scope: str,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[T], str | None]:
+    """
+    キーセットページングで1ページ分のレコードを降順に取得する。
+
+    前ページの最後のキーより後ろのレコードを行値の比較（(k1, k2) < (:k1, :k2)）で抽出するため、
+    キーと同じ並びの複合インデックスがあれば、ページの深さによらず一定の処理時間となる。
+    件数はlimit + 1件を取得して次ページの有無を判定し、総件数の集計は行わない。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    stmt: sqlalchemy.sql.Select[tuple[T]]
+        抽出条件を指定した取得クエリ（並び順・件数は指定しない）
+    keys: Sequence[sqlalchemy.orm.InstrumentedAttribute[Any]]
+        並び順のキー（最後のキーは一意であること）
+    scope: str
+        一覧の種別（カーソルの署名に含める）
+    cursor: str | None
+        前ページのカーソル（Noneの場合は先頭から取得する）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    tuple[list[T], str | None]:
+        取得結果、次ページのカーソル（次ページがない場合はNone）
+
+    Raises
+    ------
+    app.core.pagination.InvalidCursorError:
+        カーソルが不正な場合
+    """
+    if cursor is not None:
+        after = decode_cursor(scope, cursor, [key.type.python_type for key in keys])
+        stmt = stmt.where(tuple_(*keys) < tuple_(*after))
+    rows = list(
+        (await db.scalars(stmt.order_by(*(key.desc() for key in keys)).limit(limit + 1))).all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(scope, [getattr(last, key.key) for key in keys])
+
+
+async def select_users_page(
+    db: AsyncSession, cursor: str | None, limit: int
+) -> tuple[list[user_schema.User], str | None]:
+    """
+    論理削除されていないユーザーを登録日時の新しい順に1ページ分取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    cursor: str | None
+        前ページのカーソル
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    tuple[list[app.schemas.user_schema.User], str | None]:
+        取得結果、次ページのカーソル（次ページがない場合はNone）
+    """
+    rows, next_cursor = await select_page(
+        db,
+        select(User).where(not_deleted(User)),
+        [User.create_datetime, User.user_id],
+        "users",
+        cursor,
+        limit,
+    )
+    return [user_schema.User.model_validate(row) for row in rows], next_cursor
+
+
+async def select_user_posts_page(
+    db: AsyncSession, user_id: int, cursor: str | None, limit: int
+) -> tuple[list[post_schema.Post], str | None]:
+    """
+    ユーザーの論理削除されていない投稿を新しい順（投稿ID順）に1ページ分取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    user_id: int
+        投稿ユーザーID
+    cursor: str | None
+        前ページのカーソル（他のユーザーの一覧のカーソルは不正とする）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    tuple[list[app.schemas.post_schema.Post], str | None]:
+        取得結果、次ページのカーソル（次ページがない場合はNone）
+    """
+    rows, next_cursor = await select_page(
+        db,
+        select(Post).where(Post.user_id == user_id, not_deleted(Post)),
+        [Post.post_id],
+        f"posts:{user_id}",
+        cursor,
+        limit,
+    )
+    return [post_schema.Post.model_validate(row) for row in rows], next_cursor
 
 
 async def check_connection(db: AsyncSession) -> None:
@@ -45,7 +287,7 @@ async def insert_authcode(db: AsyncSession, email: str, code: str) -> auth_schem
     return auth_schema.Authcode(**authcode.__dict__)
 
 
-async def select_authcode_by_id(db: AsyncSession, authcode_id: str) -> auth_schema.Authcode | None:
+async def select_authcode_by_id(db: AsyncSession, authcode_id: UUID) -> auth_schema.Authcode | None:
     """
     認証コードIDで認証コードを取得する。
 
@@ -53,7 +295,7 @@ async def select_authcode_by_id(db: AsyncSession, authcode_id: str) -> auth_sche
     ----------
     db: sqlalchemy.ext.asyncio.AsyncSession
         DB接続
-    authcode_id: str
+    authcode_id: uuid.UUID
         認証コードID
 
     Returns
@@ -61,7 +303,11 @@ async def select_authcode_by_id(db: AsyncSession, authcode_id: str) -> auth_sche
     Authcode | None
         取得結果
     """
-    result = (await db.scalars(select(Authcode).where(Authcode.authcode_id == authcode_id))).first()
+    result = (
+        await db.scalars(
+            select(Authcode).where(Authcode.authcode_id == authcode_id, not_deleted(Authcode))
+        )
+    ).first()
     return auth_schema.Authcode(**result.__dict__) if result is not None else None
 
 
@@ -81,7 +327,7 @@ async def select_user_by_email(db: AsyncSession, email: str) -> user_schema.User
     User | None
         取得結果
     """
-    result = (await db.scalars(select(User).where(User.email == email))).first()
+    result = (await db.scalars(select(User).where(User.email == email, not_deleted(User)))).first()
     return user_schema.User(**result.__dict__) if result else None
 
 
@@ -101,12 +347,19 @@ async def select_user_by_username(db: AsyncSession, username: str) -> user_schem
     User | None
         取得結果
     """
-    result = (await db.scalars(select(User).where(User.username == username))).first()
+    result = (
+        await db.scalars(select(User).where(User.username == username, not_deleted(User)))
+    ).first()
     return user_schema.User(**result.__dict__) if result else None
 
 
 async def insert_user(
-    db: AsyncSession, username: str, account_name: str, email: str, birthday: date
+    db: AsyncSession,
+    username: str,
+    account_name: str,
+    email: str,
+    birthday: date,
+    redis: Redis,
 ) -> user_schema.User:
     """
     ユーザーを登録する。
@@ -123,6 +376,8 @@ async def insert_user(
         メールアドレス
     birthday: datetime.date
         誕生日
+    redis: Redis
+        Redisクライアント（キャッシュ無効化に使用する）
 
     Returns
     -------
@@ -133,4 +388,663 @@ async def insert_user(
     db.add(user)
     await db.commit()
     await db.refresh(user)
-    return user_schema.User(**user.__dict__)
+    result = user_schema.User(**user.__dict__)
+    await run_user_write_hooks([result], redis)
+    return result
+
+
+async def update_user(
+    db: AsyncSession, user_id: int, redis: Redis, **values: Any
+) -> user_schema.User | None:
+    """
+    ユーザーを更新する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    user_id: int
+        ユーザーID
+    redis: Redis
+        Redisクライアント（キャッシュ無効化に使用する）
+    values: Any
+        更新する項目と値
+
+    Returns
+    -------
+    User | None
+        更新結果（対象ユーザーが存在しない場合はNone）
+    """
+    # 更新前の行をロックして取得し、更新前の値を1回のクエリで返却する
+    before = (
+        select(User.user_id, User.username, User.email)
+        .where(User.user_id == user_id, not_deleted(User))
+        .with_for_update()
+        .subquery()
+    )
+    row = (
+        await db.execute(
+            update(User)
+            .where(User.user_id == before.c.user_id)
+            .values(**values, update_datetime=datetime.now())
+            .returning(User, before.c.username, before.c.email)
+        )
+    ).first()
+    if row is None:
+        return None
+    updated, old_username, old_email = row
+    result = user_schema.User(**updated.__dict__)
+    await db.commit()
+    previous = result.model_copy(update={"username": old_username, "email": old_email})
+    await run_user_write_hooks([previous, result], redis)
+    return result
+
+
+async def soft_delete_user(db: AsyncSession, user_id: int, redis: Redis) -> bool:
+    """
+    ユーザーを認証情報・投稿と合わせて論理削除する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    user_id: int
+        ユーザーID
+    redis: Redis
+        Redisクライアント（キャッシュ無効化に使用する）
+
+    Returns
+    -------
+    bool:
+        True: 削除済み / False: 対象ユーザーなし
+    """
+    now = datetime.now()
+    deleted = (
+        await db.scalars(
+            update(User)
+            .where(User.user_id == user_id, not_deleted(User))
+            .values(delete_flag=Flag.ON.value, update_datetime=now)
+            .returning(User)
+        )
+    ).first()
+    if deleted is None:
+        return False
+    result = user_schema.User(**deleted.__dict__)
+    await db.execute(
+        update(UserCredential)
+        .where(UserCredential.user_id == user_id, not_deleted(UserCredential))
+        .values(delete_flag=Flag.ON.value, update_datetime=now)
+    )
+    await db.execute(
+        update(Post)
+        .where(Post.user_id == user_id, not_deleted(Post))
+        .values(delete_flag=Flag.ON.value, update_datetime=now)
+    )
+    await db.commit()
+    await run_user_write_hooks([result], redis)
+    return True
+
+
+async def archive_deleted_users(db: AsyncSession, threshold: datetime, batch_size: int) -> int:
+    """
+    論理削除済みユーザーを1バッチ分アーカイブテーブルへ移動する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    threshold: datetime.datetime
+        この日時より前に論理削除されたユーザーを対象とする
+    batch_size: int
+        1バッチで移動する最大件数
+
+    Returns
+    -------
+    int:
+        移動したユーザー件数
+    """
+    moved = (
+        await db.execute(
+            ARCHIVE_DELETED_USERS_QUERY, {"threshold": threshold, "batch_size": batch_size}
+        )
+    ).scalar_one()
+    await db.commit()
+    return moved
+
+
+async def insert_posts(
+    db: AsyncSession, posts: Sequence[post_schema.PostCreate]
+) -> list[post_schema.Post]:
+    """
+    投稿を1回の複数行INSERT（INSERT ... RETURNING）でまとめて登録する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    posts: Sequence[app.schemas.post_schema.PostCreate]
+        登録する投稿
+
+    Returns
+    -------
+    list[app.schemas.post_schema.Post]:
+        登録結果（引数と同じ順序）
+    """
+    if not posts:
+        return []
+    # RETURNINGの行順は保証されないため、採番済みの投稿IDで引数の順序に並べ直す
+    values = [{"post_id": generate_id(), **post.model_dump()} for post in posts]
+    rows = (await db.scalars(insert(Post).values(values).returning(Post))).all()
+    inserted = {row.post_id: post_schema.Post.model_validate(row) for row in rows}
+    await db.commit()
+    return [inserted[value["post_id"]] for value in values]
+
+
+async def select_post_by_id(db: AsyncSession, post_id: int) -> post_schema.Post | None:
+    """
+    投稿IDで投稿を取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    post_id: int
+        投稿ID
+
+    Returns
+    -------
+    Post | None
+        取得結果
+    """
+    result = (
+        await db.scalars(select(Post).where(Post.post_id == post_id, not_deleted(Post)))
+    ).first()
+    return post_schema.Post.model_validate(result) if result else None
+
+
+async def select_users_by_ids(db: AsyncSession, user_ids: Sequence[int]) -> list[user_schema.User]:
+    """
+    ユーザーIDのリストでユーザーを1回のクエリで取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    user_ids: Sequence[int]
+        ユーザーIDのリスト
+
+    Returns
+    -------
+    list[app.schemas.user_schema.User]:
+        取得結果（引数の順序、存在しないユーザーは除く）
+    """
+    if not user_ids:
+        return []
+    rows = (
+        await db.scalars(select(User).where(User.user_id.in_(user_ids), not_deleted(User)))
+    ).all()
+    users = {row.user_id: user_schema.User.model_validate(row) for row in rows}
+    return [users[user_id] for user_id in user_ids if user_id in users]
+
+
+async def select_usernames_batch(
+    db: AsyncSession, after: str | None, limit: int, updated_since: datetime | None = None
+) -> list[str]:
+    """
+    論理削除されていないユーザーのユーザー名をユーザー名順にバッチ単位で取得する（キーセットページング）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    after: str | None
+        このユーザー名より後のユーザー名を取得する（Noneの場合は先頭から）
+    limit: int
+        取得件数
+    updated_since: datetime | None
+        この日時以降に登録・更新したユーザーのみを対象とする（Noneの場合は全て）
+
+    Returns
+    -------
+    list[str]:
+        ユーザー名のリスト
+    """
+    stmt = select(User.username).where(not_deleted(User))
+    if after is not None:
+        stmt = stmt.where(User.username > after)
+    if updated_since is not None:
+        stmt = stmt.where(User.update_datetime >= updated_since)
+    return list((await db.scalars(stmt.order_by(User.username).limit(limit))).all())
+
+
+# エクスポートするユーザーの列
+EXPORT_USER_COLUMNS = (
+    User.user_id,
+    User.username,
+    User.account_name,
+    User.email,
+    User.birthday,
+    User.verified_flag,
+    User.account_lock_flag,
+    User.create_datetime,
+    User.update_datetime,
+)
+
+
+async def stream_users_for_export(
+    db: AsyncSession, batch_size: int
+) -> AsyncGenerator[Sequence[RowMapping]]:
+    """
+    論理削除されていないユーザーをユーザーID順にバッチ単位で取得する（サーバーサイドカーソル）。
+
+    全件をメモリに読み込まず、カーソルからバッチの件数ずつ取得するため、
+    メモリ使用量は件数によらずバッチの件数分となる。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    batch_size: int
+        1バッチの件数
+
+    Yields
+    ------
+    Sequence[sqlalchemy.RowMapping]:
+        ユーザー（EXPORT_USER_COLUMNSの列）のバッチ
+    """
+    result = await db.stream(
+        select(*EXPORT_USER_COLUMNS)
+        .where(not_deleted(User))
+        .order_by(User.user_id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for partition in result.mappings().partitions():
+        yield partition
+
+
+# 一括登録の一時テーブル（トランザクションの終了時に削除する）
+IMPORT_STAGING_TABLE = "import_users"
+# 初期ユーザー名に使用する文字
+USERNAME_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+# 初期ユーザー名が登録済みのユーザー名と重複した場合に生成し直す最大回数
+IMPORT_USERNAME_MAX_ATTEMPTS = 5
+# 登録したユーザーのフック（キャッシュ無効化等）を1回で実行する件数
+IMPORT_HOOK_BATCH_SIZE = 1000
+
+IMPORT_CREATE_STAGING_QUERY = text(
+    f"""
+    CREATE TEMP TABLE {IMPORT_STAGING_TABLE} (
+        line integer PRIMARY KEY,
+        user_id bigint NOT NULL,
+        account_name varchar(50) NOT NULL,
+        email varchar(255) NOT NULL,
+        birthday date NOT NULL,
+        username varchar(15),
+        status varchar(20)
+    ) ON COMMIT DROP
+    """
+)
+# 入力内で重複したメールアドレスは先の行のみ登録する
+IMPORT_MARK_DUPLICATES_QUERY = text(
+    f"""
+    UPDATE {IMPORT_STAGING_TABLE} AS i SET status = :status
+      FROM (
+          SELECT line, row_number() OVER (PARTITION BY email ORDER BY line) AS n
+            FROM {IMPORT_STAGING_TABLE}
+      ) AS d
+     WHERE d.line = i.line AND d.n > 1
+    """
+)
+IMPORT_MARK_EMAIL_CONFLICTS_QUERY = text(
+    f"""
+    UPDATE {IMPORT_STAGING_TABLE} AS i SET status = :status
+     WHERE i.status IS NULL
+       AND EXISTS (SELECT 1 FROM users AS u WHERE u.email = i.email AND u.delete_flag = false)
+    """
+)
+# 初期ユーザー名を生成する（行ごとに評価されるよう、副問い合わせで外側の行を参照する）
+IMPORT_ASSIGN_USERNAMES_QUERY = text(
+    f"""
+    UPDATE {IMPORT_STAGING_TABLE} AS i
+       SET username = (
+           SELECT string_agg(substr(:alphabet, 1 + floor(random() * :size)::int, 1), '')
+             FROM generate_series(1, :length + 0 * i.line)
+       )
+     WHERE i.status IS NULL AND i.username IS NULL
+    """
+)
+# 登録済み・入力内で重複した初期ユーザー名は生成し直す
+IMPORT_RESET_USERNAME_CONFLICTS_QUERY = text(
+    f"""
+    UPDATE {IMPORT_STAGING_TABLE} AS i SET username = NULL
+     WHERE i.status IS NULL
+       AND (
+           EXISTS (
+               SELECT 1 FROM users AS u WHERE u.username = i.username AND u.delete_flag = false
+           )
+           OR EXISTS (
+               SELECT 1 FROM {IMPORT_STAGING_TABLE} AS o
+                WHERE o.username = i.username AND o.line < i.line
+           )
+       )
+    """
+)
+# 確認後に他の登録と競合した行は登録せず、競合とする
+IMPORT_INSERT_USERS_QUERY = text(
+    f"""
+    WITH inserted AS (
+        INSERT INTO users (
+            user_id, username, account_name, email, birthday, verified_flag,
+            auth_failure_count, account_lock_flag, delete_flag, create_datetime, update_datetime
+        )
+        SELECT user_id, username, account_name, email, birthday, false,
+               0, false, false, :now, :now
+          FROM {IMPORT_STAGING_TABLE}
+         WHERE status IS NULL AND username IS NOT NULL
+         ORDER BY line
+        ON CONFLICT DO NOTHING
+        RETURNING user_id
+    )
+    UPDATE {IMPORT_STAGING_TABLE} AS i
+       SET status = CASE WHEN i.user_id IN (SELECT user_id FROM inserted)
+                         THEN :created ELSE :conflict END
+     WHERE i.status IS NULL
+    """
+)
+IMPORT_RESULTS_QUERY = text(
+    f"""
+    SELECT line, email, status,
+           CASE WHEN status = :created THEN user_id END AS user_id,
+           CASE WHEN status = :created THEN username END AS username
+      FROM {IMPORT_STAGING_TABLE}
+     ORDER BY line
+    """
+)
+
+
+async def import_users(
+    db: AsyncSession, users: Sequence[tuple[int, user_schema.TempUser]], redis: Redis
+) -> list[RowMapping]:
+    """
+    ユーザーを一括登録する（1トランザクション、行数によらず一定回数のクエリで行う）。
+
+    一時テーブルへCOPYで投入し、メールアドレスの重複確認・初期ユーザー名の生成を
+    SQLで一括して行った後、1回のINSERTで登録する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    users: Sequence[tuple[int, app.schemas.user_schema.TempUser]]
+        行番号と登録するユーザーのリスト
+    redis: Redis
+        Redisクライアント（キャッシュ無効化に使用する）
+
+    Returns
+    -------
+    list[sqlalchemy.RowMapping]:
+        行ごとの登録結果（line, email, status, user_id, username、行番号順）
+    """
+    if not users:
+        return []
+    await db.execute(IMPORT_CREATE_STAGING_QUERY)
+    connection = await db.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    await driver.copy_records_to_table(  # type: ignore[union-attr]
+        IMPORT_STAGING_TABLE,
+        records=[
+            (line, generate_id(), user.account_name, user.email, user.birthday)
+            for line, user in users
+        ],
+        columns=["line", "user_id", "account_name", "email", "birthday"],
+    )
+    await db.execute(IMPORT_MARK_DUPLICATES_QUERY, {"status": ImportStatus.DUPLICATE.value})
+    await db.execute(
+        IMPORT_MARK_EMAIL_CONFLICTS_QUERY, {"status": ImportStatus.EMAIL_CONFLICT.value}
+    )
+    for _ in range(IMPORT_USERNAME_MAX_ATTEMPTS):
+        await db.execute(
+            IMPORT_ASSIGN_USERNAMES_QUERY,
+            {
+                "alphabet": USERNAME_ALPHABET,
+                "size": len(USERNAME_ALPHABET),
+                "length": get_settings().USERNAME_MAX_LENGTH,
+            },
+        )
+        if not (await db.execute(IMPORT_RESET_USERNAME_CONFLICTS_QUERY)).rowcount:
+            break
+    statuses = {
+        "created": ImportStatus.CREATED.value,
+        "conflict": ImportStatus.CONFLICT.value,
+    }
+    await db.execute(IMPORT_INSERT_USERS_QUERY, {"now": datetime.now(), **statuses})
+    results = (await db.execute(IMPORT_RESULTS_QUERY, statuses)).mappings().all()
+    await db.commit()
+
+    created = [row["user_id"] for row in results if row["user_id"] is not None]
+    for i in range(0, len(created), IMPORT_HOOK_BATCH_SIZE):
+        await run_user_write_hooks(
+            await select_users_by_ids(db, created[i : i + IMPORT_HOOK_BATCH_SIZE]), redis
+        )
+    return list(results)
+
+
+# トライグラム（3文字）を抽出できる最小文字数（未満の場合は前方一致で検索する）
+TRIGRAM_MIN_LENGTH = 3
+# LIKEのエスケープ文字（standard_conforming_stringsの設定に依存しないよう"/"とする）
+LIKE_ESCAPE = "/"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+async def search_users(db: AsyncSession, query: str, limit: int) -> list[user_schema.User]:
+    """
+    ユーザー名・アカウント名でユーザーを検索する（大文字・小文字を区別しない）。
+
+    3文字以上の場合はトライグラムインデックスで部分一致検索し、
+    3文字未満の場合はユーザー名・アカウント名の前方一致インデックスで検索する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    query: str
+        検索文字列（小文字に正規化済みであること）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    list[app.schemas.user_schema.User]:
+        検索結果（ユーザー名の前方一致、アカウント名の前方一致、ユーザー名の短い順）
+    """
+    username = func.lower(User.username)
+    account_name = func.lower(User.account_name)
+    prefix = f"{_escape_like(query)}%"
+    if len(query) >= TRIGRAM_MIN_LENGTH:
+        # インデックスの式と一致させる（区切り文字はバインド変数ではなくリテラルとする）
+        searchable = User.username.concat(literal_column("' '")).concat(User.account_name)
+        condition = func.lower(searchable).like(f"%{_escape_like(query)}%", escape=LIKE_ESCAPE)
+    else:
+        condition = or_(
+            username.like(prefix, escape=LIKE_ESCAPE), account_name.like(prefix, escape=LIKE_ESCAPE)
+        )
+    rows = (
+        await db.scalars(
+            select(User)
+            .where(not_deleted(User), condition)
+            .order_by(
+                username.like(prefix, escape=LIKE_ESCAPE).desc(),
+                account_name.like(prefix, escape=LIKE_ESCAPE).desc(),
+                func.length(User.username),
+                User.username,
+            )
+            .limit(limit)
+        )
+    ).all()
+    return [user_schema.User.model_validate(row) for row in rows]
+
+
+async def insert_follow(db: AsyncSession, follower_id: int, followee_id: int) -> datetime:
+    """
+    フォローを登録する（登録済みの場合は何もしない）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    follower_id: int
+        フォローするユーザーID
+    followee_id: int
+        フォローされるユーザーID
+
+    Returns
+    -------
+    datetime.datetime:
+        フォロー日時（登録済みの場合は登録済みのフォロー日時）
+    """
+    followed_at = (
+        await db.scalars(
+            pg_insert(Follow)
+            .values(follower_id=follower_id, followee_id=followee_id)
+            .on_conflict_do_nothing()
+            .returning(Follow.create_datetime)
+        )
+    ).first()
+    if followed_at is None:
+        followed_at = (
+            await db.scalars(
+                select(Follow.create_datetime).where(
+                    Follow.follower_id == follower_id, Follow.followee_id == followee_id
+                )
+            )
+        ).one()
+    await db.commit()
+    return followed_at
+
+
+async def delete_follow(db: AsyncSession, follower_id: int, followee_id: int) -> bool:
+    """
+    フォローを削除する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    follower_id: int
+        フォローしているユーザーID
+    followee_id: int
+        フォローされているユーザーID
+
+    Returns
+    -------
+    bool:
+        True: 削除済み / False: フォローしていない
+    """
+    deleted = (
+        await db.scalars(
+            delete(Follow)
+            .where(Follow.follower_id == follower_id, Follow.followee_id == followee_id)
+            .returning(Follow.follower_id)
+        )
+    ).first()
+    await db.commit()
+    return deleted is not None
+
+
+async def select_follows_batch(
+    db: AsyncSession, after: tuple[int, int], limit: int
+) -> list[tuple[int, int, datetime]]:
+    """
+    フォローを主キー順に1バッチ分取得する（キーセットページング）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    after: tuple[int, int]
+        前バッチの最後の（フォローするユーザーID, フォローされるユーザーID）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    list[tuple[int, int, datetime.datetime]]:
+        （フォローするユーザーID, フォローされるユーザーID, フォロー日時）のリスト
+    """
+    rows = await db.execute(
+        select(Follow.follower_id, Follow.followee_id, Follow.create_datetime)
+        .where(tuple_(Follow.follower_id, Follow.followee_id) > after)
+        .order_by(Follow.follower_id, Follow.followee_id)
+        .limit(limit)
+    )
+    return [(row.follower_id, row.followee_id, row.create_datetime) for row in rows]
+
+
+async def select_posts_by_ids(db: AsyncSession, post_ids: Sequence[int]) -> list[post_schema.Post]:
+    """
+    投稿IDのリストで投稿を1回のクエリで取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    post_ids: Sequence[int]
+        投稿IDのリスト
+
+    Returns
+    -------
+    list[app.schemas.post_schema.Post]:
+        取得結果（引数の順序、存在しない投稿は除く）
+    """
+    if not post_ids:
+        return []
+    rows = (
+        await db.scalars(select(Post).where(Post.post_id.in_(post_ids), not_deleted(Post)))
+    ).all()
+    posts = {row.post_id: post_schema.Post.model_validate(row) for row in rows}
+    return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+
+async def update_post_counters(
+    db: AsyncSession, deltas: Sequence[tuple[int, int, int, int]]
+) -> int:
+    """
+    投稿のいいね・返信・再投稿数に増分を1回のUPDATE（UPDATE ... FROM (VALUES ...)）で加算する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    deltas: Sequence[tuple[int, int, int, int]]
+        （投稿ID, いいね数の増分, 返信数の増分, 再投稿数の増分）のリスト
+
+    Returns
+    -------
+    int:
+        更新した投稿数
+    """
+    if not deltas:
+        return 0
+    # 同時に実行された更新とデッドロックしないよう、投稿ID順に行ロックを取得する
+    v = values(
+        column("post_id", BigInteger),
+        column("like_delta", Integer),
+        column("reply_delta", Integer),
+        column("repost_delta", Integer),
+        name="v",
+    ).data(sorted(deltas))
+    result = await db.execute(
+        update(Post)
+        .where(Post.post_id == v.c.post_id)
+        .values(
+            like_count=Post.like_count + v.c.like_delta,
+            reply_count=Post.reply_count + v.c.reply_delta,
+            repost_count=Post.repost_count + v.c.repost_delta,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount  # pyright: ignore[reportAttributeAccessIssue]
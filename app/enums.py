@@ -5,12 +5,12 @@ class Flag(Enum):
     """
     フラグ
 
-    OFF: 0
-    ON: 1
+    OFF: False
+    ON: True
     """
 
-    OFF = "0"
-    ON = "1"
+    OFF = False
+    ON = True
 
 
 class HealthCheckStatus(Enum):
@@ -23,3 +23,99 @@ class HealthCheckStatus(Enum):
 
     HEALTHY = "Healthy"
     UNHEALTHY = "Unhealthy"
+
+
+class UserImageType(Enum):
+    """
+    ユーザー画像種別
+
+    PROFILE: プロフィール画像
+    HEADER: ヘッダー画像
+    """
+
+    PROFILE = "profile_image"
+    HEADER = "header_image"
+
+
+class TokenType(Enum):
+    """
+    トークン種別
+
+    ACCESS: アクセストークン
+    REFRESH: リフレッシュトークン
+    """
+
+    ACCESS = "access"
+    REFRESH = "refresh"
+
+
+class TrendWindow(Enum):
+    """
+    トレンドの集計期間
+
+    MINUTES_5: 直近5分
+    HOUR_1: 直近1時間
+    HOURS_24: 直近24時間
+    """
+
+    MINUTES_5 = "5m"
+    HOUR_1 = "1h"
+    HOURS_24 = "24h"
+
+
+class NotificationType(Enum):
+    """
+    通知種別
+
+    FOLLOW: フォローされた
+    MENTION: 投稿でメンションされた
+    LIKE: 投稿にいいねされた
+    """
+
+    FOLLOW = "follow"
+    MENTION = "mention"
+    LIKE = "like"
+
+
+class ExportFormat(Enum):
+    """
+    エクスポート形式
+
+    NDJSON: 改行区切りJSON
+    CSV: CSV
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportStatus(Enum):
+    """
+    ユーザーの一括登録結果
+
+    CREATED: 登録した
+    INVALID: 入力値が不正
+    DUPLICATE: 入力内でメールアドレスが重複（先の行のみ登録する）
+    EMAIL_CONFLICT: メールアドレスが登録済み
+    CONFLICT: 登録処理中に他の登録と競合した
+    """
+
+    CREATED = "created"
+    INVALID = "invalid"
+    DUPLICATE = "duplicate"
+    EMAIL_CONFLICT = "email_conflict"
+    CONFLICT = "conflict"
+
+
+class RequestPriority(Enum):
+    """
+    リクエストの優先度（過負荷時は優先度の低いリクエストから拒否する）
+
+    LOW: 低（管理API等、遅延を許容できる処理）
+    NORMAL: 通常
+    CRITICAL: 最優先（ヘルスチェック・トークン発行）
+    """
+
+    LOW = "low"
+    NORMAL = "normal"
+    CRITICAL = "critical"
@@ -1,10 +1,102 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
-from app.routes import auth, health_check, user
+from app import crud
+from app.core.cache import listen_invalidations
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.core.deadline import DeadlineMiddleware
+from app.core.id_generator import worker_id_lease
+from app.core.load_shedding import AdaptiveLimiter, LoadSheddingMiddleware
+from app.core.redis import get_redis_client
+from app.routes import (
+    admin,
+    auth,
+    health_check,
+    media,
+    notification,
+    post,
+    search,
+    timeline,
+    trend,
+    user,
+)
+from app.services import (
+    notification_service,
+    post_counter_service,
+    post_service,
+    trend_service,
+    user_service,
+)
+
+# ユーザー更新時にキャッシュを無効化し、ユーザー名をBloomフィルターに追加する
+crud.register_user_write_hook(user_service.invalidate_user_cache)
+crud.register_user_write_hook(user_service.add_to_username_filter)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    """
+    アプリケーションの起動・終了処理
+
+    起動時にID生成用のワーカーIDをリースし、終了時に解放する。
+    また、他プロセスからのキャッシュ無効化通知・ユーザーへの通知の購読、投稿カウンターのDBへの反映、
+    トレンドのスナップショットの更新、ユーザー名のBloomフィルターの再構築を行う。
+    """
+    redis = await get_redis_client()
+    background = [
+        asyncio.create_task(listen_invalidations(redis, user_service.user_caches)),
+        asyncio.create_task(notification_service.notification_hub.run(redis)),
+        asyncio.create_task(
+            post_counter_service.run_flusher(
+                async_session, redis, get_settings().POST_COUNTER_FLUSH_INTERVAL_SECONDS
+            )
+        ),
+        asyncio.create_task(
+            trend_service.run_refresher(redis, get_settings().TRENDS_REFRESH_INTERVAL_SECONDS)
+        ),
+        asyncio.create_task(
+            user_service.run_username_filter_rebuilder(
+                async_session, redis, get_settings().USERNAME_FILTER_REBUILD_INTERVAL_SECONDS
+            )
+        ),
+    ]
+    async with worker_id_lease(redis):
+        yield
+        # 未登録の投稿を登録してから終了する
+        await post_service.post_writer.drain()
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await redis.aclose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(DeadlineMiddleware, seconds=get_settings().REQUEST_DEADLINE_SECONDS)
+# 後に追加したミドルウェアが外側となるため、流量制限で拒否したリクエストは処理期限の対象外となる
+app.add_middleware(
+    LoadSheddingMiddleware,
+    limiter=AdaptiveLimiter(
+        initial_limit=get_settings().LOAD_SHEDDING_INITIAL_LIMIT,
+        min_limit=get_settings().LOAD_SHEDDING_MIN_LIMIT,
+        max_limit=get_settings().LOAD_SHEDDING_MAX_LIMIT,
+        target_latency=get_settings().LOAD_SHEDDING_TARGET_LATENCY_MS / 1000,
+    ),
+    retry_after=get_settings().LOAD_SHEDDING_RETRY_AFTER_SECONDS,
+)
+app.include_router(admin.router)
 app.include_router(auth.router)
 app.include_router(health_check.router)
+app.include_router(media.router)
+app.include_router(notification.router)
+app.include_router(post.router)
+app.include_router(search.router)
+app.include_router(timeline.router)
+app.include_router(trend.router)
 app.include_router(user.router)
 
 
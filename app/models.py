@@ -1,13 +1,30 @@
 import uuid
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, Sequence, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Index,
+    Integer,
+    String,
+    Uuid,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 
 from app.core.config import get_settings
 from app.core.database import Base
+from app.core.id_generator import generate_id, generate_uuid7
 from app.enums import Flag
 
+# 論理削除されていないレコードを対象とする部分インデックスの条件
+ACTIVE_RECORD_CONDITION = text("delete_flag = false")
+
 
 class BaseModelMixin:
     """
@@ -15,21 +32,19 @@ class BaseModelMixin:
     """
 
     @declared_attr
-    def delete_flag(cls) -> Mapped[str]:
-        return mapped_column(
-            String(1), default=Flag.OFF.value, nullable=False, comment="削除フラグ"
-        )
+    def delete_flag(cls) -> Mapped[bool]:
+        return mapped_column(Boolean, default=Flag.OFF.value, nullable=False, comment="削除フラグ")
 
     @declared_attr
     def create_datetime(cls) -> Mapped[datetime]:
-        return mapped_column(DateTime, default=datetime.now(), nullable=False, comment="作成日時")
+        return mapped_column(DateTime, default=datetime.now, nullable=False, comment="作成日時")
 
     @declared_attr
     def update_datetime(cls) -> Mapped[datetime]:
         return mapped_column(
             DateTime,
-            default=datetime.now(),
-            onupdate=datetime.now(),
+            default=datetime.now,
+            onupdate=datetime.now,
             nullable=False,
             comment="更新日時",
         )
@@ -41,10 +56,10 @@ class Authcode(Base, BaseModelMixin):
     """
 
     __tablename__ = "authcodes"
-    authcode_id: Mapped[str] = mapped_column(
-        String(36),
+    authcode_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=generate_uuid7,
         comment="認証コードID",
     )
     code: Mapped[str] = mapped_column(String(6), nullable=False, comment="コード")
@@ -63,35 +78,75 @@ class User(Base, BaseModelMixin):
     """
 
     __tablename__ = "users"
-    user_id_seq = Sequence("user_id_seq")
-    user_id: Mapped[str] = mapped_column(
+    __table_args__ = (
+        # 論理削除済みのレコードは一意制約の対象外とし、メールアドレス・ユーザー名を再利用可能にする
+        Index(
+            "uq_users_username_active",
+            "username",
+            unique=True,
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+        Index(
+            "uq_users_email_active", "email", unique=True, postgresql_where=ACTIVE_RECORD_CONDITION
+        ),
+        # アーカイブ対象（論理削除済み）のレコード抽出用
+        Index(
+            "ix_users_deleted_update_datetime",
+            "update_datetime",
+            postgresql_where=text("delete_flag = true"),
+        ),
+        # ユーザー検索（ユーザー名・アカウント名の部分一致）用のトライグラムインデックス
+        Index(
+            "ix_users_search_trgm",
+            text("lower(username || ' ' || account_name) gin_trgm_ops"),
+            postgresql_using="gin",
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+        # ユーザー検索（トライグラムを抽出できない短い前方一致）用
+        Index(
+            "ix_users_username_prefix",
+            text("lower(username) text_pattern_ops"),
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+        Index(
+            "ix_users_account_name_prefix",
+            text("lower(account_name) text_pattern_ops"),
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+        # ユーザー一覧（登録日時の新しい順）のキーセットページング用
+        Index(
+            "ix_users_create_datetime_user_id_active",
+            "create_datetime",
+            "user_id",
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+    )
+    user_id: Mapped[int] = mapped_column(
         BigInteger,
-        user_id_seq,
         primary_key=True,
-        server_default=user_id_seq.next_value(),
+        autoincrement=False,
+        default=generate_id,
         comment="ユーザーID",
     )
-    username: Mapped[str] = mapped_column(String(15), index=True, unique=True, comment="ユーザー名")
+    username: Mapped[str] = mapped_column(String(15), comment="ユーザー名")
     account_name: Mapped[str] = mapped_column(String(50), comment="アカウント名")
-    email: Mapped[str] = mapped_column(
-        String(255), unique=True, index=True, comment="メールアドレス"
-    )
+    email: Mapped[str] = mapped_column(String(255), comment="メールアドレス")
     birthday: Mapped[date] = mapped_column(Date, comment="生年月日")
     self_introduction: Mapped[str] = mapped_column(
         String(200), nullable=True, default=None, comment="自己紹介"
     )
     profile_image: Mapped[str] = mapped_column(
-        Text, nullable=True, default=None, comment="プロフィール画像"
+        String(64), nullable=True, default=None, comment="プロフィール画像（コンテンツハッシュ）"
     )
     header_image: Mapped[str] = mapped_column(
-        Text, nullable=True, default=None, comment="ヘッダー画像"
+        String(64), nullable=True, default=None, comment="ヘッダー画像（コンテンツハッシュ）"
     )
-    verified_flag: Mapped[str] = mapped_column(
-        String(1), default=Flag.OFF.value, nullable=False, comment="認証済みフラグ"
+    verified_flag: Mapped[bool] = mapped_column(
+        Boolean, default=Flag.OFF.value, nullable=False, comment="認証済みフラグ"
     )
     auth_failure_count: Mapped[int] = mapped_column(Integer, default=0, comment="認証失敗回数")
-    account_lock_flag: Mapped[str] = mapped_column(
-        String(1), default=Flag.OFF.value, comment="アカウントロックフラグ"
+    account_lock_flag: Mapped[bool] = mapped_column(
+        Boolean, default=Flag.OFF.value, comment="アカウントロックフラグ"
     )
 
     user_credentials = relationship("UserCredential", back_populates="user")
@@ -103,11 +158,109 @@ class UserCredential(Base, BaseModelMixin):
     """
 
     __tablename__ = "user_credentials"
-    user_id: Mapped[str] = mapped_column(
+    __table_args__ = (
+        Index(
+            "uq_user_credentials_identity_active",
+            "identity",
+            unique=True,
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+    )
+    user_id: Mapped[int] = mapped_column(
         ForeignKey("users.user_id"), primary_key=True, comment="ユーザーID"
     )
     identity_type: Mapped[str] = mapped_column(String(20), primary_key=True, comment="識別子種別")
-    identity: Mapped[str] = mapped_column(String(255), unique=True, comment="識別子")
+    identity: Mapped[str] = mapped_column(String(255), comment="識別子")
     hashed_password: Mapped[str] = mapped_column(String(255), comment="ハッシュ化済みパスワード")
 
     user = relationship("User", back_populates="user_credentials")
+
+
+class ArchivedRecord(Base):
+    """
+    アーカイブレコードモデル
+
+    論理削除から一定期間経過したレコードを退避する。
+    """
+
+    __tablename__ = "archived_records"
+    archive_id: Mapped[int] = mapped_column(
+        BigInteger, Identity(), primary_key=True, comment="アーカイブID"
+    )
+    table_name: Mapped[str] = mapped_column(String(63), comment="退避元テーブル名")
+    record_id: Mapped[int] = mapped_column(BigInteger, comment="退避元レコードID")
+    record: Mapped[dict[str, object]] = mapped_column(JSONB, comment="退避レコード")
+    archive_datetime: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("now()"), comment="アーカイブ日時"
+    )
+
+
+class Post(Base, BaseModelMixin):
+    """
+    投稿（つぶやき）モデル
+    """
+
+    __tablename__ = "posts"
+    __table_args__ = (
+        # ユーザーごとの投稿一覧（投稿ID = 投稿日時順）取得用
+        Index(
+            "ix_posts_user_id_post_id_active",
+            "user_id",
+            "post_id",
+            postgresql_where=ACTIVE_RECORD_CONDITION,
+        ),
+    )
+    post_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=False,
+        default=generate_id,
+        comment="投稿ID",
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id"), comment="投稿ユーザーID")
+    content: Mapped[str] = mapped_column(String(140), comment="本文")
+    reply_to_post_id: Mapped[int | None] = mapped_column(
+        ForeignKey("posts.post_id", ondelete="SET NULL"),
+        nullable=True,
+        default=None,
+        comment="返信先投稿ID",
+    )
+    repost_of_post_id: Mapped[int | None] = mapped_column(
+        ForeignKey("posts.post_id", ondelete="SET NULL"),
+        nullable=True,
+        default=None,
+        comment="再投稿元投稿ID",
+    )
+    # いいね・返信・再投稿数（Redisで集計した増分を定期的に反映する）
+    like_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), comment="いいね数"
+    )
+    reply_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), comment="返信数"
+    )
+    repost_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default=text("0"), comment="再投稿数"
+    )
+
+
+class Follow(Base):
+    """
+    フォローモデル
+
+    フォロー解除時は物理削除する（関係の有無のみを管理し、履歴は保持しない）。
+    """
+
+    __tablename__ = "follows"
+    __table_args__ = (
+        # フォロワー一覧（フォローされているユーザー起点）取得用
+        Index("ix_follows_followee_id_follower_id", "followee_id", "follower_id"),
+    )
+    follower_id: Mapped[int] = mapped_column(
+        ForeignKey("users.user_id"), primary_key=True, comment="フォローするユーザーID"
+    )
+    followee_id: Mapped[int] = mapped_column(
+        ForeignKey("users.user_id"), primary_key=True, comment="フォローされるユーザーID"
+    )
+    create_datetime: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False, comment="フォロー日時"
+    )
@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.core import pagination
+from app.core.config import get_settings
+from app.core.database import get_session, get_session_factory
+from app.core.deadline import route_deadline
+from app.core.redis import get_redis_client
+from app.core.security import is_valid_admin_key
+from app.enums import ExportFormat
+from app.schemas.import_schema import ResponseUserImport
+from app.schemas.page_schema import ResponsePage
+from app.schemas.user_schema import ResponseUserProfile
+from app.services import export_service, import_service
+
+
+async def require_admin(x_admin_key: str | None = Header(None)) -> None:
+    """
+    管理APIの認証キー（X-Admin-Keyヘッダー）を検証する（無効な場合は401）。
+    """
+    if not is_valid_admin_key(x_admin_key):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="認証に失敗しました。")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/users")
+async def list_users(
+    cursor: str | None = Query(None),
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_session),
+) -> ResponsePage[ResponseUserProfile]:
+    """
+    ユーザー一覧取得API（登録日時の新しい順、キーセットページング）
+    """
+    try:
+        users, next_cursor = await crud.select_users_page(db, cursor, limit)
+    except pagination.InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="カーソルが不正です。"
+        ) from e
+    return ResponsePage[ResponseUserProfile](
+        items=[ResponseUserProfile.model_validate(user) for user in users],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/users/export", response_class=StreamingResponse)
+async def export_users(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    gzip: bool = Query(False),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    ユーザーエクスポートAPI
+
+    論理削除されていないユーザーをユーザーID順にNDJSON・CSVで出力する。
+    全件をメモリに読み込まず、一定件数ずつ取得・変換して順次送信する。
+    gzipを指定した場合は、gzip圧縮したファイルとして出力する。
+    """
+    filename = f"users.{export_format.value}"
+    media_type = export_service.MEDIA_TYPES[export_format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_service.export_users(
+            session_factory, export_format, get_settings().EXPORT_BATCH_SIZE, gzip
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/users/import",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(route_deadline(get_settings().IMPORT_DEADLINE_SECONDS))],
+)
+async def import_users(
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseUserImport:
+    """
+    ユーザー一括登録API
+
+    リクエストボディのNDJSON（1行1ユーザー、ユーザー登録APIと同じ項目）を受信しながら検証し、
+    有効な行をまとめて登録する（認証コードによる確認は行わない）。
+    不正な行・メールアドレスが登録済みの行があっても他の行は登録し、行ごとの結果を返却する。
+    行数が上限を超えた場合は、いずれの行も登録せずに413を返却する。
+    """
+    try:
+        return await import_service.import_users(
+            db, redis, request.stream(), get_settings().IMPORT_MAX_ROWS
+        )
+    except import_service.ImportTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="行数が上限を超えています。",
+        ) from None
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Response, status
+from fastapi.responses import RedirectResponse
+from starlette.responses import FileResponse
+
+from app.core.config import get_settings
+from app.core.http_cache import is_not_modified
+from app.core.storage import BlobStore, get_blob_store
+from app.services.image_service import VARIANT_NAMES
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+# コンテンツハッシュで参照するため、内容は不変として長期キャッシュを許可する
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+async def _blob_response(
+    store: BlobStore, digest: str, variant: str | None, if_none_match: str | None
+) -> Response:
+    """
+    Blobを返却するレスポンスを生成する。
+
+    X-Accel-Redirect用パスが設定されている場合はリバースプロキシにファイル送信（sendfile）を委譲し、
+    設定されていない場合はFileResponseでRangeリクエストに対応しながら返却する。
+    """
+    etag = f'"{digest}"' if variant is None else f'"{digest}.{variant}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if is_not_modified(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = await store.media_type(digest, variant)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="ファイルが存在しません。"
+        )
+
+    path = store.path(digest, variant)
+    accel_prefix = get_settings().MEDIA_ACCEL_REDIRECT_PREFIX
+    if accel_prefix:
+        relative = path.relative_to(get_settings().STORAGE_ROOT).as_posix()
+        headers["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{relative}"
+        return Response(media_type=media_type, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@router.get("/{digest}")
+async def get_media(
+    digest: str = Path(..., pattern=r"^[0-9a-f]{64}$"),
+    if_none_match: str | None = Header(default=None),
+    store: BlobStore = Depends(get_blob_store),
+) -> Response:
+    """
+    メディア取得API
+
+    Rangeリクエスト（部分取得）に対応する。
+    """
+    return await _blob_response(store, digest, None, if_none_match)
+
+
+@router.get("/{digest}/{variant}")
+async def get_media_variant(
+    digest: str = Path(..., pattern=r"^[0-9a-f]{64}$"),
+    variant: str = Path(...),
+    if_none_match: str | None = Header(default=None),
+    store: BlobStore = Depends(get_blob_store),
+) -> Response:
+    """
+    派生画像（サムネイル）取得API
+
+    派生画像が未生成の場合は、キャッシュさせずに元画像へリダイレクトする。
+    """
+    if variant not in VARIANT_NAMES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="ファイルが存在しません。"
+        )
+    try:
+        return await _blob_response(store, digest, variant, if_none_match)
+    except HTTPException:
+        if await store.media_type(digest) is None:
+            raise
+    return RedirectResponse(
+        f"/media/{digest}",
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": "no-store"},
+    )
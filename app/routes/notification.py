@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.core.pubsub_hub import PubSubHub
+from app.schemas.user_schema import User
+from app.services import notification_service, token_service
+
+router = APIRouter(prefix="/notifications", tags=["notification"])
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_notifications(
+    user: User = Depends(token_service.get_current_user),
+    hub: PubSubHub = Depends(notification_service.get_notification_hub),
+) -> StreamingResponse:
+    """
+    通知受信API（Server-Sent Events）
+
+    フォロー・メンション・いいねの通知をnotificationイベントで送信する。
+    プロセスの接続数が上限に達している場合は503を返却する。
+    """
+    if hub.is_full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="接続数が上限に達しています。",
+            headers={"Retry-After": str(get_settings().NOTIFICATION_HEARTBEAT_SECONDS)},
+        )
+    return StreamingResponse(
+        notification_service.stream(
+            hub, user.user_id, get_settings().NOTIFICATION_HEARTBEAT_SECONDS
+        ),
+        media_type="text/event-stream",
+        # 中継サーバーでバッファリング・キャッシュしない
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.database import get_session
+from app.core.redis import get_redis_client
+from app.enums import NotificationType
+from app.schemas.post_schema import Post, PostCreate, RequestCreatePost, ResponsePost
+from app.schemas.user_schema import User
+from app.services import (
+    notification_service,
+    post_counter_service,
+    timeline_service,
+    token_service,
+    trend_service,
+)
+from app.services.post_counter_service import PostCounter
+from app.services.post_service import PostWriter, get_post_writer
+
+router = APIRouter(prefix="/posts", tags=["post"])
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_post(
+    req: RequestCreatePost,
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+    writer: PostWriter = Depends(get_post_writer),
+) -> ResponsePost:
+    """
+    投稿API
+
+    同時に受け付けた投稿は一括登録バッファで1回のINSERTにまとめて登録する。
+    フォロワーのホームタイムラインへの配信はワーカーで非同期に行う。
+    本文のハッシュタグはトレンドに集計し、メンションしたユーザーに通知する。
+    """
+    # 返信先・再投稿元の存在チェック
+    for target_id in (req.reply_to_post_id, req.repost_of_post_id):
+        if target_id is not None and await crud.select_post_by_id(db, target_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="投稿が存在しません。"
+            )
+
+    post = await writer.submit(PostCreate(user_id=user.user_id, **req.model_dump()))
+    await timeline_service.publish_post(redis, post)
+    await trend_service.record_post(redis, post)
+    await notification_service.notify_mentions(db, redis, post)
+    if post.reply_to_post_id is not None:
+        await post_counter_service.increment(redis, post.reply_to_post_id, PostCounter.REPLY)
+    if post.repost_of_post_id is not None:
+        await post_counter_service.increment(redis, post.repost_of_post_id, PostCounter.REPOST)
+    return ResponsePost.model_validate(post)
+
+
+@router.get("/{post_id}")
+async def get_post(
+    post_id: int = Path(..., gt=0),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponsePost:
+    """
+    投稿取得API
+
+    いいね・返信・再投稿数は、DBに未反映の増分を加算して返却する。
+    """
+    post = await crud.select_post_by_id(db, post_id)
+    if post is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="投稿が存在しません。")
+    (post,) = await post_counter_service.with_pending_counts(redis, [post])
+    return ResponsePost.model_validate(post)
+
+
+async def _get_post_or_404(db: AsyncSession, redis: Redis, post_id: int) -> Post:
+    """
+    投稿を取得する（キャッシュ経由、存在しない場合は404）。
+    """
+    posts = await timeline_service.get_posts(db, redis, [post_id])
+    if not posts:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="投稿が存在しません。")
+    return posts[0]
+
+
+@router.put("/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT)
+async def like_post(
+    post_id: int = Path(..., gt=0),
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> None:
+    """
+    いいねAPI（いいね済みの場合も成功とし、件数の加算・投稿者への通知は行わない）
+    """
+    post = await _get_post_or_404(db, redis, post_id)
+    if await post_counter_service.like(redis, post_id, user.user_id):
+        await notification_service.notify(
+            redis, post.user_id, NotificationType.LIKE, user.user_id, post_id
+        )
+
+
+@router.delete("/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT)
+async def unlike_post(
+    post_id: int = Path(..., gt=0),
+    user: User = Depends(token_service.get_current_user),
+    redis: Redis = Depends(get_redis_client),
+) -> None:
+    """
+    いいね取り消しAPI（いいねしていない場合も成功とする）
+    """
+    await post_counter_service.unlike(redis, post_id, user.user_id)
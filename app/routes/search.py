@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_session
+from app.core.redis import get_redis_client
+from app.schemas.search_schema import ResponseUserSearch
+from app.services import search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# 1ページの既定件数
+DEFAULT_PAGE_SIZE = 10
+
+
+@router.get("/users")
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=search_service.MAX_RESULTS),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseUserSearch:
+    """
+    ユーザー検索API（ユーザー名・アカウント名の入力補完）
+
+    ユーザー名の前方一致、アカウント名の前方一致、部分一致の順に返却する。
+    """
+    return ResponseUserSearch(
+        users=await search_service.search_users(db, redis, q, limit),
+    )
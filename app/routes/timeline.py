@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_session
+from app.core.redis import get_redis_client
+from app.schemas.post_schema import ResponsePost, ResponseTimeline
+from app.schemas.user_schema import User
+from app.services import post_counter_service, timeline_service, token_service
+
+router = APIRouter(prefix="/timeline", tags=["timeline"])
+
+# 1ページの既定件数、最大件数
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+@router.get("/home")
+async def get_home_timeline(
+    max_id: int | None = Query(None, gt=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseTimeline:
+    """
+    ホームタイムライン取得API（自分とフォロー中のユーザーの投稿を新しい順に取得する）
+    """
+    posts, next_max_id = await timeline_service.get_home_timeline(
+        db, redis, user.user_id, max_id, limit
+    )
+    posts = await post_counter_service.with_pending_counts(redis, posts)
+    return ResponseTimeline(
+        posts=[ResponsePost.model_validate(post) for post in posts], next_max_id=next_max_id
+    )
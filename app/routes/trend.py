@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from redis.asyncio.client import Redis
+
+from app.core.redis import get_redis_client
+from app.enums import TrendWindow
+from app.schemas.trend_schema import ResponseTrends
+from app.services import trend_service
+
+router = APIRouter(prefix="/trends", tags=["trend"])
+
+
+@router.get("")
+async def get_trends(
+    window: TrendWindow = Query(TrendWindow.HOUR_1),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseTrends:
+    """
+    トレンド取得API（集計期間内に多く投稿されたハッシュタグを取得する）
+
+    数秒ごとに更新するスナップショットを返却するため、直近の投稿は反映されていない場合がある。
+    """
+    snapshot = await trend_service.get_snapshot(redis, window)
+    if snapshot is None:
+        return ResponseTrends(window=window, trends=[])
+    return ResponseTrends(window=window, trends=snapshot.trends, as_of=snapshot.as_of)
@@ -1,22 +1,57 @@
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
+from app.core import pagination
 from app.core.config import get_settings
 from app.core.database import get_session
-from app.core.redis import generate_temp_user_key, get_redis_client
+from app.core.deadline import route_deadline
+from app.core.http_cache import generate_cache_control, generate_etag, is_not_modified
+from app.core.redis import (
+    generate_followers_key,
+    generate_following_key,
+    generate_temp_user_key,
+    get_redis_client,
+)
+from app.core.storage import BlobStore, get_blob_store
+from app.enums import NotificationType, UserImageType
 from app.schemas import token_schema
 from app.schemas.auth_schema import Authcode
+from app.schemas.page_schema import ResponsePage
+from app.schemas.post_schema import ResponsePost
 from app.schemas.user_schema import (
     RequestRegisterUser,
     RequestVerifyAuthcode,
+    ResponseFollowList,
     ResponseRegisterUser,
+    ResponseUploadUserImage,
+    ResponseUsernameAvailability,
+    ResponseUserProfile,
     TempUser,
+    User,
+)
+from app.services import (
+    auth_service,
+    follow_service,
+    image_service,
+    notification_service,
+    post_counter_service,
+    token_service,
+    user_service,
 )
-from app.services import auth_service, token_service, user_service
 
 router = APIRouter(prefix="/user", tags=["user"])
 
@@ -89,7 +124,259 @@ async def verify_authcode(
         account_name=temp_user.account_name,
         email=temp_user.email,
         birthday=temp_user.birthday,
+        redis=redis,
     )
 
     # JWTトークンを返却
     return await token_service.create_tokens(user, redis)
+
+
+async def _upload_user_image(
+    request: Request,
+    image_type: UserImageType,
+    user: User,
+    db: AsyncSession,
+    redis: Redis,
+    store: BlobStore,
+) -> ResponseUploadUserImage:
+    """
+    アップロードされた画像を保存し、ユーザーには画像ハッシュのみを登録する。
+
+    派生画像（サムネイル）は画像処理ワーカーで非同期に生成する。
+    """
+    blob = await image_service.save_uploaded_image(request, store)
+    updated = await crud.update_user(
+        db, user.user_id, redis=redis, **{image_type.value: blob.digest}
+    )
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが存在しません。"
+        )
+    await image_service.enqueue_variants_job(redis, blob.digest, image_type)
+    return ResponseUploadUserImage(
+        image=blob.digest,
+        url=f"/media/{blob.digest}",
+        variants={
+            name: f"/media/{blob.digest}/{name}"
+            for name in image_service.IMAGE_VARIANTS[image_type]
+        },
+    )
+
+
+@router.put(
+    "/me/profile-image",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(route_deadline(get_settings().IMAGE_UPLOAD_DEADLINE_SECONDS))],
+)
+async def upload_profile_image(
+    request: Request,
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+    store: BlobStore = Depends(get_blob_store),
+) -> ResponseUploadUserImage:
+    """
+    プロフィール画像アップロードAPI
+
+    multipart/form-dataの"file"パートを受信しながら保存する。
+    """
+    return await _upload_user_image(request, UserImageType.PROFILE, user, db, redis, store)
+
+
+@router.put(
+    "/me/header-image",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(route_deadline(get_settings().IMAGE_UPLOAD_DEADLINE_SECONDS))],
+)
+async def upload_header_image(
+    request: Request,
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+    store: BlobStore = Depends(get_blob_store),
+) -> ResponseUploadUserImage:
+    """
+    ヘッダー画像アップロードAPI
+
+    multipart/form-dataの"file"パートを受信しながら保存する。
+    """
+    return await _upload_user_image(request, UserImageType.HEADER, user, db, redis, store)
+
+
+# GET /{username} より前に定義する（"username-available"がユーザー名として解釈されないようにする）
+@router.get("/username-available")
+async def check_username_availability(
+    name: str = Query(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseUsernameAvailability:
+    """
+    ユーザー名使用可否確認API（入力中のユーザー名の確認用）
+
+    Bloomフィルターで未登録と判定できない場合のみDBを検索する。
+    """
+    return ResponseUsernameAvailability(
+        name=name, available=await user_service.is_username_available(db, redis, name)
+    )
+
+
+@router.get(
+    "/{username}",
+    response_model=ResponseUserProfile,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
+async def get_user_profile(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> Response:
+    """
+    ユーザープロフィール取得API
+
+    ユーザーID、更新日時から生成したETagが If-None-Match と一致する場合は、
+    レスポンスボディを生成せずに304を返却する。
+    """
+    user = await user_service.get_user_by_username(db, redis, username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが存在しません。"
+        )
+
+    headers = {
+        "ETag": generate_etag(user.user_id, user.update_datetime),
+        "Cache-Control": generate_cache_control(
+            max_age=get_settings().USER_PROFILE_MAX_AGE_SECONDS,
+            s_maxage=get_settings().USER_PROFILE_S_MAXAGE_SECONDS,
+            stale_while_revalidate=get_settings().USER_PROFILE_S_MAXAGE_SECONDS,
+        ),
+    }
+    if is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=ResponseUserProfile.model_validate(user).model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def _get_user_or_404(db: AsyncSession, redis: Redis, username: str) -> User:
+    """
+    ユーザー名でユーザーを取得する（存在しない場合は404）。
+    """
+    user = await user_service.get_user_by_username(db, redis, username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが存在しません。"
+        )
+    return user
+
+
+@router.post("/{username}/follow", status_code=status.HTTP_204_NO_CONTENT)
+async def follow_user(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> None:
+    """
+    フォローAPI（フォロー済みの場合も成功とする）
+    """
+    followee = await _get_user_or_404(db, redis, username)
+    if followee.user_id == user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="自分自身はフォローできません。"
+        )
+    if await follow_service.follow(db, redis, user.user_id, followee.user_id):
+        await notification_service.notify(
+            redis, followee.user_id, NotificationType.FOLLOW, user.user_id
+        )
+
+
+@router.delete("/{username}/follow", status_code=status.HTTP_204_NO_CONTENT)
+async def unfollow_user(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    user: User = Depends(token_service.get_current_user),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> None:
+    """
+    フォロー解除API（フォローしていない場合も成功とする）
+    """
+    followee = await _get_user_or_404(db, redis, username)
+    await follow_service.unfollow(db, redis, user.user_id, followee.user_id)
+
+
+async def _follow_list(
+    db: AsyncSession, redis: Redis, key: str, cursor: str | None, limit: int
+) -> ResponseFollowList:
+    """
+    フォロー一覧（Redisのソート済みセット）の1ページ分のユーザーを取得する。
+    """
+    try:
+        user_ids, next_cursor = await follow_service.list_page(redis, key, cursor, limit)
+    except follow_service.InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="カーソルが不正です。"
+        ) from e
+    users = await crud.select_users_by_ids(db, user_ids)
+    return ResponseFollowList(
+        users=[ResponseUserProfile.model_validate(u) for u in users],
+        count=await follow_service.count(redis, key),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{username}/followers")
+async def get_followers(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    cursor: str | None = Query(None),
+    limit: int = Query(follow_service.DEFAULT_PAGE_SIZE, ge=1, le=follow_service.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseFollowList:
+    """
+    フォロワー一覧取得API（フォロー日時の新しい順）
+    """
+    user = await _get_user_or_404(db, redis, username)
+    return await _follow_list(db, redis, generate_followers_key(user.user_id), cursor, limit)
+
+
+@router.get("/{username}/following")
+async def get_following(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    cursor: str | None = Query(None),
+    limit: int = Query(follow_service.DEFAULT_PAGE_SIZE, ge=1, le=follow_service.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponseFollowList:
+    """
+    フォロー中一覧取得API（フォロー日時の新しい順）
+    """
+    user = await _get_user_or_404(db, redis, username)
+    return await _follow_list(db, redis, generate_following_key(user.user_id), cursor, limit)
+
+
+@router.get("/{username}/posts")
+async def get_user_posts(
+    username: str = Path(..., min_length=1, max_length=get_settings().USERNAME_MAX_LENGTH),
+    cursor: str | None = Query(None),
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_session),
+    redis: Redis = Depends(get_redis_client),
+) -> ResponsePage[ResponsePost]:
+    """
+    ユーザーの投稿一覧取得API（新しい順、キーセットページング）
+    """
+    user = await _get_user_or_404(db, redis, username)
+    try:
+        posts, next_cursor = await crud.select_user_posts_page(db, user.user_id, cursor, limit)
+    except pagination.InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="カーソルが不正です。"
+        ) from e
+    posts = await post_counter_service.with_pending_counts(redis, posts)
+    return ResponsePage[ResponsePost](
+        items=[ResponsePost.model_validate(post) for post in posts], next_cursor=next_cursor
+    )
@@ -1,4 +1,5 @@
 from datetime import datetime
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -11,7 +12,7 @@ class Authcode(BaseModel):
 
     Attributes
     ----------
-    authcode_id: str
+    authcode_id: uuid.UUID
         認証コードID
     code: str
         認証コード
@@ -23,7 +24,7 @@ class Authcode(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    authcode_id: str
+    authcode_id: UUID
     code: str
     email: EmailStr
     expire_datetime: datetime
@@ -35,11 +36,11 @@ class AuthcodeRead(BaseModel):
 
     Attributes
     ----------
-    authcode_id: str
+    authcode_id: uuid.UUID
         認証コードID
     """
 
-    authcode_id: str = Field(...)
+    authcode_id: UUID = Field(...)
 
 
 class RequestIssueAuthcodeForEmail(BaseModel):
@@ -55,7 +56,7 @@ class ResponseIssueAuthcodeForEmail(BaseModel):
     メール認証コード発行レスポンス
     """
 
-    authcode_id: str = Field(..., min_length=36, max_length=36, title="認証コードID")
+    authcode_id: UUID = Field(..., title="認証コードID")
     expire_datetime: datetime = Field(..., title="有効期限")
 
 
@@ -65,13 +66,13 @@ class RequestVerifyAuthcode(BaseModel):
 
     Attributes
     ----------
-    authcode_id: str
+    authcode_id: uuid.UUID
         認証コードID
     code: str
         認証コード
     """
 
-    authcode_id: str = Field(..., min_length=36, max_length=36, title="認証コードID")
+    authcode_id: UUID = Field(..., title="認証コードID")
     code: str = Field(
         ...,
         min_length=get_settings().AUTHCODE_LENGTH,
@@ -1,6 +1,10 @@
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PlainSerializer
+
+# Snowflake ID（JavaScriptの安全な整数範囲2^53を超えるため、JSONでは文字列として出力する）
+SnowflakeId = Annotated[int, PlainSerializer(str, return_type=str, when_used="json")]
 
 
 class BaseSechemaMixin(BaseModel):
@@ -9,7 +13,7 @@ class BaseSechemaMixin(BaseModel):
 
     Attributes
     ----------
-    delete_flag: str
+    delete_flag: bool
         削除フラグ
     create_datetime: datetime.datetime
         作成日時
@@ -17,6 +21,6 @@ class BaseSechemaMixin(BaseModel):
         更新日時
     """
 
-    delete_flag: str | None = Field(..., title="削除フラグ")
+    delete_flag: bool | None = Field(..., title="削除フラグ")
     create_datetime: datetime | None = Field(..., title="作成日時")
     update_datetime: datetime | None = Field(..., title="更新日時")
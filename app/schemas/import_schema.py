@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+
+from app.enums import ImportStatus
+from app.schemas.base import SnowflakeId
+
+
+class ImportResult(BaseModel):
+    """
+    ユーザー一括登録の行ごとの結果スキーマ
+    """
+
+    line: int = Field(..., title="行番号（1始まり）")
+    email: str | None = Field(None, title="メールアドレス")
+    status: ImportStatus = Field(..., title="登録結果")
+    user_id: SnowflakeId | None = Field(None, title="ユーザーID（登録した場合のみ）")
+    username: str | None = Field(None, title="初期ユーザー名（登録した場合のみ）")
+    detail: str | None = Field(None, title="登録できなかった理由")
+
+
+class ResponseUserImport(BaseModel):
+    """
+    ユーザー一括登録レスポンススキーマ
+    """
+
+    created: int = Field(..., title="登録した件数")
+    failed: int = Field(..., title="登録できなかった件数")
+    results: list[ImportResult] = Field(..., title="行ごとの結果（行番号順）")
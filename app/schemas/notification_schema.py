@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.enums import NotificationType
+from app.schemas.base import SnowflakeId
+
+
+class Notification(BaseModel):
+    """
+    通知スキーマ（SSEのdataとして送信する）
+    """
+
+    type: NotificationType = Field(..., title="通知種別")
+    actor_id: SnowflakeId = Field(..., title="通知の契機となったユーザーID")
+    post_id: SnowflakeId | None = Field(None, title="対象の投稿ID")
+    create_datetime: datetime = Field(..., title="通知日時")
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field, computed_field
+
+
+class ResponsePage[T](BaseModel):
+    """
+    キーセットページングの一覧レスポンススキーマ
+
+    総件数は集計しない（次ページの有無はlimit + 1件の取得で判定する）。
+    """
+
+    items: list[T] = Field(..., title="一覧")
+    next_cursor: str | None = Field(None, title="次ページのカーソル")
+
+    @computed_field(title="次ページの有無")
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
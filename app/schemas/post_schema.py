@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.config import get_settings
+from app.schemas.base import SnowflakeId
+
+
+class PostCreate(BaseModel):
+    """
+    投稿登録スキーマ（一括登録バッファに渡す値）
+    """
+
+    user_id: int
+    content: str
+    reply_to_post_id: int | None = None
+    repost_of_post_id: int | None = None
+
+
+class Post(BaseModel):
+    """
+    投稿スキーマ
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    post_id: int
+    user_id: int
+    content: str
+    reply_to_post_id: int | None = None
+    repost_of_post_id: int | None = None
+    like_count: int = 0
+    reply_count: int = 0
+    repost_count: int = 0
+    create_datetime: datetime
+
+
+class RequestCreatePost(BaseModel):
+    """
+    投稿リクエストスキーマ
+
+    再投稿（repost_of_post_idを指定）の場合のみ本文を省略できる。
+    """
+
+    content: str = Field("", max_length=get_settings().POST_MAX_LENGTH, title="本文")
+    reply_to_post_id: SnowflakeId | None = Field(None, title="返信先投稿ID")
+    repost_of_post_id: SnowflakeId | None = Field(None, title="再投稿元投稿ID")
+
+    @model_validator(mode="after")
+    def require_content(self) -> Self:
+        if not self.content.strip() and self.repost_of_post_id is None:
+            raise ValueError("本文を入力してください。")
+        return self
+
+
+class ResponsePost(BaseModel):
+    """
+    投稿レスポンススキーマ
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    post_id: SnowflakeId = Field(..., title="投稿ID")
+    user_id: SnowflakeId = Field(..., title="投稿ユーザーID")
+    content: str = Field(..., title="本文")
+    reply_to_post_id: SnowflakeId | None = Field(None, title="返信先投稿ID")
+    repost_of_post_id: SnowflakeId | None = Field(None, title="再投稿元投稿ID")
+    like_count: int = Field(0, title="いいね数")
+    reply_count: int = Field(0, title="返信数")
+    repost_count: int = Field(0, title="再投稿数")
+    create_datetime: datetime = Field(..., title="投稿日時")
+
+
+class ResponseTimeline(BaseModel):
+    """
+    タイムラインレスポンススキーマ
+    """
+
+    posts: list[ResponsePost] = Field(..., title="投稿一覧（新しい順）")
+    next_max_id: SnowflakeId | None = Field(None, title="次ページ取得時に指定するmax_id")
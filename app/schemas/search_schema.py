@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.user_schema import ResponseUserProfile
+
+
+class ResponseUserSearch(BaseModel):
+    """
+    ユーザー検索レスポンススキーマ
+    """
+
+    users: list[ResponseUserProfile] = Field(..., title="検索結果")
@@ -12,6 +12,7 @@ class Payload(BaseModel):
     exp: int  # expiration time
     nbf: int  # not before
     iat: int  # issued at
+    typ: str  # token type (access / refresh)
 
 
 class Token(BaseModel):
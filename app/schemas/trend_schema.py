@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.enums import TrendWindow
+
+
+class Trend(BaseModel):
+    """
+    トレンドスキーマ
+    """
+
+    hashtag: str = Field(..., title="ハッシュタグ（#を除く）")
+    count: int = Field(..., title="推定投稿数")
+
+
+class TrendSnapshot(BaseModel):
+    """
+    トレンドのスナップショットスキーマ（定期的に集計してRedisに保存する値）
+    """
+
+    trends: list[Trend]
+    as_of: datetime
+
+
+class ResponseTrends(BaseModel):
+    """
+    トレンドレスポンススキーマ
+    """
+
+    window: TrendWindow = Field(..., title="集計期間")
+    trends: list[Trend] = Field(..., title="トレンド（推定投稿数の多い順）")
+    as_of: datetime | None = Field(None, title="集計日時（未集計の場合はNone）")
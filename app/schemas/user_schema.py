@@ -4,6 +4,7 @@ from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 from app.enums import Flag
 from app.schemas.auth_schema import RequestVerifyAuthcode, ResponseIssueAuthcodeForEmail
+from app.schemas.base import SnowflakeId
 
 
 class TempUser(BaseModel):
@@ -37,9 +38,10 @@ class User(BaseModel):
     self_introduction: str | None = None
     profile_image: str | None = None
     header_image: str | None = None
-    verified_flag: str | Flag
+    verified_flag: bool | Flag
     auth_failure_count: int
-    account_lock_flag: str | Flag
+    account_lock_flag: bool | Flag
+    update_datetime: datetime | None = None
 
     # JSONからのデシリアライズ（str->date）のため実装
     @field_validator("birthday")
@@ -48,6 +50,53 @@ class User(BaseModel):
         return value if isinstance(value, date) else datetime.strptime(value, "%Y%m%d")
 
 
+class ResponseUserProfile(BaseModel):
+    """
+    ユーザープロフィールレスポンススキーマ
+
+    公開可能な項目のみを返却する（メールアドレス、生年月日等は含めない）。
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: SnowflakeId = Field(..., title="ユーザーID")
+    username: str = Field(..., title="ユーザー名")
+    account_name: str = Field(..., title="アカウント名")
+    self_introduction: str | None = Field(None, title="自己紹介")
+    profile_image: str | None = Field(None, title="プロフィール画像")
+    header_image: str | None = Field(None, title="ヘッダー画像")
+    verified_flag: bool = Field(..., title="認証済みフラグ")
+
+
+class ResponseFollowList(BaseModel):
+    """
+    フォロワー・フォロー中一覧レスポンススキーマ
+    """
+
+    users: list[ResponseUserProfile] = Field(..., title="ユーザー一覧")
+    count: int = Field(..., title="総件数")
+    next_cursor: str | None = Field(None, title="次ページのカーソル")
+
+
+class ResponseUsernameAvailability(BaseModel):
+    """
+    ユーザー名使用可否レスポンススキーマ
+    """
+
+    name: str = Field(..., title="ユーザー名")
+    available: bool = Field(..., title="使用可否")
+
+
+class ResponseUploadUserImage(BaseModel):
+    """
+    ユーザー画像アップロードレスポンススキーマ
+    """
+
+    image: str = Field(..., title="画像ハッシュ")
+    url: str = Field(..., title="画像URL")
+    variants: dict[str, str] = Field(..., title="派生画像URL（種別名: URL）")
+
+
 class RequestRegisterUser(BaseModel):
     """
     ユーザー登録リクエストスキーマ
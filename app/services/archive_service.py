@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import get_settings
+
+
+async def archive_deleted_users(
+    db: AsyncSession,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    interval_seconds: float = 0.0,
+) -> int:
+    """
+    保持期間を過ぎた論理削除済みユーザーをアーカイブテーブルへ移動する。
+
+    1バッチごとにコミットし、ロック保持時間とWAL量を抑える。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    retention_days: int | None
+        論理削除後の保持日数（省略時は設定値）
+    batch_size: int | None
+        1バッチの件数（省略時は設定値）
+    interval_seconds: float
+        バッチ間の待機秒数
+
+    Returns
+    -------
+    int:
+        移動したユーザー件数
+
+    Raises
+    ------
+    ValueError:
+        保持日数が負、またはバッチ件数が1未満の場合
+    """
+    if retention_days is None:
+        retention_days = get_settings().ARCHIVE_RETENTION_DAYS
+    if batch_size is None:
+        batch_size = get_settings().ARCHIVE_BATCH_SIZE
+    if retention_days < 0 or batch_size < 1:
+        raise ValueError("retention_days must be >= 0 and batch_size must be >= 1.")
+    threshold = datetime.now() - timedelta(days=retention_days)
+
+    total = 0
+    while True:
+        moved = await crud.archive_deleted_users(db, threshold=threshold, batch_size=batch_size)
+        total += moved
+        if moved < batch_size:
+            return total
+        await asyncio.sleep(interval_seconds)
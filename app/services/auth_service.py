@@ -1,4 +1,5 @@
 from datetime import datetime
+from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -33,7 +34,7 @@ async def send_authcode_by_email(db: AsyncSession, email: str) -> auth_schema.Au
     return authcode
 
 
-async def verify_authcode(db: AsyncSession, authcode_id: str, code: str) -> auth_schema.Authcode:
+async def verify_authcode(db: AsyncSession, authcode_id: UUID, code: str) -> auth_schema.Authcode:
     """
     認証コードを検証する。
 
@@ -41,7 +42,7 @@ async def verify_authcode(db: AsyncSession, authcode_id: str, code: str) -> auth
     ----------
     db: AsyncSession
         DB接続
-    authcode_id: str
+    authcode_id: uuid.UUID
         認証コードID
     code: str
         認証コード
@@ -0,0 +1,135 @@
+"""
+ユーザーのエクスポート
+
+サーバーサイドカーソルでバッチ単位に取得したユーザーを、バッチごとにNDJSON・CSVへ変換して
+順次出力する。全件をメモリに読み込まないため、メモリ使用量は件数によらず一定となる。
+gzip圧縮する場合もバッチごとに圧縮して出力する。
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.enums import ExportFormat
+
+# エクスポートする項目（CSVのヘッダー）
+EXPORT_FIELDS = [column.key for column in crud.EXPORT_USER_COLUMNS]
+
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+
+
+def _export_value(value: Any) -> Any:
+    # ユーザーIDはAPIと同じく文字列とする（JavaScriptの安全な整数範囲を超えるため）
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows: Sequence[RowMapping]) -> str:
+    """
+    ユーザーのバッチをNDJSONに変換する。
+    """
+    return "".join(
+        json.dumps({key: _export_value(row[key]) for key in EXPORT_FIELDS}, ensure_ascii=False)
+        + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[RowMapping], header: bool) -> str:
+    """
+    ユーザーのバッチをCSVに変換する。
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_export_value(row[key]) for key in EXPORT_FIELDS] for row in rows)
+    return buffer.getvalue()
+
+
+async def encode_batches(
+    batches: AsyncIterable[Sequence[RowMapping]], export_format: ExportFormat
+) -> AsyncGenerator[bytes]:
+    """
+    ユーザーのバッチを順次エクスポート形式に変換する。
+
+    CSVの場合は、ユーザーが存在しない場合もヘッダーを出力する。
+
+    Parameters
+    ----------
+    batches: AsyncIterable[Sequence[sqlalchemy.RowMapping]]
+        ユーザーのバッチ
+    export_format: ExportFormat
+        エクスポート形式
+
+    Yields
+    ------
+    bytes:
+        バッチごとの出力（UTF-8）
+    """
+    header = export_format == ExportFormat.CSV
+    async for rows in batches:
+        if export_format == ExportFormat.CSV:
+            yield encode_csv(rows, header).encode()
+            header = False
+        else:
+            yield encode_ndjson(rows).encode()
+    if header:
+        yield encode_csv([], header=True).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes]:
+    """
+    出力を順次gzip圧縮する。
+
+    受信側が順次展開できるよう、チャンクごとに圧縮済みのデータを出力する（Z_SYNC_FLUSH）。
+    """
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH):
+            yield compressed
+    yield compressor.flush()
+
+
+async def export_users(
+    session_factory: async_sessionmaker[AsyncSession],
+    export_format: ExportFormat,
+    batch_size: int,
+    compress: bool,
+) -> AsyncGenerator[bytes]:
+    """
+    論理削除されていないユーザーをエクスポートする。
+
+    レスポンスの送信中もDBを参照するため、出力の生成中のみ使用するセッションを生成する。
+
+    Parameters
+    ----------
+    session_factory: async_sessionmaker[AsyncSession]
+        DBセッションの生成元
+    export_format: ExportFormat
+        エクスポート形式
+    batch_size: int
+        1回で取得・出力する件数
+    compress: bool
+        gzip圧縮するか
+
+    Yields
+    ------
+    bytes:
+        出力
+    """
+    async with session_factory() as db:
+        chunks = encode_batches(crud.stream_users_for_export(db, batch_size), export_format)
+        async for chunk in gzip_chunks(chunks) if compress else chunks:
+            yield chunk
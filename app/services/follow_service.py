@@ -0,0 +1,168 @@
+from datetime import datetime
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core import pagination
+from app.core.pagination import InvalidCursorError
+from app.core.redis import generate_followers_key, generate_following_key
+from app.services import timeline_service
+
+# 一覧取得の既定件数、最大件数
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# ページングカーソルの署名に含める一覧の種別
+FOLLOW_CURSOR_SCOPE = "follows"
+
+
+def follow_score(followed_at: datetime) -> int:
+    """
+    フォロー一覧（ソート済みセット）のスコア（フォロー日時のUNIXミリ秒）を取得する。
+    """
+    return int(followed_at.timestamp() * 1000)
+
+
+def encode_cursor(score: float, member: str) -> str:
+    """
+    ページングカーソル（最後に返却した要素のスコアとメンバー）を生成する。
+    """
+    return pagination.encode_cursor(FOLLOW_CURSOR_SCOPE, [int(score), member])
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """
+    ページングカーソルをスコアとメンバーに変換する。
+
+    Raises
+    ------
+    InvalidCursorError:
+        カーソルが不正な場合
+    """
+    score, member = pagination.decode_cursor(FOLLOW_CURSOR_SCOPE, cursor, [int, str])
+    if not isinstance(score, int) or not isinstance(member, str) or not member.isdigit():
+        raise InvalidCursorError(cursor)
+    return score, member
+
+
+async def follow(db: AsyncSession, redis: Redis, follower_id: int, followee_id: int) -> bool:
+    """
+    フォローを登録し、Redisのフォロー一覧に反映する（ライトスルー）。
+
+    フォロワー数に応じて、ホームタイムラインへの配信方法（配信・読み込み時に取得）も切り替える。
+
+    フォロー済みの場合もRedisに反映するため、Redisへの反映に失敗した場合は再実行で回復できる。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    follower_id: int
+        フォローするユーザーID
+    followee_id: int
+        フォローされるユーザーID
+
+    Returns
+    -------
+    bool:
+        True: 新たにフォローした / False: フォロー済み
+    """
+    score = follow_score(await crud.insert_follow(db, follower_id, followee_id))
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zadd(generate_followers_key(followee_id), {str(follower_id): score})
+        pipe.zadd(generate_following_key(follower_id), {str(followee_id): score})
+        pipe.zcard(generate_followers_key(followee_id))
+        added, _, follower_count = await pipe.execute()
+    await timeline_service.update_pull_account(redis, followee_id, follower_count)
+    return added == 1
+
+
+async def unfollow(db: AsyncSession, redis: Redis, follower_id: int, followee_id: int) -> None:
+    """
+    フォローを削除し、Redisのフォロー一覧・ホームタイムラインから削除する（ライトスルー）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    follower_id: int
+        フォローしているユーザーID
+    followee_id: int
+        フォローされているユーザーID
+    """
+    await crud.delete_follow(db, follower_id, followee_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zrem(generate_followers_key(followee_id), str(follower_id))
+        pipe.zrem(generate_following_key(follower_id), str(followee_id))
+        pipe.zcard(generate_followers_key(followee_id))
+        *_, follower_count = await pipe.execute()
+    await timeline_service.update_pull_account(redis, followee_id, follower_count)
+    await timeline_service.remove_user_posts(redis, follower_id, followee_id)
+
+
+async def count(redis: Redis, key: str) -> int:
+    """
+    フォロー一覧の件数を取得する（ソート済みセットの要素数のため、件数の集計は行わない）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    key: str
+        フォロー一覧のキー
+
+    Returns
+    -------
+    int:
+        件数
+    """
+    return await redis.zcard(key)
+
+
+async def list_page(
+    redis: Redis, key: str, cursor: str | None, limit: int
+) -> tuple[list[int], str | None]:
+    """
+    フォロー一覧をフォロー日時の新しい順に1ページ分取得する（キーセットページング）。
+
+    同一スコアの要素はメンバーの降順に並ぶため、カーソルと同一スコアの要素と
+    それより古い要素を1回の往復（パイプライン）で取得して結合する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    key: str
+        フォロー一覧のキー
+    cursor: str | None
+        前ページのカーソル（Noneの場合は先頭から取得する）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    tuple[list[int], str | None]:
+        ユーザーIDのリスト、次ページのカーソル（次ページがない場合はNone）
+
+    Raises
+    ------
+    InvalidCursorError:
+        カーソルが不正な場合
+    """
+    if cursor is None:
+        entries = await redis.zrevrangebyscore(key, "+inf", "-inf", 0, limit + 1, withscores=True)
+    else:
+        score, member = decode_cursor(cursor)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(key, score, score)
+            pipe.zrevrangebyscore(key, f"({score}", "-inf", 0, limit + 1, withscores=True)
+            ties, older = await pipe.execute()
+        entries = [(m, float(score)) for m in sorted(ties, reverse=True) if m < member] + older
+
+    page = entries[:limit]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(entries) > limit else None
+    return [int(member) for member, _ in page], next_cursor
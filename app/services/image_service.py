@@ -0,0 +1,218 @@
+import asyncio
+import io
+import json
+from concurrent.futures import Executor
+
+import anyio
+from fastapi import HTTPException, Request, status
+from PIL import Image, ImageOps
+from redis.asyncio.client import Redis
+
+from app.core.config import get_settings
+from app.core.multipart import MultipartError, iter_file_part
+from app.core.redis import generate_queue_key
+from app.core.storage import BlobInfo, BlobStore, BlobTooLargeError, UnsupportedMediaTypeError
+from app.enums import UserImageType
+
+# multipart/form-dataのヘッダー等、ファイル以外の部分として許容するサイズ
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+# 派生画像生成ジョブのキュー名
+IMAGE_QUEUE = "image_variants"
+
+# 画像種別ごとの派生画像（種別名, (幅, 高さ)）
+IMAGE_VARIANTS: dict[UserImageType, dict[str, tuple[int, int]]] = {
+    UserImageType.PROFILE: {"thumb": (96, 96), "medium": (400, 400)},
+    UserImageType.HEADER: {"small": (600, 200), "large": (1500, 500)},
+}
+# 派生画像の種別名一覧
+VARIANT_NAMES = frozenset(name for variants in IMAGE_VARIANTS.values() for name in variants)
+
+
+class ImageTooLargeError(Exception):
+    """
+    画素数上限超過エラー
+    """
+
+
+async def save_uploaded_image(
+    request: Request, store: BlobStore, field_name: str = "file"
+) -> BlobInfo:
+    """
+    multipart/form-dataでアップロードされた画像をBlobストアに保存する。
+
+    リクエストボディは受信したチャンク単位で解析・保存し、ファイル全体をメモリに保持しない。
+
+    Parameters
+    ----------
+    request: fastapi.Request
+        リクエスト
+    store: app.core.storage.BlobStore
+        保存先Blobストア
+    field_name: str
+        ファイルパートのフィールド名
+
+    Returns
+    -------
+    app.core.storage.BlobInfo:
+        保存した画像の情報
+
+    Raises
+    ------
+    HTTPException:
+        リクエスト形式が不正な場合（HTTPステータスコード：400）
+    HTTPException:
+        サイズ上限を超えた場合（HTTPステータスコード：413）
+    HTTPException:
+        未対応の画像形式の場合（HTTPステータスコード：415）
+    """
+    max_bytes = get_settings().IMAGE_MAX_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="ファイルサイズが上限を超えています。",
+    )
+    bad_request = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="リクエスト形式が不正です。"
+    )
+    # Content-Lengthで上限超過が明らかな場合は受信前に拒否する
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise bad_request
+        if int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise too_large
+
+    try:
+        chunks = iter_file_part(
+            request.headers.get("content-type", ""), request.stream(), field_name
+        )
+        return await store.save(chunks, max_bytes)
+    except MultipartError as e:
+        raise bad_request from e
+    except BlobTooLargeError as e:
+        raise too_large from e
+    except UnsupportedMediaTypeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="対応していない画像形式です。",
+        ) from e
+
+
+def _fit(image: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """
+    アスペクト比を保ったまま中央を切り抜き、指定サイズに縮小する。
+
+    縮小率が大きい場合は整数倍の縮小（reduce）を先に行い、リサンプリングのコストを抑える。
+    """
+    width, height = image.size
+    scale = max(size[0] / width, size[1] / height)
+    crop_width, crop_height = round(size[0] / scale), round(size[1] / scale)
+    left, top = (width - crop_width) // 2, (height - crop_height) // 2
+    return image.resize(
+        size,
+        Image.Resampling.LANCZOS,
+        box=(left, top, left + crop_width, top + crop_height),
+        reducing_gap=3.0,
+    )
+
+
+def render_variants(
+    data: bytes, sizes: dict[str, tuple[int, int]], quality: int, max_pixels: int
+) -> dict[str, bytes]:
+    """
+    画像をリサイズ・再エンコードし、派生画像を生成する。
+
+    CPU負荷の高い処理のため、イベントループ外（プロセスプール）で実行する。
+    EXIF等のメタデータは向きの補正にのみ使用し、出力には含めない。
+
+    Parameters
+    ----------
+    data: bytes
+        元画像
+    sizes: dict[str, tuple[int, int]]
+        派生画像の種別名と(幅, 高さ)
+    quality: int
+        WebPのエンコード品質
+    max_pixels: int
+        元画像の画素数上限
+
+    Returns
+    -------
+    dict[str, bytes]:
+        種別名をキーとした派生画像（WebP）
+
+    Raises
+    ------
+    ImageTooLargeError:
+        元画像の画素数が上限を超える場合
+    PIL.UnidentifiedImageError:
+        画像としてデコードできない場合
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        # 高圧縮の巨大画像でデコード時にメモリを使い果たさないよう、デコード前に画素数を確認する
+        if image.width * image.height > max_pixels:
+            raise ImageTooLargeError(f"image has {image.width}x{image.height} pixels.")
+        # JPEGは出力サイズに近い縮小率でデコードし、デコードコストを抑える
+        image.draft("RGB", (max(w for w, _ in sizes.values()), max(h for _, h in sizes.values())))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    variants: dict[str, bytes] = {}
+    for name, size in sizes.items():
+        resized = _fit(image, size)
+        buffer = io.BytesIO()
+        resized.save(buffer, format="WEBP", quality=quality, method=4)
+        variants[name] = buffer.getvalue()
+    return variants
+
+
+async def enqueue_variants_job(redis: Redis, digest: str, image_type: UserImageType) -> None:
+    """
+    派生画像生成ジョブをキューに登録する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    digest: str
+        元画像のコンテンツハッシュ
+    image_type: app.enums.UserImageType
+        画像種別
+    """
+    job = json.dumps({"digest": digest, "image_type": image_type.value})
+    await redis.rpush(generate_queue_key(IMAGE_QUEUE), job)  # pyright: ignore[reportUnknownMemberType]
+
+
+async def process_variants_job(store: BlobStore, executor: Executor, job: str) -> list[str]:
+    """
+    派生画像生成ジョブを実行し、生成した派生画像を元画像と同じ場所に保存する。
+
+    Parameters
+    ----------
+    store: app.core.storage.BlobStore
+        Blobストア
+    executor: concurrent.futures.Executor
+        画像処理を実行するExecutor（プロセスプール）
+    job: str
+        ジョブ（JSON）
+
+    Returns
+    -------
+    list[str]:
+        保存した派生画像の種別名
+    """
+    obj = json.loads(job)
+    digest: str = obj["digest"]
+    sizes = IMAGE_VARIANTS[UserImageType(obj["image_type"])]
+    data = await anyio.Path(store.path(digest)).read_bytes()
+    variants = await asyncio.get_running_loop().run_in_executor(
+        executor,
+        render_variants,
+        data,
+        sizes,
+        get_settings().IMAGE_VARIANT_QUALITY,
+        get_settings().IMAGE_MAX_PIXELS,
+    )
+    for name, variant in variants.items():
+        await store.save_variant(digest, name, variant)
+    return list(variants)
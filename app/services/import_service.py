@@ -0,0 +1,130 @@
+"""
+ユーザーの一括登録
+
+NDJSON（1行1ユーザー）で受信したユーザーを行ごとに検証し、有効な行をまとめて登録する。
+登録はCOPYで一時テーブルへ投入してSQLで一括処理するため、クエリ回数は行数によらず一定となる。
+"""
+
+from collections.abc import AsyncGenerator, AsyncIterable
+
+from pydantic import ValidationError
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.enums import ImportStatus
+from app.schemas import user_schema
+from app.schemas.import_schema import ImportResult, ResponseUserImport
+
+# 登録できなかった理由
+IMPORT_DETAILS = {
+    ImportStatus.DUPLICATE: "入力内でメールアドレスが重複しています。",
+    ImportStatus.EMAIL_CONFLICT: "メールアドレスは既に登録されています。",
+    ImportStatus.CONFLICT: "登録処理中に他の登録と競合しました。",
+}
+
+
+class ImportTooLargeError(Exception):
+    """
+    行数上限超過エラー
+    """
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes]:
+    """
+    受信したチャンクを行に分割する（改行を含まない、最終行は改行が無くてもよい）。
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def parse_user(line: bytes) -> user_schema.TempUser:
+    """
+    1行分のユーザーを検証する（ユーザー登録APIと同じ検証を行う）。
+
+    Raises
+    ------
+    pydantic.ValidationError:
+        入力値が不正な場合
+    """
+    user = user_schema.RequestRegisterUser.model_validate_json(line)
+    return user_schema.TempUser.model_validate(user.model_dump())
+
+
+def _format_errors(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error['loc']) or 'body'}: {error['msg']}"
+        for error in e.errors()
+    )
+
+
+async def import_users(
+    db: AsyncSession, redis: Redis, chunks: AsyncIterable[bytes], max_rows: int
+) -> ResponseUserImport:
+    """
+    NDJSONのユーザーを一括登録する。
+
+    不正な行・登録できなかった行があっても他の行は登録し、行ごとの結果を返却する。
+    空行は無視する（行番号には含める）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    chunks: AsyncIterable[bytes]
+        NDJSON（UTF-8）
+    max_rows: int
+        受け付ける最大行数（空行を除く）
+
+    Returns
+    -------
+    app.schemas.import_schema.ResponseUserImport:
+        登録結果
+
+    Raises
+    ------
+    ImportTooLargeError:
+        行数が上限を超えた場合（いずれの行も登録しない）
+    """
+    users: list[tuple[int, user_schema.TempUser]] = []
+    invalid: list[ImportResult] = []
+    rows = 0
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        rows += 1
+        if rows > max_rows:
+            raise ImportTooLargeError
+        try:
+            users.append((line_number, parse_user(line)))
+        except ValidationError as e:
+            invalid.append(
+                ImportResult(
+                    line=line_number, status=ImportStatus.INVALID, detail=_format_errors(e)
+                )
+            )
+
+    imported = [
+        ImportResult(
+            line=row["line"],
+            email=row["email"],
+            status=ImportStatus(row["status"]),
+            user_id=row["user_id"],
+            username=row["username"],
+            detail=IMPORT_DETAILS.get(ImportStatus(row["status"])),
+        )
+        for row in await crud.import_users(db, users, redis)
+    ]
+    results = sorted(imported + invalid, key=lambda result: result.line)
+    created = sum(result.status == ImportStatus.CREATED for result in results)
+    return ResponseUserImport(created=created, failed=len(results) - created, results=results)
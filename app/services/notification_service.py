@@ -0,0 +1,154 @@
+import json
+import re
+from collections.abc import AsyncGenerator
+from datetime import datetime
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.pubsub_hub import PubSubHub
+from app.core.redis import NOTIFICATION_CONTROL_CHANNEL, generate_notification_channel
+from app.enums import NotificationType
+from app.schemas import post_schema
+from app.schemas.notification_schema import Notification
+from app.services import user_service
+
+# 1投稿で通知するメンションの最大数
+MAX_MENTIONS_PER_POST = 10
+
+_MENTION_PATTERN = re.compile(rf"@(\w{{1,{get_settings().USERNAME_MAX_LENGTH}}})")
+
+# 通知の購読ハブ（プロセスで1つのRedis接続を全てのSSE接続で共有する）
+notification_hub = PubSubHub(
+    NOTIFICATION_CONTROL_CHANNEL,
+    max_subscribers=get_settings().NOTIFICATION_MAX_CONNECTIONS,
+    queue_size=get_settings().NOTIFICATION_QUEUE_SIZE,
+)
+
+
+def get_notification_hub() -> PubSubHub:
+    """
+    通知の購読ハブを取得する（テスト時に差し替えられるよう、依存性として注入する）。
+    """
+    return notification_hub
+
+
+async def notify(
+    redis: Redis,
+    user_id: int,
+    notification_type: NotificationType,
+    actor_id: int,
+    post_id: int | None = None,
+) -> None:
+    """
+    ユーザーに通知を送信する（自分自身の操作は通知しない）。
+
+    接続中のプロセスにのみ配信され、未接続の場合は破棄される。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    user_id: int
+        通知先のユーザーID
+    notification_type: NotificationType
+        通知種別
+    actor_id: int
+        通知の契機となったユーザーID
+    post_id: int | None
+        対象の投稿ID
+    """
+    if user_id == actor_id:
+        return
+    notification = Notification(
+        type=notification_type, actor_id=actor_id, post_id=post_id, create_datetime=datetime.now()
+    )
+    await redis.publish(  # pyright: ignore[reportUnknownMemberType]
+        generate_notification_channel(user_id), notification.model_dump_json()
+    )
+
+
+def extract_mentions(content: str) -> list[str]:
+    """
+    本文からメンションしたユーザー名を抽出する（重複を除く）。
+
+    Parameters
+    ----------
+    content: str
+        本文
+
+    Returns
+    -------
+    list[str]:
+        ユーザー名（@を除く、出現順、最大MAX_MENTIONS_PER_POST件）
+    """
+    return list(dict.fromkeys(_MENTION_PATTERN.findall(content)))[:MAX_MENTIONS_PER_POST]
+
+
+async def notify_mentions(db: AsyncSession, redis: Redis, post: post_schema.Post) -> int:
+    """
+    投稿でメンションしたユーザーに通知する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    post: app.schemas.post_schema.Post
+        登録した投稿
+
+    Returns
+    -------
+    int:
+        通知したユーザー数
+    """
+    notified = 0
+    for username in extract_mentions(post.content):
+        user = await user_service.get_user_by_username(db, redis, username)
+        if user is not None and user.user_id != post.user_id:
+            await notify(redis, user.user_id, NotificationType.MENTION, post.user_id, post.post_id)
+            notified += 1
+    return notified
+
+
+def format_event(event: str, data: str) -> str:
+    """
+    Server-Sent Eventsのイベントを生成する。
+    """
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def stream(hub: PubSubHub, user_id: int, heartbeat: float) -> AsyncGenerator[str]:
+    """
+    ユーザーへの通知をServer-Sent Eventsとして送信する（クライアントが切断するまで継続する）。
+
+    通知がない間は一定間隔でコメントを送信し、中継サーバーによる接続の切断を防ぐ。
+    受信が遅く通知を破棄した場合は、次の通知の前に破棄した件数をdroppedイベントで送信する。
+
+    Parameters
+    ----------
+    hub: PubSubHub
+        通知の購読ハブ
+    user_id: int
+        ユーザーID
+    heartbeat: float
+        コメントを送信する間隔（秒）
+
+    Yields
+    ------
+    str:
+        イベント
+    """
+    async with hub.subscribe(generate_notification_channel(user_id)) as subscription:
+        # 接続直後にバッファリングされずに応答が開始されるよう、コメントを送信する
+        yield ": connected\n\n"
+        while True:
+            message = await subscription.get(heartbeat)
+            if message is None:
+                yield ": heartbeat\n\n"
+                continue
+            if dropped := subscription.take_dropped():
+                yield format_event("dropped", json.dumps({"count": dropped}))
+            yield format_event("notification", message)
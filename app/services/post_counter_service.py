@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import random
+from collections.abc import Sequence
+from enum import Enum
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.core.config import get_settings
+from app.core.redis import (
+    POST_COUNTER_DIRTY_KEY,
+    generate_post_counter_key,
+    generate_post_likes_key,
+)
+from app.schemas import post_schema
+from app.services import timeline_service
+
+logger = logging.getLogger(__name__)
+
+
+class PostCounter(Enum):
+    """
+    投稿カウンター種別（値は投稿スキーマの項目名）
+
+    LIKE: いいね数
+    REPLY: 返信数
+    REPOST: 再投稿数
+    """
+
+    LIKE = "like_count"
+    REPLY = "reply_count"
+    REPOST = "repost_count"
+
+
+# いいね・いいね解除（ユーザーのセットへの追加・削除に成功した場合のみ、増分を加算する）
+_TOGGLE_LIKE_SCRIPT = """
+local changed
+if ARGV[3] == '1' then
+    changed = redis.call('sadd', KEYS[1], ARGV[1])
+else
+    changed = redis.call('srem', KEYS[1], ARGV[1])
+end
+if changed == 1 then
+    redis.call('hincrby', KEYS[2], ARGV[2], ARGV[3] == '1' and 1 or -1)
+    redis.call('sadd', KEYS[3], ARGV[4])
+end
+return changed
+"""
+
+
+def _counter_key(post_id: int) -> str:
+    """
+    増分を書き込むキーを取得する（シャードを無作為に選択する）。
+    """
+    return generate_post_counter_key(post_id, random.randrange(get_settings().POST_COUNTER_SHARDS))
+
+
+def _shard_keys(post_id: int) -> list[str]:
+    return [
+        generate_post_counter_key(post_id, shard)
+        for shard in range(get_settings().POST_COUNTER_SHARDS)
+    ]
+
+
+def _sum_shards(
+    post_ids: Sequence[int], shards: Sequence[dict[str, str]]
+) -> dict[int, dict[str, int]]:
+    """
+    投稿ごとに全シャードの増分を合計する（shardsは投稿ID順・シャード番号順に並んでいること）。
+    """
+    per_post = get_settings().POST_COUNTER_SHARDS
+    deltas: dict[int, dict[str, int]] = {}
+    for i, post_id in enumerate(post_ids):
+        merged: dict[str, int] = {}
+        for shard in shards[i * per_post : (i + 1) * per_post]:
+            for field, value in shard.items():
+                merged[field] = merged.get(field, 0) + int(value)
+        if merged:
+            deltas[post_id] = merged
+    return deltas
+
+
+async def like(redis: Redis, post_id: int, user_id: int) -> bool:
+    """
+    投稿にいいねする（いいね済みの場合は何もしない）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post_id: int
+        投稿ID
+    user_id: int
+        ユーザーID
+
+    Returns
+    -------
+    bool:
+        True: いいねした / False: いいね済み
+    """
+    return await _toggle_like(redis, post_id, user_id, True)
+
+
+async def unlike(redis: Redis, post_id: int, user_id: int) -> bool:
+    """
+    投稿のいいねを取り消す（いいねしていない場合は何もしない）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post_id: int
+        投稿ID
+    user_id: int
+        ユーザーID
+
+    Returns
+    -------
+    bool:
+        True: 取り消した / False: いいねしていない
+    """
+    return await _toggle_like(redis, post_id, user_id, False)
+
+
+async def _toggle_like(redis: Redis, post_id: int, user_id: int, liked: bool) -> bool:
+    changed = await redis.eval(  # pyright: ignore[reportUnknownMemberType]
+        _TOGGLE_LIKE_SCRIPT,
+        3,
+        generate_post_likes_key(post_id),
+        _counter_key(post_id),
+        POST_COUNTER_DIRTY_KEY,
+        str(user_id),
+        PostCounter.LIKE.value,
+        "1" if liked else "0",
+        str(post_id),
+    )
+    return changed == 1
+
+
+async def increment(redis: Redis, post_id: int, counter: PostCounter, amount: int = 1) -> None:
+    """
+    投稿カウンターに増分を加算する（DBへの反映は定期的にまとめて行う）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post_id: int
+        投稿ID
+    counter: PostCounter
+        カウンター種別
+    amount: int
+        増分
+    """
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hincrby(_counter_key(post_id), counter.value, amount)
+        pipe.sadd(POST_COUNTER_DIRTY_KEY, str(post_id))
+        await pipe.execute()
+
+
+async def get_pending_deltas(redis: Redis, post_ids: Sequence[int]) -> dict[int, dict[str, int]]:
+    """
+    DBに未反映の増分を取得する（全シャードを1回のパイプラインで取得する）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post_ids: Sequence[int]
+        投稿IDのリスト
+
+    Returns
+    -------
+    dict[int, dict[str, int]]:
+        投稿IDごとの（項目名: 増分）
+    """
+    if not post_ids:
+        return {}
+    async with redis.pipeline(transaction=False) as pipe:
+        for post_id in post_ids:
+            for key in _shard_keys(post_id):
+                pipe.hgetall(key)
+        shards = await pipe.execute()
+    return _sum_shards(post_ids, shards)
+
+
+async def with_pending_counts(
+    redis: Redis, posts: Sequence[post_schema.Post]
+) -> list[post_schema.Post]:
+    """
+    DBの値に未反映の増分を加算した投稿を取得する（反映待ちの間も最新の件数を表示する）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    posts: Sequence[app.schemas.post_schema.Post]
+        投稿
+
+    Returns
+    -------
+    list[app.schemas.post_schema.Post]:
+        未反映の増分を加算した投稿
+    """
+    deltas = await get_pending_deltas(redis, [post.post_id for post in posts])
+    return [
+        post.model_copy(
+            update={
+                field: max(getattr(post, field) + delta, 0)
+                for field, delta in deltas[post.post_id].items()
+            }
+        )
+        if post.post_id in deltas
+        else post
+        for post in posts
+    ]
+
+
+async def _claim_deltas(redis: Redis, post_ids: list[int]) -> list[tuple[int, int, int, int]]:
+    """
+    未反映の増分を取得してRedisから削除する（MULTIで取得・削除の間の加算を取りこぼさない）。
+    """
+    async with redis.pipeline(transaction=True) as pipe:
+        for post_id in post_ids:
+            for key in _shard_keys(post_id):
+                pipe.hgetall(key)
+                pipe.delete(key)
+        results = await pipe.execute()
+    deltas = _sum_shards(post_ids, results[::2])
+    return [
+        (post_id, *(deltas[post_id].get(counter.value, 0) for counter in PostCounter))
+        for post_id in post_ids
+        if any(deltas.get(post_id, {}).values())
+    ]
+
+
+async def _restore_deltas(redis: Redis, rows: list[tuple[int, int, int, int]]) -> None:
+    """
+    DBに反映できなかった増分をRedisに戻す。
+    """
+    async with redis.pipeline(transaction=True) as pipe:
+        for post_id, *amounts in rows:
+            key = generate_post_counter_key(post_id, 0)
+            for counter, amount in zip(PostCounter, amounts, strict=True):
+                if amount:
+                    pipe.hincrby(key, counter.value, amount)
+            pipe.sadd(POST_COUNTER_DIRTY_KEY, str(post_id))
+        await pipe.execute()
+
+
+async def flush(db: AsyncSession, redis: Redis, batch_size: int) -> int:
+    """
+    未反映の増分を1バッチ分DBに反映する。
+
+    複数プロセスで同時に実行しても、同じ増分を重複して反映しない。
+    DBへの反映に失敗した場合は増分をRedisに戻す。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    batch_size: int
+        1バッチで反映する最大投稿数
+
+    Returns
+    -------
+    int:
+        反映した投稿数
+    """
+    members = await redis.spop(POST_COUNTER_DIRTY_KEY, batch_size)  # pyright: ignore[reportUnknownMemberType]
+    if not members:
+        return 0
+    rows = await _claim_deltas(redis, [int(member) for member in members])
+    try:
+        await crud.update_post_counters(db, rows)
+    except Exception:
+        await db.rollback()
+        await _restore_deltas(redis, rows)
+        raise
+    # キャッシュ済みの投稿はDB反映前の件数を保持しているため削除する
+    if rows:
+        await redis.delete(*(timeline_service.generate_post_cache_key(row[0]) for row in rows))
+    return len(rows)
+
+
+async def run_flusher(
+    session_factory: async_sessionmaker[AsyncSession], redis: Redis, interval: float
+) -> None:
+    """
+    未反映の増分を一定間隔でDBに反映する（キャンセルされるまで実行する）。
+
+    Parameters
+    ----------
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[AsyncSession]
+        DBセッションの生成元
+    redis: Redis
+        Redisクライアント
+    interval: float
+        反映間隔（秒）
+    """
+    batch_size = get_settings().POST_COUNTER_FLUSH_BATCH_SIZE
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                # 1バッチに収まらない場合は続けて反映する
+                while await flush(db, redis, batch_size) >= batch_size:
+                    pass
+        except Exception:
+            # 反映できなかった増分は次回に反映する
+            logger.exception("投稿カウンターの反映に失敗しました。")
@@ -0,0 +1,50 @@
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.core.group_commit import GroupCommitBuffer
+from app.schemas import post_schema
+
+# 投稿の一括登録バッファ
+type PostWriter = GroupCommitBuffer[post_schema.PostCreate, post_schema.Post]
+
+
+def create_post_writer(session_factory: async_sessionmaker[AsyncSession]) -> PostWriter:
+    """
+    投稿の一括登録バッファを生成する。
+
+    複数リクエストの投稿を、リクエストのDBセッションとは別のセッションで1回のINSERTにまとめて登録する。
+
+    Parameters
+    ----------
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[AsyncSession]
+        一括登録に使用するDBセッションの生成元
+
+    Returns
+    -------
+    PostWriter:
+        投稿の一括登録バッファ
+    """
+
+    async def flush(posts: Sequence[post_schema.PostCreate]) -> list[post_schema.Post]:
+        async with session_factory() as db:
+            return await crud.insert_posts(db, posts)
+
+    return GroupCommitBuffer(
+        flush,
+        max_batch_size=get_settings().POST_BATCH_MAX_SIZE,
+        max_delay=get_settings().POST_BATCH_MAX_DELAY_MS / 1000,
+    )
+
+
+post_writer: PostWriter = create_post_writer(async_session)
+
+
+def get_post_writer() -> PostWriter:
+    """
+    投稿の一括登録バッファを取得する（プロセス内で共有する）。
+    """
+    return post_writer
@@ -0,0 +1,81 @@
+import unicodedata
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.cache import TwoTierCache
+from app.core.config import get_settings
+from app.schemas.search_schema import ResponseUserSearch
+from app.schemas.user_schema import ResponseUserProfile
+
+# 1回の検索で取得する最大件数
+MAX_RESULTS = 20
+
+# 短い検索文字列（前方一致）の検索結果のキャッシュ
+# 入力補完では同じ短い文字列の検索が集中し、かつDBでの絞り込みが効きにくいためキャッシュする
+# ユーザー情報の更新は有効期限まで反映されない
+user_search_cache = TwoTierCache(
+    "search:users",
+    ResponseUserSearch,
+    local_maxsize=get_settings().SEARCH_CACHE_LOCAL_MAXSIZE,
+    local_ttl=get_settings().SEARCH_CACHE_LOCAL_TTL_SECONDS,
+    ttl=get_settings().SEARCH_CACHE_TTL_SECONDS,
+    negative_ttl=get_settings().SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def normalize_query(query: str) -> str:
+    """
+    検索文字列を正規化する（全角英数字を半角に、大文字を小文字に変換し、前後の空白を除く）。
+
+    Parameters
+    ----------
+    query: str
+        検索文字列
+
+    Returns
+    -------
+    str:
+        正規化した検索文字列
+    """
+    return unicodedata.normalize("NFKC", query).strip().lower()
+
+
+async def search_users(
+    db: AsyncSession, redis: Redis, query: str, limit: int
+) -> list[ResponseUserProfile]:
+    """
+    ユーザー名・アカウント名でユーザーを検索する（入力補完用）。
+
+    SEARCH_PREFIX_CACHE_MAX_LENGTH文字以下の検索文字列は、最大件数分の検索結果をキャッシュから返却する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    query: str
+        検索文字列
+    limit: int
+        取得件数（MAX_RESULTS以下）
+
+    Returns
+    -------
+    list[app.schemas.user_schema.ResponseUserProfile]:
+        検索結果
+    """
+    query = normalize_query(query)
+    if not query:
+        return []
+    if len(query) > get_settings().SEARCH_PREFIX_CACHE_MAX_LENGTH:
+        users = await crud.search_users(db, query, limit)
+        return [ResponseUserProfile.model_validate(user) for user in users]
+
+    async def load() -> ResponseUserSearch:
+        users = await crud.search_users(db, query, MAX_RESULTS)
+        return ResponseUserSearch(users=[ResponseUserProfile.model_validate(u) for u in users])
+
+    result = await user_search_cache.get_or_load(redis, query, load)
+    return result.users[:limit] if result is not None else []
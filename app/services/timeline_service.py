@@ -0,0 +1,262 @@
+import heapq
+import json
+from collections.abc import Sequence
+
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import get_settings
+from app.core.redis import (
+    TIMELINE_PULL_ACCOUNTS_KEY,
+    generate_cache_key,
+    generate_followers_key,
+    generate_following_key,
+    generate_queue_key,
+    generate_timeline_key,
+    generate_user_posts_key,
+)
+from app.schemas import post_schema
+
+# ホームタイムライン配信ジョブのキュー名
+TIMELINE_QUEUE = "timeline_fanout"
+# 投稿キャッシュの名前空間
+POST_CACHE_NAMESPACE = "post"
+
+
+def generate_post_cache_key(post_id: int) -> str:
+    """
+    投稿キャッシュ用キーを生成する。
+    """
+    return generate_cache_key(POST_CACHE_NAMESPACE, str(post_id))
+
+
+async def publish_post(redis: Redis, post: post_schema.Post) -> None:
+    """
+    登録した投稿をキャッシュし、投稿者の最新投稿・ホームタイムラインに追加して、
+    フォロワーへの配信ジョブを登録する（1回のパイプラインで送信する）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post: app.schemas.post_schema.Post
+        登録した投稿
+    """
+    max_length = get_settings().TIMELINE_MAX_LENGTH
+    job = json.dumps({"post_id": post.post_id, "user_id": post.user_id})
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(
+            generate_post_cache_key(post.post_id),
+            post.model_dump_json(),
+            ex=get_settings().POST_CACHE_TTL_SECONDS,
+        )
+        for key in (generate_user_posts_key(post.user_id), generate_timeline_key(post.user_id)):
+            pipe.lpush(key, post.post_id)
+            pipe.ltrim(key, 0, max_length - 1)
+        pipe.rpush(generate_queue_key(TIMELINE_QUEUE), job)
+        await pipe.execute()
+
+
+async def fanout_post(redis: Redis, post_id: int, user_id: int) -> int:
+    """
+    投稿をフォロワーのホームタイムラインに配信する。
+
+    フォロワー数が閾値以上のユーザーの投稿は配信せず、タイムライン読み込み時に取得する。
+    フォロワーはバッチ単位で取得し、1バッチ分の書き込みを1回のパイプラインで送信する。
+    再試行により同じ投稿が重複して配信された場合は、読み込み時に除外する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post_id: int
+        投稿ID
+    user_id: int
+        投稿ユーザーID
+
+    Returns
+    -------
+    int:
+        配信したフォロワー数
+    """
+    if await redis.zscore(TIMELINE_PULL_ACCOUNTS_KEY, str(user_id)) is not None:
+        return 0
+    max_length = get_settings().TIMELINE_MAX_LENGTH
+    batch_size = get_settings().TIMELINE_FANOUT_BATCH_SIZE
+    key = generate_followers_key(user_id)
+    delivered = 0
+    start = 0
+    while followers := await redis.zrange(key, start, start + batch_size - 1):
+        async with redis.pipeline(transaction=False) as pipe:
+            for follower_id in followers:
+                timeline = generate_timeline_key(int(follower_id))
+                pipe.lpush(timeline, post_id)
+                pipe.ltrim(timeline, 0, max_length - 1)
+            await pipe.execute()
+        delivered += len(followers)
+        start += batch_size
+    return delivered
+
+
+async def update_pull_account(redis: Redis, user_id: int, follower_count: int) -> None:
+    """
+    フォロワー数に応じて、投稿を配信するか読み込み時に取得するかを切り替える。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    user_id: int
+        ユーザーID
+    follower_count: int
+        フォロワー数
+    """
+    if follower_count >= get_settings().TIMELINE_FANOUT_THRESHOLD:
+        await redis.zadd(TIMELINE_PULL_ACCOUNTS_KEY, {str(user_id): follower_count})
+    else:
+        await redis.zrem(TIMELINE_PULL_ACCOUNTS_KEY, str(user_id))
+
+
+async def remove_user_posts(redis: Redis, user_id: int, author_id: int) -> None:
+    """
+    フォロー解除したユーザーの投稿をホームタイムラインから削除する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    user_id: int
+        ホームタイムラインのユーザーID
+    author_id: int
+        フォロー解除したユーザーID
+    """
+    post_ids = await redis.lrange(generate_user_posts_key(author_id), 0, -1)  # pyright: ignore[reportUnknownMemberType]
+    if not post_ids:
+        return
+    timeline = generate_timeline_key(user_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        for post_id in post_ids:
+            pipe.lrem(timeline, 0, post_id)
+        await pipe.execute()
+
+
+def merge_post_ids(sources: Sequence[Sequence[str]], max_id: int | None, limit: int) -> list[int]:
+    """
+    複数の投稿IDのリストを投稿IDの降順（投稿日時の新しい順）にk-wayマージする。
+
+    Parameters
+    ----------
+    sources: Sequence[Sequence[str]]
+        投稿IDのリスト
+    max_id: int | None
+        この投稿IDより古い投稿のみを対象とする（Noneの場合は全て）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    list[int]:
+        重複を除いた投稿IDのリスト
+    """
+    # 配信の遅延・再試行により順序が前後する場合があるため、各リストを整列してからマージする
+    merged = heapq.merge(
+        *(sorted((int(post_id) for post_id in source), reverse=True) for source in sources),
+        reverse=True,
+    )
+    seen: set[int] = set()
+    result: list[int] = []
+    for post_id in merged:
+        if post_id in seen or (max_id is not None and post_id >= max_id):
+            continue
+        seen.add(post_id)
+        result.append(post_id)
+        if len(result) >= limit:
+            break
+    return result
+
+
+async def get_posts(db: AsyncSession, redis: Redis, post_ids: list[int]) -> list[post_schema.Post]:
+    """
+    投稿をキャッシュから1回のMGETで取得し、キャッシュにない投稿のみDBから1回のクエリで取得する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    post_ids: list[int]
+        投稿IDのリスト
+
+    Returns
+    -------
+    list[app.schemas.post_schema.Post]:
+        投稿（引数の順序、削除済みの投稿は除く）
+    """
+    if not post_ids:
+        return []
+    cached = await redis.mget([generate_post_cache_key(post_id) for post_id in post_ids])
+    posts = {
+        post_id: post_schema.Post.model_validate_json(data)
+        for post_id, data in zip(post_ids, cached, strict=True)
+        if data is not None
+    }
+    missing = [post_id for post_id in post_ids if post_id not in posts]
+    if missing:
+        loaded = await crud.select_posts_by_ids(db, missing)
+        async with redis.pipeline(transaction=False) as pipe:
+            for post in loaded:
+                posts[post.post_id] = post
+                pipe.set(
+                    generate_post_cache_key(post.post_id),
+                    post.model_dump_json(),
+                    ex=get_settings().POST_CACHE_TTL_SECONDS,
+                )
+            await pipe.execute()
+    return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+
+async def get_home_timeline(
+    db: AsyncSession, redis: Redis, user_id: int, max_id: int | None, limit: int
+) -> tuple[list[post_schema.Post], int | None]:
+    """
+    ホームタイムラインを取得する。
+
+    配信済みのホームタイムラインと、フォロー中の配信対象外（フォロワー数が閾値以上）のユーザーの
+    最新投稿をマージする。フォロー数に関わらず、Redisへの往復回数は最大3回となる。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    user_id: int
+        ユーザーID
+    max_id: int | None
+        この投稿IDより古い投稿を取得する（Noneの場合は最新から取得する）
+    limit: int
+        取得件数
+
+    Returns
+    -------
+    tuple[list[app.schemas.post_schema.Post], int | None]:
+        投稿のリスト、次ページのmax_id（次ページがない場合はNone）
+    """
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.lrange(generate_timeline_key(user_id), 0, -1)
+        pipe.zinter([generate_following_key(user_id), TIMELINE_PULL_ACCOUNTS_KEY])
+        timeline, pull_accounts = await pipe.execute()
+
+    sources: list[Sequence[str]] = [timeline]
+    if pull_accounts:
+        async with redis.pipeline(transaction=False) as pipe:
+            for author_id in pull_accounts:
+                pipe.lrange(generate_user_posts_key(int(author_id)), 0, -1)
+            sources.extend(await pipe.execute())
+
+    post_ids = merge_post_ids(sources, max_id, limit + 1)
+    posts = await get_posts(db, redis, post_ids[:limit])
+    next_max_id = post_ids[limit - 1] if len(post_ids) > limit else None
+    return posts, next_max_id
@@ -1,18 +1,25 @@
 import uuid
 from datetime import datetime, timedelta
 
-from jose import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from pydantic import ValidationError
 from redis.asyncio.client import Redis
 
 from app.core.config import get_settings
-from app.core.redis import generate_jwt_token_key
+from app.core.redis import generate_jwt_token_key, get_redis_client
+from app.enums import TokenType
 from app.schemas import token_schema, user_schema
 
+bearer_scheme = HTTPBearer(auto_error=False)
+
 
 async def create_token(
     user: user_schema.User,
     expires_delta: timedelta,
     redis: Redis,
+    token_type: TokenType,
 ) -> str:
     """
     JWTを作成する。
@@ -23,6 +30,8 @@ async def create_token(
         ユーザー
     expires_delta: timedelta
         有効期間（分）
+    token_type: app.enums.TokenType
+        トークン種別
 
     Returns
     -------
@@ -38,6 +47,7 @@ async def create_token(
         exp=int(datetime.timestamp(datetime.now() + expires_delta)),
         nbf=int(datetime.timestamp(datetime.now())),
         iat=int(datetime.timestamp(datetime.now())),
+        typ=token_type.value,
     )
     token = jwt.encode(
         payload.model_dump(), get_settings().SECRET_KEY, algorithm=get_settings().ALGORITHM
@@ -64,7 +74,9 @@ async def create_access_token(user: user_schema.User, redis: Redis) -> str:
         アクセストークン
     """
     access_token_expire = timedelta(minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
-    return await create_token(user=user, expires_delta=access_token_expire, redis=redis)
+    return await create_token(
+        user=user, expires_delta=access_token_expire, redis=redis, token_type=TokenType.ACCESS
+    )
 
 
 async def create_refresh_token(user: user_schema.User, redis: Redis) -> str:
@@ -82,7 +94,9 @@ async def create_refresh_token(user: user_schema.User, redis: Redis) -> str:
         リフレッシュトークン
     """
     refresh_token_expire = timedelta(minutes=get_settings().REFRESH_TOKEN_EXPIRE_MINUTES)
-    return await create_token(user=user, expires_delta=refresh_token_expire, redis=redis)
+    return await create_token(
+        user=user, expires_delta=refresh_token_expire, redis=redis, token_type=TokenType.REFRESH
+    )
 
 
 async def create_tokens(user: user_schema.User, redis: Redis) -> token_schema.Token:
@@ -106,3 +120,58 @@ async def create_tokens(user: user_schema.User, redis: Redis) -> token_schema.To
         refresh_token=refresh_token,
         token_type="bearer",
     )
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    redis: Redis = Depends(get_redis_client),
+) -> user_schema.User:
+    """
+    Authorizationヘッダーのアクセストークンを検証し、認証済みユーザーを取得する。
+
+    リフレッシュトークンは認証に使用できない。
+
+    Parameters
+    ----------
+    credentials: HTTPAuthorizationCredentials | None
+        Bearerトークン
+    redis: Redis
+        Redisクライアント
+
+    Returns
+    -------
+    app.schemas.user_schema.User:
+        認証済みユーザー
+
+    Raises
+    ------
+    HTTPException:
+        トークンが存在しない、不正、アクセストークンでない、または失効している場合
+        （HTTPステータスコード：401）
+    """
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="認証に失敗しました。",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if credentials is None:
+        raise unauthorized
+    try:
+        payload = token_schema.Payload(
+            **jwt.decode(
+                credentials.credentials,
+                get_settings().SECRET_KEY,
+                algorithms=[get_settings().ALGORITHM],
+                issuer=get_settings().BASE_URL,
+            )
+        )
+    except (JWTError, ValidationError) as e:
+        raise unauthorized from e
+    if payload.typ != TokenType.ACCESS.value:
+        raise unauthorized
+
+    # キャッシュに存在しないトークンは失効済みとする
+    data = await redis.get(generate_jwt_token_key(payload.jti))
+    if data is None:
+        raise unauthorized
+    return user_schema.User.model_validate_json(data)
@@ -0,0 +1,299 @@
+"""
+トレンド（ハッシュタグ）の集計
+
+投稿登録時にハッシュタグを抽出し、集計期間ごとに時間区間単位のCount-Min Sketchと
+上位K件のソート済みセットへ加算する。全プロセスが同じRedisのキーへ加算するため、
+プロセスをまたいだ集計結果のマージは不要となる。
+メモリ使用量はハッシュタグの種類数によらず、（列数×行数＋K）×区間数で一定となる。
+
+トレンドの取得はGROUP BYで都度集計せず、定期的に更新するスナップショットから返却する。
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime
+
+from redis.asyncio.client import Redis
+
+from app.core.config import get_settings
+from app.core.redis import (
+    TRENDS_REFRESH_LOCK_KEY,
+    generate_trend_sketch_key,
+    generate_trend_snapshot_key,
+    generate_trend_top_key,
+)
+from app.enums import TrendWindow
+from app.schemas import post_schema, trend_schema
+
+logger = logging.getLogger(__name__)
+
+# 集計期間ごとの（時間区間の秒数, 区間数）
+# 最新の区間から区間数分を合算して集計期間のトレンドとする（古い区間はキーの有効期限で削除する）
+WINDOW_BUCKETS: dict[TrendWindow, tuple[int, int]] = {
+    TrendWindow.MINUTES_5: (60, 5),
+    TrendWindow.HOUR_1: (300, 12),
+    TrendWindow.HOURS_24: (3600, 24),
+}
+# 1投稿から集計するハッシュタグの最大数
+MAX_HASHTAGS_PER_POST = 10
+
+_HASHTAG_PATTERN = re.compile(r"#(\w{1,100})")
+
+# ハッシュタグの出現回数を集計期間ごとのCount-Min Sketchに加算し、推定出現回数で上位K件を更新する
+# KEYS: 集計期間ごとの（Count-Min Sketch, 上位ハッシュタグ）
+# ARGV: K, 行数, 集計期間ごとのキーの有効秒数, ハッシュタグごとの（ハッシュタグ, 行数分のセル）
+_RECORD_SCRIPT = """
+local k = tonumber(ARGV[1])
+local depth = tonumber(ARGV[2])
+local windows = #KEYS / 2
+for w = 1, windows do
+    local sketch = KEYS[2 * w - 1]
+    local top = KEYS[2 * w]
+    local i = 3 + windows
+    while i <= #ARGV do
+        local estimate
+        for d = 1, depth do
+            local count = redis.call('hincrby', sketch, ARGV[i + d], 1)
+            if estimate == nil or count < estimate then
+                estimate = count
+            end
+        end
+        redis.call('zadd', top, estimate, ARGV[i])
+        i = i + depth + 1
+    end
+    redis.call('zremrangebyrank', top, 0, -(k + 1))
+    redis.call('expire', sketch, ARGV[2 + w])
+    redis.call('expire', top, ARGV[2 + w])
+end
+"""
+
+
+def extract_hashtags(content: str) -> list[str]:
+    """
+    本文からハッシュタグを抽出する（全角・半角、大文字・小文字を区別せず、重複を除く）。
+
+    Parameters
+    ----------
+    content: str
+        本文
+
+    Returns
+    -------
+    list[str]:
+        ハッシュタグ（#を除く、出現順、最大MAX_HASHTAGS_PER_POST件）
+    """
+    normalized = unicodedata.normalize("NFKC", content).casefold()
+    hashtags = dict.fromkeys(_HASHTAG_PATTERN.findall(normalized))
+    return list(hashtags)[:MAX_HASHTAGS_PER_POST]
+
+
+def sketch_cells(hashtag: str, width: int, depth: int) -> list[str]:
+    """
+    ハッシュタグを加算するCount-Min Sketchのセル（行ごとに1つ）を取得する。
+
+    プロセスによらず同じセルとなるよう、組み込みのhash()ではなくBLAKE2を使用する。
+
+    Parameters
+    ----------
+    hashtag: str
+        ハッシュタグ
+    width: int
+        列数
+    depth: int
+        行数
+
+    Returns
+    -------
+    list[str]:
+        セル（"行:列"）のリスト
+    """
+    digest = hashlib.blake2b(hashtag.encode(), digest_size=16).digest()
+    # 2つのハッシュ値の線形結合で行ごとの独立したハッシュ値を生成する
+    h1 = int.from_bytes(digest[:8])
+    h2 = int.from_bytes(digest[8:]) | 1
+    return [f"{row}:{(h1 + row * h2) % width}" for row in range(depth)]
+
+
+def _bucket(window: TrendWindow, now: float) -> int:
+    seconds, _ = WINDOW_BUCKETS[window]
+    return int(now // seconds)
+
+
+async def record_hashtags(redis: Redis, hashtags: list[str], now: float) -> None:
+    """
+    ハッシュタグの出現回数を全ての集計期間に加算する（1回のスクリプト実行で行う）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    hashtags: list[str]
+        ハッシュタグ
+    now: float
+        投稿日時（UNIX時刻）
+    """
+    if not hashtags:
+        return
+    settings = get_settings()
+    keys: list[str] = []
+    ttls: list[int] = []
+    for window, (seconds, count) in WINDOW_BUCKETS.items():
+        bucket = _bucket(window, now)
+        keys += [
+            generate_trend_sketch_key(window.value, bucket),
+            generate_trend_top_key(window.value, bucket),
+        ]
+        # 集計期間に含まれる間は保持する
+        ttls.append(seconds * (count + 1))
+    args: list[str | int] = [settings.TRENDS_TOP_K, settings.TRENDS_SKETCH_DEPTH, *ttls]
+    for hashtag in hashtags:
+        args += [
+            hashtag,
+            *sketch_cells(hashtag, settings.TRENDS_SKETCH_WIDTH, settings.TRENDS_SKETCH_DEPTH),
+        ]
+    await redis.eval(_RECORD_SCRIPT, len(keys), *keys, *args)  # pyright: ignore[reportUnknownMemberType]
+
+
+async def record_post(redis: Redis, post: post_schema.Post) -> None:
+    """
+    登録した投稿のハッシュタグを集計する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    post: app.schemas.post_schema.Post
+        登録した投稿
+    """
+    await record_hashtags(redis, extract_hashtags(post.content), post.create_datetime.timestamp())
+
+
+async def compute_trends(redis: Redis, window: TrendWindow, now: float) -> list[trend_schema.Trend]:
+    """
+    集計期間のトレンドを集計する。
+
+    各区間の上位ハッシュタグを候補とし、区間ごとの推定出現回数を合算して上位K件を取得する。
+    Redisへの往復回数は区間数によらず2回となる。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    window: TrendWindow
+        集計期間
+    now: float
+        集計日時（UNIX時刻）
+
+    Returns
+    -------
+    list[app.schemas.trend_schema.Trend]:
+        トレンド（推定出現回数の多い順）
+    """
+    settings = get_settings()
+    _, count = WINDOW_BUCKETS[window]
+    current = _bucket(window, now)
+    buckets = range(current - count + 1, current + 1)
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for bucket in buckets:
+            pipe.zrange(generate_trend_top_key(window.value, bucket), 0, -1)
+        candidates = list(dict.fromkeys(tag for top in await pipe.execute() for tag in top))
+    if not candidates:
+        return []
+
+    cells = [
+        sketch_cells(tag, settings.TRENDS_SKETCH_WIDTH, settings.TRENDS_SKETCH_DEPTH)
+        for tag in candidates
+    ]
+    fields = [cell for tag_cells in cells for cell in tag_cells]
+    async with redis.pipeline(transaction=False) as pipe:
+        for bucket in buckets:
+            pipe.hmget(generate_trend_sketch_key(window.value, bucket), fields)
+        sketches = await pipe.execute()
+
+    # 区間ごとの推定値（行ごとの最小値）の合計は、合算したSketchの推定値以下、実際の値以上となる
+    depth = settings.TRENDS_SKETCH_DEPTH
+    estimates: dict[str, int] = dict.fromkeys(candidates, 0)
+    for sketch in sketches:
+        for i, tag in enumerate(candidates):
+            estimates[tag] += min(int(value or 0) for value in sketch[i * depth : (i + 1) * depth])
+    ranked = sorted(estimates.items(), key=lambda item: (-item[1], item[0]))
+    return [
+        trend_schema.Trend(hashtag=tag, count=estimate)
+        for tag, estimate in ranked[: settings.TRENDS_TOP_K]
+        if estimate > 0
+    ]
+
+
+async def refresh_snapshots(redis: Redis, now: float | None = None) -> bool:
+    """
+    全ての集計期間のトレンドを集計し、スナップショットを更新する。
+
+    複数プロセスで実行しても、更新間隔ごとに1プロセスのみが集計する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    now: float | None
+        集計日時（UNIX時刻、Noneの場合は現在日時）
+
+    Returns
+    -------
+    bool:
+        True: 更新した / False: 他のプロセスが更新済み
+    """
+    interval = get_settings().TRENDS_REFRESH_INTERVAL_SECONDS
+    if not await redis.set(TRENDS_REFRESH_LOCK_KEY, 1, nx=True, ex=interval):
+        return False
+    now = time.time() if now is None else now
+    as_of = datetime.fromtimestamp(now)
+    for window in TrendWindow:
+        snapshot = trend_schema.TrendSnapshot(
+            trends=await compute_trends(redis, window, now), as_of=as_of
+        )
+        await redis.set(generate_trend_snapshot_key(window.value), snapshot.model_dump_json())
+    return True
+
+
+async def get_snapshot(redis: Redis, window: TrendWindow) -> trend_schema.TrendSnapshot | None:
+    """
+    トレンドのスナップショットを取得する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    window: TrendWindow
+        集計期間
+
+    Returns
+    -------
+    app.schemas.trend_schema.TrendSnapshot | None:
+        スナップショット（未集計の場合はNone）
+    """
+    data = await redis.get(generate_trend_snapshot_key(window.value))
+    return None if data is None else trend_schema.TrendSnapshot.model_validate_json(data)
+
+
+async def run_refresher(redis: Redis, interval: float) -> None:
+    """
+    トレンドのスナップショットを一定間隔で更新する（キャンセルされるまで実行する）。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    interval: float
+        更新間隔（秒）
+    """
+    while True:
+        try:
+            await refresh_snapshots(redis)
+        except Exception:
+            logger.exception("トレンドの更新に失敗しました。")
+        await asyncio.sleep(interval)
@@ -1,10 +1,52 @@
+import asyncio
+import logging
 import secrets
 import string
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app import crud
+from app.core.bloom_filter import BloomFilter
+from app.core.cache import TwoTierCache
 from app.core.config import get_settings
+from app.core.redis import USERNAME_FILTER_KEY, USERNAME_FILTER_REBUILD_LOCK_KEY
+from app.schemas import user_schema
+
+logger = logging.getLogger(__name__)
+
+# ユーザー検索結果のキャッシュ（ユーザー名、メールアドレス別）
+user_cache_by_username = TwoTierCache(
+    "user:username",
+    user_schema.User,
+    local_maxsize=get_settings().USER_CACHE_LOCAL_MAXSIZE,
+    local_ttl=get_settings().USER_CACHE_LOCAL_TTL_SECONDS,
+    ttl=get_settings().USER_CACHE_TTL_SECONDS,
+    negative_ttl=get_settings().USER_CACHE_NEGATIVE_TTL_SECONDS,
+)
+user_cache_by_email = TwoTierCache(
+    "user:email",
+    user_schema.User,
+    local_maxsize=get_settings().USER_CACHE_LOCAL_MAXSIZE,
+    local_ttl=get_settings().USER_CACHE_LOCAL_TTL_SECONDS,
+    ttl=get_settings().USER_CACHE_TTL_SECONDS,
+    negative_ttl=get_settings().USER_CACHE_NEGATIVE_TTL_SECONDS,
+)
+# 無効化通知の購読対象
+user_caches = (user_cache_by_username, user_cache_by_email)
+
+# 登録済みユーザー名のBloomフィルター（ユーザー名の使用可否確認でDBの検索を省略する）
+username_filter = BloomFilter(
+    USERNAME_FILTER_KEY,
+    size=get_settings().USERNAME_FILTER_BITS,
+    hashes=get_settings().USERNAME_FILTER_HASHES,
+)
+# Bloomフィルター再構築時の1バッチの件数
+USERNAME_FILTER_BATCH_SIZE = 10000
+# 再構築中に登録されたユーザー名を取りこぼさないよう、再構築開始より前から追加し直す期間
+USERNAME_FILTER_CATCH_UP_MARGIN = timedelta(minutes=1)
 
 
 async def is_registered_email(db: AsyncSession, email: str) -> bool:
@@ -47,6 +89,21 @@ async def is_registered_username(db: AsyncSession, username: str) -> bool:
     return user_exist is not None
 
 
+def generate_username_candidate() -> str:
+    """
+    初期ユーザー名の候補（英数字）を生成する。
+
+    Returns
+    -------
+    username: str
+        初期ユーザー名の候補
+    """
+    return "".join(
+        secrets.choice(string.ascii_letters + string.digits)
+        for _ in range(get_settings().USERNAME_MAX_LENGTH)
+    )
+
+
 async def generate_initial_username(db: AsyncSession) -> str:
     """
     ユニークな初期ユーザー名を生成する。
@@ -57,9 +114,178 @@ async def generate_initial_username(db: AsyncSession) -> str:
         初期ユーザー名
     """
     while True:
-        username = "".join(
-            secrets.choice(string.ascii_letters + string.digits)
-            for _ in range(get_settings().USERNAME_MAX_LENGTH)
-        )
+        username = generate_username_candidate()
         if not await is_registered_username(db, username):
             return username
+
+
+async def get_user_by_username(
+    db: AsyncSession, redis: Redis, username: str
+) -> user_schema.User | None:
+    """
+    ユーザー名でユーザーを取得する（キャッシュ経由）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    username: str
+        ユーザー名
+
+    Returns
+    -------
+    User | None
+        取得結果
+    """
+    return await user_cache_by_username.get_or_load(
+        redis, username, lambda: crud.select_user_by_username(db, username)
+    )
+
+
+async def get_user_by_email(db: AsyncSession, redis: Redis, email: str) -> user_schema.User | None:
+    """
+    メールアドレスでユーザーを取得する（キャッシュ経由）。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    email: str
+        メールアドレス
+
+    Returns
+    -------
+    User | None
+        取得結果
+    """
+    return await user_cache_by_email.get_or_load(
+        redis, email, lambda: crud.select_user_by_email(db, email)
+    )
+
+
+async def invalidate_user_cache(users: Sequence[user_schema.User], redis: Redis) -> None:
+    """
+    ユーザーのキャッシュ（ネガティブキャッシュを含む）を無効化する。
+
+    crud.register_user_write_hookでユーザー更新時のフックとして登録する。
+
+    Parameters
+    ----------
+    users: Sequence[app.schemas.user_schema.User]
+        更新前後のユーザー
+    redis: Redis
+        Redisクライアント
+    """
+    await user_cache_by_username.invalidate(redis, *{user.username for user in users})
+    await user_cache_by_email.invalidate(redis, *{user.email for user in users})
+
+
+async def is_username_available(db: AsyncSession, redis: Redis, username: str) -> bool:
+    """
+    ユーザー名が使用可能（未登録）か確認する。
+
+    Bloomフィルターで登録済みの可能性がある場合（またはフィルター未構築の場合）のみDBを検索する。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    username: str
+        ユーザー名
+
+    Returns
+    -------
+    bool:
+        True: 使用可能 / False: 登録済み
+    """
+    if await username_filter.might_contain(redis, username) is False:
+        return True
+    return not await is_registered_username(db, username)
+
+
+async def add_to_username_filter(users: Sequence[user_schema.User], redis: Redis) -> None:
+    """
+    登録・更新したユーザーのユーザー名をBloomフィルターに追加する。
+
+    crud.register_user_write_hookでユーザー更新時のフックとして登録する。
+
+    Parameters
+    ----------
+    users: Sequence[app.schemas.user_schema.User]
+        更新前後のユーザー
+    redis: Redis
+        Redisクライアント
+    """
+    await username_filter.add(redis, *{user.username for user in users})
+
+
+async def rebuild_username_filter(db: AsyncSession, redis: Redis, batch_size: int) -> int:
+    """
+    登録済みユーザー名のBloomフィルターを再構築する（論理削除したユーザー名を除外する）。
+
+    全ユーザー名からプロセス内でビット列を生成して1回で置き換え、
+    再構築中に登録・変更されたユーザー名は置き換え後に追加し直す。
+
+    Parameters
+    ----------
+    db: sqlalchemy.ext.asyncio.AsyncSession
+        DBセッション
+    redis: Redis
+        Redisクライアント
+    batch_size: int
+        1バッチの件数
+
+    Returns
+    -------
+    int:
+        登録したユーザー名の件数
+    """
+    started = datetime.now()
+    bitmap = username_filter.build([])
+    total = 0
+    after = None
+    while usernames := await crud.select_usernames_batch(db, after, batch_size):
+        username_filter.build(usernames, bitmap)
+        total += len(usernames)
+        after = usernames[-1]
+    await username_filter.replace(redis, bitmap)
+
+    after = None
+    updated_since = started - USERNAME_FILTER_CATCH_UP_MARGIN
+    while usernames := await crud.select_usernames_batch(db, after, batch_size, updated_since):
+        await username_filter.add(redis, *usernames)
+        after = usernames[-1]
+    return total
+
+
+async def run_username_filter_rebuilder(
+    session_factory: async_sessionmaker[AsyncSession], redis: Redis, interval: float
+) -> None:
+    """
+    登録済みユーザー名のBloomフィルターを一定間隔で再構築する（キャンセルされるまで実行する）。
+
+    複数プロセスで実行しても、再構築間隔ごとに1プロセスのみが再構築する。
+
+    Parameters
+    ----------
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[AsyncSession]
+        DBセッションの生成元
+    redis: Redis
+        Redisクライアント
+    interval: float
+        再構築間隔（秒）
+    """
+    while True:
+        try:
+            if await redis.set(USERNAME_FILTER_REBUILD_LOCK_KEY, 1, nx=True, ex=round(interval)):
+                async with session_factory() as db:
+                    await rebuild_username_filter(db, redis, USERNAME_FILTER_BATCH_SIZE)
+        except Exception:
+            logger.exception("ユーザー名のBloomフィルターの再構築に失敗しました。")
+        await asyncio.sleep(interval)
@@ -0,0 +1,132 @@
+"""
+画像処理ワーカー
+
+Redisのジョブキューから派生画像（サムネイル）生成ジョブを取り出し、プロセスプールで処理する。
+画像のデコード・リサイズ・エンコードはCPU負荷が高いため、APIサーバーのイベントループでは実行しない。
+
+Usage
+-----
+    python -m app.workers.image_worker [--processes 2]
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from PIL import UnidentifiedImageError
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis import get_redis_client
+from app.core.storage import BlobStore, get_blob_store
+from app.services import image_service
+from app.workers import job_queue
+
+logger = logging.getLogger(__name__)
+
+# 再試行しても成功しない（ジョブを破棄する）エラー
+PERMANENT_ERRORS: tuple[type[Exception], ...] = (
+    UnidentifiedImageError,
+    image_service.ImageTooLargeError,
+    # 元画像が存在しない
+    FileNotFoundError,
+    # ジョブの形式が不正
+    KeyError,
+    ValueError,
+)
+
+
+async def handle_job(
+    redis: Redis, store: BlobStore, executor: Executor, job: str, max_attempts: int
+) -> None:
+    """
+    ジョブを処理し、処理中リストから削除する。
+
+    恒久的なエラー（画像として不正、元画像が存在しない等）のジョブは破棄し、
+    それ以外のエラー（ストレージ・Redisの一時的な障害等）のジョブは再試行する。
+    Redis障害で処理中リストから削除できなかったジョブは、次回起動時にキューへ戻される。
+    """
+    try:
+        try:
+            await image_service.process_variants_job(store, executor, job)
+        except PERMANENT_ERRORS:
+            logger.warning("派生画像を生成できないためジョブを破棄しました: %s", job, exc_info=True)
+        except Exception:
+            logger.exception("派生画像の生成に失敗しました: %s", job)
+            if not await job_queue.retry_job(redis, image_service.IMAGE_QUEUE, job, max_attempts):
+                logger.error(
+                    "再試行回数の上限を超えたためデッドレターキューへ移動しました: %s", job
+                )
+        await job_queue.complete_job(redis, image_service.IMAGE_QUEUE, job)
+    except RedisError:
+        logger.exception("ジョブの完了を記録できませんでした: %s", job)
+
+
+async def run(
+    redis: Redis,
+    store: BlobStore,
+    executor: Executor,
+    concurrency: int,
+    stop: asyncio.Event,
+    max_attempts: int,
+) -> None:
+    """
+    停止要求があるまでジョブを取り出して処理する。
+
+    同時に処理するジョブ数をプロセス数までに制限し、プロセスプールを空きなく稼働させる。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    store: app.core.storage.BlobStore
+        Blobストア
+    executor: concurrent.futures.Executor
+        画像処理を実行するExecutor
+    concurrency: int
+        同時に処理するジョブ数
+    stop: asyncio.Event
+        停止要求
+    max_attempts: int
+        ジョブの最大試行回数
+    """
+    await job_queue.consume(
+        redis,
+        image_service.IMAGE_QUEUE,
+        lambda job: handle_job(redis, store, executor, job, max_attempts),
+        concurrency,
+        stop,
+    )
+
+
+async def main(processes: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    redis = await get_redis_client()
+    requeued = await job_queue.requeue_processing_jobs(redis, image_service.IMAGE_QUEUE)
+    if requeued:
+        logger.info("処理中だったジョブをキューに戻しました: %d", requeued)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        await run(
+            redis,
+            get_blob_store(),
+            executor,
+            processes,
+            stop,
+            get_settings().IMAGE_JOB_MAX_ATTEMPTS,
+        )
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="画像処理ワーカー")
+    parser.add_argument("--processes", type=int, help="画像処理のプロセス数")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(main(args.processes or get_settings().IMAGE_WORKER_PROCESSES))
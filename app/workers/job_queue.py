@@ -0,0 +1,151 @@
+"""
+Redisのジョブキュー
+
+ワーカーが取り出したジョブは処理完了まで処理中リストに保持し、異常終了時に再投入できるようにする。
+一時的なエラーのジョブは試行回数を加算して再登録し、上限を超えた場合はデッドレターキューへ移動する。
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import (
+    generate_dead_letter_queue_key,
+    generate_processing_queue_key,
+    generate_queue_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# ジョブ待機のタイムアウト秒数（停止要求の確認間隔）
+POLL_TIMEOUT_SECONDS = 5
+# 再試行までの待機秒数の上限
+MAX_RETRY_DELAY_SECONDS = 60
+
+
+async def requeue_processing_jobs(redis: Redis, name: str) -> int:
+    """
+    前回異常終了時に処理中だったジョブをキューに戻す。
+
+    ジョブの処理は冪等とし、他のワーカーが処理中のジョブを重複して処理しても問題ないようにすること。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    name: str
+        キュー名
+
+    Returns
+    -------
+    int:
+        キューに戻したジョブ件数
+    """
+    queue = generate_queue_key(name)
+    processing = generate_processing_queue_key(name)
+    count = 0
+    while await redis.lmove(processing, queue, "RIGHT", "LEFT") is not None:
+        count += 1
+    return count
+
+
+async def retry_job(redis: Redis, name: str, job: str, max_attempts: int) -> bool:
+    """
+    試行回数を加算したジョブをキューに再登録する。試行回数の上限を超えた場合はデッドレターキューへ移動する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    name: str
+        キュー名
+    job: str
+        ジョブ（JSON）
+    max_attempts: int
+        最大試行回数
+
+    Returns
+    -------
+    bool:
+        True: 再登録 / False: デッドレターキューへ移動
+    """
+    obj = json.loads(job)
+    obj["attempts"] = obj.get("attempts", 0) + 1
+    if obj["attempts"] >= max_attempts:
+        await redis.rpush(  # pyright: ignore[reportUnknownMemberType]
+            generate_dead_letter_queue_key(name), json.dumps(obj)
+        )
+        return False
+    # 一時的な障害の回復を待つため、試行回数に応じて待機してから再登録する
+    await asyncio.sleep(min(2 ** obj["attempts"], MAX_RETRY_DELAY_SECONDS))
+    await redis.rpush(generate_queue_key(name), json.dumps(obj))  # pyright: ignore[reportUnknownMemberType]
+    return True
+
+
+async def complete_job(redis: Redis, name: str, job: str) -> None:
+    """
+    処理済みのジョブを処理中リストから削除する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    name: str
+        キュー名
+    job: str
+        ジョブ（JSON）
+    """
+    await redis.lrem(generate_processing_queue_key(name), 1, job)  # pyright: ignore[reportUnknownMemberType]
+
+
+async def consume(
+    redis: Redis,
+    name: str,
+    handle: Callable[[str], Awaitable[None]],
+    concurrency: int,
+    stop: asyncio.Event,
+) -> None:
+    """
+    停止要求があるまでジョブを取り出して処理する。
+
+    Parameters
+    ----------
+    redis: Redis
+        Redisクライアント
+    name: str
+        キュー名
+    handle: Callable[[str], Awaitable[None]]
+        ジョブを処理する関数（処理完了後にcomplete_jobを呼び出すこと）
+    concurrency: int
+        同時に処理するジョブ数
+    stop: asyncio.Event
+        停止要求
+    """
+    queue = generate_queue_key(name)
+    processing = generate_processing_queue_key(name)
+    slots = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task[None]] = set()
+
+    while not stop.is_set():
+        await slots.acquire()
+        try:
+            # 取り出したジョブは処理完了まで処理中リストに保持する（ワーカー異常終了時の消失防止）
+            job = await redis.blmove(queue, processing, POLL_TIMEOUT_SECONDS, "LEFT", "RIGHT")
+        except RedisError:
+            logger.exception("ジョブの取得に失敗しました。")
+            slots.release()
+            await asyncio.sleep(POLL_TIMEOUT_SECONDS)
+            continue
+        if job is None:
+            slots.release()
+            continue
+        task = asyncio.create_task(handle(job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        task.add_done_callback(lambda _: slots.release())
+
+    await asyncio.gather(*tasks)
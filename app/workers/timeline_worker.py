@@ -0,0 +1,84 @@
+"""
+ホームタイムライン配信ワーカー
+
+Redisのジョブキューから投稿の配信ジョブを取り出し、投稿をフォロワーのホームタイムラインに配信する。
+フォロワー数に比例する書き込みをAPIサーバーのリクエスト処理から切り離す。
+
+Usage
+-----
+    python -m app.workers.timeline_worker [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis import get_redis_client
+from app.services import timeline_service
+from app.workers import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_job(redis: Redis, job: str, max_attempts: int) -> None:
+    """
+    配信ジョブを処理し、処理中リストから削除する。
+
+    形式が不正なジョブは破棄し、それ以外のエラー（Redisの一時的な障害等）のジョブは再試行する。
+    """
+    try:
+        try:
+            obj = json.loads(job)
+            post_id, user_id = int(obj["post_id"]), int(obj["user_id"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("形式が不正なためジョブを破棄しました: %s", job, exc_info=True)
+        else:
+            try:
+                delivered = await timeline_service.fanout_post(redis, post_id, user_id)
+                logger.debug("投稿を配信しました: post_id=%d, followers=%d", post_id, delivered)
+            except Exception:
+                logger.exception("投稿の配信に失敗しました: %s", job)
+                if not await job_queue.retry_job(
+                    redis, timeline_service.TIMELINE_QUEUE, job, max_attempts
+                ):
+                    logger.error(
+                        "再試行回数の上限を超えたためデッドレターキューへ移動しました: %s", job
+                    )
+        await job_queue.complete_job(redis, timeline_service.TIMELINE_QUEUE, job)
+    except RedisError:
+        logger.exception("ジョブの完了を記録できませんでした: %s", job)
+
+
+async def main(concurrency: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    redis = await get_redis_client()
+    requeued = await job_queue.requeue_processing_jobs(redis, timeline_service.TIMELINE_QUEUE)
+    if requeued:
+        logger.info("処理中だったジョブをキューに戻しました: %d", requeued)
+    max_attempts = get_settings().TIMELINE_JOB_MAX_ATTEMPTS
+    await job_queue.consume(
+        redis,
+        timeline_service.TIMELINE_QUEUE,
+        lambda job: handle_job(redis, job, max_attempts),
+        concurrency,
+        stop,
+    )
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ホームタイムライン配信ワーカー")
+    parser.add_argument("--concurrency", type=int, default=4, help="同時に処理するジョブ数")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(main(args.concurrency))
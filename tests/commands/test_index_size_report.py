@@ -0,0 +1,20 @@
+from app.commands import index_size_report
+
+
+def test_render_report() -> None:
+    """
+    変更前後のサイズ差分がレポートに出力されること。
+    """
+    before: dict[str, dict[str, str | int]] = {
+        "authcodes_pkey": {"kind": "index", "table": "authcodes", "bytes": 2048},
+        "users": {"kind": "table", "table": "users", "bytes": 8192},
+    }
+    after: dict[str, dict[str, str | int]] = {
+        "authcodes_pkey": {"kind": "index", "table": "authcodes", "bytes": 1024},
+        "users": {"kind": "table", "table": "users", "bytes": 8192},
+    }
+    lines = index_size_report.render_report(after, before).splitlines()
+    assert lines[1].startswith("authcodes_pkey")
+    assert lines[1].endswith("-50.0%")
+    assert lines[2].endswith("+0.0%")
+    assert lines[-1].startswith("TOTAL")
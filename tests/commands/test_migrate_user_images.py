@@ -0,0 +1,26 @@
+import base64
+
+import pytest
+
+from app.commands.migrate_user_images import decode_inline_image
+
+PNG_DATA = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+PNG_BASE64 = base64.b64encode(PNG_DATA).decode()
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        pytest.param(f"data:image/png;base64,{PNG_BASE64}", PNG_DATA, id="data url"),
+        pytest.param(PNG_BASE64, PNG_DATA, id="base64"),
+        pytest.param(f" {PNG_BASE64}\n", PNG_DATA, id="surrounding whitespace"),
+        pytest.param("data:image/png,rawdata", None, id="data url without base64"),
+        pytest.param("https://example.com/image.png", None, id="url"),
+        pytest.param("", None, id="empty"),
+    ],
+)
+def test_decode_inline_image(value: str, expected: bytes | None) -> None:
+    """
+    data URL、Base64の画像がデコードされ、それ以外の値はNoneとなること。
+    """
+    assert decode_inline_image(value) == expected
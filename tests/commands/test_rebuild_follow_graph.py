@@ -0,0 +1,53 @@
+import pytest
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.commands.rebuild_follow_graph import clear_follow_graph, rebuild_follow_graph
+from app.core.redis import generate_cache_key, generate_followers_key, generate_following_key
+from app.models import Follow, User
+
+
+@pytest.mark.asyncio
+async def test_clear_follow_graph(get_test_redis: Redis) -> None:
+    """
+    フォロー一覧のキーのみが削除されること。
+    """
+    for user_id in range(3):
+        await get_test_redis.zadd(generate_followers_key(user_id), {"1": 1})
+        await get_test_redis.zadd(generate_following_key(user_id), {"1": 1})
+    await get_test_redis.set(generate_cache_key("test", "followers"), "1")
+
+    assert await clear_follow_graph(get_test_redis) == 6
+    assert await get_test_redis.keys() == [generate_cache_key("test", "followers")]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_follow_graph(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    followsテーブルの内容でRedisのフォロー一覧が再構築され、DBに存在しないフォローは削除されること。
+    """
+    async with get_test_session() as db:
+        user_ids = (await db.scalars(select(User.user_id).order_by(User.user_id))).all()
+        db.add_all([
+            Follow(follower_id=follower_id, followee_id=followee_id)
+            for follower_id in user_ids
+            for followee_id in user_ids
+            if follower_id != followee_id
+        ])
+        await db.commit()
+        # DBに存在しないフォロー
+        await get_test_redis.zadd(generate_followers_key(0), {"1": 1})
+
+        total = await rebuild_follow_graph(db, get_test_redis, batch_size=2)
+
+    assert total == 6
+    assert await get_test_redis.exists(generate_followers_key(0)) == 0
+    for user_id in user_ids:
+        others = {str(other) for other in user_ids if other != user_id}
+        assert set(await get_test_redis.zrange(generate_followers_key(user_id), 0, -1)) == others
+        assert set(await get_test_redis.zrange(generate_following_key(user_id), 0, -1)) == others
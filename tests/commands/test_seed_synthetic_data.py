@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.commands import seed_synthetic_data
+from app.core.config import get_settings
+from app.models import Authcode, User, UserCredential
+
+
+def test_generate_batch_deterministic() -> None:
+    """
+    同じシード値・範囲では同じデータ、異なるシード値では異なるデータが生成されること。
+    """
+    batch = seed_synthetic_data.generate_batch(0, 0, 100, 0.5, 1.0)
+    assert batch == seed_synthetic_data.generate_batch(0, 0, 100, 0.5, 1.0)
+    assert batch.users != seed_synthetic_data.generate_batch(1, 0, 100, 0.5, 1.0).users
+
+
+def test_generate_batch() -> None:
+    """
+    ユーザー名・メールアドレスが範囲をまたいで一意となり、件数が割合に従うこと。
+    """
+    batches = [
+        seed_synthetic_data.generate_batch(0, start, start + 1000, 0.5, 1.5) for start in (0, 1000)
+    ]
+    users = [user for batch in batches for user in batch.users]
+    usernames = [user[1] for user in users]
+    assert len(set(usernames)) == len({user[3] for user in users}) == 2000
+    assert max(map(len, usernames)) <= get_settings().USERNAME_MAX_LENGTH
+    assert users[0][0] == seed_synthetic_data.SEED_USER_ID_OFFSET
+    assert 800 <= sum(len(batch.credentials) for batch in batches) <= 1200
+    assert 2700 <= sum(len(batch.authcodes) for batch in batches) <= 3300
+    # 認証コードIDは発行日時順のUUIDv7となる
+    authcode = batches[0].authcodes[0]
+    assert authcode[0].version == 7
+
+
+@pytest.mark.asyncio
+async def test_seed(get_test_session: async_sessionmaker[AsyncSession]) -> None:
+    """
+    合成データがCOPYで投入されてインデックスが作成し直され、再実行時は不足分のみ投入されること。
+    """
+    async with get_test_session() as db:
+        total = await seed_synthetic_data.seed(
+            db,
+            users=30,
+            seed_value=0,
+            credential_ratio=1.0,
+            authcode_ratio=1.0,
+            batch_size=20,
+            keep_indexes=False,
+        )
+        assert total == 30
+        assert (await db.scalar(select(func.count()).select_from(User))) == 30
+        assert (await db.scalar(select(func.count()).select_from(UserCredential))) == 30
+        assert (await db.scalar(select(func.count()).select_from(Authcode))) == 30
+        connection = await db.connection()
+        indexes = await connection.run_sync(
+            lambda sync: {index["name"] for index in inspect(sync).get_indexes("users")}
+        )
+        assert {index.name for index in User.__table__.indexes} <= indexes
+
+        total = await seed_synthetic_data.seed(
+            db,
+            users=40,
+            seed_value=0,
+            credential_ratio=1.0,
+            authcode_ratio=1.0,
+            batch_size=20,
+            keep_indexes=True,
+        )
+        assert total == 10
+        assert (await db.scalar(select(func.count()).select_from(User))) == 40
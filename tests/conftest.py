@@ -1,12 +1,16 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Generator
 from datetime import date, datetime
+from pathlib import Path
 from typing import Any
 from urllib.parse import quote_plus
+from uuid import UUID
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from redis import ConnectionError
 from redis.asyncio.client import Redis
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -17,8 +21,10 @@ from sqlalchemy.ext.asyncio import (
 from app.core.config import get_settings
 from app.core.database import DATABASE_OPTION, Base, get_session
 from app.core.redis import get_redis_client
+from app.core.storage import BlobStore, LocalBlobStore, get_blob_store
 from app.main import app
 from app.models import Authcode, User
+from app.services import post_service, search_service, user_service
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -40,8 +46,9 @@ async def get_test_session() -> AsyncGenerator[async_sessionmaker[AsyncSession],
         autoflush=False,
         expire_on_commit=True,
     )
-    # SQLAlchemyで定義しているテーブルを全て作成する
+    # SQLAlchemyで定義しているテーブルを全て作成する（トライグラムインデックスの拡張機能を含む）
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
     yield async_session
@@ -96,6 +103,14 @@ async def async_client(
     # DIでFastAPIのDBの向き先をテスト用DBに変更
     app.dependency_overrides[get_session] = _override_get_session
     app.dependency_overrides[get_redis_client] = _ovveride_get_redis
+    # 投稿の一括登録もテスト用DBに登録する
+    post_writer = post_service.create_post_writer(get_test_session)
+    app.dependency_overrides[post_service.get_post_writer] = lambda: post_writer
+
+    # テスト間でプロセス内キャッシュを共有しないようにクリア
+    user_service.user_cache_by_username.local.clear()
+    user_service.user_cache_by_email.local.clear()
+    search_service.user_search_cache.local.clear()
 
     # テスト用非同期HTTPクライアントを返却
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -130,7 +145,7 @@ async def insert_test_data_authcode(get_test_session: async_sessionmaker[AsyncSe
     """
     data = [
         Authcode(
-            authcode_id=f"00000000-0000-0000-0000-00000000000{i}",
+            authcode_id=UUID(f"00000000-0000-0000-0000-00000000000{i}"),
             code=f"12345{i}",
             email=f"test{i}@sample.com",
             expire_datetime=datetime.strptime(
@@ -170,12 +185,23 @@ async def insert_test_data_user(get_test_session: async_sessionmaker[AsyncSessio
             account_name=f"ユーザー{i}",
             email=f"user{i}@sample.com",
             birthday=date(2000, 1, i),
-            verified_flag=str(i % 2),
+            verified_flag=bool(i % 2),
             auth_failure_count=(i % 5),
-            account_lock_flag="0" if i < 5 else "1",
+            account_lock_flag=i >= 5,
         )
         for i in range(1, 4)
     ]
     async with get_test_session() as db:
         db.add_all(data)
         await db.commit()
+
+
+@pytest.fixture(scope="function")
+def test_blob_store(tmp_path: Path) -> Generator[BlobStore, Any]:
+    """
+    一時ディレクトリを保存先とするBlobストアを返却する。
+    """
+    store = LocalBlobStore(tmp_path)
+    app.dependency_overrides[get_blob_store] = lambda: store
+    yield store
+    app.dependency_overrides.pop(get_blob_store, None)
@@ -0,0 +1,62 @@
+import pytest
+from redis.asyncio.client import Redis
+
+from app.core.bloom_filter import BloomFilter
+
+
+def create_filter(size: int = 8192, hashes: int = 5) -> BloomFilter:
+    return BloomFilter("test:bloom_filter", size=size, hashes=hashes)
+
+
+def test_positions() -> None:
+    """
+    同じ要素は常に同じビット位置となり、全ての位置がビット数未満となること。
+    """
+    bloom_filter = create_filter()
+    positions = bloom_filter.positions("user1")
+    assert positions == bloom_filter.positions("user1")
+    assert len(positions) == 5
+    assert all(0 <= position < 8192 for position in positions)
+
+
+@pytest.mark.asyncio
+async def test_add_and_might_contain(get_test_redis: Redis) -> None:
+    """
+    フィルター未構築の場合はNone、追加した要素はTrue、追加していない要素は（概ね）Falseとなること。
+    """
+    bloom_filter = create_filter()
+    assert await bloom_filter.might_contain(get_test_redis, "user1") is None
+
+    await bloom_filter.add(get_test_redis, *(f"user{i}" for i in range(100)))
+
+    assert all([await bloom_filter.might_contain(get_test_redis, f"user{i}") for i in range(100)])
+    false_positives = [
+        await bloom_filter.might_contain(get_test_redis, f"other{i}") for i in range(1000)
+    ]
+    # 100要素・8192ビット・ハッシュ関数5個の偽陽性率は約0.01%
+    assert sum(false_positives) <= 5
+
+
+async def get_bits(redis: Redis, bloom_filter: BloomFilter) -> list[int]:
+    async with redis.pipeline(transaction=False) as pipe:
+        for position in range(bloom_filter.size):
+            pipe.getbit(bloom_filter.key, position)
+        return await pipe.execute()
+
+
+@pytest.mark.asyncio
+async def test_build_and_replace(get_test_redis: Redis) -> None:
+    """
+    プロセス内で生成したビット列が、Redisで1要素ずつ追加したビット列と一致すること。
+    """
+    bloom_filter = create_filter()
+    items = [f"user{i}" for i in range(50)]
+    await bloom_filter.add(get_test_redis, *items)
+    expected = await get_bits(get_test_redis, bloom_filter)
+
+    await get_test_redis.delete(bloom_filter.key)
+    bitmap = bloom_filter.build(items[:20])
+    await bloom_filter.replace(get_test_redis, bloom_filter.build(items[20:], bitmap))
+
+    assert await get_bits(get_test_redis, bloom_filter) == expected
+    assert await get_test_redis.exists(f"{bloom_filter.key}:building") == 0
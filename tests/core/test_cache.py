@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+from pydantic import BaseModel
+from redis.asyncio.client import Redis
+
+from app.core.cache import CacheEntry, LocalTTLCache, TwoTierCache, listen_invalidations
+from app.core.redis import CACHE_INVALIDATION_CHANNEL, generate_cache_key
+
+
+class Item(BaseModel):
+    name: str
+
+
+def create_cache() -> TwoTierCache[Item]:
+    return TwoTierCache(
+        "test", Item, local_maxsize=2, local_ttl=60, ttl=60, negative_ttl=10, beta=0.0
+    )
+
+
+def test_local_ttl_cache_evicts_least_recently_used() -> None:
+    """
+    最大エントリ数を超えた場合、最も古く参照されたエントリが破棄されること。
+    """
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    entry = CacheEntry(value={"name": "a"}, expire_at=time.time() + 60, delta=0.0)
+    cache.set("a", entry)
+    cache.set("b", entry)
+    assert cache.get("a") is not None
+    cache.set("c", entry)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_should_refresh() -> None:
+    """
+    有効期限切れのエントリは必ず更新対象となり、期限まで余裕のあるエントリは更新対象とならないこと。
+    """
+    now = time.time()
+    assert CacheEntry(value=None, expire_at=now - 1, delta=0.1).should_refresh(1.0, now)
+    assert not CacheEntry(value=None, expire_at=now + 3600, delta=0.0).should_refresh(1.0, now)
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_loads(get_test_redis: Redis) -> None:
+    """
+    同一キーへの同時アクセスでロード関数が1回のみ呼び出され、以降はキャッシュから取得されること。
+    """
+    cache = create_cache()
+    calls = 0
+
+    async def loader() -> Item:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return Item(name="user1")
+
+    results = await asyncio.gather(
+        *(cache.get_or_load(get_test_redis, "k", loader) for _ in range(10))
+    )
+    assert all(result == Item(name="user1") for result in results)
+    assert calls == 1
+    assert await get_test_redis.exists(generate_cache_key("test", "k")) == 1
+
+    # プロセス内キャッシュを破棄してもRedisから取得されること
+    cache.local.clear()
+    assert await cache.get_or_load(get_test_redis, "k", loader) == Item(name="user1")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_and_invalidate(get_test_redis: Redis) -> None:
+    """
+    存在しない値がネガティブキャッシュされ、無効化後は再ロードされること。
+    """
+    cache = create_cache()
+    value: Item | None = None
+    calls = 0
+
+    async def loader() -> Item | None:
+        nonlocal calls
+        calls += 1
+        return value
+
+    assert await cache.get_or_load(get_test_redis, "k", loader) is None
+    assert await cache.get_or_load(get_test_redis, "k", loader) is None
+    assert calls == 1
+
+    value = Item(name="user1")
+    await cache.invalidate(get_test_redis, "k")
+    assert await cache.get_or_load(get_test_redis, "k", loader) == value
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_leader_cancelled(get_test_redis: Redis) -> None:
+    """
+    ロード中の呼び出し元がキャンセルされても、待機中の呼び出し元はロードし直して値を取得すること。
+    """
+    cache = create_cache()
+    started = asyncio.Event()
+    calls = 0
+
+    async def loader() -> Item:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return Item(name="user1")
+
+    leader = asyncio.create_task(cache.get_or_load(get_test_redis, "k", loader))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load(get_test_redis, "k", loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == Item(name="user1")
+    assert leader.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_listen_invalidations(get_test_redis: Redis) -> None:
+    """
+    他プロセスでの無効化がPub/Sub経由でプロセス内キャッシュに反映されること。
+    """
+    cache = create_cache()
+    other = create_cache()
+    entry = CacheEntry(value={"name": "a"}, expire_at=time.time() + 60, delta=0.0)
+
+    listener = asyncio.create_task(listen_invalidations(get_test_redis, [cache]))
+    try:
+        # 購読開始時にプロセス内キャッシュが破棄されるため、購読開始後にエントリを設定する
+        for _ in range(100):
+            if (await get_test_redis.pubsub_numsub(CACHE_INVALIDATION_CHANNEL))[0][1]:
+                break
+            await asyncio.sleep(0.01)
+        cache.local.set("k", entry)
+        cache.local.set("other", entry)
+
+        await other.invalidate(get_test_redis, "k")
+        for _ in range(100):
+            if cache.local.get("k") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert cache.local.get("k") is None
+        assert cache.local.get("other") is not None
+    finally:
+        listener.cancel()
@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI, status
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core import deadline
+from app.core.deadline import DeadlineMiddleware, route_deadline
+from app.core.redis import get_redis_client
+
+# テスト用アプリケーションの既定の処理期限（秒）
+DEADLINE_SECONDS = 0.2
+
+deadline_app = FastAPI()
+deadline_app.add_middleware(DeadlineMiddleware, seconds=DEADLINE_SECONDS)
+cleaned_up: list[str] = []
+
+
+async def resource() -> AsyncGenerator[None]:
+    try:
+        yield
+    finally:
+        cleaned_up.append("resource")
+
+
+@deadline_app.get("/remaining")
+async def get_remaining() -> dict[str, float | None]:
+    return {"remaining": deadline.remaining()}
+
+
+@deadline_app.get("/sleep", dependencies=[Depends(resource)])
+async def sleep(seconds: float) -> dict[str, str]:
+    await asyncio.sleep(seconds)
+    return {"status": "ok"}
+
+
+@deadline_app.get("/extended", dependencies=[Depends(route_deadline(1.0))])
+async def extended() -> dict[str, float | None]:
+    await asyncio.sleep(DEADLINE_SECONDS * 2)
+    return {"remaining": deadline.remaining()}
+
+
+@deadline_app.get("/stream")
+async def stream() -> StreamingResponse:
+    async def chunks() -> AsyncGenerator[str]:
+        for _ in range(3):
+            await asyncio.sleep(DEADLINE_SECONDS)
+            yield "chunk\n"
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@deadline_app.get("/redis-timeout")
+async def redis_timeout() -> dict[str, float | None]:
+    client = await get_redis_client()
+    return {"socket_timeout": client.connection_pool.connection_kwargs.get("socket_timeout")}
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncGenerator[AsyncClient]:
+    async with AsyncClient(transport=ASGITransport(app=deadline_app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_remaining(client: AsyncClient) -> None:
+    """
+    リクエストの処理中は残り時間が取得でき、処理中以外はNoneとなること。
+    """
+    response = await client.get("/remaining")
+    assert 0 < response.json()["remaining"] <= DEADLINE_SECONDS
+    assert deadline.remaining() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["path", "expected_http_status"],
+    [
+        pytest.param("/sleep?seconds=0", status.HTTP_200_OK, id="within"),
+        pytest.param("/sleep?seconds=5", status.HTTP_504_GATEWAY_TIMEOUT, id="exceeded"),
+        pytest.param("/extended", status.HTTP_200_OK, id="route_deadline"),
+        pytest.param("/stream", status.HTTP_200_OK, id="streaming"),
+    ],
+)
+async def test_deadline(client: AsyncClient, path: str, expected_http_status: int) -> None:
+    """
+    処理期限について以下ケースを検証する。
+
+    +----+----------------------------------------------+-------------+
+    | No | case                                         | HTTP status |
+    +====+==============================================+=============+
+    | 1  | 処理期限内に完了する                         | 200         |
+    +----+----------------------------------------------+-------------+
+    | 2  | 処理期限を超える（キャンセルされる）         | 504         |
+    +----+----------------------------------------------+-------------+
+    | 3  | APIごとの処理期限で既定の処理期限を延長する  | 200         |
+    +----+----------------------------------------------+-------------+
+    | 4  | ストリーミングの送信中は処理期限の対象外     | 200         |
+    +----+----------------------------------------------+-------------+
+    """
+    cleaned_up.clear()
+    response = await client.get(path)
+    assert response.status_code == expected_http_status
+    if path.startswith("/sleep"):
+        # キャンセルされた場合も依存性の終了処理が実行されること
+        assert cleaned_up == ["resource"]
+    if path == "/stream":
+        assert response.text == "chunk\n" * 3
+
+
+@pytest.mark.asyncio
+async def test_redis_socket_timeout(client: AsyncClient) -> None:
+    """
+    リクエストの処理中に取得したRedisクライアントは、残り時間がコマンドのタイムアウトとなること。
+    """
+    response = await client.get("/redis-timeout")
+    assert 0 < response.json()["socket_timeout"] <= DEADLINE_SECONDS
+    client_outside = await get_redis_client()
+    assert client_outside.connection_pool.connection_kwargs.get("socket_timeout") is None
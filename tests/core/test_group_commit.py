@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.core.group_commit import GroupCommitBuffer
+
+
+@pytest.mark.asyncio
+async def test_submit_batches_concurrent_writes() -> None:
+    """
+    同時に登録した書き込みが1回の書き込みにまとめられ、各呼び出し元に対応する結果が返却されること。
+    """
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    buffer = GroupCommitBuffer(flush, max_batch_size=100, max_delay=0.01)
+    results = await asyncio.gather(*(buffer.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_submit_flushes_when_batch_is_full() -> None:
+    """
+    最大件数に達した場合は待機時間を待たずに書き込みを実行すること。
+    """
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return items
+
+    buffer = GroupCommitBuffer(flush, max_batch_size=2, max_delay=60)
+    results = await asyncio.wait_for(asyncio.gather(*(buffer.submit(i) for i in range(4))), 1)
+
+    assert results == [0, 1, 2, 3]
+    assert batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_submit_isolates_failed_item() -> None:
+    """
+    まとめた書き込みが失敗した場合は1件ずつ再実行し、不正な値の呼び出し元のみ例外となること。
+    """
+
+    async def flush(items: list[int]) -> list[int]:
+        if -1 in items:
+            raise ValueError("invalid item")
+        return items
+
+    buffer = GroupCommitBuffer(flush, max_batch_size=100, max_delay=0.01)
+    results = await asyncio.gather(*(buffer.submit(i) for i in (1, -1, 2)), return_exceptions=True)
+
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_flushes_pending_writes() -> None:
+    """
+    drainで待機中の書き込みが実行されること。
+    """
+    flushed: list[int] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        flushed.extend(items)
+        return items
+
+    buffer = GroupCommitBuffer(flush, max_batch_size=100, max_delay=60)
+    task = asyncio.create_task(buffer.submit(1))
+    await asyncio.sleep(0)
+    await buffer.drain()
+
+    assert flushed == [1]
+    assert await task == 1
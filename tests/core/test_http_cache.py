@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from app.core import http_cache
+
+
+def test_generate_etag() -> None:
+    """
+    同じ値からは同じETagが生成され、更新日時が変わるとETagも変わること。
+    """
+    updated = datetime(2025, 7, 1, 0, 0, 0)
+    etag = http_cache.generate_etag(1, updated)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == http_cache.generate_etag(1, updated)
+    assert etag != http_cache.generate_etag(1, updated.replace(microsecond=1))
+
+
+@pytest.mark.parametrize(
+    ["if_none_match", "expected"],
+    [
+        pytest.param(None, False),
+        pytest.param('"1-2"', True),
+        pytest.param('W/"1-2"', True),
+        pytest.param('"0-0", "1-2"', True),
+        pytest.param('"1-3"', False),
+        pytest.param("*", True),
+    ],
+)
+def test_is_not_modified(if_none_match: str | None, expected: bool) -> None:
+    """
+    If-None-MatchとETagの比較について以下ケースを検証する。
+
+    +----+---------------+----------+
+    | No | If-None-Match | expected |
+    +====+===============+==========+
+    | 1  | (none)        | False    |
+    | 2  | "1-2"         | True     |
+    | 3  | W/"1-2"       | True     |
+    | 4  | "0-0", "1-2"  | True     |
+    | 5  | "1-3"         | False    |
+    | 6  | *             | True     |
+    +----+---------------+----------+
+    """
+    assert http_cache.is_not_modified(if_none_match, '"1-2"') == expected
+
+
+def test_generate_cache_control() -> None:
+    """
+    共有キャッシュを許可するCache-Controlが生成されること。
+    """
+    result = http_cache.generate_cache_control(max_age=30, s_maxage=300, stale_while_revalidate=60)
+    assert result == "public, max-age=30, s-maxage=300, stale-while-revalidate=60"
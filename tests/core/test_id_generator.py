@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import id_generator
+from app.core.redis import generate_id_worker_key
+
+
+class Exit(Exception):
+    """
+    リース延長ループを終了させるための例外
+    """
+
+
+def test_generate_unique_and_ordered() -> None:
+    """
+    Snowflake IDが一意かつ単調増加で生成されること。
+    """
+    generator = id_generator.SnowflakeGenerator(worker_id=1)
+    ids = [generator.generate() for _ in range(10000)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_parse_id() -> None:
+    """
+    Snowflake IDから生成時刻、ワーカーIDを復元できること。
+    """
+    generator = id_generator.SnowflakeGenerator(worker_id=123)
+    before = time.time_ns() // 1_000_000
+    snowflake_id = generator.generate()
+    after = time.time_ns() // 1_000_000
+
+    timestamp, worker_id, sequence = id_generator.parse_id(snowflake_id)
+    assert before <= timestamp <= after
+    assert worker_id == 123
+    assert sequence == 0
+    assert snowflake_id < 2**63
+
+
+@pytest.mark.parametrize("worker_id", [-1, id_generator.MAX_WORKER_ID + 1])
+def test_invalid_worker_id(worker_id: int) -> None:
+    """
+    範囲外のワーカーIDを設定できないこと。
+    """
+    with pytest.raises(ValueError):
+        id_generator.SnowflakeGenerator(worker_id=worker_id)
+
+
+def test_generate_uuid7() -> None:
+    """
+    時系列順のUUIDv7が生成されること。
+    """
+    first = id_generator.generate_uuid7()
+    time.sleep(0.002)
+    second = id_generator.generate_uuid7()
+    assert first.version == 7
+    assert first.variant == "specified in RFC 4122"
+    assert first < second
+
+
+@pytest.mark.asyncio
+async def test_worker_id_lease(get_test_redis: Redis) -> None:
+    """
+    ワーカーIDがリースされ、終了時に解放されること。
+    """
+    generator = id_generator.SnowflakeGenerator()
+    async with id_generator.worker_id_lease(get_test_redis, generator) as worker_id:
+        assert generator.worker_id == worker_id
+        assert await get_test_redis.exists(generate_id_worker_key(worker_id)) == 1
+        generator.generate()
+    assert await get_test_redis.exists(generate_id_worker_key(worker_id)) == 0
+    # 解放後は採番しないこと
+    with pytest.raises(id_generator.WorkerIdLeaseError):
+        generator.generate()
+
+
+def test_generate_lease_expired() -> None:
+    """
+    ワーカーIDのリース期限を過ぎた場合は採番しないこと。
+    """
+    generator = id_generator.SnowflakeGenerator()
+    generator.lease_expire_at = time.monotonic() + 60
+    generator.generate()
+
+    generator.lease_expire_at = time.monotonic()
+    with pytest.raises(id_generator.WorkerIdLeaseError):
+        generator.generate()
+
+
+@pytest.mark.asyncio
+async def test_keep_worker_id_alive_retry(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    リース延長に失敗しても再試行を続け、延長できた時点で採番を再開すること。
+    """
+    generator = id_generator.SnowflakeGenerator()
+    generator.worker_id = await id_generator.lease_worker_id(get_test_redis, "token", 60)
+    generator.lease_expire_at = time.monotonic()
+    renew = mocker.patch.object(
+        id_generator,
+        "renew_worker_id",
+        side_effect=[RedisConnectionError("connection lost"), True],
+    )
+    mocker.patch.object(id_generator, "LEASE_RETRY_INTERVAL_SECONDS", 0)
+    sleep = mocker.patch.object(id_generator.asyncio, "sleep", side_effect=[None, None, Exit])
+
+    with pytest.raises(Exit):
+        await id_generator.keep_worker_id_alive(get_test_redis, generator, "token", 60)
+    assert renew.call_count == 2
+    # 失敗後は短い間隔で再試行すること
+    assert sleep.call_args_list[1].args == (0,)
+    generator.generate()
+
+
+@pytest.mark.asyncio
+async def test_keep_worker_id_alive_lost(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    リースを喪失した場合は新しいワーカーIDを取り直すこと。
+    """
+    generator = id_generator.SnowflakeGenerator()
+    generator.worker_id = await id_generator.lease_worker_id(get_test_redis, "token", 60)
+    lost_worker_id = generator.worker_id
+    # 他プロセスにワーカーIDを奪われた状態とする
+    await get_test_redis.set(generate_id_worker_key(lost_worker_id), "other")
+    mocker.patch.object(id_generator.asyncio, "sleep", side_effect=[None, Exit])
+
+    with pytest.raises(Exit):
+        await id_generator.keep_worker_id_alive(get_test_redis, generator, "token", 60)
+    assert generator.worker_id != lost_worker_id
+    assert await get_test_redis.get(generate_id_worker_key(generator.worker_id)) == "token"
+    generator.generate()
@@ -0,0 +1,153 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.core.load_shedding import AdaptiveLimiter, LoadSheddingMiddleware, classify
+from app.enums import RequestPriority
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_limiter(clock: FakeClock | None = None, initial_limit: int = 10) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        initial_limit=initial_limit,
+        min_limit=2,
+        max_limit=12,
+        target_latency=0.5,
+        clock=clock or FakeClock(),
+    )
+
+
+@pytest.mark.parametrize(
+    ["path", "expected"],
+    [
+        pytest.param("/health-check", RequestPriority.CRITICAL, id="health_check"),
+        pytest.param("/user/register/verify-authcode", RequestPriority.CRITICAL, id="token"),
+        pytest.param("/admin/users/export", RequestPriority.LOW, id="admin"),
+        pytest.param("/posts", RequestPriority.NORMAL, id="other"),
+    ],
+)
+def test_classify(path: str, expected: RequestPriority) -> None:
+    """
+    パスから優先度を判定できること。
+    """
+    assert classify(path) == expected
+
+
+@pytest.mark.parametrize(
+    ["priority", "expected"],
+    [
+        pytest.param(RequestPriority.LOW, 5, id="low"),
+        pytest.param(RequestPriority.NORMAL, 9, id="normal"),
+        pytest.param(RequestPriority.CRITICAL, 10, id="critical"),
+    ],
+)
+def test_try_acquire(priority: RequestPriority, expected: int) -> None:
+    """
+    優先度ごとに、同時処理数の上限（10）のうち使用できる割合まで受け付けること。
+    """
+    limiter = create_limiter()
+    assert sum(limiter.try_acquire(priority) for _ in range(20)) == expected
+    assert limiter.in_flight == expected
+
+
+def test_release_decrease() -> None:
+    """
+    目標応答時間を超えた場合・サーバーエラーの場合は上限を減らし、
+    目標応答時間内の再度の減少は行わず、最小値を下回らないこと。
+    """
+    clock = FakeClock()
+    limiter = create_limiter(clock)
+    for _ in range(3):
+        limiter.try_acquire(RequestPriority.NORMAL)
+
+    limiter.release(latency=1.0, overloaded=False)
+    assert limiter.limit == pytest.approx(9.0)
+    limiter.release(latency=0.1, overloaded=True)
+    assert limiter.limit == pytest.approx(9.0)
+
+    clock.now = 0.5
+    limiter.release(latency=0.1, overloaded=True)
+    assert limiter.limit == pytest.approx(8.1)
+    assert limiter.in_flight == 0
+
+    for i in range(1, 30):
+        clock.now = i
+        limiter.try_acquire(RequestPriority.NORMAL)
+        limiter.release(latency=1.0, overloaded=False)
+    assert limiter.limit == 2
+
+
+def test_release_increase() -> None:
+    """
+    目標応答時間内の場合、上限の半分以上を使用していれば上限を増やし、最大値を超えないこと。
+    """
+    limiter = create_limiter(initial_limit=4)
+    limiter.try_acquire(RequestPriority.NORMAL)
+    limiter.release(latency=0.1, overloaded=False)
+    assert limiter.limit == 4
+
+    for _ in range(500):
+        limiter.try_acquire(RequestPriority.NORMAL)
+        limiter.try_acquire(RequestPriority.NORMAL)
+        limiter.release(latency=0.1, overloaded=False)
+        limiter.release(latency=0.1, overloaded=False)
+    assert limiter.limit == 12
+
+
+shed_app = FastAPI()
+release_event = asyncio.Event()
+
+
+@shed_app.get("/wait")
+async def wait() -> dict[str, str]:
+    await release_event.wait()
+    return {"status": "ok"}
+
+
+@shed_app.get("/health-check")
+async def health_check() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncGenerator[AsyncClient]:
+    limiter = create_limiter()
+    app = LoadSheddingMiddleware(shed_app, limiter=limiter, retry_after=3)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_load_shedding_middleware(client: AsyncClient) -> None:
+    """
+    上限に達した場合は通常のリクエストを503（Retry-Afterあり）で拒否し、
+    ヘルスチェックは受け付けること。
+    """
+    release_event.clear()
+    # 上限10のうち通常のリクエストが使用できるのは9件まで
+    waiting = [asyncio.create_task(client.get("/wait")) for _ in range(9)]
+    await asyncio.sleep(0.05)
+
+    response = await client.get("/wait")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "3"
+
+    response = await client.get("/health-check")
+    assert response.status_code == status.HTTP_200_OK
+
+    release_event.set()
+    responses = await asyncio.gather(*waiting)
+    assert all(response.status_code == status.HTTP_200_OK for response in responses)
+    response = await client.get("/wait")
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.core.multipart import MultipartError, iter_file_part
+
+BOUNDARY = "testboundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def build_body(*parts: tuple[str, str | None, bytes]) -> bytes:
+    body = b""
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        body += data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+async def to_stream(body: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(body), chunk_size):
+        yield body[i : i + chunk_size]
+
+
+async def collect(content_type: str, body: bytes, chunk_size: int = 7) -> bytes:
+    return b"".join([
+        chunk async for chunk in iter_file_part(content_type, to_stream(body, chunk_size), "file")
+    ])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+async def test_iter_file_part(chunk_size: int) -> None:
+    """
+    チャンクの分割位置によらず、指定したファイルパートのデータのみが取り出されること。
+    """
+    data = bytes(range(256)) * 4
+    body = build_body(
+        ("comment", None, b"hello"),
+        ("file", "image.png", data),
+        ("file", "other.png", b"ignored"),
+    )
+    assert await collect(CONTENT_TYPE, body, chunk_size) == data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["content_type", "body"],
+    [
+        pytest.param("application/json", b"{}", id="not multipart"),
+        pytest.param("multipart/form-data", build_body(), id="no boundary"),
+        pytest.param(CONTENT_TYPE, build_body(("file", None, b"not a file")), id="no file part"),
+    ],
+)
+async def test_iter_file_part_error(content_type: str, body: bytes) -> None:
+    """
+    multipart/form-dataでない場合、またはファイルパートが存在しない場合はエラーとなること。
+    """
+    with pytest.raises(MultipartError):
+        await collect(content_type, body)
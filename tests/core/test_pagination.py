@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+
+from app.core import pagination
+
+
+def test_cursor_round_trip() -> None:
+    """
+    生成したカーソルから並び順のキーを取得できること（日時はマイクロ秒まで保持する）。
+    """
+    values = [datetime(2025, 1, 1, 12, 0, 0, 123456), 2**60]
+    cursor = pagination.encode_cursor("users", values)
+    assert pagination.decode_cursor("users", cursor, [datetime, int]) == values
+
+
+def _tamper(cursor: str) -> str:
+    signature = cursor.partition(".")[2]
+    return f"{pagination.encode_cursor('users', [1]).partition('.')[0]}.{signature}"
+
+
+@pytest.mark.parametrize(
+    ["scope", "cursor", "types"],
+    [
+        pytest.param("users", "invalid", [int], id="format"),
+        pytest.param("users", "", [int], id="empty"),
+        pytest.param("posts:1", pagination.encode_cursor("posts:2", [1]), [int], id="scope"),
+        pytest.param("users", _tamper(pagination.encode_cursor("users", [2])), [int], id="tamper"),
+        pytest.param("users", pagination.encode_cursor("users", [1, 2]), [int], id="arity"),
+        pytest.param("users", pagination.encode_cursor("users", ["1"]), [int], id="type"),
+        pytest.param("users", pagination.encode_cursor("users", [True]), [int], id="bool"),
+        pytest.param("users", pagination.encode_cursor("users", ["x"]), [datetime], id="datetime"),
+    ],
+)
+def test_decode_cursor_invalid(scope: str, cursor: str, types: list[type]) -> None:
+    """
+    decode_cursorについて以下ケースでInvalidCursorErrorとなることを検証する。
+
+    +----+----------+--------------------------------------+
+    | No | case     | cursor                               |
+    +====+==========+======================================+
+    | 1  | format   | 署名の区切りが無い                   |
+    +----+----------+--------------------------------------+
+    | 2  | empty    | 空文字列                             |
+    +----+----------+--------------------------------------+
+    | 3  | scope    | 別の一覧のカーソル                   |
+    +----+----------+--------------------------------------+
+    | 4  | tamper   | キーを書き換えたカーソル             |
+    +----+----------+--------------------------------------+
+    | 5  | arity    | キーの数が一致しない                 |
+    +----+----------+--------------------------------------+
+    | 6  | type     | キーの型が一致しない                 |
+    +----+----------+--------------------------------------+
+    | 7  | bool     | 整数のキーに真偽値                   |
+    +----+----------+--------------------------------------+
+    | 8  | datetime | 日時のキーに日時でない文字列         |
+    +----+----------+--------------------------------------+
+    """
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(scope, cursor, types)
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from redis.asyncio.client import Redis
+
+from app.core.pubsub_hub import PubSubHub, Subscription, TooManySubscribersError
+
+
+def create_hub(max_subscribers: int = 10, queue_size: int = 3) -> PubSubHub:
+    return PubSubHub("test:control", max_subscribers=max_subscribers, queue_size=queue_size)
+
+
+@pytest.mark.asyncio
+async def test_subscription_drops_oldest() -> None:
+    """
+    キューが満杯の場合は最も古いメッセージを破棄し、破棄した件数を取得するとリセットされること。
+    """
+    subscription = Subscription("test:channel", queue_size=2)
+    for message in ("1", "2", "3"):
+        subscription.put(message)
+
+    assert subscription.take_dropped() == 1
+    assert subscription.take_dropped() == 0
+    assert await subscription.get(0.1) == "2"
+    assert await subscription.get(0.1) == "3"
+    assert await subscription.get(0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_dispatch() -> None:
+    """
+    メッセージがチャネルの購読者にのみ分配され、購読を解除すると分配されないこと。
+    """
+    hub = create_hub()
+    async with hub.subscribe("test:a") as a1, hub.subscribe("test:a") as a2:
+        async with hub.subscribe("test:b") as b:
+            assert hub.count == 3
+            assert hub.dispatch("test:a", "message") == 2
+            assert await a1.get(0.1) == "message"
+            assert await a2.get(0.1) == "message"
+            assert await b.get(0.01) is None
+        assert hub.dispatch("test:b", "message") == 0
+    assert hub.count == 0
+    assert hub.dispatch("test:a", "message") == 0
+
+
+@pytest.mark.asyncio
+async def test_max_subscribers() -> None:
+    """
+    購読者数が上限に達している場合はTooManySubscribersErrorとなり、解除後は購読できること。
+    """
+    hub = create_hub(max_subscribers=1)
+    async with hub.subscribe("test:a"):
+        assert hub.is_full
+        with pytest.raises(TooManySubscribersError):
+            async with hub.subscribe("test:b"):
+                pass
+    assert not hub.is_full
+    async with hub.subscribe("test:b"):
+        assert hub.count == 1
+
+
+@pytest.mark.asyncio
+async def test_run(get_test_redis: Redis) -> None:
+    """
+    起動前・起動後に購読したチャネルに発行したメッセージが購読者に分配されること。
+    """
+    hub = create_hub()
+    async with hub.subscribe("test:before") as before:
+        task = asyncio.create_task(hub.run(get_test_redis))
+        try:
+            async with hub.subscribe("test:after") as after:
+                # 購読の完了を待機する
+                for _ in range(50):
+                    if await get_test_redis.pubsub_numsub("test:before", "test:after") == [
+                        ("test:before", 1),
+                        ("test:after", 1),
+                    ]:
+                        break
+                    await asyncio.sleep(0.02)
+                await get_test_redis.publish("test:before", "message1")
+                await get_test_redis.publish("test:after", "message2")
+
+                assert await before.get(1) == "message1"
+                assert await after.get(1) == "message2"
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -46,3 +46,26 @@ def test_generte_jwt_token_key() -> None:
     expected = f"{redis.PREFIX_JWT_TOKEN}:{token_id}"
     result = redis.generate_jwt_token_key(token_id)
     assert result == expected
+
+
+def test_generate_id_worker_key() -> None:
+    """
+    ワーカーIDリース用のRedisキーが以下形式で取得できること。
+
+    "{Prefix}:{worker_id}"
+    """
+    worker_id = 1
+    expected = f"{redis.PREFIX_ID_WORKER}:{worker_id}"
+    result = redis.generate_id_worker_key(worker_id)
+    assert result == expected
+
+
+def test_generate_queue_key() -> None:
+    """
+    ジョブキュー用、処理中ジョブ用のRedisキーが以下形式で取得できること。
+
+    "{Prefix}:{name}"、"{Prefix}:{name}:processing"、"{Prefix}:{name}:dead"
+    """
+    assert redis.generate_queue_key("image") == f"{redis.PREFIX_QUEUE}:image"
+    assert redis.generate_processing_queue_key("image") == f"{redis.PREFIX_QUEUE}:image:processing"
+    assert redis.generate_dead_letter_queue_key("image") == f"{redis.PREFIX_QUEUE}:image:dead"
@@ -0,0 +1,95 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from app.core.storage import (
+    BlobTooLargeError,
+    LocalBlobStore,
+    UnsupportedMediaTypeError,
+    detect_image_type,
+)
+
+PNG_DATA = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+
+async def to_stream(data: bytes, chunk_size: int = 16) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), chunk_size):
+        yield data[i : i + chunk_size]
+
+
+@pytest.mark.parametrize(
+    ["head", "expected"],
+    [
+        pytest.param(b"\x89PNG\r\n\x1a\n\x00\x00\x00\x00", "image/png", id="png"),
+        pytest.param(b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01", "image/jpeg", id="jpeg"),
+        pytest.param(b"GIF89a\x01\x00\x01\x00\x00\x00", "image/gif", id="gif"),
+        pytest.param(b"RIFF\x00\x00\x00\x00WEBP", "image/webp", id="webp"),
+        pytest.param(b"<html></html", None, id="unsupported"),
+    ],
+)
+def test_detect_image_type(head: bytes, expected: str | None) -> None:
+    """
+    先頭バイト列から画像のMIMEタイプが判定されること。
+    """
+    assert detect_image_type(head) == expected
+
+
+@pytest.mark.asyncio
+async def test_save(tmp_path: Path) -> None:
+    """
+    コンテンツハッシュをキーに保存され、同一内容のファイルは1つだけ保持されること。
+    """
+    store = LocalBlobStore(tmp_path)
+    info = await store.save(to_stream(PNG_DATA), max_bytes=1024)
+    assert info.size == len(PNG_DATA)
+    assert info.media_type == "image/png"
+    assert store.path(info.digest).read_bytes() == PNG_DATA
+    assert await store.media_type(info.digest) == "image/png"
+
+    # 同一内容を再保存しても同じハッシュとなり、一時ファイルが残らないこと
+    assert await store.save(to_stream(PNG_DATA), max_bytes=1024) == info
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["data", "max_bytes", "error"],
+    [
+        pytest.param(PNG_DATA, 64, BlobTooLargeError, id="too large"),
+        pytest.param(b"<html>" + b"\x00" * 100, 1024, UnsupportedMediaTypeError, id="not image"),
+        pytest.param(b"\x89PNG", 1024, UnsupportedMediaTypeError, id="too short"),
+    ],
+)
+async def test_save_error(
+    tmp_path: Path, data: bytes, max_bytes: int, error: type[Exception]
+) -> None:
+    """
+    サイズ上限超過、または画像でない場合はエラーとなり、ファイルが残らないこと。
+    """
+    store = LocalBlobStore(tmp_path)
+    with pytest.raises(error):
+        await store.save(to_stream(data), max_bytes=max_bytes)
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+@pytest.mark.asyncio
+async def test_media_type_not_found(tmp_path: Path) -> None:
+    """
+    存在しないBlobのMIMEタイプはNoneとなること。
+    """
+    assert await LocalBlobStore(tmp_path).media_type("0" * 64) is None
+
+
+@pytest.mark.asyncio
+async def test_save_variant(tmp_path: Path) -> None:
+    """
+    派生ファイルが元のBlobと同じディレクトリに保存されること。
+    """
+    store = LocalBlobStore(tmp_path)
+    info = await store.save(to_stream(PNG_DATA), max_bytes=1024)
+    assert await store.media_type(info.digest, "thumb") is None
+
+    await store.save_variant(info.digest, "thumb", b"RIFF\x00\x00\x00\x00WEBP")
+    assert store.path(info.digest, "thumb").parent == store.path(info.digest).parent
+    assert await store.media_type(info.digest, "thumb") == "image/webp"
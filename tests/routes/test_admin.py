@@ -0,0 +1,136 @@
+import gzip
+import json
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockFixture
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.main import app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["headers"],
+    [
+        pytest.param({}, id="missing"),
+        pytest.param({"X-Admin-Key": "invalid"}, id="invalid"),
+    ],
+)
+async def test_export_users_unauthorized(async_client: AsyncClient, headers: dict[str, str]):
+    """
+    管理APIの認証キーが無い・一致しない場合は401となること。
+    """
+    response = await async_client.get("/admin/users/export", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_export_users(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    insert_test_data_user: None,
+):
+    """
+    ユーザーエクスポートAPIについて以下ケースを検証する。
+
+    +----+----------------+----------------------+-------------------------+
+    | No | case           | format               | content type            |
+    +====+================+======================+=========================+
+    | 1  | NDJSON.        | ndjson               | application/x-ndjson    |
+    +----+----------------+----------------------+-------------------------+
+    | 2  | CSV with gzip. | csv (gzip=true)      | application/gzip        |
+    +----+----------------+----------------------+-------------------------+
+    """
+    app.dependency_overrides[get_session_factory] = lambda: get_test_session
+    headers = {"X-Admin-Key": get_settings().ADMIN_API_KEY}
+    try:
+        response = await async_client.get("/admin/users/export", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        users = [json.loads(line) for line in response.text.splitlines()]
+        user_ids = [int(user["user_id"]) for user in users]
+        assert users and user_ids == sorted(user_ids)
+
+        response = await async_client.get(
+            "/admin/users/export", params={"format": "csv", "gzip": "true"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'filename="users.csv.gz"' in response.headers["content-disposition"]
+        lines = gzip.decompress(response.content).decode().splitlines()
+        assert lines[0].startswith("user_id,username,")
+        assert len(lines) == len(users) + 1
+    finally:
+        app.dependency_overrides.pop(get_session_factory, None)
+
+
+@pytest.mark.asyncio
+async def test_import_users(async_client: AsyncClient, insert_test_data_user: None):
+    """
+    ユーザー一括登録APIで、行ごとの結果が返却されること。
+    """
+    body = "\n".join([
+        json.dumps({"account_name": "新規", "email": "new@sample.com", "birthday": "2000-01-01"}),
+        json.dumps({
+            "account_name": "登録済",
+            "email": "user1@sample.com",
+            "birthday": "2000-01-01",
+        }),
+        "invalid",
+    ])
+    response = await async_client.post(
+        "/admin/users/import",
+        content=body.encode(),
+        headers={"X-Admin-Key": get_settings().ADMIN_API_KEY},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["created"], data["failed"]) == (1, 2)
+    assert [result["status"] for result in data["results"]] == [
+        "created",
+        "email_conflict",
+        "invalid",
+    ]
+    assert data["results"][0]["user_id"] is not None
+
+
+@pytest.mark.asyncio
+async def test_import_users_too_large(async_client: AsyncClient, mocker: MockFixture):
+    """
+    行数が上限を超えた場合は413となること。
+    """
+    mocker.patch.object(get_settings(), "IMPORT_MAX_ROWS", 1)
+    response = await async_client.post(
+        "/admin/users/import",
+        content=b"{}\n{}\n",
+        headers={"X-Admin-Key": get_settings().ADMIN_API_KEY},
+    )
+    assert response.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_list_users(async_client: AsyncClient, insert_test_data_user: None):
+    """
+    ユーザー一覧をカーソルで重複・欠落なく取得できること。
+    """
+    headers = {"X-Admin-Key": get_settings().ADMIN_API_KEY}
+    response = await async_client.get("/admin/users", params={"limit": 2}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    first = response.json()
+    assert len(first["items"]) == 2
+    assert first["has_next"] is True
+
+    response = await async_client.get(
+        "/admin/users", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers
+    )
+    second = response.json()
+    assert second["has_next"] is False
+    assert {user["username"] for user in first["items"] + second["items"]} == {
+        "user1",
+        "user2",
+        "user3",
+    }
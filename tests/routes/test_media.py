@@ -0,0 +1,132 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockFixture
+
+from app.core.storage import BlobStore
+
+PNG_DATA = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+WEBP_DATA = b"RIFF\x00\x00\x00\x00WEBPVP8 "
+
+
+async def to_stream(data: bytes):
+    yield data
+
+
+@pytest.mark.asyncio
+async def test_get_media(async_client: AsyncClient, test_blob_store: BlobStore):
+    """
+    保存済みの画像が長期キャッシュ可能なヘッダー付きで返却され、Rangeリクエストに対応すること。
+    """
+    info = await test_blob_store.save(to_stream(PNG_DATA), max_bytes=1024)
+
+    response = await async_client.get(f"/media/{info.digest}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == PNG_DATA
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{info.digest}"'
+    assert "immutable" in response.headers["cache-control"]
+
+    # Rangeリクエストの場合は指定範囲のみ返却すること
+    response = await async_client.get(f"/media/{info.digest}", headers={"Range": "bytes=0-7"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == PNG_DATA[:8]
+
+    # ETag一致の場合は304（ボディなし）
+    response = await async_client.get(
+        f"/media/{info.digest}", headers={"If-None-Match": f'"{info.digest}"'}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_get_media_accel_redirect(
+    async_client: AsyncClient, test_blob_store: BlobStore, mocker: MockFixture
+):
+    """
+    X-Accel-Redirect用パスが設定されている場合は、ボディを返却せずファイル送信をプロキシに委譲すること。
+    """
+    info = await test_blob_store.save(to_stream(PNG_DATA), max_bytes=1024)
+    settings = mocker.patch("app.routes.media.get_settings").return_value
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected/"
+    settings.STORAGE_ROOT = str(test_blob_store.path(info.digest).parents[2])
+
+    response = await async_client.get(f"/media/{info.digest}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == (
+        f"/protected/{info.digest[:2]}/{info.digest[2:4]}/{info.digest}"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["digest", "expected_http_status"],
+    [
+        pytest.param("0" * 64, status.HTTP_404_NOT_FOUND, id="not found"),
+        pytest.param("invalid", status.HTTP_422_UNPROCESSABLE_CONTENT, id="invalid digest"),
+    ],
+)
+async def test_get_media_error(
+    async_client: AsyncClient,
+    test_blob_store: BlobStore,
+    digest: str,
+    expected_http_status: int,
+):
+    """
+    存在しない、または不正なハッシュの場合はエラーを返却すること。
+    """
+    response = await async_client.get(f"/media/{digest}")
+    assert response.status_code == expected_http_status
+
+
+@pytest.mark.asyncio
+async def test_get_media_variant(async_client: AsyncClient, test_blob_store: BlobStore):
+    """
+    生成済みの派生画像はETag付きで返却されること。
+    """
+    info = await test_blob_store.save(to_stream(PNG_DATA), max_bytes=1024)
+    await test_blob_store.save_variant(info.digest, "thumb", WEBP_DATA)
+
+    response = await async_client.get(f"/media/{info.digest}/thumb")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == WEBP_DATA
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["etag"] == f'"{info.digest}.thumb"'
+    assert "immutable" in response.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+async def test_get_media_variant_pending(async_client: AsyncClient, test_blob_store: BlobStore):
+    """
+    派生画像が未生成の場合は、キャッシュさせずに元画像へリダイレクトすること。
+    """
+    info = await test_blob_store.save(to_stream(PNG_DATA), max_bytes=1024)
+
+    response = await async_client.get(f"/media/{info.digest}/thumb")
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+    assert response.headers["location"] == f"/media/{info.digest}"
+    assert response.headers["cache-control"] == "no-store"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["variant", "has_original"],
+    [
+        pytest.param("unknown", True, id="unknown variant"),
+        pytest.param("thumb", False, id="original not found"),
+    ],
+)
+async def test_get_media_variant_not_found(
+    async_client: AsyncClient, test_blob_store: BlobStore, variant: str, has_original: bool
+):
+    """
+    未定義の派生画像種別、または元画像が存在しない場合は404を返却すること。
+    """
+    digest = "0" * 64
+    if has_original:
+        digest = (await test_blob_store.save(to_stream(PNG_DATA), max_bytes=1024)).digest
+
+    response = await async_client.get(f"/media/{digest}/{variant}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.pubsub_hub import PubSubHub
+from app.main import app
+from app.models import User
+from app.schemas import user_schema
+from app.services import notification_service, token_service
+
+
+async def create_auth_header(
+    get_test_session: async_sessionmaker[AsyncSession], redis: Redis, username: str
+) -> dict[str, str]:
+    """
+    テスト用ユーザーのアクセストークンを設定したAuthorizationヘッダーを生成する。
+    """
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == username))).scalar_one()
+    token = await token_service.create_access_token(user_schema.User.model_validate(user), redis)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_stream_notifications_unauthorized(async_client: AsyncClient):
+    """
+    未認証の場合は401となること。
+    """
+    response = await async_client.get("/notifications/stream")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_stream_notifications_too_many_connections(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    接続数が上限に達している場合は503となり、再接続までの待機秒数が返却されること。
+    """
+    app.dependency_overrides[notification_service.get_notification_hub] = lambda: PubSubHub(
+        "test:control", max_subscribers=0, queue_size=1
+    )
+    try:
+        headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+        response = await async_client.get("/notifications/stream", headers=headers)
+    finally:
+        app.dependency_overrides.pop(notification_service.get_notification_hub, None)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "Retry-After" in response.headers
@@ -0,0 +1,193 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.redis import generate_queue_key
+from app.models import Post, User
+from app.schemas import user_schema
+from app.services import timeline_service, token_service
+
+
+async def create_auth_header(
+    get_test_session: async_sessionmaker[AsyncSession], redis: Redis, username: str
+) -> dict[str, str]:
+    """
+    テスト用ユーザーのアクセストークンを設定したAuthorizationヘッダーを生成する。
+    """
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == username))).scalar_one()
+    token = await token_service.create_access_token(user_schema.User.model_validate(user), redis)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["body", "expected_http_status"],
+    [
+        pytest.param({"content": "はじめてのつぶやき"}, status.HTTP_201_CREATED),
+        pytest.param({"content": ""}, status.HTTP_422_UNPROCESSABLE_CONTENT),
+        pytest.param({"content": "あ" * 141}, status.HTTP_422_UNPROCESSABLE_CONTENT),
+        pytest.param({"content": "返信", "reply_to_post_id": "1"}, status.HTTP_404_NOT_FOUND),
+    ],
+)
+async def test_create_post(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+    body: dict[str, str],
+    expected_http_status: int,
+):
+    """
+    投稿APIについて以下ケースを検証する。
+
+    +----+------------------------------+-------------+
+    | No | case                         | HTTP status |
+    +====+==============================+=============+
+    | 1  | Success.                     | 201         |
+    +----+------------------------------+-------------+
+    | 2  | Error(empty content).        | 422         |
+    +----+------------------------------+-------------+
+    | 3  | Error(content too long).     | 422         |
+    +----+------------------------------+-------------+
+    | 4  | Error(reply target missing). | 404         |
+    +----+------------------------------+-------------+
+    """
+    headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+    response = await async_client.post("/posts", json=body, headers=headers)
+    assert response.status_code == expected_http_status
+
+    async with get_test_session() as db:
+        posts = (await db.scalars(select(Post))).all()
+    if expected_http_status == status.HTTP_201_CREATED:
+        response_obj = response.json()
+        # Snowflake IDは文字列で返却されること
+        assert isinstance(response_obj["post_id"], str)
+        assert response_obj["content"] == body["content"]
+        assert [str(post.post_id) for post in posts] == [response_obj["post_id"]]
+
+        # 登録した投稿が取得できること
+        response = await async_client.get(f"/posts/{response_obj['post_id']}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == response_obj
+    else:
+        assert posts == []
+
+
+@pytest.mark.asyncio
+async def test_create_post_concurrently(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    同時に投稿した場合も、全ての投稿がそれぞれの投稿者の投稿として登録されること。
+    """
+    headers = [
+        await create_auth_header(get_test_session, get_test_redis, f"user{i}") for i in (1, 2, 3)
+    ]
+    responses = await asyncio.gather(
+        *(
+            async_client.post("/posts", json={"content": f"投稿{i}"}, headers=header)
+            for i, header in enumerate(headers)
+        )
+    )
+    assert all(response.status_code == status.HTTP_201_CREATED for response in responses)
+
+    async with get_test_session() as db:
+        rows = (await db.execute(select(Post.content, User.username).join(User))).all()
+    assert sorted(rows) == [("投稿0", "user1"), ("投稿1", "user2"), ("投稿2", "user3")]
+
+
+@pytest.mark.asyncio
+async def test_create_post_unauthorized(async_client: AsyncClient):
+    """
+    認証トークンが存在しない場合は401を返却すること。
+    """
+    response = await async_client.post("/posts", json={"content": "投稿"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_get_post_not_found(async_client: AsyncClient):
+    """
+    存在しない投稿の場合は404を返却すること。
+    """
+    response = await async_client.get("/posts/1")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_home_timeline(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    フォロー中のユーザーの投稿が配信され、自分の投稿と合わせて新しい順に取得できること。
+    """
+    user1 = await create_auth_header(get_test_session, get_test_redis, "user1")
+    user2 = await create_auth_header(get_test_session, get_test_redis, "user2")
+    await async_client.post("/user/user2/follow", headers=user1)
+
+    await async_client.post("/posts", json={"content": "user1の投稿"}, headers=user1)
+    await async_client.post("/posts", json={"content": "user2の投稿"}, headers=user2)
+    # 配信ワーカーの処理
+    while job := await get_test_redis.lpop(generate_queue_key(timeline_service.TIMELINE_QUEUE)):
+        obj = json.loads(job)
+        await timeline_service.fanout_post(get_test_redis, obj["post_id"], obj["user_id"])
+
+    response = await async_client.get("/timeline/home", headers=user1)
+    assert response.status_code == status.HTTP_200_OK
+    assert [p["content"] for p in response.json()["posts"]] == ["user2の投稿", "user1の投稿"]
+
+    # user2のホームタイムラインにはuser1の投稿は配信されないこと
+    response = await async_client.get("/timeline/home", headers=user2)
+    assert [p["content"] for p in response.json()["posts"]] == ["user2の投稿"]
+
+
+@pytest.mark.asyncio
+async def test_like_post(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    いいね・いいね取り消しを繰り返しても件数が重複して加算されず、
+    DBへの反映前も取得した投稿の件数に反映されること。
+    """
+    headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+    response = await async_client.post("/posts", json={"content": "投稿"}, headers=headers)
+    post_id = response.json()["post_id"]
+
+    for _ in range(2):
+        response = await async_client.put(f"/posts/{post_id}/like", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = await async_client.get(f"/posts/{post_id}")
+    assert response.json()["like_count"] == 1
+
+    for _ in range(2):
+        response = await async_client.delete(f"/posts/{post_id}/like", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = await async_client.get(f"/posts/{post_id}")
+    assert response.json()["like_count"] == 0
+
+    # 返信すると返信先の返信数に加算されること
+    await async_client.post(
+        "/posts", json={"content": "返信", "reply_to_post_id": post_id}, headers=headers
+    )
+    response = await async_client.get(f"/posts/{post_id}")
+    assert response.json()["reply_count"] == 1
+
+    # 存在しない投稿にはいいねできないこと
+    response = await async_client.put("/posts/1/like", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
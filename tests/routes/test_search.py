@@ -0,0 +1,50 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["params", "expected_http_status", "expected_usernames"],
+    [
+        pytest.param({"q": "user"}, status.HTTP_200_OK, ["user1", "user2", "user3"]),
+        pytest.param({"q": "ユーザー2"}, status.HTTP_200_OK, ["user2"]),
+        pytest.param({"q": "ｕ", "limit": "1"}, status.HTTP_200_OK, ["user1"]),
+        pytest.param({"q": "zzz"}, status.HTTP_200_OK, []),
+        pytest.param({"q": ""}, status.HTTP_422_UNPROCESSABLE_CONTENT, None),
+        pytest.param({"q": "user", "limit": "21"}, status.HTTP_422_UNPROCESSABLE_CONTENT, None),
+    ],
+)
+async def test_search_users(
+    async_client: AsyncClient,
+    insert_test_data_user: None,
+    params: dict[str, str],
+    expected_http_status: int,
+    expected_usernames: list[str] | None,
+):
+    """
+    ユーザー検索APIについて以下ケースを検証する。
+
+    +----+---------------------------------+-------------+
+    | No | case                            | HTTP status |
+    +====+=================================+=============+
+    | 1  | Success(username).              | 200         |
+    +----+---------------------------------+-------------+
+    | 2  | Success(japanese account name). | 200         |
+    +----+---------------------------------+-------------+
+    | 3  | Success(short query, limit).    | 200         |
+    +----+---------------------------------+-------------+
+    | 4  | Success(no match).              | 200         |
+    +----+---------------------------------+-------------+
+    | 5  | Error(empty query).             | 422         |
+    +----+---------------------------------+-------------+
+    | 6  | Error(limit too large).         | 422         |
+    +----+---------------------------------+-------------+
+    """
+    response = await async_client.get("/search/users", params=params)
+    assert response.status_code == expected_http_status
+    if expected_usernames is not None:
+        users = response.json()["users"]
+        assert [user["username"] for user in users] == expected_usernames
+        # 公開可能な項目のみを返却すること
+        assert all("email" not in user for user in users)
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import User
+from app.schemas import user_schema
+from app.services import token_service, trend_service
+
+
+async def create_auth_header(
+    get_test_session: async_sessionmaker[AsyncSession], redis: Redis, username: str
+) -> dict[str, str]:
+    """
+    テスト用ユーザーのアクセストークンを設定したAuthorizationヘッダーを生成する。
+    """
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == username))).scalar_one()
+    token = await token_service.create_access_token(user_schema.User.model_validate(user), redis)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_get_trends(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    投稿したハッシュタグがスナップショットの更新後にトレンドとして取得できること。
+    """
+    response = await async_client.get("/trends", params={"window": "5m"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"window": "5m", "trends": [], "as_of": None}
+
+    headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+    for content in ("#FastAPI 入門", "#fastapi と #Redis"):
+        await async_client.post("/posts", json={"content": content}, headers=headers)
+    await trend_service.refresh_snapshots(get_test_redis)
+
+    response = await async_client.get("/trends", params={"window": "5m"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["trends"] == [
+        {"hashtag": "fastapi", "count": 2},
+        {"hashtag": "redis", "count": 1},
+    ]
+
+    response = await async_client.get("/trends", params={"window": "1w"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
@@ -11,8 +11,12 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core import redis
 from app.core.config import get_settings
+from app.core.storage import BlobStore
 from app.models import User
 from app.schemas import auth_schema, user_schema
+from app.services import token_service
+
+PNG_DATA = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
 
 
 @pytest_asyncio.fixture
@@ -193,3 +197,311 @@ async def test_verify_authcode(
         # 異常系の場合、DBにユーザーが登録されないこと
         else:
             assert len(result) == expected_before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["username", "expected_http_status"],
+    [
+        pytest.param("user1", status.HTTP_200_OK),
+        pytest.param("user9", status.HTTP_404_NOT_FOUND),
+    ],
+)
+async def test_get_user_profile(
+    async_client: AsyncClient,
+    insert_test_data_user: None,
+    username: str,
+    expected_http_status: int,
+):
+    """
+    ユーザープロフィール取得APIについて以下ケースを検証する。
+
+    +----+--------------------+----------+-------------+
+    | No | case               | username | HTTP status |
+    +====+====================+==========+=============+
+    | 1  | Success.           | user1    | 200         |
+    +----+--------------------+----------+-------------+
+    | 2  | Error(not found).  | user9    | 404         |
+    +----+--------------------+----------+-------------+
+    """
+    response = await async_client.get(f"/user/{username}")
+    assert response.status_code == expected_http_status
+
+    if expected_http_status == status.HTTP_200_OK:
+        response_obj = response.json()
+        assert response_obj["username"] == username
+        # Snowflake IDはJavaScriptで精度が失われないよう文字列で返却されること
+        assert isinstance(response_obj["user_id"], str)
+        assert int(response_obj["user_id"]) > 0
+        # 非公開項目が含まれないこと
+        assert "email" not in response_obj
+        assert "birthday" not in response_obj
+        assert response.headers["etag"]
+        assert "public" in response.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["name", "expected_http_status", "expected_available"],
+    [
+        pytest.param("user1", status.HTTP_200_OK, False),
+        pytest.param("newname", status.HTTP_200_OK, True),
+        pytest.param("", status.HTTP_422_UNPROCESSABLE_CONTENT, None),
+    ],
+)
+async def test_check_username_availability(
+    async_client: AsyncClient,
+    insert_test_data_user: None,
+    name: str,
+    expected_http_status: int,
+    expected_available: bool | None,
+):
+    """
+    ユーザー名使用可否確認APIについて以下ケースを検証する。
+    （GET /user/{username} ではなく本APIにルーティングされること）
+
+    +----+---------------------+----------+-------------+-----------+
+    | No | case                | name     | HTTP status | available |
+    +====+=====================+==========+=============+===========+
+    | 1  | Success(registered) | user1    | 200         | False     |
+    +----+---------------------+----------+-------------+-----------+
+    | 2  | Success(available)  | newname  | 200         | True      |
+    +----+---------------------+----------+-------------+-----------+
+    | 3  | Error(empty name)   |          | 422         | -         |
+    +----+---------------------+----------+-------------+-----------+
+    """
+    response = await async_client.get("/user/username-available", params={"name": name})
+    assert response.status_code == expected_http_status
+    if expected_available is not None:
+        assert response.json() == {"name": name, "available": expected_available}
+
+
+@pytest.mark.asyncio
+async def test_get_user_profile_not_modified(
+    async_client: AsyncClient,
+    insert_test_data_user: None,
+):
+    """
+    If-None-MatchがETagと一致する場合は304を返却すること。
+    """
+    response = await async_client.get("/user/user1")
+    etag = response.headers["etag"]
+
+    # ETag一致の場合は304（ボディなし）
+    response = await async_client.get("/user/user1", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # ETag不一致の場合は200
+    response = await async_client.get("/user/user1", headers={"If-None-Match": '"0-0"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["path", "column", "content", "expected_http_status"],
+    [
+        pytest.param("/user/me/profile-image", "profile_image", PNG_DATA, status.HTTP_200_OK),
+        pytest.param("/user/me/header-image", "header_image", PNG_DATA, status.HTTP_200_OK),
+        pytest.param(
+            "/user/me/profile-image",
+            "profile_image",
+            b"<html></html>",
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        ),
+        pytest.param(
+            "/user/me/profile-image",
+            "profile_image",
+            b"\x89PNG\r\n\x1a\n" + b"\x00" * get_settings().IMAGE_MAX_BYTES,
+            status.HTTP_413_CONTENT_TOO_LARGE,
+        ),
+    ],
+)
+async def test_upload_user_image(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+    test_blob_store: BlobStore,
+    path: str,
+    column: str,
+    content: bytes,
+    expected_http_status: int,
+):
+    """
+    ユーザー画像アップロードAPIについて以下ケースを検証する。
+
+    +----+-------------------------+----------------+-------------+
+    | No | case                    | image          | HTTP status |
+    +====+=========================+================+=============+
+    | 1  | Success(profile image). | png            | 200         |
+    +----+-------------------------+----------------+-------------+
+    | 2  | Success(header image).  | png            | 200         |
+    +----+-------------------------+----------------+-------------+
+    | 3  | Error(not image).       | html           | 415         |
+    +----+-------------------------+----------------+-------------+
+    | 4  | Error(too large).       | png(over max)  | 413         |
+    +----+-------------------------+----------------+-------------+
+    """
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == "user1"))).scalar_one()
+    token = await token_service.create_access_token(
+        user_schema.User.model_validate(user), get_test_redis
+    )
+
+    response = await async_client.put(
+        path,
+        files={"file": ("image.png", content, "image/png")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == expected_http_status
+
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == "user1"))).scalar_one()
+    if expected_http_status == status.HTTP_200_OK:
+        digest = response.json()["image"]
+        # DBにはコンテンツハッシュのみ保存され、画像本体はBlobストアに保存されること
+        assert getattr(user, column) == digest
+        assert test_blob_store.path(digest).read_bytes() == content
+        # アップロードした画像が取得できること
+        response = await async_client.get(response.json()["url"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == content
+    else:
+        assert getattr(user, column) is None
+
+
+@pytest.mark.asyncio
+async def test_upload_user_image_unauthorized(async_client: AsyncClient):
+    """
+    認証トークンが存在しない場合は401を返却すること。
+    """
+    response = await async_client.put(
+        "/user/me/profile-image", files={"file": ("image.png", PNG_DATA, "image/png")}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def create_auth_header(
+    get_test_session: async_sessionmaker[AsyncSession], redis: Redis, username: str
+) -> dict[str, str]:
+    """
+    テスト用ユーザーのアクセストークンを設定したAuthorizationヘッダーを生成する。
+    """
+    async with get_test_session() as db:
+        user = (await db.execute(select(User).where(User.username == username))).scalar_one()
+    token = await token_service.create_access_token(user_schema.User.model_validate(user), redis)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["username", "expected_http_status"],
+    [
+        pytest.param("user2", status.HTTP_204_NO_CONTENT),
+        pytest.param("user1", status.HTTP_400_BAD_REQUEST),
+        pytest.param("user9", status.HTTP_404_NOT_FOUND),
+    ],
+)
+async def test_follow_user(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+    username: str,
+    expected_http_status: int,
+):
+    """
+    フォローAPIについて以下ケースを検証する（user1でフォローする）。
+
+    +----+------------------------+----------+-------------+
+    | No | case                   | username | HTTP status |
+    +====+========================+==========+=============+
+    | 1  | Success.               | user2    | 204         |
+    +----+------------------------+----------+-------------+
+    | 2  | Error(follow oneself). | user1    | 400         |
+    +----+------------------------+----------+-------------+
+    | 3  | Error(not found).      | user9    | 404         |
+    +----+------------------------+----------+-------------+
+    """
+    headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+    response = await async_client.post(f"/user/{username}/follow", headers=headers)
+    assert response.status_code == expected_http_status
+
+    response = await async_client.get(f"/user/{username}/followers")
+    if expected_http_status == status.HTTP_204_NO_CONTENT:
+        response_obj = response.json()
+        assert response_obj["count"] == 1
+        assert [u["username"] for u in response_obj["users"]] == ["user1"]
+        assert response_obj["next_cursor"] is None
+
+        response = await async_client.get("/user/user1/following")
+        assert [u["username"] for u in response.json()["users"]] == [username]
+
+        # フォロー解除
+        response = await async_client.delete(f"/user/{username}/follow", headers=headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = await async_client.get(f"/user/{username}/followers")
+        assert response.json() == {"users": [], "count": 0, "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_get_followers_paginated(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    フォロワー一覧をカーソルで重複・欠落なく取得でき、不正なカーソルの場合は400を返却すること。
+    """
+    for follower in ("user1", "user2"):
+        headers = await create_auth_header(get_test_session, get_test_redis, follower)
+        await async_client.post("/user/user3/follow", headers=headers)
+
+    response = await async_client.get("/user/user3/followers", params={"limit": 1})
+    first = response.json()
+    assert first["count"] == 2
+    assert first["next_cursor"] is not None
+
+    response = await async_client.get(
+        "/user/user3/followers", params={"limit": 1, "cursor": first["next_cursor"]}
+    )
+    second = response.json()
+    assert second["next_cursor"] is None
+    assert {u["username"] for u in first["users"] + second["users"]} == {"user1", "user2"}
+
+    response = await async_client.get("/user/user3/followers", params={"cursor": "invalid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_user_posts(
+    async_client: AsyncClient,
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+):
+    """
+    ユーザーの投稿一覧を新しい順にカーソルで取得でき、不正なカーソルの場合は400を返却すること。
+    """
+    headers = await create_auth_header(get_test_session, get_test_redis, "user1")
+    for i in range(3):
+        await async_client.post("/posts", json={"content": f"投稿{i}"}, headers=headers)
+
+    response = await async_client.get("/user/user1/posts", params={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    first = response.json()
+    assert first["has_next"] is True
+    assert [post["content"] for post in first["items"]] == ["投稿2", "投稿1"]
+
+    response = await async_client.get(
+        "/user/user1/posts", params={"limit": 2, "cursor": first["next_cursor"]}
+    )
+    second = response.json()
+    assert second == {"items": second["items"], "next_cursor": None, "has_next": False}
+    assert [post["content"] for post in second["items"]] == ["投稿0"]
+
+    response = await async_client.get("/user/user2/posts", params={"cursor": first["next_cursor"]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_mock import MockFixture
+
+from app.services import archive_service
+
+
+@pytest.mark.asyncio
+async def test_archive_deleted_users_explicit_zero(mocker: MockFixture) -> None:
+    """
+    保持日数に0を明示した場合は設定値ではなく0日（論理削除済みの全ユーザー）が対象となること。
+    """
+    mocker.patch.object(archive_service, "get_settings").return_value.ARCHIVE_RETENTION_DAYS = 30
+    archive = mocker.patch.object(
+        archive_service.crud, "archive_deleted_users", AsyncMock(side_effect=[2, 1])
+    )
+    before = archive_service.datetime.now()
+
+    total = await archive_service.archive_deleted_users(AsyncMock(), retention_days=0, batch_size=2)
+    assert total == 3
+    assert archive.call_count == 2
+    assert archive.call_args.kwargs["threshold"] >= before
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["retention_days", "batch_size"],
+    [
+        pytest.param(-1, 1, id="negative retention days"),
+        pytest.param(0, 0, id="zero batch size"),
+    ],
+)
+async def test_archive_deleted_users_invalid(retention_days: int, batch_size: int) -> None:
+    """
+    保持日数が負、またはバッチ件数が1未満の場合はエラーとなること。
+    """
+    with pytest.raises(ValueError):
+        await archive_service.archive_deleted_users(
+            AsyncMock(), retention_days=retention_days, batch_size=batch_size
+        )
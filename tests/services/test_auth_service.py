@@ -1,3 +1,5 @@
+from uuid import UUID
+
 import pytest
 from fastapi import HTTPException
 from freezegun import freeze_time
@@ -71,9 +73,9 @@ async def test_verify_authcode(
 
     async with get_test_session() as db:
         if is_success:
-            result = await auth_service.verify_authcode(db, test_authcode_id, test_code)
-            assert result.authcode_id == test_authcode_id
+            result = await auth_service.verify_authcode(db, UUID(test_authcode_id), test_code)
+            assert str(result.authcode_id) == test_authcode_id
             assert result.code == test_code
         else:
             with pytest.raises(HTTPException):
-                await auth_service.verify_authcode(db, test_authcode_id, test_code)
+                await auth_service.verify_authcode(db, UUID(test_authcode_id), test_code)
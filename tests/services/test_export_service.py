@@ -0,0 +1,93 @@
+import gzip
+import json
+from collections.abc import AsyncGenerator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from app.enums import ExportFormat
+from app.services import export_service
+
+ROWS: list[dict[str, Any]] = [
+    {
+        "user_id": 2**60 + i,
+        "username": f"user{i}",
+        "account_name": f"ユーザー,{i}",
+        "email": f"user{i}@sample.com",
+        "birthday": date(2000, 1, 1),
+        "verified_flag": i == 1,
+        "account_lock_flag": False,
+        "create_datetime": datetime(2025, 1, 1, 0, 0, i),
+        "update_datetime": datetime(2025, 1, 2),
+    }
+    for i in range(1, 4)
+]
+
+
+async def batches(rows: list[dict[str, Any]], size: int) -> AsyncGenerator[Sequence[Any]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]  # type: ignore[misc]
+
+
+async def collect(export_format: ExportFormat, rows: list[dict[str, Any]]) -> str:
+    chunks = [
+        chunk async for chunk in export_service.encode_batches(batches(rows, 2), export_format)
+    ]
+    return b"".join(chunks).decode()
+
+
+@pytest.mark.asyncio
+async def test_encode_ndjson() -> None:
+    """
+    1行に1ユーザーのJSONが出力され、ユーザーIDは文字列、日時はISO形式となること。
+    """
+    lines = (await collect(ExportFormat.NDJSON, ROWS)).splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == {
+        "user_id": str(2**60 + 1),
+        "username": "user1",
+        "account_name": "ユーザー,1",
+        "email": "user1@sample.com",
+        "birthday": "2000-01-01",
+        "verified_flag": True,
+        "account_lock_flag": False,
+        "create_datetime": "2025-01-01T00:00:01",
+        "update_datetime": "2025-01-02T00:00:00",
+    }
+
+
+@pytest.mark.parametrize(
+    ["rows", "expected_lines"],
+    [
+        pytest.param(ROWS, 4, id="rows"),
+        pytest.param([], 1, id="empty"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_encode_csv(rows: list[dict[str, Any]], expected_lines: int) -> None:
+    """
+    ヘッダーはバッチ数・件数によらず先頭に1回のみ出力され、区切り文字を含む値は引用符で囲まれること。
+    """
+    lines = (await collect(ExportFormat.CSV, rows)).splitlines()
+    assert len(lines) == expected_lines
+    assert lines[0] == ",".join(export_service.EXPORT_FIELDS)
+    if rows:
+        assert lines[1].startswith(f'{2**60 + 1},user1,"ユーザー,1",')
+
+
+@pytest.mark.asyncio
+async def test_gzip_chunks() -> None:
+    """
+    チャンクごとに出力された圧縮データを連結すると、元のデータに展開できること。
+    """
+
+    async def chunks() -> AsyncGenerator[bytes]:
+        for i in range(3):
+            yield f"chunk{i}\n".encode() * 100
+
+    compressed = [chunk async for chunk in export_service.gzip_chunks(chunks())]
+    assert len(compressed) == 4
+    assert gzip.decompress(b"".join(compressed)) == b"".join(
+        f"chunk{i}\n".encode() * 100 for i in range(3)
+    )
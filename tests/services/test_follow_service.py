@@ -0,0 +1,103 @@
+import pytest
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import pagination
+from app.core.redis import generate_followers_key, generate_following_key
+from app.models import Follow, User
+from app.services import follow_service
+
+
+@pytest.mark.asyncio
+async def test_list_page_keyset(get_test_redis: Redis) -> None:
+    """
+    フォロー日時の新しい順に、同一スコアの要素を含めて重複・欠落なくページングできること。
+    """
+    key = generate_followers_key(1)
+    # 同一スコア（同一ミリ秒のフォロー）を含む
+    await get_test_redis.zadd(key, {"11": 300, "12": 200, "13": 200, "14": 200, "15": 100})
+
+    pages: list[list[int]] = []
+    cursor = None
+    while True:
+        user_ids, cursor = await follow_service.list_page(get_test_redis, key, cursor, 2)
+        pages.append(user_ids)
+        if cursor is None:
+            break
+
+    assert pages == [[11, 14], [13, 12], [15]]
+    assert await follow_service.count(get_test_redis, key) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_page_empty(get_test_redis: Redis) -> None:
+    """
+    フォロー一覧が存在しない場合は空のページを返却すること。
+    """
+    user_ids, cursor = await follow_service.list_page(
+        get_test_redis, generate_followers_key(1), None, 20
+    )
+    assert user_ids == []
+    assert cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "invalid",
+        "",
+        "MTAw",
+        "MTAwOmFiYw==",
+        pagination.encode_cursor(follow_service.FOLLOW_CURSOR_SCOPE, [100, "abc"]),
+        pagination.encode_cursor("posts:1", [100, "12345"]),
+    ],
+)
+def test_decode_cursor_invalid(cursor: str) -> None:
+    """
+    不正なカーソルの場合はInvalidCursorErrorとなること。
+    """
+    with pytest.raises(follow_service.InvalidCursorError):
+        follow_service.decode_cursor(cursor)
+
+
+def test_cursor_round_trip() -> None:
+    """
+    生成したカーソルからスコアとメンバーを取得できること。
+    """
+    cursor = follow_service.encode_cursor(1700000000000.0, "12345")
+    assert follow_service.decode_cursor(cursor) == (1700000000000, "12345")
+
+
+@pytest.mark.asyncio
+async def test_follow_and_unfollow(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    フォロー・フォロー解除がDBとRedisのフォロー一覧の両方に反映され、繰り返し実行しても結果が変わらないこと。
+    """
+    async with get_test_session() as db:
+        user1, user2 = (await db.scalars(select(User).order_by(User.user_id).limit(2))).all()
+        results = [
+            await follow_service.follow(db, get_test_redis, user1.user_id, user2.user_id)
+            for _ in range(2)
+        ]
+        assert results == [True, False]
+
+        assert len((await db.scalars(select(Follow))).all()) == 1
+        assert await get_test_redis.zrange(generate_followers_key(user2.user_id), 0, -1) == [
+            str(user1.user_id)
+        ]
+        assert await get_test_redis.zrange(generate_following_key(user1.user_id), 0, -1) == [
+            str(user2.user_id)
+        ]
+
+        for _ in range(2):
+            await follow_service.unfollow(db, get_test_redis, user1.user_id, user2.user_id)
+
+        assert (await db.scalars(select(Follow))).all() == []
+        assert (
+            await follow_service.count(get_test_redis, generate_followers_key(user2.user_id)) == 0
+        )
@@ -0,0 +1,118 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, Request, status
+from PIL import Image
+from redis.asyncio.client import Redis
+
+from app.core.redis import generate_queue_key
+from app.core.storage import LocalBlobStore
+from app.enums import UserImageType
+from app.services import image_service
+
+
+def create_jpeg(width: int, height: int) -> bytes:
+    """
+    EXIF（向き・撮影機材）付きのJPEG画像を生成する。
+    """
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: 90度回転
+    exif[0x0110] = "test camera"  # Model
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (255, 0, 0)).save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+async def to_stream(data: bytes):
+    yield data
+
+
+@pytest.mark.parametrize("image_type", list(UserImageType))
+def test_render_variants(image_type: UserImageType) -> None:
+    """
+    画像種別ごとの全派生画像が指定サイズのWebPで生成され、メタデータが除去されていること。
+    """
+    sizes = image_service.IMAGE_VARIANTS[image_type]
+    variants = image_service.render_variants(
+        create_jpeg(1200, 800), sizes, quality=80, max_pixels=1200 * 800
+    )
+
+    assert variants.keys() == sizes.keys()
+    for name, data in variants.items():
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            assert image.size == sizes[name]
+            assert not image.getexif()
+
+
+def test_render_variants_transparency() -> None:
+    """
+    透過画像は透過情報を保ったまま変換されること。
+    """
+    buffer = io.BytesIO()
+    Image.new("RGBA", (300, 300), (0, 0, 0, 0)).save(buffer, format="PNG")
+    variants = image_service.render_variants(
+        buffer.getvalue(), {"thumb": (96, 96)}, quality=80, max_pixels=300 * 300
+    )
+    with Image.open(io.BytesIO(variants["thumb"])) as image:
+        assert image.mode == "RGBA"
+
+
+def test_render_variants_too_large() -> None:
+    """
+    画素数が上限を超える画像はデコード前にエラーとなること。
+    """
+    with pytest.raises(image_service.ImageTooLargeError):
+        image_service.render_variants(
+            create_jpeg(1200, 800), {"thumb": (96, 96)}, quality=80, max_pixels=1200 * 800 - 1
+        )
+
+
+@pytest.mark.asyncio
+async def test_process_variants_job(get_test_redis: Redis, tmp_path: Path) -> None:
+    """
+    キューに登録したジョブから派生画像が生成され、元画像と同じ場所に保存されること。
+    """
+    store = LocalBlobStore(tmp_path)
+    blob = await store.save(to_stream(create_jpeg(1200, 800)), max_bytes=1024 * 1024)
+    await image_service.enqueue_variants_job(get_test_redis, blob.digest, UserImageType.HEADER)
+
+    job = await get_test_redis.lpop(generate_queue_key(image_service.IMAGE_QUEUE))
+    assert json.loads(job) == {"digest": blob.digest, "image_type": "header_image"}
+
+    with ThreadPoolExecutor() as executor:
+        names = await image_service.process_variants_job(store, executor, job)
+    assert names == ["small", "large"]
+    for name in names:
+        assert await store.media_type(blob.digest, name) == "image/webp"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["content_length", "expected_http_status"],
+    [
+        pytest.param("abc", status.HTTP_400_BAD_REQUEST, id="not a number"),
+        pytest.param("-1", status.HTTP_400_BAD_REQUEST, id="negative"),
+        pytest.param(str(10**12), status.HTTP_413_CONTENT_TOO_LARGE, id="too large"),
+    ],
+)
+async def test_save_uploaded_image_content_length(
+    tmp_path: Path, content_length: str, expected_http_status: int
+) -> None:
+    """
+    Content-Lengthが不正、または上限を超える場合は受信前にエラーとなること。
+    """
+    request = Request({
+        "type": "http",
+        "method": "PUT",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=x"),
+            (b"content-length", content_length.encode()),
+        ],
+    })
+    with pytest.raises(HTTPException) as e:
+        await image_service.save_uploaded_image(request, LocalBlobStore(tmp_path))
+    assert e.value.status_code == expected_http_status
@@ -0,0 +1,62 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from app.enums import ImportStatus
+from app.services import import_service
+
+
+async def chunks(*values: bytes) -> AsyncGenerator[bytes]:
+    for value in values:
+        yield value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["values", "expected"],
+    [
+        pytest.param([b'{"a": 1}\n{"b"', b": 2}\n"], [b'{"a": 1}', b'{"b": 2}'], id="split"),
+        pytest.param([b"a\n", b"\nb"], [b"a", b"", b"b"], id="no_trailing_newline"),
+        pytest.param([b""], [], id="empty"),
+    ],
+)
+async def test_iter_lines(values: list[bytes], expected: list[bytes]) -> None:
+    """
+    iter_linesについて以下ケースを検証する。
+
+    +----+------------------------------+---------------------------+
+    | No | case                         | expected                  |
+    +====+==============================+===========================+
+    | 1  | 行がチャンクをまたぐ         | 行ごとに結合される        |
+    +----+------------------------------+---------------------------+
+    | 2  | 空行・最終行に改行が無い     | 空行・最終行も出力される  |
+    +----+------------------------------+---------------------------+
+    | 3  | 空の入力                     | 出力されない              |
+    +----+------------------------------+---------------------------+
+    """
+    assert [line async for line in import_service.iter_lines(chunks(*values))] == expected
+
+
+@pytest.mark.asyncio
+async def test_import_users_invalid() -> None:
+    """
+    不正な行は登録せずにINVALIDとなり、空行は無視されること（行番号には含める）。
+    """
+    body = b'{"account_name": "", "email": "a@sample.com", "birthday": "2000-01-01"}\n\nnot json\n'
+    response = await import_service.import_users(None, None, chunks(body), max_rows=10)  # type: ignore[arg-type]
+    assert response.created == 0
+    assert response.failed == 2
+    assert [result.line for result in response.results] == [1, 3]
+    assert all(result.status == ImportStatus.INVALID for result in response.results)
+    assert response.results[0].detail is not None
+    assert "account_name" in response.results[0].detail
+
+
+@pytest.mark.asyncio
+async def test_import_users_too_large() -> None:
+    """
+    空行を除く行数が上限を超えた場合はImportTooLargeErrorとなること。
+    """
+    body = b"{}\n\n{}\n{}\n"
+    with pytest.raises(import_service.ImportTooLargeError):
+        await import_service.import_users(None, None, chunks(body), max_rows=2)  # type: ignore[arg-type]
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+
+from app.core.pubsub_hub import PubSubHub
+from app.core.redis import generate_notification_channel
+from app.enums import NotificationType
+from app.schemas import post_schema, user_schema
+from app.services import notification_service
+
+
+@pytest.mark.parametrize(
+    ["content", "expected"],
+    [
+        pytest.param("@user1 と @user2 へ", ["user1", "user2"], id="multiple"),
+        pytest.param("@user1 @user1", ["user1"], id="duplicate"),
+        pytest.param("mail@ ＠user1", [], id="none"),
+        pytest.param(" ".join(f"@u{i}" for i in range(20)), [f"u{i}" for i in range(10)], id="max"),
+    ],
+)
+def test_extract_mentions(content: str, expected: list[str]) -> None:
+    """
+    本文からメンションしたユーザー名が重複除去して抽出されること。
+    """
+    assert notification_service.extract_mentions(content) == expected
+
+
+@pytest.mark.asyncio
+async def test_notify(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    通知先のチャネルに通知が発行され、自分自身の操作は通知されないこと。
+    """
+    publish = mocker.spy(get_test_redis, "publish")
+
+    await notification_service.notify(get_test_redis, 1, NotificationType.LIKE, 1, 10)
+    publish.assert_not_called()
+
+    await notification_service.notify(get_test_redis, 1, NotificationType.LIKE, 2, 10)
+    channel, data = publish.call_args.args
+    assert channel == generate_notification_channel(1)
+    assert json.loads(data) | {"create_datetime": None} == {
+        "type": "like",
+        "actor_id": "2",
+        "post_id": "10",
+        "create_datetime": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_notify_mentions(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    存在するユーザーのうち、投稿者以外にのみメンションが通知されること。
+    """
+    users = {
+        name: mocker.Mock(spec=user_schema.User, user_id=user_id)
+        for name, user_id in (("user1", 1), ("user2", 2))
+    }
+    mocker.patch(
+        "app.services.user_service.get_user_by_username",
+        side_effect=lambda db, redis, username: users.get(username),
+    )
+    notify = mocker.patch("app.services.notification_service.notify")
+    post = post_schema.Post(
+        post_id=10,
+        user_id=1,
+        content="@user1 @user2 @user9",
+        reply_to_post_id=None,
+        repost_of_post_id=None,
+        create_datetime=datetime.now(),
+    )
+
+    assert await notification_service.notify_mentions(mocker.Mock(), get_test_redis, post) == 1
+    notify.assert_awaited_once_with(get_test_redis, 2, NotificationType.MENTION, 1, 10)
+
+
+@pytest.mark.asyncio
+async def test_stream() -> None:
+    """
+    接続直後・通知がない間はコメントを送信し、破棄した件数を次の通知の前に送信すること。
+    """
+    hub = PubSubHub("test:control", max_subscribers=1, queue_size=2)
+    events = notification_service.stream(hub, 1, heartbeat=0.01)
+
+    assert await anext(events) == ": connected\n\n"
+    assert hub.count == 1
+    assert await anext(events) == ": heartbeat\n\n"
+
+    channel = generate_notification_channel(1)
+    for message in ('{"n": 1}', '{"n": 2}', '{"n": 3}'):
+        hub.dispatch(channel, message)
+    assert await anext(events) == 'event: dropped\ndata: {"count": 1}\n\n'
+    assert await anext(events) == 'event: notification\ndata: {"n": 2}\n\n'
+    assert await anext(events) == 'event: notification\ndata: {"n": 3}\n\n'
+
+    # 切断すると購読を解除する
+    await events.aclose()
+    assert hub.count == 0
@@ -0,0 +1,117 @@
+from datetime import datetime
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import POST_COUNTER_DIRTY_KEY, generate_post_likes_key
+from app.schemas import post_schema
+from app.services import post_counter_service, timeline_service
+from app.services.post_counter_service import PostCounter
+
+
+def create_post(post_id: int, like_count: int = 0) -> post_schema.Post:
+    return post_schema.Post(
+        post_id=post_id,
+        user_id=1,
+        content=f"投稿{post_id}",
+        like_count=like_count,
+        create_datetime=datetime.now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_like_and_unlike(get_test_redis: Redis) -> None:
+    """
+    いいね・いいね取り消しを繰り返しても、件数が重複して加算・減算されないこと。
+
+    | 操作           | 戻り値 | 増分 |
+    | -------------- | ------ | ---- |
+    | いいね         | True   | 1    |
+    | 再度いいね     | False  | 1    |
+    | 取り消し       | True   | 0    |
+    | 再度取り消し   | False  | 0    |
+    """
+    assert await post_counter_service.like(get_test_redis, 100, 1) is True
+    assert await post_counter_service.like(get_test_redis, 100, 1) is False
+    assert await post_counter_service.get_pending_deltas(get_test_redis, [100]) == {
+        100: {"like_count": 1}
+    }
+    assert await get_test_redis.smembers(generate_post_likes_key(100)) == {"1"}
+
+    assert await post_counter_service.unlike(get_test_redis, 100, 1) is True
+    assert await post_counter_service.unlike(get_test_redis, 100, 1) is False
+    assert await post_counter_service.get_pending_deltas(get_test_redis, [100]) == {
+        100: {"like_count": 0}
+    }
+    assert await get_test_redis.sismember(POST_COUNTER_DIRTY_KEY, "100")
+
+
+@pytest.mark.asyncio
+async def test_increment(get_test_redis: Redis) -> None:
+    """
+    複数のシャードに分散して加算した増分が合計されること。
+    """
+    for _ in range(10):
+        await post_counter_service.increment(get_test_redis, 100, PostCounter.REPLY)
+    await post_counter_service.increment(get_test_redis, 100, PostCounter.REPOST, 3)
+
+    assert await post_counter_service.get_pending_deltas(get_test_redis, [100, 200]) == {
+        100: {"reply_count": 10, "repost_count": 3}
+    }
+
+
+@pytest.mark.asyncio
+async def test_with_pending_counts(get_test_redis: Redis) -> None:
+    """
+    DBの値に未反映の増分が加算されること（増分がない投稿はそのまま、負数にはならない）。
+    """
+    await post_counter_service.like(get_test_redis, 100, 1)
+    await post_counter_service.like(get_test_redis, 100, 2)
+    await post_counter_service.increment(get_test_redis, 200, PostCounter.LIKE, -5)
+
+    posts = await post_counter_service.with_pending_counts(
+        get_test_redis, [create_post(100, 3), create_post(200, 1), create_post(300, 7)]
+    )
+
+    assert [post.like_count for post in posts] == [5, 0, 7]
+
+
+@pytest.mark.asyncio
+async def test_flush(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    未反映の増分がDBに反映され、Redisの増分・投稿キャッシュが削除されること。
+    """
+    update = mocker.patch("app.crud.update_post_counters", return_value=1)
+    await post_counter_service.like(get_test_redis, 100, 1)
+    await post_counter_service.increment(get_test_redis, 100, PostCounter.REPLY, 2)
+    await get_test_redis.set(timeline_service.generate_post_cache_key(100), "{}")
+    db = mocker.AsyncMock(spec=AsyncSession)
+
+    assert await post_counter_service.flush(db, get_test_redis, 10) == 1
+
+    update.assert_awaited_once_with(db, [(100, 1, 2, 0)])
+    assert await post_counter_service.get_pending_deltas(get_test_redis, [100]) == {}
+    assert await get_test_redis.scard(POST_COUNTER_DIRTY_KEY) == 0
+    assert await get_test_redis.exists(timeline_service.generate_post_cache_key(100)) == 0
+    assert await post_counter_service.flush(db, get_test_redis, 10) == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_failure(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    DBへの反映に失敗した場合、増分がRedisに戻され、次回に反映されること。
+    """
+    mocker.patch("app.crud.update_post_counters", side_effect=RuntimeError("DB障害"))
+    await post_counter_service.increment(get_test_redis, 100, PostCounter.REPOST, 4)
+    db = mocker.AsyncMock(spec=AsyncSession)
+
+    with pytest.raises(RuntimeError):
+        await post_counter_service.flush(db, get_test_redis, 10)
+
+    db.rollback.assert_awaited_once()
+    assert await post_counter_service.get_pending_deltas(get_test_redis, [100]) == {
+        100: {"repost_count": 4}
+    }
+    assert await get_test_redis.sismember(POST_COUNTER_DIRTY_KEY, "100")
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import user_schema
+from app.services import search_service
+
+
+def create_user(user_id: int) -> user_schema.User:
+    return user_schema.User(
+        user_id=user_id,
+        username=f"user{user_id}",
+        account_name=f"ユーザー{user_id}",
+        email=f"user{user_id}@sample.com",
+        birthday=date(2000, 1, 1),
+        verified_flag=False,
+        auth_failure_count=0,
+        account_lock_flag=False,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache() -> None:
+    search_service.user_search_cache.local.clear()
+
+
+@pytest.mark.parametrize(
+    ["query", "expected"],
+    [
+        pytest.param(" User ", "user", id="strip and lower"),
+        pytest.param("ＵＳＥＲ１", "user1", id="full width"),
+        pytest.param("ﾕｰｻﾞｰ", "ユーザー", id="half width kana"),
+    ],
+)
+def test_normalize_query(query: str, expected: str) -> None:
+    """
+    検索文字列が全角・半角、大文字・小文字を区別しない形に正規化されること。
+    """
+    assert search_service.normalize_query(query) == expected
+
+
+@pytest.mark.asyncio
+async def test_search_users_short_query_cached(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    短い検索文字列は最大件数分の検索結果がキャッシュされ、2回目以降はDBを検索しないこと。
+    """
+    search = mocker.patch(
+        "app.crud.search_users", return_value=[create_user(i) for i in range(1, 4)]
+    )
+    db = mocker.AsyncMock(spec=AsyncSession)
+
+    first = await search_service.search_users(db, get_test_redis, "U", 2)
+    second = await search_service.search_users(db, get_test_redis, "u", 3)
+
+    search.assert_awaited_once_with(db, "u", search_service.MAX_RESULTS)
+    assert [user.username for user in first] == ["user1", "user2"]
+    assert [user.username for user in second] == ["user1", "user2", "user3"]
+
+
+@pytest.mark.asyncio
+async def test_search_users_long_query(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    キャッシュ対象より長い検索文字列は、毎回DBを検索すること。
+    """
+    search = mocker.patch("app.crud.search_users", return_value=[create_user(1)])
+    db = mocker.AsyncMock(spec=AsyncSession)
+
+    for _ in range(2):
+        result = await search_service.search_users(db, get_test_redis, "user1", 5)
+        assert [user.user_id for user in result] == [1]
+
+    assert search.await_count == 2
+    search.assert_awaited_with(db, "user1", 5)
+
+
+@pytest.mark.asyncio
+async def test_search_users_blank_query(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    空白のみの検索文字列はDBを検索せず、空の結果を返却すること。
+    """
+    search = mocker.patch("app.crud.search_users")
+
+    assert await search_service.search_users(mocker.AsyncMock(), get_test_redis, "　", 5) == []
+    search.assert_not_called()
@@ -0,0 +1,136 @@
+import json
+from datetime import datetime
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+
+from app.core.config import get_settings
+from app.core.redis import (
+    TIMELINE_PULL_ACCOUNTS_KEY,
+    generate_followers_key,
+    generate_following_key,
+    generate_queue_key,
+    generate_timeline_key,
+    generate_user_posts_key,
+)
+from app.schemas import post_schema
+from app.services import timeline_service
+
+
+def create_post(post_id: int, user_id: int) -> post_schema.Post:
+    return post_schema.Post(
+        post_id=post_id, user_id=user_id, content=f"投稿{post_id}", create_datetime=datetime.now()
+    )
+
+
+@pytest.mark.parametrize(
+    ["sources", "max_id", "limit", "expected"],
+    [
+        pytest.param([["5", "3", "1"], ["4", "2"]], None, 10, [5, 4, 3, 2, 1], id="merge"),
+        pytest.param([["5", "3", "3"], ["5", "2"]], None, 10, [5, 3, 2], id="deduplicate"),
+        pytest.param([["3", "5", "1"], []], None, 10, [5, 3, 1], id="unordered source"),
+        pytest.param([["5", "3", "1"], ["4", "2"]], 4, 10, [3, 2, 1], id="max_id"),
+        pytest.param([["5", "3", "1"], ["4", "2"]], None, 2, [5, 4], id="limit"),
+    ],
+)
+def test_merge_post_ids(
+    sources: list[list[str]], max_id: int | None, limit: int, expected: list[int]
+) -> None:
+    """
+    複数の投稿IDのリストが投稿IDの降順にマージされ、重複・max_id以降の投稿が除外されること。
+    """
+    assert timeline_service.merge_post_ids(sources, max_id, limit) == expected
+
+
+@pytest.mark.asyncio
+async def test_publish_post(get_test_redis: Redis) -> None:
+    """
+    投稿がキャッシュされ、投稿者の最新投稿・ホームタイムラインに追加され、配信ジョブが登録されること。
+    """
+    await timeline_service.publish_post(get_test_redis, create_post(100, 1))
+
+    assert await get_test_redis.lrange(generate_user_posts_key(1), 0, -1) == ["100"]
+    assert await get_test_redis.lrange(generate_timeline_key(1), 0, -1) == ["100"]
+    assert await get_test_redis.exists(timeline_service.generate_post_cache_key(100)) == 1
+    jobs = await get_test_redis.lrange(generate_queue_key(timeline_service.TIMELINE_QUEUE), 0, -1)
+    assert [json.loads(job) for job in jobs] == [{"post_id": 100, "user_id": 1}]
+
+
+@pytest.mark.asyncio
+async def test_fanout_post(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    投稿がバッチ単位で全フォロワーのホームタイムラインに配信され、最大件数を超えた投稿は削除されること。
+    """
+    mocker.patch.object(get_settings(), "TIMELINE_FANOUT_BATCH_SIZE", 2)
+    mocker.patch.object(get_settings(), "TIMELINE_MAX_LENGTH", 2)
+    await get_test_redis.zadd(generate_followers_key(1), {"11": 1, "12": 2, "13": 3})
+    await get_test_redis.rpush(generate_timeline_key(11), "90", "80")
+
+    assert await timeline_service.fanout_post(get_test_redis, 100, 1) == 3
+
+    assert await get_test_redis.lrange(generate_timeline_key(11), 0, -1) == ["100", "90"]
+    for follower_id in (12, 13):
+        assert await get_test_redis.lrange(generate_timeline_key(follower_id), 0, -1) == ["100"]
+
+
+@pytest.mark.asyncio
+async def test_fanout_post_pull_account(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    フォロワー数が閾値以上のユーザーの投稿は配信しないこと。
+    """
+    mocker.patch.object(get_settings(), "TIMELINE_FANOUT_THRESHOLD", 2)
+    await get_test_redis.zadd(generate_followers_key(1), {"11": 1, "12": 2})
+    await timeline_service.update_pull_account(get_test_redis, 1, 2)
+
+    assert await timeline_service.fanout_post(get_test_redis, 100, 1) == 0
+    assert await get_test_redis.exists(generate_timeline_key(11)) == 0
+
+    # 閾値を下回った場合は配信対象に戻ること
+    await timeline_service.update_pull_account(get_test_redis, 1, 1)
+    assert await get_test_redis.zscore(TIMELINE_PULL_ACCOUNTS_KEY, "1") is None
+
+
+@pytest.mark.asyncio
+async def test_get_home_timeline(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    配信済みのホームタイムラインと、フォロー中の配信対象外ユーザーの最新投稿がマージされ、
+    キャッシュ済みの投稿はDBに問い合わせないこと。
+    """
+    posts = [create_post(post_id, 2) for post_id in (10, 30)] + [create_post(20, 3)]
+    for post in posts:
+        await timeline_service.publish_post(get_test_redis, post)
+    # user1のホームタイムラインにはuser2の投稿のみ配信済み、user3は配信対象外
+    await get_test_redis.rpush(generate_timeline_key(1), "30", "10")
+    await get_test_redis.zadd(generate_following_key(1), {"2": 1, "3": 1})
+    await get_test_redis.zadd(TIMELINE_PULL_ACCOUNTS_KEY, {"3": 10000})
+    select_posts = mocker.patch.object(timeline_service.crud, "select_posts_by_ids")
+    db = mocker.MagicMock()
+
+    result, next_max_id = await timeline_service.get_home_timeline(db, get_test_redis, 1, None, 2)
+    assert [post.post_id for post in result] == [30, 20]
+    assert next_max_id == 20
+
+    result, next_max_id = await timeline_service.get_home_timeline(
+        db, get_test_redis, 1, next_max_id, 2
+    )
+    assert [post.post_id for post in result] == [10]
+    assert next_max_id is None
+    select_posts.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_posts_loads_missing(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    キャッシュにない投稿のみDBから取得してキャッシュし、削除済みの投稿は除外されること。
+    """
+    await timeline_service.publish_post(get_test_redis, create_post(1, 1))
+    select_posts = mocker.patch.object(
+        timeline_service.crud, "select_posts_by_ids", return_value=[create_post(2, 1)]
+    )
+
+    result = await timeline_service.get_posts(mocker.MagicMock(), get_test_redis, [3, 2, 1])
+
+    assert [post.post_id for post in result] == [2, 1]
+    assert select_posts.call_args.args[1] == [3, 2]
+    assert await get_test_redis.exists(timeline_service.generate_post_cache_key(2)) == 1
@@ -1,12 +1,15 @@
 from datetime import date, datetime, timedelta
 
 import pytest
+from fastapi import HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from freezegun import freeze_time
 from jose import jwt
 from redis.asyncio.client import Redis
 
 from app.core.config import get_settings
 from app.core.redis import generate_jwt_token_key
+from app.enums import TokenType
 from app.schemas import token_schema, user_schema
 from app.services import token_service
 
@@ -19,9 +22,9 @@ def test_user() -> user_schema.User:
         account_name="テストユーザー",
         email="test_user@sample.com",
         birthday=date(year=2000, month=1, day=1),
-        verified_flag="0",
+        verified_flag=False,
         auth_failure_count=0,
-        account_lock_flag="0",
+        account_lock_flag=False,
     )
 
 
@@ -39,7 +42,7 @@ async def test_create_token(test_user: user_schema.User, get_test_redis: Redis):
 
     # JWTトークンからpayload、キャッシュデータを取得
     token = await token_service.create_token(
-        test_user, timedelta(minutes=expire_delta), get_test_redis
+        test_user, timedelta(minutes=expire_delta), get_test_redis, TokenType.ACCESS
     )
     decoded_data = jwt.decode(
         token, get_settings().SECRET_KEY, algorithms=[get_settings().ALGORITHM]
@@ -48,9 +51,10 @@ async def test_create_token(test_user: user_schema.User, get_test_redis: Redis):
     data = await get_test_redis.get(generate_jwt_token_key(payload.jti))
     chache_user = user_schema.User.model_validate_json(data)
 
-    # payloadに設定されたuser_id、有効期限が正しいこと
+    # payloadに設定されたuser_id、有効期限、トークン種別が正しいこと
     assert payload.sub == str(test_user.user_id)
     assert payload.exp == expire_timestamp
+    assert payload.typ == TokenType.ACCESS.value
     # キャッシュに保存されたユーザー情報が正しいこと
     assert chache_user.__dict__ == test_user.__dict__
 
@@ -156,11 +160,48 @@ async def test_create_tokens(test_user: user_schema.User, get_test_redis: Redis)
     # アクセストークンのpayloadに設定されたuser_id、有効期限が正しいこと
     assert payload_at.sub == str(test_user.user_id)
     assert payload_at.exp == expected_expire_at
+    assert payload_at.typ == TokenType.ACCESS.value
     # アクセストークンのキャッシュに保存されたユーザー情報が正しいこと
     assert chache_user_at.__dict__ == test_user.__dict__
 
     # リフレッシュトークンのpayloadに設定されたuser_id、有効期限が正しいこと
     assert payload_rt.sub == str(test_user.user_id)
     assert payload_rt.exp == expected_expire_rt
+    assert payload_rt.typ == TokenType.REFRESH.value
     # リフレッシュトークンのキャッシュに保存されたユーザー情報が正しいこと
     assert chache_user_rt.__dict__ == test_user.__dict__
+
+
+@pytest.mark.asyncio
+async def test_get_current_user(test_user: user_schema.User, get_test_redis: Redis):
+    """
+    get_current_userで有効なトークンから認証済みユーザーが取得でき、
+    不正・失効したトークンの場合は401エラーとなること。
+    """
+    token = await token_service.create_access_token(test_user, get_test_redis)
+
+    # 有効なトークンの場合、キャッシュに保存されたユーザー情報が返却されること
+    user = await token_service.get_current_user(
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), get_test_redis
+    )
+    assert user.__dict__ == test_user.__dict__
+
+    # トークンが存在しない、不正、またはリフレッシュトークンの場合は401エラーとなること
+    refresh_token = await token_service.create_refresh_token(test_user, get_test_redis)
+    for credentials in [
+        None,
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials="invalid"),
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=refresh_token),
+    ]:
+        with pytest.raises(HTTPException) as e:
+            await token_service.get_current_user(credentials, get_test_redis)
+        assert e.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # キャッシュから削除された（失効した）トークンの場合は401エラーとなること
+    payload = jwt.decode(token, get_settings().SECRET_KEY, algorithms=[get_settings().ALGORITHM])
+    await get_test_redis.delete(generate_jwt_token_key(payload["jti"]))
+    with pytest.raises(HTTPException) as e:
+        await token_service.get_current_user(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), get_test_redis
+        )
+    assert e.value.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,96 @@
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+
+from app.core.config import get_settings
+from app.enums import TrendWindow
+from app.services import trend_service
+
+# 2025-09-16 00:00:00 UTC（全ての集計期間の区間の先頭）
+NOW = 1757980800.0
+
+
+@pytest.mark.parametrize(
+    ["content", "expected"],
+    [
+        pytest.param("#Python と #FastAPI", ["python", "fastapi"], id="multiple"),
+        pytest.param("＃ＰＹＴＨＯＮ #python", ["python"], id="normalize"),
+        pytest.param("#トレンド入り", ["トレンド入り"], id="japanese"),
+        pytest.param("ハッシュタグなし # 空", [], id="none"),
+        pytest.param(" ".join(f"#t{i}" for i in range(20)), [f"t{i}" for i in range(10)], id="max"),
+    ],
+)
+def test_extract_hashtags(content: str, expected: list[str]) -> None:
+    """
+    本文からハッシュタグが正規化・重複除去して抽出されること。
+    """
+    assert trend_service.extract_hashtags(content) == expected
+
+
+def test_sketch_cells() -> None:
+    """
+    同じハッシュタグは常に同じセルとなり、行ごとに1セルずつ列数未満の列に割り当てられること。
+    """
+    cells = trend_service.sketch_cells("python", 2048, 4)
+    assert cells == trend_service.sketch_cells("python", 2048, 4)
+    assert [cell.split(":")[0] for cell in cells] == ["0", "1", "2", "3"]
+    assert all(0 <= int(cell.split(":")[1]) < 2048 for cell in cells)
+
+
+@pytest.mark.asyncio
+async def test_compute_trends(get_test_redis: Redis) -> None:
+    """
+    集計期間ごとに、期間内の区間の出現回数を合算した上位のハッシュタグが集計されること。
+
+    | 投稿日時   | ハッシュタグ       |
+    | ---------- | ------------------ |
+    | 2時間前    | old × 5            |
+    | 10分前     | hour × 3           |
+    | 直近       | hot × 4, hour × 1  |
+    """
+    for _ in range(5):
+        await trend_service.record_hashtags(get_test_redis, ["old"], NOW - 7200)
+    for _ in range(3):
+        await trend_service.record_hashtags(get_test_redis, ["hour"], NOW - 600)
+    for _ in range(4):
+        await trend_service.record_hashtags(get_test_redis, ["hot"], NOW + 10)
+    await trend_service.record_hashtags(get_test_redis, ["hour", "hot"], NOW + 20)
+
+    async def trends(window: TrendWindow) -> list[tuple[str, int]]:
+        result = await trend_service.compute_trends(get_test_redis, window, NOW + 30)
+        return [(trend.hashtag, trend.count) for trend in result]
+
+    assert await trends(TrendWindow.MINUTES_5) == [("hot", 5), ("hour", 1)]
+    assert await trends(TrendWindow.HOUR_1) == [("hot", 5), ("hour", 4)]
+    assert await trends(TrendWindow.HOURS_24) == [("hot", 5), ("old", 5), ("hour", 4)]
+
+
+@pytest.mark.asyncio
+async def test_compute_trends_top_k(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    区間ごとに保持する上位ハッシュタグがK件に制限され、頻出するハッシュタグが残ること。
+    """
+    mocker.patch.object(get_settings(), "TRENDS_TOP_K", 2)
+    for tag, count in (("a", 3), ("b", 2), ("c", 1), ("d", 4)):
+        for _ in range(count):
+            await trend_service.record_hashtags(get_test_redis, [tag], NOW)
+
+    result = await trend_service.compute_trends(get_test_redis, TrendWindow.MINUTES_5, NOW)
+    assert [(trend.hashtag, trend.count) for trend in result] == [("d", 4), ("a", 3)]
+
+
+@pytest.mark.asyncio
+async def test_refresh_snapshots(get_test_redis: Redis) -> None:
+    """
+    スナップショットが更新され、更新間隔内は他のプロセスが重複して更新しないこと。
+    """
+    assert await trend_service.get_snapshot(get_test_redis, TrendWindow.HOUR_1) is None
+    await trend_service.record_hashtags(get_test_redis, ["python"], NOW)
+
+    assert await trend_service.refresh_snapshots(get_test_redis, NOW) is True
+    assert await trend_service.refresh_snapshots(get_test_redis, NOW) is False
+
+    snapshot = await trend_service.get_snapshot(get_test_redis, TrendWindow.HOUR_1)
+    assert snapshot is not None
+    assert [(trend.hashtag, trend.count) for trend in snapshot.trends] == [("python", 1)]
+    assert snapshot.as_of.timestamp() == NOW
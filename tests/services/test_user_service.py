@@ -2,6 +2,7 @@ import re
 
 import pytest
 from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import get_settings
@@ -89,3 +90,70 @@ async def test_generate_initial_username(
             re.fullmatch(rf"([a-zA-Z0-9]{{{get_settings().USERNAME_MAX_LENGTH}}})", result)
             is not None
         )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["filtered_usernames", "registered", "expect_result", "expect_db_call_count"],
+    [
+        pytest.param(None, True, False, 1, id="filter not built"),
+        pytest.param(["user1"], True, False, 1, id="registered"),
+        pytest.param(["user1"], False, True, 1, id="false positive"),
+        pytest.param(["other"], False, True, 0, id="not in filter"),
+    ],
+)
+async def test_is_username_available(
+    mocker: MockFixture,
+    get_test_redis: Redis,
+    filtered_usernames: list[str] | None,
+    registered: bool,
+    expect_result: bool,
+    expect_db_call_count: int,
+):
+    """
+    is_username_availableについて以下ケースを検証する
+
+    +-------------------+------------------+------------+---------------+----------+
+    | case              | filter           | registered | expect result | DB calls |
+    +===================+==================+============+===============+==========+
+    | filter not built  | -                | True       | False         | 1        |
+    +-------------------+------------------+------------+---------------+----------+
+    | registered        | contains user1   | True       | False         | 1        |
+    +-------------------+------------------+------------+---------------+----------+
+    | false positive    | contains user1   | False      | True          | 1        |
+    +-------------------+------------------+------------+---------------+----------+
+    | not in filter     | not contains     | False      | True          | 0        |
+    +-------------------+------------------+------------+---------------+----------+
+    """
+    if filtered_usernames is not None:
+        await user_service.username_filter.add(get_test_redis, *filtered_usernames)
+    mocked_func = mocker.patch(
+        "app.services.user_service.is_registered_username", return_value=registered
+    )
+
+    result = await user_service.is_username_available(mocker.AsyncMock(), get_test_redis, "user1")
+    assert result == expect_result
+    assert mocked_func.call_count == expect_db_call_count
+
+
+@pytest.mark.asyncio
+async def test_rebuild_username_filter(mocker: MockFixture, get_test_redis: Redis):
+    """
+    登録済みのユーザー名のみでフィルターが再構築され、再構築中に登録されたユーザー名が追加されること。
+    """
+    await user_service.username_filter.add(get_test_redis, "deleted")
+    mocked_func = mocker.patch(
+        "app.crud.select_usernames_batch",
+        side_effect=[["user1", "user2"], ["user3"], [], ["user4"], []],
+    )
+    db = mocker.AsyncMock()
+
+    assert await user_service.rebuild_username_filter(db, get_test_redis, 2) == 3
+
+    for username in ("user1", "user2", "user3", "user4"):
+        assert await user_service.username_filter.might_contain(get_test_redis, username)
+    assert not await user_service.username_filter.might_contain(get_test_redis, "deleted")
+    # 2巡目（再構築中に登録されたユーザー名）は更新日時で絞り込むこと
+    assert mocked_func.call_args_list[1].args == (db, "user2", 2)
+    assert mocked_func.call_args_list[3].args[1:3] == (None, 2)
+    assert mocked_func.call_args_list[3].args[3] is not None
@@ -1,12 +1,17 @@
-from datetime import date
+from datetime import date, datetime, timedelta
+from uuid import UUID
 
 import pytest
-from sqlalchemy import select
+from redis.asyncio.client import Redis
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app import crud
-from app.enums import Flag
-from app.models import Authcode, User
+from app.core.pagination import InvalidCursorError
+from app.enums import Flag, ImportStatus
+from app.models import ArchivedRecord, Authcode, Post, User
+from app.schemas import post_schema, user_schema
+from app.services import user_service
 
 
 @pytest.mark.asyncio
@@ -93,7 +98,7 @@ async def test_select_authcode_by_id(
     """
 
     async with get_test_session() as db:
-        result = await crud.select_authcode_by_id(db, authcode_id=authcode_id)
+        result = await crud.select_authcode_by_id(db, authcode_id=UUID(authcode_id))
         if expected_hit:
             assert result is not None
             assert result.code == expected_code
@@ -173,7 +178,9 @@ async def test_select_user_by_username(
 
 
 @pytest.mark.asyncio
-async def test_insert_user(get_test_session: async_sessionmaker[AsyncSession]) -> None:
+async def test_insert_user(
+    get_test_session: async_sessionmaker[AsyncSession], get_test_redis: Redis
+) -> None:
     """
     insert_userでusersテーブルに1件レコードを登録できること。
     """
@@ -190,7 +197,7 @@ async def test_insert_user(get_test_session: async_sessionmaker[AsyncSession]) -
         assert len(result.all()) == expected_before
 
         # データ投入
-        user = await crud.insert_user(db, username, account_name, email, birthday)
+        user = await crud.insert_user(db, username, account_name, email, birthday, get_test_redis)
         assert user.username == username
         assert user.account_name == account_name
         assert user.email == email
@@ -202,3 +209,397 @@ async def test_insert_user(get_test_session: async_sessionmaker[AsyncSession]) -
         # 実行後は1件
         result = await db.scalars(select(User))
         assert len(result.all()) == expected_after
+
+
+@pytest.mark.asyncio
+async def test_update_user(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    update_userでユーザーが更新され、変更前・変更後のユーザー名のキャッシュが無効化されること。
+    """
+    async with get_test_session() as db:
+        user = await user_service.get_user_by_username(db, get_test_redis, "user1")
+        assert user is not None
+        # 変更後のユーザー名はネガティブキャッシュされた状態とする
+        assert await user_service.get_user_by_username(db, get_test_redis, "renamed") is None
+
+        updated = await crud.update_user(db, user.user_id, get_test_redis, username="renamed")
+        assert updated is not None
+        assert updated.username == "renamed"
+
+        assert await user_service.get_user_by_username(db, get_test_redis, "user1") is None
+        cached = await user_service.get_user_by_username(db, get_test_redis, "renamed")
+        assert cached is not None
+        assert cached.user_id == user.user_id
+
+        # 存在しないユーザーの場合はNone
+        assert await crud.update_user(db, 0, get_test_redis, username="none") is None
+
+
+@pytest.mark.asyncio
+async def test_soft_delete_user(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    soft_delete_userで論理削除したユーザーが検索対象外となり、同じメールアドレス・ユーザー名で
+    再登録できること。
+    """
+    async with get_test_session() as db:
+        user = await crud.select_user_by_username(db, "user1")
+        assert user is not None
+
+        # 論理削除（2回目は対象なし）
+        assert await crud.soft_delete_user(db, user.user_id, get_test_redis) is True
+        assert await crud.soft_delete_user(db, user.user_id, get_test_redis) is False
+
+        # 論理削除済みユーザーは検索されないこと
+        assert await crud.select_user_by_username(db, "user1") is None
+        assert await crud.select_user_by_email(db, "user1@sample.com") is None
+
+        # 同じメールアドレス・ユーザー名で登録できること
+        new_user = await crud.insert_user(
+            db, "user1", "ユーザー1", "user1@sample.com", date.today(), get_test_redis
+        )
+        assert new_user.user_id != user.user_id
+
+
+@pytest.mark.asyncio
+async def test_archive_deleted_users(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    archive_deleted_usersで保持期間を過ぎた論理削除済みユーザーのみがアーカイブされること。
+    """
+    async with get_test_session() as db:
+        users = (await db.scalars(select(User).order_by(User.user_id))).all()
+        user_ids = [user.user_id for user in users]
+        for user_id in user_ids[:2]:
+            await crud.soft_delete_user(db, user_id, get_test_redis)
+
+    # 1件目のみ保持期間を過ぎた状態とする
+    threshold = datetime.now() + timedelta(seconds=1)
+    async with get_test_session() as db:
+        user = await db.get(User, user_ids[0])
+        assert user is not None
+        user.update_datetime = threshold - timedelta(days=1)
+        await db.commit()
+
+        # 1件ずつバッチ実行し、対象がなくなれば0件となること
+        moved = await crud.archive_deleted_users(
+            db, threshold=threshold - timedelta(hours=1), batch_size=1
+        )
+        assert moved == 1
+        moved = await crud.archive_deleted_users(
+            db, threshold=threshold - timedelta(hours=1), batch_size=1
+        )
+        assert moved == 0
+
+        remaining = (await db.scalars(select(User.user_id).order_by(User.user_id))).all()
+        assert remaining == user_ids[1:]
+        archived = (await db.scalars(select(ArchivedRecord))).all()
+        assert [(r.table_name, r.record_id) for r in archived] == [("users", user_ids[0])]
+
+
+@pytest.mark.asyncio
+async def test_insert_posts(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    insert_postsで複数の投稿を1回で登録し、引数と同じ順序で登録結果を返却すること。
+    """
+    async with get_test_session() as db:
+        user = (await db.scalars(select(User).where(User.username == "user1"))).one()
+        posts = [post_schema.PostCreate(user_id=user.user_id, content=f"投稿{i}") for i in range(3)]
+        result = await crud.insert_posts(db, posts)
+        assert [post.content for post in result] == ["投稿0", "投稿1", "投稿2"]
+        assert len({post.post_id for post in result}) == 3
+
+        rows = (await db.scalars(select(Post))).all()
+        assert len(rows) == 3
+
+        # 返信先として登録済みの投稿を参照できること
+        reply = await crud.insert_posts(
+            db,
+            [
+                post_schema.PostCreate(
+                    user_id=user.user_id, content="返信", reply_to_post_id=result[0].post_id
+                )
+            ],
+        )
+        assert reply[0].reply_to_post_id == result[0].post_id
+        assert await crud.insert_posts(db, []) == []
+
+
+@pytest.mark.asyncio
+async def test_select_post_by_id(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    select_post_by_idで投稿を取得でき、論理削除済みの投稿は取得しないこと。
+    """
+    async with get_test_session() as db:
+        user = (await db.scalars(select(User).where(User.username == "user1"))).one()
+        (post,) = await crud.insert_posts(
+            db, [post_schema.PostCreate(user_id=user.user_id, content="投稿")]
+        )
+        result = await crud.select_post_by_id(db, post.post_id)
+        assert result is not None
+        assert result.content == "投稿"
+
+        await db.execute(
+            update(Post).where(Post.post_id == post.post_id).values(delete_flag=Flag.ON.value)
+        )
+        await db.commit()
+        assert await crud.select_post_by_id(db, post.post_id) is None
+
+
+@pytest.mark.asyncio
+async def test_update_post_counters(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    update_post_countersで複数の投稿のいいね・返信・再投稿数に増分を1回で加算すること。
+    """
+    async with get_test_session() as db:
+        user = (await db.scalars(select(User).where(User.username == "user1"))).one()
+        posts = await crud.insert_posts(
+            db, [post_schema.PostCreate(user_id=user.user_id, content=f"投稿{i}") for i in range(2)]
+        )
+        assert posts[0].like_count == 0
+
+        updated = await crud.update_post_counters(
+            db, [(posts[1].post_id, 1, 0, 2), (posts[0].post_id, 3, 1, 0), (1, 1, 1, 1)]
+        )
+        assert updated == 2
+        await crud.update_post_counters(db, [(posts[0].post_id, -1, 0, 0)])
+
+        rows = (
+            await db.execute(
+                select(Post.like_count, Post.reply_count, Post.repost_count).order_by(Post.post_id)
+            )
+        ).all()
+        assert [tuple(row) for row in rows] == [(2, 1, 0), (1, 0, 2)]
+        assert await crud.update_post_counters(db, []) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["query", "expected"],
+    [
+        pytest.param("user", ["user1", "user2", "user3"], id="prefix"),
+        pytest.param("ser2", ["user2"], id="substring"),
+        pytest.param("ユーザー3", ["user3"], id="japanese"),
+        pytest.param("ユ", ["user1", "user2", "user3"], id="short prefix"),
+        pytest.param("er", [], id="short substring"),
+        pytest.param("user%", [], id="escape"),
+    ],
+)
+async def test_search_users(
+    get_test_session: async_sessionmaker[AsyncSession],
+    insert_test_data_user: None,
+    query: str,
+    expected: list[str],
+) -> None:
+    """
+    search_usersでユーザー名・アカウント名を検索できること。
+    3文字未満の場合は前方一致のみ、ワイルドカード文字は文字として検索すること。
+    """
+    async with get_test_session() as db:
+        result = await crud.search_users(db, query, 10)
+        assert [user.username for user in result] == expected
+
+
+@pytest.mark.asyncio
+async def test_search_users_excludes_deleted(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    論理削除済みのユーザーは検索結果に含まないこと。
+    """
+    async with get_test_session() as db:
+        await db.execute(
+            update(User).where(User.username == "user1").values(delete_flag=Flag.ON.value)
+        )
+        await db.commit()
+        result = await crud.search_users(db, "user", 10)
+        assert [user.username for user in result] == ["user2", "user3"]
+
+
+@pytest.mark.asyncio
+async def test_stream_users_for_export(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    論理削除されていないユーザーが、ユーザーID順に指定件数ずつのバッチで取得されること。
+    """
+    async with get_test_session() as db:
+        await db.execute(
+            update(User).where(User.username == "user1").values(delete_flag=Flag.ON.value)
+        )
+        await db.commit()
+        batches = [batch async for batch in crud.stream_users_for_export(db, 1)]
+        assert [len(batch) for batch in batches] == [1, 1]
+        assert [batch[0]["username"] for batch in batches] == ["user2", "user3"]
+
+
+@pytest.mark.asyncio
+async def test_select_users_page(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    登録日時の新しい順に、カーソルで重複・欠落なく全件を取得できること。
+    """
+    async with get_test_session() as db:
+        # 同一の登録日時のユーザーはユーザーIDの降順とする
+        await db.execute(update(User).values(create_datetime=datetime(2025, 1, 1)))
+        await db.execute(
+            update(User)
+            .where(User.username == "user2")
+            .values(create_datetime=datetime(2025, 1, 2))
+        )
+        await db.commit()
+
+        pages: list[list[str]] = []
+        cursor = None
+        while True:
+            users, cursor = await crud.select_users_page(db, cursor, 2)
+            pages.append([user.username for user in users])
+            if cursor is None:
+                break
+        user1, user3 = sorted(
+            (await db.scalars(select(User).where(User.username != "user2"))).all(),
+            key=lambda user: user.user_id,
+            reverse=True,
+        )
+        assert pages == [["user2", user1.username], [user3.username]]
+
+
+@pytest.mark.asyncio
+async def test_select_user_posts_page(
+    get_test_session: async_sessionmaker[AsyncSession], insert_test_data_user: None
+) -> None:
+    """
+    ユーザーの投稿を新しい順に取得でき、他のユーザーの一覧のカーソルは不正となること。
+    """
+    async with get_test_session() as db:
+        user1, user2 = (await db.scalars(select(User).order_by(User.user_id).limit(2))).all()
+        posts = await crud.insert_posts(
+            db,
+            [post_schema.PostCreate(user_id=user1.user_id, content=f"投稿{i}") for i in range(3)]
+            + [post_schema.PostCreate(user_id=user2.user_id, content="他のユーザー")],
+        )
+
+        first, cursor = await crud.select_user_posts_page(db, user1.user_id, None, 2)
+        assert cursor is not None
+        second, last = await crud.select_user_posts_page(db, user1.user_id, cursor, 2)
+        assert last is None
+        assert [post.post_id for post in first + second] == sorted(
+            (post.post_id for post in posts if post.user_id == user1.user_id), reverse=True
+        )
+        with pytest.raises(InvalidCursorError):
+            await crud.select_user_posts_page(db, user2.user_id, cursor, 2)
+
+
+@pytest.mark.asyncio
+async def test_import_users(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    import_usersについて以下ケースを検証する。
+
+    +----+----------------------------------+----------------+
+    | No | case                             | status         |
+    +====+==================================+================+
+    | 1  | 新規のメールアドレス             | created        |
+    +----+----------------------------------+----------------+
+    | 2  | 登録済みのメールアドレス         | email_conflict |
+    +----+----------------------------------+----------------+
+    | 3  | 入力内で重複したメールアドレス   | duplicate      |
+    +----+----------------------------------+----------------+
+    """
+    users = [
+        (
+            1,
+            user_schema.TempUser(
+                account_name="新規", email="new@sample.com", birthday=date(2000, 1, 1)
+            ),
+        ),
+        (
+            2,
+            user_schema.TempUser(
+                account_name="登録済", email="user1@sample.com", birthday=date(2000, 1, 1)
+            ),
+        ),
+        (
+            4,
+            user_schema.TempUser(
+                account_name="重複", email="new@sample.com", birthday=date(2000, 1, 1)
+            ),
+        ),
+    ]
+    async with get_test_session() as db:
+        results = await crud.import_users(db, users, get_test_redis)
+        assert [(row["line"], row["status"]) for row in results] == [
+            (1, ImportStatus.CREATED.value),
+            (2, ImportStatus.EMAIL_CONFLICT.value),
+            (4, ImportStatus.DUPLICATE.value),
+        ]
+        assert results[1]["user_id"] is None and results[2]["user_id"] is None
+        user = await crud.select_user_by_email(db, "new@sample.com")
+        assert user is not None
+        assert user.user_id == results[0]["user_id"]
+        assert user.username == results[0]["username"]
+        assert user.account_name == "新規"
+
+
+@pytest.mark.asyncio
+async def test_archive_deleted_users_with_posts(
+    get_test_session: async_sessionmaker[AsyncSession],
+    get_test_redis: Redis,
+    insert_test_data_user: None,
+) -> None:
+    """
+    論理削除したユーザーの投稿も論理削除され、アーカイブ時に投稿・フォローもアーカイブされること。
+    また、アーカイブした投稿への他ユーザーの返信は返信先がNULLとなること。
+    """
+    async with get_test_session() as db:
+        user1, user2 = (await db.scalars(select(User).order_by(User.user_id).limit(2))).all()
+        (post,) = await crud.insert_posts(
+            db, [post_schema.PostCreate(user_id=user1.user_id, content="投稿")]
+        )
+        (reply,) = await crud.insert_posts(
+            db,
+            [
+                post_schema.PostCreate(
+                    user_id=user2.user_id, content="返信", reply_to_post_id=post.post_id
+                )
+            ],
+        )
+
+        await crud.insert_follow(db, user2.user_id, user1.user_id)
+        await crud.soft_delete_user(db, user1.user_id, get_test_redis)
+        assert await crud.select_post_by_id(db, post.post_id) is None
+
+        moved = await crud.archive_deleted_users(
+            db, threshold=datetime.now() + timedelta(seconds=1), batch_size=10
+        )
+        assert moved == 1
+
+        archived = (await db.scalars(select(ArchivedRecord))).all()
+        assert sorted((r.table_name, r.record_id) for r in archived) == [
+            ("follows", user2.user_id),
+            ("posts", post.post_id),
+            ("users", user1.user_id),
+        ]
+        remaining = await crud.select_post_by_id(db, reply.post_id)
+        assert remaining is not None
+        assert remaining.reply_to_post_id is None
@@ -0,0 +1,106 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+
+from app.core.redis import (
+    generate_dead_letter_queue_key,
+    generate_processing_queue_key,
+    generate_queue_key,
+)
+from app.core.storage import LocalBlobStore
+from app.enums import UserImageType
+from app.services import image_service
+from app.workers import image_worker, job_queue
+
+QUEUE = generate_queue_key(image_service.IMAGE_QUEUE)
+PROCESSING = generate_processing_queue_key(image_service.IMAGE_QUEUE)
+DEAD = generate_dead_letter_queue_key(image_service.IMAGE_QUEUE)
+
+
+async def to_stream(data: bytes):
+    yield data
+
+
+def create_job(digest: str, attempts: int | None = None) -> str:
+    obj: dict[str, str | int] = {"digest": digest, "image_type": UserImageType.PROFILE.value}
+    if attempts is not None:
+        obj["attempts"] = attempts
+    return json.dumps(obj)
+
+
+@pytest.mark.asyncio
+async def test_handle_job(get_test_redis: Redis, tmp_path: Path) -> None:
+    """
+    ジョブが処理され、処理中リストから削除されること。
+    """
+    store = LocalBlobStore(tmp_path)
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 800)).save(buffer, format="PNG")
+    blob = await store.save(to_stream(buffer.getvalue()), max_bytes=1024 * 1024)
+    job = create_job(blob.digest)
+    await get_test_redis.rpush(PROCESSING, job)
+
+    with ThreadPoolExecutor() as executor:
+        await image_worker.handle_job(get_test_redis, store, executor, job, max_attempts=3)
+
+    assert await get_test_redis.exists(QUEUE, PROCESSING, DEAD) == 0
+    for name in image_service.IMAGE_VARIANTS[UserImageType.PROFILE]:
+        assert await store.media_type(blob.digest, name) == "image/webp"
+
+
+@pytest.mark.asyncio
+async def test_handle_job_permanent_error(get_test_redis: Redis, tmp_path: Path) -> None:
+    """
+    元画像が存在しない等、恒久的なエラーのジョブは再試行せず破棄されること。
+    """
+    job = create_job("0" * 64)
+    await get_test_redis.rpush(PROCESSING, job)
+
+    with ThreadPoolExecutor() as executor:
+        await image_worker.handle_job(
+            get_test_redis, LocalBlobStore(tmp_path), executor, job, max_attempts=3
+        )
+
+    assert await get_test_redis.exists(QUEUE, PROCESSING, DEAD) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ["attempts", "expected_queue", "expected_attempts"],
+    [
+        pytest.param(None, QUEUE, 1, id="retry"),
+        pytest.param(2, DEAD, 3, id="dead letter"),
+    ],
+)
+async def test_handle_job_transient_error(
+    get_test_redis: Redis,
+    tmp_path: Path,
+    mocker: MockFixture,
+    attempts: int | None,
+    expected_queue: str,
+    expected_attempts: int,
+) -> None:
+    """
+    一時的なエラーのジョブは試行回数を加算して再登録され、上限に達した場合はデッドレターキューへ移動すること。
+    """
+    mocker.patch.object(
+        image_service, "process_variants_job", side_effect=OSError("storage unavailable")
+    )
+    mocker.patch.object(job_queue.asyncio, "sleep")
+    job = create_job("0" * 64, attempts)
+    await get_test_redis.rpush(PROCESSING, job)
+
+    with ThreadPoolExecutor() as executor:
+        await image_worker.handle_job(
+            get_test_redis, LocalBlobStore(tmp_path), executor, job, max_attempts=3
+        )
+
+    assert await get_test_redis.exists(PROCESSING) == 0
+    jobs = await get_test_redis.lrange(expected_queue, 0, -1)
+    assert [json.loads(j)["attempts"] for j in jobs] == [expected_attempts]
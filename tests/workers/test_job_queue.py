@@ -0,0 +1,22 @@
+import pytest
+from redis.asyncio.client import Redis
+
+from app.core.redis import generate_processing_queue_key, generate_queue_key
+from app.workers import job_queue
+
+NAME = "test"
+QUEUE = generate_queue_key(NAME)
+PROCESSING = generate_processing_queue_key(NAME)
+
+
+@pytest.mark.asyncio
+async def test_requeue_processing_jobs(get_test_redis: Redis) -> None:
+    """
+    処理中リストに残ったジョブが元の順序でキューの先頭に戻されること。
+    """
+    await get_test_redis.rpush(PROCESSING, "job1", "job2")
+    await get_test_redis.rpush(QUEUE, "job3")
+
+    assert await job_queue.requeue_processing_jobs(get_test_redis, NAME) == 2
+    assert await get_test_redis.lrange(QUEUE, 0, -1) == ["job1", "job2", "job3"]
+    assert await get_test_redis.exists(PROCESSING) == 0
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from pytest_mock import MockFixture
+from redis.asyncio.client import Redis
+
+from app.core.redis import (
+    generate_dead_letter_queue_key,
+    generate_followers_key,
+    generate_processing_queue_key,
+    generate_queue_key,
+    generate_timeline_key,
+)
+from app.services import timeline_service
+from app.workers import job_queue, timeline_worker
+
+QUEUE = generate_queue_key(timeline_service.TIMELINE_QUEUE)
+PROCESSING = generate_processing_queue_key(timeline_service.TIMELINE_QUEUE)
+DEAD = generate_dead_letter_queue_key(timeline_service.TIMELINE_QUEUE)
+
+
+@pytest.mark.asyncio
+async def test_handle_job(get_test_redis: Redis) -> None:
+    """
+    投稿がフォロワーに配信され、ジョブが処理中リストから削除されること。
+    """
+    await get_test_redis.zadd(generate_followers_key(1), {"11": 1})
+    job = json.dumps({"post_id": 100, "user_id": 1})
+    await get_test_redis.rpush(PROCESSING, job)
+
+    await timeline_worker.handle_job(get_test_redis, job, max_attempts=3)
+
+    assert await get_test_redis.lrange(generate_timeline_key(11), 0, -1) == ["100"]
+    assert await get_test_redis.exists(QUEUE, PROCESSING, DEAD) == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_job_invalid(get_test_redis: Redis) -> None:
+    """
+    形式が不正なジョブは再試行せず破棄されること。
+    """
+    job = json.dumps({"post_id": "abc"})
+    await get_test_redis.rpush(PROCESSING, job)
+
+    await timeline_worker.handle_job(get_test_redis, job, max_attempts=3)
+
+    assert await get_test_redis.exists(QUEUE, PROCESSING, DEAD) == 0
+
+
+@pytest.mark.asyncio
+async def test_handle_job_transient_error(get_test_redis: Redis, mocker: MockFixture) -> None:
+    """
+    配信に失敗したジョブは試行回数を加算して再登録されること。
+    """
+    mocker.patch.object(timeline_service, "fanout_post", side_effect=OSError("unavailable"))
+    mocker.patch.object(job_queue.asyncio, "sleep")
+    job = json.dumps({"post_id": 100, "user_id": 1})
+    await get_test_redis.rpush(PROCESSING, job)
+
+    await timeline_worker.handle_job(get_test_redis, job, max_attempts=3)
+
+    assert await get_test_redis.exists(PROCESSING) == 0
+    jobs = await get_test_redis.lrange(QUEUE, 0, -1)
+    assert [json.loads(j)["attempts"] for j in jobs] == [1]